@@ -0,0 +1,156 @@
+# Measure how much logging adds to every step of a camera movement, without
+# Blender. A step logs the calls it makes the way VLIPSSimulation and the vlips
+# classes do: eagerly formatting every argument with f-strings (before) or
+# through CallTrace (after). The Blender context and property groups passed to
+# the methods are stood in by objects as slow to format as Blender's.
+#
+# python benchmark_logging.py --steps 10000
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "vlips_addon"))
+
+from vlips import CallTrace, Camera  # noqa: E402
+
+log = logging.getLogger("vlips.benchmark")
+
+
+class BlenderStruct:
+    """
+    Stand-in for a Blender context or property group: formatting it walks its
+    properties, as Blender's own representation does.
+    """
+
+    def __init__(self, name, properties=40):
+        self.name = name
+        self.properties = {f"property_{index}": index * 0.5 for index in range(properties)}
+
+    def __str__(self):
+        return f"<bpy_struct, {self.name}({', '.join(f'{key}={value}' for key, value in self.properties.items())})>"
+
+
+def log_step_before(context, properties, camera, step):
+    """
+    Log a step the way the add-on did before CallTrace.
+    """
+
+    log.debug(f"VLIPSSimulation.setup_camera("
+              f"context={context}, "
+              f"name={camera.name}, "
+              f"resolution_width={camera.resolution_width}, "
+              f"resolution_height={camera.resolution_height}, "
+              f"focal_length={camera.focal_length}, "
+              f"pixel_size={camera.pixel_size}, "
+              f"scene_properties={properties}, "
+              f"room_properties={properties}, "
+              f"beacon_properties={properties}, "
+              f"x={step}, "
+              f"y={step})")
+    log.debug(f"VLIPSSimulation.update_camera_pose("
+              f"context={context}, "
+              f"camera_movement_step={step})")
+    log.debug(f"- camera.location={camera.location}")
+    log.debug(f"- camera.rotation_euler={camera.rotation}")
+    log.debug(f"Camera.__init__("
+              f"name={camera.name}, "
+              f"facing={camera.facing}, "
+              f"location={camera.location}, "
+              f"rotation={camera.rotation}, "
+              f"rotation_x_angle={camera.rotation_x_angle}, "
+              f"rotation_z_angle={camera.rotation_z_angle})")
+
+
+def log_step_after(context, properties, camera, step):
+    """
+    Log a step the way the add-on does with CallTrace.
+    """
+
+    CallTrace.log(log, "VLIPSSimulation.setup_camera",
+                  context=context,
+                  name=camera.name,
+                  resolution_width=camera.resolution_width,
+                  resolution_height=camera.resolution_height,
+                  focal_length=camera.focal_length,
+                  pixel_size=camera.pixel_size,
+                  scene_properties=properties,
+                  room_properties=properties,
+                  beacon_properties=properties,
+                  x=step,
+                  y=step)
+    CallTrace.log(log, "VLIPSSimulation.update_camera_pose",
+                  context=context,
+                  camera_movement_step=step)
+    log.debug("- camera.location=%s", camera.location)
+    log.debug("- camera.rotation_euler=%s", camera.rotation)
+    CallTrace.log(log, "Camera.__init__",
+                  name=camera.name,
+                  facing=camera.facing,
+                  location=camera.location,
+                  rotation=camera.rotation,
+                  rotation_x_angle=camera.rotation_x_angle,
+                  rotation_z_angle=camera.rotation_z_angle)
+
+
+def time_steps(log_step, steps) -> float:
+    """
+    Log the given number of steps.
+
+    :return: mean time per step, in microseconds.
+    """
+
+    context = BlenderStruct("Context")
+    properties = BlenderStruct("PropertyGroup")
+    camera = Camera(facing=Camera.Facing.BACK, location=(100, 200, 1000), rotation=(180, 0, 170))
+
+    start_time = time.perf_counter()
+    for step in range(steps):
+        log_step(context, properties, camera, step)
+    return (time.perf_counter() - start_time) * 1e6 / steps
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the overhead of logging per camera movement step")
+    parser.add_argument(
+        "--steps",
+        type=int,
+        default=10000,
+        help="steps logged for every measurement")
+    parser.add_argument(
+        "--trace-sample-every",
+        type=int,
+        default=100,
+        help="sampling of the call trace measured")
+    arguments = parser.parse_args()
+
+    # Keep handlers away from the measurements: records enabled are written
+    # to a handler that discards them
+    log.addHandler(logging.NullHandler())
+    log.propagate = False
+    CallTrace.trace_log.addHandler(logging.NullHandler())
+    CallTrace.trace_log.setLevel(logging.INFO)
+    CallTrace.trace_log.propagate = False
+
+    measurements = []
+    for level in (logging.INFO, logging.DEBUG):
+        log.setLevel(level)
+        for name, log_step in (("before", log_step_before), ("after", log_step_after)):
+            measurements.append((logging.getLevelName(level), name, "-", time_steps(log_step, arguments.steps)))
+
+    log.setLevel(logging.INFO)
+    CallTrace.set_sample_every(arguments.trace_sample_every)
+    measurements.append(("INFO", "after", f"1/{arguments.trace_sample_every}",
+                         time_steps(log_step_after, arguments.steps)))
+    CallTrace.set_sample_every(0)
+
+    print(f"{'level':<8}{'logging':<10}{'trace':<10}{'us/step':>10}")
+    for level, name, trace, microseconds in measurements:
+        print(f"{level:<8}{name:<10}{trace:<10}{microseconds:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+# Render a camera movement without Blender's user interface, one render after
+# the other in the same process. The add-on must be installed in Blender.
+#
+# blender -b --python render_camera_movement.py -- --settings settings.yml
+#
+# Use --shard-index and --shard-count to render only a part of the steps, so
+# several Blender instances can share the camera movement. See
+# render_camera_movement_sharded.py.
+#
+# Use --work-queue to share the steps among nodes with a common output path
+# instead: the scheduler fills a queue in the output path with
+# --plan-only --work-queue, and then any number of workers, on any node, take
+# batches of steps from it with --work-queue until none is left. See
+# vlips.WorkQueue.
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+import addon_utils
+import bpy
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+# Lines written to the standard output starting with this prefix carry a JSON
+# event, so the launcher of several shards can follow their progress among the
+# rest of Blender's output.
+EVENT_PREFIX = "VLIPS_EVENT "
+
+
+def emit_event(**event):
+    """
+    Write an event describing the progress of the render to the standard
+    output.
+
+    :param event: values describing the event.
+    """
+
+    print(f"{EVENT_PREFIX}{json.dumps(event)}", flush=True)
+
+
+def parse_arguments(argv):
+    """
+    Parse the arguments given to the script, this is, the ones after "--" in
+    Blender's command line.
+
+    :param argv: command line arguments.
+
+    :return: parsed arguments.
+    """
+
+    from vlips import WorkQueue
+
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    else:
+        argv = []
+
+    parser = argparse.ArgumentParser(
+        prog="blender -b --python render_camera_movement.py --",
+        description="Render a camera movement described in a settings file")
+    parser.add_argument(
+        "--settings",
+        required=True,
+        help="path to the settings file (YAML) saved by the add-on")
+    parser.add_argument(
+        "--output-path",
+        default=None,
+        help="folder where the renders will be saved to, instead of the one in the settings file")
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="render every step, even the ones already rendered to the output path")
+    parser.add_argument(
+        "--plan-only",
+        action="store_true",
+        help="only save the settings and the manifest to the output path, without rendering")
+    parser.add_argument(
+        "--shard-index",
+        type=int,
+        default=0,
+        help="index of the shard of steps rendered by this process, starting at 0")
+    parser.add_argument(
+        "--shard-count",
+        type=int,
+        default=1,
+        help="number of shards the steps are split into")
+    parser.add_argument(
+        "--trace-sample-every",
+        type=int,
+        default=0,
+        help="write one of every this many calls to each method to call_trace.jsonl in the output path "
+             "(default: 0, no trace)")
+    parser.add_argument(
+        "--work-queue",
+        action="store_true",
+        help="fill the work queue of the output path with the steps to render, along with --plan-only, or render "
+             "batches of steps taken from it until none is left")
+    parser.add_argument(
+        "--worker-id",
+        default=None,
+        help="name of this worker in the work queue (default: host name and process id)")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=WorkQueue.DEFAULT_BATCH_SIZE,
+        help=f"steps per batch of the work queue (default: {WorkQueue.DEFAULT_BATCH_SIZE})")
+    parser.add_argument(
+        "--lease-duration",
+        type=float,
+        default=WorkQueue.DEFAULT_LEASE_DURATION,
+        help="seconds a worker keeps a batch without heartbeats before others can take it "
+             f"(default: {WorkQueue.DEFAULT_LEASE_DURATION:g})")
+
+    arguments = parser.parse_args(argv)
+    if arguments.work_queue and arguments.shard_count > 1:
+        parser.error("--work-queue can't be used along with --shard-count")
+    if arguments.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if arguments.lease_duration <= 0:
+        parser.error("--lease-duration must be greater than 0")
+    if arguments.shard_count < 1:
+        parser.error("--shard-count must be at least 1")
+    if not 0 <= arguments.shard_index < arguments.shard_count:
+        parser.error("--shard-index must be between 0 and --shard-count - 1")
+    if arguments.trace_sample_every < 0:
+        parser.error("--trace-sample-every must be 0 or greater")
+
+    return arguments
+
+
+def main():
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)-15s %(levelname)8s %(name)s %(message)s')
+
+    addon_utils.enable("vlips_addon", default_set=False)
+
+    arguments = parse_arguments(sys.argv)
+
+    from vlips import CallTrace, CameraMovementManifest, ImageWriterPool, StageTimer, WorkQueue
+    from vlips_addon.modules.camera_movement_render_mode import CameraMovementRenderMode
+    from vlips_addon.modules.constants import SETUP_CAMERA_MOVEMENT_OPERATOR_NAME
+    from vlips_addon.modules.settings import Settings
+    from vlips_addon.modules.vlips_simulation import VLIPSSimulation
+
+    context = bpy.context
+
+    Settings.load(
+        context=context,
+        filepath=Path(arguments.settings))
+
+    camera_movement_properties = context.window_manager.operator_properties_last(
+        SETUP_CAMERA_MOVEMENT_OPERATOR_NAME)
+    if arguments.output_path is not None:
+        camera_movement_properties.output_path = arguments.output_path
+    if not camera_movement_properties.output_path:
+        log.error("Output path is empty")
+        sys.exit(1)
+
+    VLIPSSimulation.empty_scene(context)
+    VLIPSSimulation.create_scene(context)
+
+    try:
+        plan = VLIPSSimulation.plan_camera_movement(context)
+    except ValueError as error:
+        log.error(error)
+        sys.exit(1)
+
+    # Workers of a work queue take whatever batches are left, so they don't
+    # save the plan, which the scheduler already did
+    is_queue_worker = arguments.work_queue and not arguments.plan_only
+    if arguments.work_queue:
+        work_queue = WorkQueue(
+            Path(camera_movement_properties.output_path) / WorkQueue.QUEUE_FOLDER_NAME,
+            worker_id=arguments.worker_id,
+            lease_duration=arguments.lease_duration)
+    else:
+        work_queue = None
+
+    # Every shard, or worker, logs its completed renders, times its stages,
+    # and traces its calls to its own files, and tells its events apart
+    if is_queue_worker:
+        file_suffix = f"_{work_queue.worker_id}"
+        event_source = {"worker_id": work_queue.worker_id}
+    elif arguments.shard_count > 1:
+        file_suffix = f"_{arguments.shard_index}"
+        event_source = {"shard_index": arguments.shard_index}
+    else:
+        file_suffix = ""
+        event_source = {"shard_index": arguments.shard_index}
+    manifest = CameraMovementManifest(
+        camera_movement_properties.output_path,
+        completed_file_name=f"{Path(CameraMovementManifest.COMPLETED_FILE_NAME).stem}{file_suffix}.jsonl")
+
+    labels = VLIPSSimulation.get_camera_movement_labels(
+        context=context,
+        plan=plan)
+
+    # Every shard culls the same steps, since the plan is the same
+    labels, culled_steps = VLIPSSimulation.cull_camera_movement_steps(
+        plan=plan,
+        labels=labels,
+        visibility_policy=camera_movement_properties.visibility_policy,
+        culling_action=camera_movement_properties.culling_action)
+    if culled_steps > 0:
+        log.info(f"{culled_steps} steps culled by visibility, renders saved")
+
+    # Only the first shard saves the settings, the manifest, and the labels, so
+    # several processes don't write the same files at once
+    if arguments.shard_index == 0 and not is_queue_worker:
+        Settings.save(
+            context=context,
+            filepath=Path(camera_movement_properties.output_path) / "settings.yml")
+        manifest.write(plan.iter_manifest_steps())
+        VLIPSSimulation.save_camera_movement_labels(
+            labels=labels,
+            output_path=camera_movement_properties.output_path)
+
+    renderable_rows = plan.get_renderable_rows()
+    resume = camera_movement_properties.camera_movement_resume_enabled and not arguments.no_resume
+
+    if arguments.plan_only:
+        log.info(f"Manifest with {len(plan)} steps saved to {manifest.manifest_path}")
+        if work_queue is not None:
+            queued_rows = plan.get_pending_rows(manifest, renderable_rows) if resume else renderable_rows
+            batch_count = work_queue.create(queued_rows.tolist(), arguments.batch_size)
+            log.info(f"{len(queued_rows)} steps queued in {batch_count} batches to {work_queue.path}")
+        return
+
+    if is_queue_worker:
+        batch_count = work_queue.get_status()["total"]
+        if batch_count == 0:
+            log.error(f"Work queue {work_queue.path} is empty, fill it with --plan-only --work-queue")
+            sys.exit(1)
+        emit_event(
+            type="start",
+            **event_source,
+            total=len(renderable_rows),
+            culled=culled_steps,
+            batches=batch_count)
+    else:
+        # Steps are dealt round-robin, so every shard gets a similar share of
+        # each distance and angle. File paths come from the rows of the whole
+        # movement, so they are the same ones a single process would use
+        shard_rows = renderable_rows[arguments.shard_index::arguments.shard_count]
+        if resume:
+            pending_rows = plan.get_pending_rows(manifest, shard_rows)
+            log.info(f"{len(shard_rows) - len(pending_rows)} steps already rendered, skipped")
+        else:
+            pending_rows = shard_rows
+        emit_event(
+            type="start",
+            **event_source,
+            shard_count=arguments.shard_count,
+            total=len(renderable_rows),
+            culled=culled_steps,
+            shard_total=len(shard_rows),
+            skipped=len(shard_rows) - len(pending_rows))
+
+    rendered = 0
+    failures = []
+    attempted = 0
+
+    def step_rendered(manifest_step):
+        nonlocal rendered
+        manifest.record_completion(manifest_step)
+        rendered += 1
+        log.info(f"Render {rendered} saved to {manifest_step['filepath']}")
+        emit_event(type="render", **event_source, index=manifest_step["index"],
+                   filepath=manifest_step["filepath"])
+
+    def step_failed(manifest_step, error):
+        log.error(f"Render {manifest_step['index']} failed: {error}")
+        failures.append({"index": manifest_step["index"], "filepath": manifest_step["filepath"],
+                         "error": str(error)})
+        emit_event(type="failure", **event_source, index=manifest_step["index"],
+                   filepath=manifest_step["filepath"], error=str(error))
+
+    def collect_saved_steps(writer):
+        saved_steps, writer_failures = writer.collect()
+        for manifest_step in saved_steps:
+            step_rendered(manifest_step)
+        for manifest_step, error in writer_failures:
+            step_failed(manifest_step, error)
+
+    def render_steps(rows):
+        nonlocal attempted
+        attempted += len(rows)
+        if camera_movement_properties.render_mode == CameraMovementRenderMode.ANIMATION.value.identifier:
+            failed_steps = VLIPSSimulation.render_camera_movement_animation(
+                context=context,
+                plan=plan,
+                rows=rows,
+                output_path=camera_movement_properties.output_path,
+                step_rendered=step_rendered)
+            for manifest_step in failed_steps:
+                step_failed(manifest_step, "Frame couldn't be saved")
+        else:
+            # Renders are saved in the background while the next ones are made
+            with ImageWriterPool(stage_timer=stage_timer) as image_writer_pool:
+                for row in rows:
+                    manifest_step = plan.get_manifest_step(row)
+                    try:
+                        VLIPSSimulation.render_camera_movement_step(
+                            context=context,
+                            sweep=plan.sweep,
+                            camera_movement_step=plan.get_step(row),
+                            filepath=manifest_step["filepath"],
+                            writer=image_writer_pool,
+                            tag=manifest_step)
+                    except (RuntimeError, OSError) as error:
+                        step_failed(manifest_step, error)
+                    collect_saved_steps(image_writer_pool)
+                image_writer_pool.flush()
+                collect_saved_steps(image_writer_pool)
+
+    # Batches with failed renders are released, so any worker tries them
+    # again. Renders already saved are skipped then, if resuming. Steps of
+    # batches are rows of the table of the plan
+    def render_batch(step_indices):
+        batch_rows = np.asarray(step_indices, dtype=np.int64)
+        if resume:
+            batch_rows = plan.get_pending_rows(manifest, batch_rows)
+        previous_failures = len(failures)
+        render_steps(batch_rows)
+        if len(failures) > previous_failures:
+            raise RuntimeError(f"{len(failures) - previous_failures} renders of the batch failed")
+
+    # Every shard times its own stages, and reports them even if it is
+    # interrupted
+    stage_timer = StageTimer()
+    timing_report_path = Path(camera_movement_properties.output_path) / \
+        f"{Path(StageTimer.REPORT_FILE_NAME).stem}{file_suffix}.json"
+    VLIPSSimulation.set_stage_timer(stage_timer)
+
+    # So does its trace, if any
+    if arguments.trace_sample_every > 0:
+        trace_path = Path(camera_movement_properties.output_path) / \
+            f"{Path(CallTrace.FILE_NAME).stem}{file_suffix}.jsonl"
+        CallTrace.start(trace_path, arguments.trace_sample_every)
+
+    start_time = time.perf_counter()
+    finished = False
+    try:
+        if is_queue_worker:
+            work_queue.work(render_batch)
+        else:
+            render_steps(pending_rows)
+        finished = True
+    finally:
+        CallTrace.stop()
+        VLIPSSimulation.set_stage_timer(None)
+        stage_timer.count_renders(rendered)
+        stage_timer.save_report(
+            timing_report_path,
+            **event_source,
+            shard_count=arguments.shard_count,
+            pending=attempted,
+            failed=len(failures),
+            cancelled=not finished,
+            **plan.transitions)
+        log.info(f"Timing report saved to {timing_report_path}")
+    elapsed_time = time.perf_counter() - start_time
+
+    renders_per_second = rendered / elapsed_time if elapsed_time > 0 else 0.0
+    log.info(f"Rendered {rendered} images in {elapsed_time:.2f} s "
+             f"({renders_per_second:.2f} renders/s)")
+    if failures:
+        log.error(f"{len(failures)} renders failed")
+
+    emit_event(
+        type="finish",
+        **event_source,
+        rendered=rendered,
+        failures=failures,
+        elapsed_time=elapsed_time)
+
+    # Failures of a worker may be rendered by others later, so it only fails
+    # if batches were given up
+    if is_queue_worker:
+        status = work_queue.get_status()
+        log.info(f"Work queue: {status['done']}/{status['total']} batches done, {status['given_up']} given up")
+        if status["given_up"] > 0:
+            sys.exit(1)
+    elif failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+# Render a camera movement without Blender. The only thing visible in the
+# renders is the beacon, so it is projected with the same camera model Blender
+# uses and rasterized with NumPy. Renders get the same file names and EXIF data
+# Blender's would.
+#
+# The steps are read from the manifest in the output folder, written by the
+# add-on or by:
+#
+# blender -b --python render_camera_movement.py -- --settings settings.yml --plan-only
+#
+# Then:
+#
+# python render_camera_movement_analytic.py --settings settings.yml
+#
+# With --validate, nothing is written: the steps already rendered by Blender
+# are rendered again and compared, and the differences are saved to
+# validation_report.json in the output folder.
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import yaml
+from PIL import Image
+
+from vlips import AnalyticRenderer, Beacon, Camera, CameraMovementManifest, ImageWriterPool, Scene
+from vlips.constants import CAMERA_DEFAULT_ROTATION
+
+log = logging.getLogger(__name__)
+
+VALIDATION_REPORT_FILE_NAME = "validation_report.json"
+
+
+def get_scene_description(settings: dict) -> (Scene, Beacon, dict):
+    """
+    Describe the scene in a settings file with the helper classes used to store
+    it as EXIF data, as the add-on does.
+
+    :param settings: settings saved by the add-on.
+
+    :return: scene, beacon, and keyword arguments shared by the camera of
+    every step.
+    :rtype: (Scene, Beacon, dict)
+    """
+
+    scene_settings = settings["scene"]
+    beacon_settings = settings["beacon"]
+    camera_settings = settings["camera"]
+
+    scene = Scene(
+        tile_side=round(scene_settings["tile_side"]),
+        floor_sides_tiles=scene_settings["floor_side_tiles"])
+
+    # The beacon is in the middle of the ceiling
+    beacon = Beacon(
+        name=beacon_settings["name"],
+        dimensions=(round(beacon_settings["width"]), round(beacon_settings["height"]), 0),
+        location=(0, 0, round(settings["room"]["height"])),
+        rotation=(0.0, 0.0, 0.0))
+
+    camera_arguments = {
+        "name": camera_settings["name"],
+        "facing": Camera.Facing.from_str(camera_settings["facing"]),
+        "resolution_width": camera_settings["resolution_width"],
+        "resolution_height": camera_settings["resolution_height"],
+        "focal_length": camera_settings["focal_length"],
+        "pixel_size": camera_settings["pixel_size"],
+        "make": camera_settings["make"],
+        "model": camera_settings["model"],
+        "software": f"vlips ({settings['version']})"
+    }
+
+    return scene, beacon, camera_arguments
+
+
+def get_camera(step: dict, scene: Scene, camera_arguments: dict) -> Camera:
+    """
+    Describe the camera placed as a step of the camera movement says.
+
+    :param step: step as stored in the manifest.
+    :param scene: scene the camera is in.
+    :param camera_arguments: keyword arguments shared by every step.
+
+    :return: camera of the step.
+    :rtype: Camera
+    """
+
+    x, y, z = step["camera_location"]
+    return Camera(
+        location=(x, y, z),
+        rotation=(
+            CAMERA_DEFAULT_ROTATION[0] - step["rotation_x_angle"],
+            CAMERA_DEFAULT_ROTATION[1],
+            CAMERA_DEFAULT_ROTATION[2] - step["rotation_z_angle"]),
+        grid_location=(round(x / scene.tile_side), round(y / scene.tile_side)),
+        rotation_x_angle=step["rotation_x_angle"],
+        rotation_z_angle=step["rotation_z_angle"],
+        **camera_arguments)
+
+
+def render(steps, renderer, scene, beacon, camera_arguments, manifest, workers):
+    """
+    Render the steps and save them with their EXIF data.
+
+    :return: number of renders saved and failures.
+    """
+
+    rendered = 0
+    failures = []
+    with ImageWriterPool(workers=workers) as image_writer_pool:
+        def collect_saved_steps():
+            nonlocal rendered
+            saved_steps, writer_failures = image_writer_pool.collect()
+            for step in saved_steps:
+                manifest.record_completion(step)
+                rendered += 1
+            for step, error in writer_failures:
+                log.error(f"Render {step['index']} failed: {error}")
+                failures.append({"index": step["index"], "filepath": step["filepath"], "error": str(error)})
+
+        for step in steps:
+            camera = get_camera(step, scene, camera_arguments)
+            image_writer_pool.save_image(
+                filepath=step["filepath"],
+                pixels=renderer.render(camera, beacon),
+                scene=scene,
+                beacon=beacon,
+                camera=camera,
+                tag=step)
+            collect_saved_steps()
+        image_writer_pool.flush()
+        collect_saved_steps()
+
+    return rendered, failures
+
+
+def validate(steps, renderer, scene, beacon, camera_arguments) -> [dict]:
+    """
+    Render the steps already rendered by Blender and compare both renders.
+
+    :return: comparison of each step.
+    """
+
+    comparisons = []
+    for step in steps:
+        if not os.path.isfile(step["filepath"]):
+            continue
+
+        with Image.open(step["filepath"]) as image:
+            reference = np.asarray(image.convert("RGB"))
+        pixels = renderer.render(get_camera(step, scene, camera_arguments), beacon)
+        if pixels.shape != reference.shape:
+            log.error(f"Render {step['index']} has size {reference.shape}, {pixels.shape} expected")
+            continue
+
+        comparison = AnalyticRenderer.compare(pixels, reference)
+        comparison.update(index=step["index"], filepath=step["filepath"])
+        comparisons.append(comparison)
+        log.info(f"Render {step['index']}: IoU {comparison['intersection_over_union']:.4f}, "
+                 f"centroid distance {comparison['centroid_distance']} px")
+
+    return comparisons
+
+
+def main():
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)-15s %(levelname)8s %(name)s %(message)s')
+
+    parser = argparse.ArgumentParser(
+        description="Render a camera movement without Blender, projecting the beacon analytically")
+    parser.add_argument(
+        "--settings",
+        required=True,
+        help="path to the settings file (YAML) saved by the add-on")
+    parser.add_argument(
+        "--output-path",
+        default=None,
+        help="folder with the manifest, where the renders will be saved to, instead of the one in the settings file")
+    parser.add_argument(
+        "--supersampling",
+        type=int,
+        default=AnalyticRenderer.DEFAULT_SUPERSAMPLING,
+        help="samples per pixel along each axis, for anti-aliasing")
+    parser.add_argument(
+        "--beacon-color",
+        type=int,
+        nargs=3,
+        default=AnalyticRenderer.DEFAULT_BEACON_COLOR,
+        help="RGB color of the beacon")
+    parser.add_argument(
+        "--background-color",
+        type=int,
+        nargs=3,
+        default=AnalyticRenderer.DEFAULT_BACKGROUND_COLOR,
+        help="RGB color of the background")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=ImageWriterPool.DEFAULT_WORKERS,
+        help="threads encoding and saving the renders")
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="render every step, even the ones already rendered to the output path")
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="compare with the renders already in the output path instead of saving new ones")
+    arguments = parser.parse_args()
+
+    with open(arguments.settings, "r") as file:
+        settings = yaml.safe_load(file)
+
+    output_path = arguments.output_path or settings["camera_movement"]["output_path"]
+    manifest = CameraMovementManifest(output_path)
+    steps = manifest.read()
+    if not steps:
+        log.error(f"No manifest found in {output_path}")
+        sys.exit(1)
+    steps = CameraMovementManifest.exclude_culled(steps)
+
+    scene, beacon, camera_arguments = get_scene_description(settings)
+    if settings["camera"]["orientation"] == "landscape":
+        image_width, image_height = camera_arguments["resolution_width"], camera_arguments["resolution_height"]
+    else:
+        image_width, image_height = camera_arguments["resolution_height"], camera_arguments["resolution_width"]
+    renderer = AnalyticRenderer(
+        image_width=image_width,
+        image_height=image_height,
+        supersampling=arguments.supersampling,
+        beacon_color=tuple(arguments.beacon_color),
+        background_color=tuple(arguments.background_color))
+
+    start_time = time.perf_counter()
+
+    if arguments.validate:
+        comparisons = validate(steps, renderer, scene, beacon, camera_arguments)
+        centroid_distances = [
+            comparison["centroid_distance"] for comparison in comparisons
+            if comparison["centroid_distance"] is not None]
+        report = {
+            "settings": arguments.settings,
+            "output_path": output_path,
+            "supersampling": arguments.supersampling,
+            "compared": len(comparisons),
+            "mean_intersection_over_union":
+                float(np.mean([comparison["intersection_over_union"] for comparison in comparisons]))
+                if comparisons else None,
+            "max_centroid_distance": max(centroid_distances) if centroid_distances else None,
+            "mean_absolute_difference":
+                float(np.mean([comparison["mean_absolute_difference"] for comparison in comparisons]))
+                if comparisons else None,
+            "steps": comparisons
+        }
+
+        report_path = Path(output_path) / VALIDATION_REPORT_FILE_NAME
+        with open(report_path, "w") as file:
+            json.dump(report, file, indent=2)
+
+        log.info(f"Compared {len(comparisons)} renders, mean IoU {report['mean_intersection_over_union']}, "
+                 f"max centroid distance {report['max_centroid_distance']} px")
+        log.info(f"Report saved to {report_path}")
+        return
+
+    if arguments.no_resume:
+        pending_steps = steps
+    else:
+        pending_steps = manifest.get_pending_steps(steps)
+        log.info(f"{len(steps) - len(pending_steps)} steps already rendered, skipped")
+
+    rendered, failures = render(pending_steps, renderer, scene, beacon, camera_arguments, manifest, arguments.workers)
+    elapsed_time = time.perf_counter() - start_time
+
+    renders_per_minute = rendered * 60 / elapsed_time if elapsed_time > 0 else 0.0
+    log.info(f"Rendered {rendered} images in {elapsed_time:.2f} s ({renders_per_minute:.0f} renders/min)")
+
+    if failures:
+        log.error(f"{len(failures)} renders failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# Render a camera movement with several Blender instances in background mode,
+# each one rendering a disjoint shard of the steps into the same output folder.
+# Renders get the same file names a single process would give them.
+#
+# python render_camera_movement_sharded.py --settings settings.yml --workers 4
+
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import yaml
+
+log = logging.getLogger(__name__)
+
+# Must match the prefix used by render_camera_movement.py
+EVENT_PREFIX = "VLIPS_EVENT "
+
+WORKER_SCRIPT_PATH = Path(__file__).parent / "render_camera_movement.py"
+REPORT_FILE_NAME = "render_report.json"
+
+
+class ShardProgress:
+    """
+    Merge the progress of every shard into a single count of renders and
+    failures.
+    """
+
+    def __init__(self, shard_count):
+        self.lock = threading.Lock()
+        self.total = None
+        self.rendered = 0
+        self.skipped = 0
+        self.culled = 0
+        self.failures = []
+        self.shards = {
+            shard_index: {"rendered": 0, "failures": 0, "finished": False, "elapsed_time": None}
+            for shard_index in range(shard_count)}
+
+    def update(self, event: dict):
+        """
+        Account for an event sent by one of the shards.
+
+        :param event: event read from the output of the shard.
+        """
+
+        with self.lock:
+            shard = self.shards[event["shard_index"]]
+            if event["type"] == "start":
+                self.total = event["total"]
+                self.culled = event.get("culled", 0)
+                self.skipped += event["skipped"]
+            elif event["type"] == "render":
+                self.rendered += 1
+                shard["rendered"] += 1
+                log.info(f"Render {self.skipped + self.rendered + len(self.failures)}/{self.total} "
+                         f"saved to {event['filepath']} (shard {event['shard_index']})")
+            elif event["type"] == "failure":
+                self.failures.append(event)
+                shard["failures"] += 1
+                log.error(f"Render {event['index']} failed in shard {event['shard_index']}: {event['error']}")
+            elif event["type"] == "finish":
+                shard["finished"] = True
+                shard["elapsed_time"] = event["elapsed_time"]
+
+
+def follow_shard(process: subprocess.Popen, progress: ShardProgress):
+    """
+    Read the output of a shard until it ends, forwarding its events.
+
+    :param process: Blender process rendering the shard.
+    :param progress: merged progress of all the shards.
+    """
+
+    for line in process.stdout:
+        if line.startswith(EVENT_PREFIX):
+            progress.update(json.loads(line[len(EVENT_PREFIX):]))
+        else:
+            log.debug(line.rstrip())
+
+
+def main():
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)-15s %(levelname)8s %(name)s %(message)s')
+
+    cpu_count = os.cpu_count() or 1
+
+    parser = argparse.ArgumentParser(
+        description="Render a camera movement with several Blender processes")
+    parser.add_argument(
+        "--settings",
+        required=True,
+        help="path to the settings file (YAML) saved by the add-on")
+    parser.add_argument(
+        "--output-path",
+        default=None,
+        help="folder where the renders will be saved to, instead of the one in the settings file")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=cpu_count,
+        help="number of Blender processes, each one rendering its own shard of the steps")
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="render threads for each Blender process (default: CPUs divided by workers)")
+    parser.add_argument(
+        "--blender",
+        default="blender",
+        help="path to Blender's executable")
+    parser.add_argument(
+        "--trace-sample-every",
+        type=int,
+        default=0,
+        help="write one of every this many calls to each method to a trace file per shard (default: 0, no trace)")
+    arguments = parser.parse_args()
+
+    if arguments.workers < 1:
+        parser.error("--workers must be at least 1")
+    threads = arguments.threads or max(1, cpu_count // arguments.workers)
+
+    output_path = arguments.output_path
+    if output_path is None:
+        with open(arguments.settings, "r") as file:
+            output_path = yaml.safe_load(file)["camera_movement"]["output_path"]
+
+    progress = ShardProgress(arguments.workers)
+    processes = []
+    followers = []
+    start_time = time.perf_counter()
+    for shard_index in range(arguments.workers):
+        command = [
+            arguments.blender, "-b", "-t", str(threads),
+            "--python-exit-code", "1",
+            "--python", str(WORKER_SCRIPT_PATH),
+            "--",
+            "--settings", arguments.settings,
+            "--output-path", output_path,
+            "--shard-index", str(shard_index),
+            "--shard-count", str(arguments.workers),
+            "--trace-sample-every", str(arguments.trace_sample_every)]
+        log.debug("- command: %s", command)
+
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True)
+        follower = threading.Thread(target=follow_shard, args=(process, progress), daemon=True)
+        follower.start()
+        processes.append(process)
+        followers.append(follower)
+
+    return_codes = [process.wait() for process in processes]
+    for follower in followers:
+        follower.join()
+    elapsed_time = time.perf_counter() - start_time
+
+    # Shards that died before finishing didn't report every failure, so they
+    # are listed apart
+    crashed_shards = [
+        shard_index for shard_index, shard in progress.shards.items()
+        if not shard["finished"] or return_codes[shard_index] not in (0, 1)]
+
+    report = {
+        "settings": arguments.settings,
+        "output_path": output_path,
+        "workers": arguments.workers,
+        "threads": threads,
+        "total": progress.total,
+        "rendered": progress.rendered,
+        "skipped": progress.skipped,
+        "culled": progress.culled,
+        "failed": len(progress.failures),
+        "elapsed_time": elapsed_time,
+        "renders_per_second": progress.rendered / elapsed_time if elapsed_time > 0 else 0.0,
+        "crashed_shards": crashed_shards,
+        "shards": progress.shards,
+        "failures": [
+            {"index": failure["index"], "filepath": failure["filepath"],
+             "error": failure["error"], "shard_index": failure["shard_index"]}
+            for failure in sorted(progress.failures, key=lambda failure: failure["index"])]
+    }
+
+    report_path = Path(output_path) / REPORT_FILE_NAME
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, "w") as file:
+        json.dump(report, file, indent=2)
+
+    log.info(f"Rendered {progress.rendered}/{progress.total} images in {elapsed_time:.2f} s "
+             f"({report['renders_per_second']:.2f} renders/s) with {arguments.workers} workers")
+    log.info(f"Report saved to {report_path}")
+
+    if progress.failures or crashed_shards:
+        log.error(f"{len(progress.failures)} renders failed, {len(crashed_shards)} shards crashed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+# Keep a Blender instance running in background mode with the scene of a
+# settings file built, rendering the jobs sent to it over a local socket. Jobs
+# skip Blender's startup, the add-on registration, and the creation of the
+# scene, so small jobs of a few poses are rendered right away.
+#
+# blender -b --python render_worker.py -- --settings settings.yml --port 8765
+#
+# Messages are lines of JSON, described in vlips.RenderJobProtocol. Once the
+# worker listens, it writes a "ready" event to the standard output, like the
+# ones of render_camera_movement.py, with the port it listens on.
+
+import argparse
+import json
+import logging
+import socket
+import sys
+import time
+from pathlib import Path
+
+import addon_utils
+import bpy
+
+log = logging.getLogger(__name__)
+
+# Must match the prefix used by render_camera_movement.py
+EVENT_PREFIX = "VLIPS_EVENT "
+
+
+def parse_arguments(argv):
+    """
+    Parse the arguments given to the script, this is, the ones after "--" in
+    Blender's command line.
+
+    :param argv: command line arguments.
+
+    :return: parsed arguments.
+    """
+
+    from vlips import RenderJobProtocol
+
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    else:
+        argv = []
+
+    parser = argparse.ArgumentParser(
+        prog="blender -b --python render_worker.py --",
+        description="Render jobs sent over a local socket, keeping the scene of a settings file built")
+    parser.add_argument(
+        "--settings",
+        required=True,
+        help="path to the settings file (YAML) saved by the add-on")
+    parser.add_argument(
+        "--host",
+        default=RenderJobProtocol.DEFAULT_HOST,
+        help="address the worker listens on (default: only local connections)")
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=RenderJobProtocol.DEFAULT_PORT,
+        help="port the worker listens on, or 0 to pick a free one")
+
+    return parser.parse_args(argv)
+
+
+class RenderWorker:
+    """
+    Render the jobs read from a connection, sending back their progress.
+    """
+
+    def __init__(self, context):
+        from vlips_addon.modules.constants import SETUP_ROOM_OPERATOR_NAME
+        from vlips_addon.modules.vlips_simulation import VLIPSSimulation
+
+        self.context = context
+        self.sweep = VLIPSSimulation.get_camera_movement_sweep(context)
+        self.room_height = context.window_manager.operator_properties_last(SETUP_ROOM_OPERATOR_NAME).height
+
+    @staticmethod
+    def send(connection: socket.socket, **message):
+        from vlips import RenderJobProtocol
+
+        connection.sendall(RenderJobProtocol.encode(message))
+
+    def serve(self, server: socket.socket):
+        """
+        Accept connections one after the other until a client asks the worker
+        to shut down.
+
+        :param server: socket listening for connections.
+        """
+
+        while True:
+            connection, address = server.accept()
+            log.info(f"Client connected from {address}")
+            with connection:
+                try:
+                    if not self.serve_connection(connection):
+                        return
+                except OSError as error:
+                    log.warning(f"Connection with {address} lost: {error}")
+            log.info(f"Client {address} disconnected")
+
+    def serve_connection(self, connection: socket.socket) -> bool:
+        """
+        Handle the messages read from a connection until it is closed.
+
+        :param connection: connection with a client.
+
+        :return: False if the client asked the worker to shut down.
+        """
+
+        from vlips import RenderJobProtocol
+
+        with connection.makefile("rb") as reader:
+            for line in reader:
+                try:
+                    message = RenderJobProtocol.decode(line)
+                except ValueError as error:
+                    self.send(connection, type=RenderJobProtocol.MessageType.ERROR, error=str(error))
+                    continue
+
+                if message["type"] == RenderJobProtocol.MessageType.PING:
+                    self.send(connection, type=RenderJobProtocol.MessageType.PONG)
+                elif message["type"] == RenderJobProtocol.MessageType.SHUTDOWN:
+                    log.info("Shutdown requested")
+                    return False
+                elif message["type"] == RenderJobProtocol.MessageType.RENDER:
+                    try:
+                        RenderJobProtocol.validate_job(message)
+                    except ValueError as error:
+                        self.send(connection, type=RenderJobProtocol.MessageType.ERROR,
+                                  job_id=message.get("job_id"), error=str(error))
+                        continue
+
+                    # A job that fails unexpectedly fails alone, the worker
+                    # keeps serving
+                    try:
+                        self.render_job(connection, message)
+                    except ConnectionError:
+                        raise
+                    except Exception as error:
+                        log.exception(f"Job {message['job_id']} failed")
+                        self.send(connection, type=RenderJobProtocol.MessageType.ERROR,
+                                  job_id=message["job_id"], error=str(error))
+                else:
+                    self.send(connection, type=RenderJobProtocol.MessageType.ERROR,
+                              error=f"Workers don't accept {message['type'].value} messages")
+
+        return True
+
+    def render_job(self, connection: socket.socket, job: dict):
+        """
+        Render every pose of a job, sending a message as soon as each render
+        is saved.
+
+        :param connection: connection with the client that sent the job.
+        :param job: job message.
+        """
+
+        from vlips import CameraMovementManifest, ImageWriterPool, RenderJobProtocol
+        from vlips_addon.modules.vlips_simulation import VLIPSSimulation
+
+        job_id = job["job_id"]
+        Path(job["output_path"]).mkdir(parents=True, exist_ok=True)
+        file_paths = RenderJobProtocol.get_file_paths(job)
+
+        log.info(f"Render job {job_id} with {len(job['poses'])} poses")
+        self.send(connection, type=RenderJobProtocol.MessageType.START, job_id=job_id, total=len(job["poses"]))
+
+        start_time = time.perf_counter()
+        rendered = 0
+        failed = 0
+
+        def send_saved_steps(writer):
+            nonlocal rendered, failed
+            saved_steps, writer_failures = writer.collect()
+            for step in saved_steps:
+                rendered += 1
+                self.send(connection, type=RenderJobProtocol.MessageType.STEP, job_id=job_id, step=step)
+            for step, error in writer_failures:
+                failed += 1
+                self.send(connection, type=RenderJobProtocol.MessageType.FAILURE, job_id=job_id,
+                          step=step, error=str(error))
+
+        with ImageWriterPool() as image_writer_pool:
+            for index, (pose, filepath) in enumerate(zip(job["poses"], file_paths)):
+                # The step sent back is the one stored in camera movement
+                # manifests
+                step = CameraMovementManifest.create_step(
+                    index=index,
+                    filepath=filepath,
+                    camera_location=(pose["x"], pose["y"], self.room_height - pose["distance"]),
+                    rotation_x_angle=pose["rotation_x_angle"],
+                    rotation_z_angle=pose["rotation_z_angle"])
+                try:
+                    VLIPSSimulation.render_camera_movement_step(
+                        context=self.context,
+                        sweep=self.sweep,
+                        camera_movement_step=VLIPSSimulation.get_pose_camera_movement_step(
+                            **{key: pose[key] for key in RenderJobProtocol.POSE_KEYS}),
+                        filepath=filepath,
+                        writer=image_writer_pool,
+                        tag=step)
+                except (RuntimeError, OSError) as error:
+                    failed += 1
+                    self.send(connection, type=RenderJobProtocol.MessageType.FAILURE, job_id=job_id,
+                              step=step, error=str(error))
+                send_saved_steps(image_writer_pool)
+            image_writer_pool.flush()
+            send_saved_steps(image_writer_pool)
+
+        elapsed_time = time.perf_counter() - start_time
+        log.info(f"Job {job_id} rendered in {elapsed_time:.2f} s, {failed} failures")
+        self.send(connection, type=RenderJobProtocol.MessageType.FINISH, job_id=job_id,
+                  rendered=rendered, failed=failed, elapsed_time=elapsed_time)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)-15s %(levelname)8s %(name)s %(message)s')
+
+    start_time = time.perf_counter()
+
+    addon_utils.enable("vlips_addon", default_set=False)
+
+    from vlips_addon.modules.settings import Settings
+    from vlips_addon.modules.vlips_simulation import VLIPSSimulation
+
+    arguments = parse_arguments(sys.argv)
+
+    context = bpy.context
+
+    Settings.load(
+        context=context,
+        filepath=Path(arguments.settings))
+
+    VLIPSSimulation.empty_scene(context)
+    VLIPSSimulation.create_scene(context)
+
+    worker = RenderWorker(context)
+
+    with socket.create_server((arguments.host, arguments.port)) as server:
+        host, port = server.getsockname()[:2]
+        startup_time = time.perf_counter() - start_time
+        log.info(f"Worker listening on {host}:{port}, ready in {startup_time:.2f} s")
+        print(f"{EVENT_PREFIX}{json.dumps({'type': 'ready', 'host': host, 'port': port})}", flush=True)
+
+        worker.serve(server)
+
+
+if __name__ == "__main__":
+    main()
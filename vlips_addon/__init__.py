@@ -3,6 +3,7 @@ import logging
 import bpy
 
 from .modules.constants import ADDON_SHORT_NAME, CAMERA_SOFTWARE
+from .operators.benchmark_render_profiles_operator import BenchmarkRenderProfilesOperator
 from .operators.create_scene_operator import CreateSceneOperator
 from .operators.empty_scene_operator import EmptySceneOperator
 from .operators.load_settings_operator import LoadSettingsOperator
@@ -54,6 +55,7 @@ addon_classes = [
     RenderSceneOperator,
     RenderCameraMovementOperator,
     RenderCameraFOVCornersOperator,
+    BenchmarkRenderProfilesOperator,
     VIEW3D_PT_actions,
     VIEW3D_PT_preferences,
     VIEW3D_PT_camera_movement,
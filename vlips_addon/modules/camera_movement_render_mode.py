@@ -0,0 +1,12 @@
+from vlips_addon.modules.enum_property import EnumProperty, EnumPropertyItem
+
+
+class CameraMovementRenderMode(EnumProperty):
+    STILLS = EnumPropertyItem(
+        identifier="stills",
+        name="Stills",
+        description="Render each step of the camera movement on its own")
+    ANIMATION = EnumPropertyItem(
+        identifier="animation",
+        name="Animation",
+        description="Bake the steps as keyframes and render them as a single animation")
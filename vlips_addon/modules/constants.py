@@ -26,6 +26,7 @@ SETUP_CAMERA_MOVEMENT_ROTATION_X_ANGLE_OPERATOR_NAME = \
     f"mesh.{ADDON_SHORT_NAME}_setup_camera_movement_rotation_x_angle"
 SETUP_CAMERA_MOVEMENT_ROTATION_Z_ANGLE_OPERATOR_NAME = \
     f"mesh.{ADDON_SHORT_NAME}_setup_camera_movement_rotation_z_angle"
+BENCHMARK_RENDER_PROFILES_OPERATOR_NAME = f"mesh.{ADDON_SHORT_NAME}_benchmark_render_profiles"
 
 # Scene Operator Constants
 
@@ -37,6 +38,48 @@ DEFAULT_FLOOR_SIDE_TILES = 32  # tiles
 MIN_FLOOR_SIDE_TILES = 1
 MAX_FLOOR_SIDE_TILES = 100
 
+DEFAULT_REGION_OF_INTEREST_MODE = "off"
+
+DEFAULT_RENDER_PROFILE = "scene"
+
+# Render settings changed by each render profile, as paths relative to the
+# scene and their values. They are restored after rendering
+RENDER_PROFILE_SETTINGS = {
+    "scene": {},
+    "workbench_flat": {
+        "render.engine": "BLENDER_WORKBENCH",
+        "display.render_aa": "8",
+        "display.shading.light": "FLAT",
+        "display.shading.color_type": "MATERIAL",
+        "display.shading.show_shadows": False,
+        "display.shading.show_cavity": False,
+        "display.shading.show_object_outline": False,
+        "display.shading.show_specular_highlight": False
+    },
+    "eevee": {
+        "render.engine": "BLENDER_EEVEE",
+        "eevee.taa_render_samples": 16,
+        "eevee.use_bloom": False,
+        "eevee.use_gtao": False,
+        "eevee.use_ssr": False,
+        "eevee.use_soft_shadows": False
+    },
+    "cycles_cpu": {
+        "render.engine": "CYCLES",
+        "cycles.device": "CPU",
+        "cycles.samples": 16,
+        "cycles.use_adaptive_sampling": True,
+        "cycles.use_denoising": True,
+        "cycles.denoiser": "OPENIMAGEDENOISE",
+        "cycles.use_auto_tile": True,
+        "cycles.tile_size": 2048
+    }
+}
+
+DEFAULT_REGION_OF_INTEREST_MARGIN = 16  # pixels
+MIN_REGION_OF_INTEREST_MARGIN = 0
+MAX_REGION_OF_INTEREST_MARGIN = 256
+
 DISTANCE_STEP = 100  # millimeters
 
 # Room Operator Constants
@@ -74,6 +117,8 @@ MAX_BEACON_HEIGHT = 500
 
 DEFAULT_BEACON_ROTATION = (0.0, 0.0, 0.0)
 
+BEACON_MATERIAL_NAME = "Plane Light Emission Shader"
+
 # Camera constants
 
 DEFAULT_CAMERA_NAME = "Camera"
@@ -147,6 +192,9 @@ CAMERA_FOV_BEACON_NAME = "2. Beacon"
 CAMERA_FOV_TILES_NAME = "3. Tiles"
 CAMERA_FOV_EVEN_TILES_NAME = "4. Even Tiles"
 
+# Custom property of the FOV meshes with the subdivisions of their geometry
+FOV_SUBDIVISIONS_PROPERTY = "vlips_subdivisions"
+
 CAMERA_FOV_FULL_COLOR = (.1, .1, .1, .5)
 CAMERA_FOV_BEACON_COLOR = (.2, .2, .2, .6)
 CAMERA_FOV_TILES_COLOR = (.3, .3, .3, .7)
@@ -183,6 +231,15 @@ DEFAULT_CAMERA_MOVEMENT_FOV_SCAN_ENABLED = True
 DEFAULT_CAMERA_MOVEMENT_BEACON_DISTANCE_ENABLED = False
 DEFAULT_CAMERA_MOVEMENT_ROTATION_X_ANGLE_ENABLED = False
 DEFAULT_CAMERA_MOVEMENT_ROTATION_Z_ANGLE_ENABLED = False
+DEFAULT_CAMERA_MOVEMENT_RESUME_ENABLED = True
+DEFAULT_CAMERA_MOVEMENT_RENDER_MODE = "stills"
+DEFAULT_CAMERA_MOVEMENT_VISIBILITY_POLICY = "all"
+DEFAULT_CAMERA_MOVEMENT_CULLING_ACTION = "drop"
+DEFAULT_CAMERA_MOVEMENT_SAMPLING_MODE = "grid"
+DEFAULT_CAMERA_MOVEMENT_SAMPLE_COUNT = 100
+MIN_CAMERA_MOVEMENT_SAMPLE_COUNT = 1
+MAX_CAMERA_MOVEMENT_SAMPLE_COUNT = 1000000
+DEFAULT_CAMERA_MOVEMENT_SAMPLING_SEED = 0
 
 DEFAULT_CAMERA_DISTANCE_STEP = 100  # millimeters
 MIN_CAMERA_DISTANCE_STEP = 10
@@ -226,6 +283,22 @@ DEFAULT_RENDER_SCENE_OUTPUT_PATH = f"{expanduser('~')}/Desktop/"
 DEFAULT_RENDER_CAMERA_MOVEMENT_OUTPUT_PATH = f"{expanduser('~')}/Desktop/renders/"
 DEFAULT_RENDER_CAMERA_FOV_CORNERS_OUTPUT_PATH = f"{expanduser('~')}/Desktop/renders/"
 
+# Camera poses rendered by the render profiles benchmark: X, Y, beacon
+# distance, rotation X angle, and rotation Z angle, in millimeters and degrees
+BENCHMARK_RENDER_PROFILES_POSES = [
+    (0, 0, 1000, 0.0, 0.0),
+    (250, -150, 1500, 0.0, 30.0),
+    (0, 0, 1800, 20.0, 0.0),
+    (-200, 100, 600, 10.0, -45.0),
+    (400, 300, 1200, -15.0, 90.0)
+]
+BENCHMARK_RENDER_PROFILES_FOLDER_NAME = "render_profiles_benchmark"
+BENCHMARK_RENDER_PROFILES_REPORT_FILE_NAME = "render_profiles_benchmark.json"
+DEFAULT_BENCHMARK_MIN_INTERSECTION_OVER_UNION = 0.95
+
+# Image where the compositor's viewer node leaves the last render
+VIEWER_NODE_IMAGE_NAME = "Viewer Node"
+
 CAMERA_MOVEMENT_FOV_SCAN_LOCATION_KEY = "location"
 CAMERA_MOVEMENT_FOV_SCAN_FILE_NAME_KEY = "file_name"
 CAMERA_MOVEMENT_FOV_GRID_COORDINATES = "camera_movement_fov_grid_coordinates"
@@ -233,6 +306,21 @@ CAMERA_MOVEMENT_BEACON_DISTANCE = "camera_movement_beacon_distance"
 CAMERA_MOVEMENT_ROTATION_X_ANGLE = "camera_movement_rotation_x_angle"
 CAMERA_MOVEMENT_ROTATION_Z_ANGLE = "camera_movement_rotation_z_angle"
 
+# Axes of the sweep of a camera movement. Their names match the columns of its
+# step table
+SWEEP_DISTANCE_AXIS = "distance"
+SWEEP_ROTATION_X_ANGLE_AXIS = "rotation_x_angle"
+SWEEP_ROTATION_Z_ANGLE_AXIS = "rotation_z_angle"
+SWEEP_LOCATION_AXIS = "location"
+
+# Estimated cost of changing the value of each axis between consecutive steps,
+# in milliseconds. A new distance rebuilds the FOV meshes, while the rest only
+# move the camera and rewrite some texts
+SWEEP_DISTANCE_TRANSITION_COST = 50.0
+SWEEP_ROTATION_TRANSITION_COST = 1.0
+SWEEP_LOCATION_TRANSITION_COST = 1.0
+SWEEP_EXPENSIVE_TRANSITION_COST = SWEEP_DISTANCE_TRANSITION_COST
+
 # Settings
 DEFAULT_SETTINGS_PATH = f"{expanduser('~')}/Desktop/"
 
@@ -243,6 +331,9 @@ SETTINGS_DATE_KEY = "date"
 SETTINGS_SCENE_KEY = "scene"
 SETTINGS_SCENE_TILE_SIDE_KEY = "tile_side"
 SETTINGS_SCENE_FLOOR_SIDE_TILES_KEY = "floor_side_tiles"
+SETTINGS_SCENE_REGION_OF_INTEREST_MODE_KEY = "region_of_interest_mode"
+SETTINGS_SCENE_REGION_OF_INTEREST_MARGIN_KEY = "region_of_interest_margin"
+SETTINGS_SCENE_RENDER_PROFILE_KEY = "render_profile"
 
 SETTINGS_ROOM_KEY = "room"
 SETTINGS_ROOM_NAME_KEY = "name"
@@ -278,6 +369,13 @@ SETTINGS_CAMERA_MOVEMENT_FOV_SCAN_ENABLED_KEY = "camera_movement_fov_scan_enable
 SETTINGS_CAMERA_MOVEMENT_BEACON_DISTANCE_ENABLED_KEY = "camera_movement_beacon_distance_enabled"
 SETTINGS_CAMERA_MOVEMENT_HORIZONTAL_ROTATION_ANGLE_ENABLED_KEY = "camera_movement_rotation_z_angle_enabled"
 SETTINGS_CAMERA_MOVEMENT_VERTICAL_ROTATION_ANGLE_ENABLED_KEY = "camera_movement_rotation_x_angle_enabled"
+SETTINGS_CAMERA_MOVEMENT_RESUME_ENABLED_KEY = "camera_movement_resume_enabled"
+SETTINGS_CAMERA_MOVEMENT_RENDER_MODE_KEY = "render_mode"
+SETTINGS_CAMERA_MOVEMENT_VISIBILITY_POLICY_KEY = "visibility_policy"
+SETTINGS_CAMERA_MOVEMENT_CULLING_ACTION_KEY = "culling_action"
+SETTINGS_CAMERA_MOVEMENT_SAMPLING_MODE_KEY = "sampling_mode"
+SETTINGS_CAMERA_MOVEMENT_SAMPLE_COUNT_KEY = "sample_count"
+SETTINGS_CAMERA_MOVEMENT_SAMPLING_SEED_KEY = "sampling_seed"
 SETTINGS_CAMERA_MOVEMENT_OUTPUT_PATH_KEY = "output_path"
 SETTINGS_CAMERA_MOVEMENT_FILE_PREFIX_KEY = "file_prefix"
 
@@ -0,0 +1,12 @@
+from vlips_addon.modules.enum_property import EnumProperty, EnumPropertyItem
+
+
+class CullingAction(EnumProperty):
+    DROP = EnumPropertyItem(
+        identifier="drop",
+        name="Drop",
+        description="Leave the culled steps out of the manifest and the labels")
+    TAG = EnumPropertyItem(
+        identifier="tag",
+        name="Tag",
+        description="Keep the culled steps in the manifest and the labels, marked as culled, without rendering them")
@@ -0,0 +1,16 @@
+from vlips_addon.modules.enum_property import EnumProperty, EnumPropertyItem
+
+
+class RegionOfInterestMode(EnumProperty):
+    OFF = EnumPropertyItem(
+        identifier="off",
+        name="Off",
+        description="Render the whole image")
+    CROP = EnumPropertyItem(
+        identifier="crop",
+        name="Crop",
+        description="Render only the region around the beacon and save it cropped, with its offset as EXIF data")
+    FULL_FRAME = EnumPropertyItem(
+        identifier="full_frame",
+        name="Full Frame",
+        description="Render only the region around the beacon and save it in an image of the full size")
@@ -0,0 +1,20 @@
+from vlips_addon.modules.enum_property import EnumProperty, EnumPropertyItem
+
+
+class RenderProfile(EnumProperty):
+    SCENE = EnumPropertyItem(
+        identifier="scene",
+        name="Scene",
+        description="Render with the scene's own render settings")
+    WORKBENCH_FLAT = EnumPropertyItem(
+        identifier="workbench_flat",
+        name="Workbench Flat",
+        description="Workbench with flat lighting and material colors: the fastest, without any shading")
+    EEVEE = EnumPropertyItem(
+        identifier="eevee",
+        name="EEVEE",
+        description="EEVEE with few samples and without bloom, ambient occlusion, or reflections")
+    CYCLES_CPU = EnumPropertyItem(
+        identifier="cycles_cpu",
+        name="Cycles CPU",
+        description="Cycles on the CPU with few samples and denoising")
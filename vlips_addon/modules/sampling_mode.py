@@ -0,0 +1,20 @@
+from vlips_addon.modules.enum_property import EnumProperty, EnumPropertyItem
+
+
+class SamplingMode(EnumProperty):
+    GRID = EnumPropertyItem(
+        identifier="grid",
+        name="Grid",
+        description="Every combination of FOV tile, distance, and rotation angles, one step apart")
+    SOBOL = EnumPropertyItem(
+        identifier="sobol",
+        name="Sobol",
+        description="Poses drawn from the Sobol sequence, inside the same limits")
+    HALTON = EnumPropertyItem(
+        identifier="halton",
+        name="Halton",
+        description="Poses drawn from the Halton sequence, inside the same limits")
+    LATIN_HYPERCUBE = EnumPropertyItem(
+        identifier="latin_hypercube",
+        name="Latin Hypercube",
+        description="Poses drawn with Latin hypercube sampling, inside the same limits")
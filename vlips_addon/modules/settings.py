@@ -4,6 +4,7 @@ from pathlib import Path
 
 import addon_utils
 import yaml
+from vlips import CallTrace
 from vlips.constants import DECIMAL_PRECISION
 
 from .constants import *
@@ -31,9 +32,9 @@ class Settings:
         """
 
         log.info("Load add-on settings")
-        log.debug(f"Settings.load("
-                  f"context={context}, "
-                  f"filepath={filepath})")
+        CallTrace.log(log, "Settings.load",
+                      context=context,
+                      filepath=filepath)
 
         with open(filepath, "r") as file:
             settings = yaml.safe_load(file)
@@ -44,6 +45,13 @@ class Settings:
             SETUP_SCENE_OPERATOR_NAME)
         scene_properties.tile_side = scene_settings[SETTINGS_SCENE_TILE_SIDE_KEY]
         scene_properties.floor_side_tiles = scene_settings[SETTINGS_SCENE_FLOOR_SIDE_TILES_KEY]
+        # Settings saved by previous versions don't include these values
+        scene_properties.render_profile = scene_settings.get(
+            SETTINGS_SCENE_RENDER_PROFILE_KEY, DEFAULT_RENDER_PROFILE)
+        scene_properties.region_of_interest_mode = scene_settings.get(
+            SETTINGS_SCENE_REGION_OF_INTEREST_MODE_KEY, DEFAULT_REGION_OF_INTEREST_MODE)
+        scene_properties.region_of_interest_margin = scene_settings.get(
+            SETTINGS_SCENE_REGION_OF_INTEREST_MARGIN_KEY, DEFAULT_REGION_OF_INTEREST_MARGIN)
 
         room_settings = settings[SETTINGS_ROOM_KEY]
         log.debug(room_settings)
@@ -95,6 +103,21 @@ class Settings:
             camera_movement_settings[SETTINGS_CAMERA_MOVEMENT_VERTICAL_ROTATION_ANGLE_ENABLED_KEY]
         camera_movement_properties.camera_movement_rotation_z_angle_enabled = \
             camera_movement_settings[SETTINGS_CAMERA_MOVEMENT_HORIZONTAL_ROTATION_ANGLE_ENABLED_KEY]
+        # Settings saved by previous versions don't include these values
+        camera_movement_properties.camera_movement_resume_enabled = camera_movement_settings.get(
+            SETTINGS_CAMERA_MOVEMENT_RESUME_ENABLED_KEY, DEFAULT_CAMERA_MOVEMENT_RESUME_ENABLED)
+        camera_movement_properties.render_mode = camera_movement_settings.get(
+            SETTINGS_CAMERA_MOVEMENT_RENDER_MODE_KEY, DEFAULT_CAMERA_MOVEMENT_RENDER_MODE)
+        camera_movement_properties.visibility_policy = camera_movement_settings.get(
+            SETTINGS_CAMERA_MOVEMENT_VISIBILITY_POLICY_KEY, DEFAULT_CAMERA_MOVEMENT_VISIBILITY_POLICY)
+        camera_movement_properties.culling_action = camera_movement_settings.get(
+            SETTINGS_CAMERA_MOVEMENT_CULLING_ACTION_KEY, DEFAULT_CAMERA_MOVEMENT_CULLING_ACTION)
+        camera_movement_properties.sampling_mode = camera_movement_settings.get(
+            SETTINGS_CAMERA_MOVEMENT_SAMPLING_MODE_KEY, DEFAULT_CAMERA_MOVEMENT_SAMPLING_MODE)
+        camera_movement_properties.sample_count = camera_movement_settings.get(
+            SETTINGS_CAMERA_MOVEMENT_SAMPLE_COUNT_KEY, DEFAULT_CAMERA_MOVEMENT_SAMPLE_COUNT)
+        camera_movement_properties.sampling_seed = camera_movement_settings.get(
+            SETTINGS_CAMERA_MOVEMENT_SAMPLING_SEED_KEY, DEFAULT_CAMERA_MOVEMENT_SAMPLING_SEED)
         camera_movement_properties.output_path = \
             camera_movement_settings[SETTINGS_CAMERA_MOVEMENT_OUTPUT_PATH_KEY]
         camera_movement_properties.file_prefix = \
@@ -153,9 +176,9 @@ class Settings:
         """
 
         log.info("Save add-on settings")
-        log.debug(f"Settings.save("
-                  f"context={context}, "
-                  f"filepath={filepath})")
+        CallTrace.log(log, "Settings.save",
+                      context=context,
+                      filepath=filepath)
 
         module_version = ""
         modules = addon_utils.modules()
@@ -188,7 +211,13 @@ class Settings:
             SETTINGS_SCENE_TILE_SIDE_KEY:
                 scene_properties.tile_side,
             SETTINGS_SCENE_FLOOR_SIDE_TILES_KEY:
-                scene_properties.floor_side_tiles
+                scene_properties.floor_side_tiles,
+            SETTINGS_SCENE_RENDER_PROFILE_KEY:
+                scene_properties.render_profile,
+            SETTINGS_SCENE_REGION_OF_INTEREST_MODE_KEY:
+                scene_properties.region_of_interest_mode,
+            SETTINGS_SCENE_REGION_OF_INTEREST_MARGIN_KEY:
+                scene_properties.region_of_interest_margin
         }
         room_properties_dictionary = {
             SETTINGS_ROOM_NAME_KEY:
@@ -275,6 +304,20 @@ class Settings:
                 camera_movement_properties.camera_movement_rotation_z_angle_enabled,
             SETTINGS_CAMERA_MOVEMENT_VERTICAL_ROTATION_ANGLE_ENABLED_KEY:
                 camera_movement_properties.camera_movement_rotation_x_angle_enabled,
+            SETTINGS_CAMERA_MOVEMENT_RESUME_ENABLED_KEY:
+                camera_movement_properties.camera_movement_resume_enabled,
+            SETTINGS_CAMERA_MOVEMENT_RENDER_MODE_KEY:
+                camera_movement_properties.render_mode,
+            SETTINGS_CAMERA_MOVEMENT_VISIBILITY_POLICY_KEY:
+                camera_movement_properties.visibility_policy,
+            SETTINGS_CAMERA_MOVEMENT_CULLING_ACTION_KEY:
+                camera_movement_properties.culling_action,
+            SETTINGS_CAMERA_MOVEMENT_SAMPLING_MODE_KEY:
+                camera_movement_properties.sampling_mode,
+            SETTINGS_CAMERA_MOVEMENT_SAMPLE_COUNT_KEY:
+                camera_movement_properties.sample_count,
+            SETTINGS_CAMERA_MOVEMENT_SAMPLING_SEED_KEY:
+                camera_movement_properties.sampling_seed,
             SETTINGS_CAMERA_MOVEMENT_OUTPUT_PATH_KEY:
                 camera_movement_properties.output_path,
             SETTINGS_CAMERA_MOVEMENT_FILE_PREFIX_KEY:
@@ -0,0 +1,16 @@
+from vlips_addon.modules.enum_property import EnumProperty, EnumPropertyItem
+
+
+class VisibilityPolicy(EnumProperty):
+    ALL = EnumPropertyItem(
+        identifier="all",
+        name="All",
+        description="Render every step, wherever the beacon is")
+    PARTIALLY_VISIBLE = EnumPropertyItem(
+        identifier="partially_visible",
+        name="Partially Visible",
+        description="Render only the steps where some part of the beacon is inside the image")
+    FULLY_VISIBLE = EnumPropertyItem(
+        identifier="fully_visible",
+        name="Fully Visible",
+        description="Render only the steps where the whole beacon is inside the image")
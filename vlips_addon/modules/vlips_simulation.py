@@ -1,62 +1,125 @@
 import logging
 import os
+import shutil
+import tempfile
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Iterable, Iterator
 
 import bpy
-from numpy import arange
-from vlips import Beacon, Camera, ExifWriter, Scene
+import numpy as np
+from PIL import Image
+from vlips import AnalyticRenderer, Beacon, BeaconLabels, CallTrace, Camera, CameraFOV, CameraMovementManifest, \
+    CameraMovementPlan, CameraMovementStepTable, DatablockPool, ExifReader, ExifWriter, ImageWriterPool, MeshGeometry, \
+    PoseSampler, RegionOfInterest, Scene, StageTimer, Sweep, SweepAxis
 
 from .camera_movement import CameraMovement
 from .camera_orientation import CameraOrientation
 from .constants import *
+from .culling_action import CullingAction
+from .region_of_interest_mode import RegionOfInterestMode
+from .sampling_mode import SamplingMode
+from .visibility_policy import VisibilityPolicy
 
 log = logging.getLogger(__name__)
 
 
 class VLIPSSimulation:
 
+    # Values each camera was last set up with, by camera name, so pose updates
+    # only touch what depends on values that changed
+    _camera_inputs = {}
+
+    # FOV objects, meshes, and materials, and the beacon material, created once
+    # and then updated on every call
+    _datablock_pool = DatablockPool()
+
+    # Timer the stages of the renders are accounted to, if any
+    _stage_timer = None
+
+    @staticmethod
+    def set_stage_timer(stage_timer: StageTimer = None):
+        """
+        Account the time spent in each stage of the renders that follow to a
+        timer, until another one is set.
+
+        :param stage_timer: timer of the stages, or None to stop timing them.
+        """
+
+        VLIPSSimulation._stage_timer = stage_timer
+
+    @staticmethod
+    def _time_stage(name: str):
+        """
+        Time the code run inside the context as a stage, if a timer is set.
+
+        :param name: name of the stage.
+
+        :return: context manager timing the stage.
+        """
+
+        if VLIPSSimulation._stage_timer is None:
+            return nullcontext()
+        return VLIPSSimulation._stage_timer.stage(name)
+
     # region Actions
 
     @staticmethod
-    def empty_scene(context):
+    def empty_scene(context) -> dict:
         """
-        Remove every item from the scene to start it from scratch.
+        Remove every item from the scene to start it from scratch. Datablocks
+        are gathered first and removed in a single batch, which is much faster
+        than removing them one at a time. The meshes and font curves of the
+        objects removed are removed too, and so are the ones left orphan by
+        previous versions.
 
         :param context: Blender's current context containing the scene where
         the simulation must reside.
+
+        :return: number of datablocks removed by kind, and the time it took in
+        seconds, as "elapsed_time".
+        :rtype: dict
         """
 
         log.info("Empty scene")
-        log.debug(f"VLIPSSimulation.empty_scene("
-                  f"context={context})")
-
-        # Remove objects
-        for scene_object in context.scene.objects:
-            if scene_object.type == "MESH":
-                scene_object.hide_set(False)
-                scene_object.select_set(state=True)
-            elif scene_object.type == "GRID":
-                scene_object.select_set(state=True)
-            elif scene_object.type == "FONT":
-                scene_object.select_set(state=True)
-            else:
-                scene_object.select_set(state=False)
-            bpy.data.objects.remove(scene_object, do_unlink=True)
-
-        # Remove materials
-        for material in bpy.data.materials:
-            bpy.data.materials.remove(material)
+        CallTrace.log(log, "VLIPSSimulation.empty_scene",
+                      context=context)
+
+        start_time = time.perf_counter()
+
+        # Object data is only removed if the objects removed are its only
+        # users
+        scene_objects = list(context.scene.objects)
+        object_data_users = {}
+        for scene_object in scene_objects:
+            if scene_object.data is not None:
+                object_data_users[scene_object.data] = object_data_users.get(scene_object.data, 0) + 1
+
+        def is_removable(object_data):
+            return object_data.users == 0 or object_data_users.get(object_data) == object_data.users
+
+        datablocks = {
+            "objects": scene_objects,
+            "meshes": [mesh for mesh in bpy.data.meshes if is_removable(mesh)],
+            "curves": [curve for curve in bpy.data.curves if is_removable(curve)],
+            "materials": list(bpy.data.materials),
+            "lights": list(bpy.data.lights),
+            "cameras": list(bpy.data.cameras),
+            "collections": list(bpy.data.collections)
+        }
+        bpy.data.batch_remove([
+            datablock for kind_datablocks in datablocks.values() for datablock in kind_datablocks])
 
-        # Remove lights
-        for light in bpy.data.lights:
-            bpy.data.lights.remove(light)
+        VLIPSSimulation._camera_inputs.clear()
+        VLIPSSimulation._datablock_pool.clear()
 
-        # Remove cameras
-        for camera in bpy.data.cameras:
-            bpy.data.cameras.remove(camera)
+        report = {kind: len(kind_datablocks) for kind, kind_datablocks in datablocks.items()}
+        report["elapsed_time"] = time.perf_counter() - start_time
+        log.info(f"Removed {sum(report[kind] for kind in datablocks)} datablocks "
+                 f"in {report['elapsed_time']:.3f} s: {report}")
 
-        # Remove collections
-        for collection in bpy.data.collections:
-            bpy.data.collections.remove(collection)
+        return report
 
     @staticmethod
     def setup_scene(
@@ -75,21 +138,23 @@ class VLIPSSimulation:
         """
 
         log.info("Setup scene")
-        log.debug(f"VLIPSSimulation.setup_scene("
-                  f"context={context}, "
-                  f"tile_side={tile_side}, "
-                  f"floor_side_tiles={floor_side_tiles})")
+        CallTrace.log(log, "VLIPSSimulation.setup_scene",
+                      context=context,
+                      tile_side=tile_side,
+                      floor_side_tiles=floor_side_tiles)
 
         # Set the scene units
         context.scene.unit_settings.system = "METRIC"
         context.scene.unit_settings.length_unit = "METERS"
         context.scene.unit_settings.scale_length = 0.001
-        context.space_data.overlay.grid_scale = 0.001
-        context.space_data.clip_end = 1e+06
+        # There is no 3D viewport when Blender runs in background mode
+        if context.space_data is not None:
+            context.space_data.overlay.grid_scale = 0.001
+            context.space_data.clip_end = 1e+06
         context.scene.unit_settings.system_rotation = "DEGREES"
 
-        log.debug(f"- context.scene.unit_settings.system={context.scene.unit_settings.system}")
-        log.debug(f"- context.scene.unit_settings.system_rotation={context.scene.unit_settings.system_rotation}")
+        log.debug("- context.scene.unit_settings.system=%s", context.scene.unit_settings.system)
+        log.debug("- context.scene.unit_settings.system_rotation=%s", context.scene.unit_settings.system_rotation)
 
         # Set some properties of the scene that depends on the camera
         camera_properties = context.window_manager.operator_properties_last(
@@ -102,10 +167,10 @@ class VLIPSSimulation:
             context.scene.render.resolution_y = camera_properties.resolution_width
         context.scene.render.resolution_percentage = 100
 
-        log.debug(f"- context.scene.render.resolution_x={context.scene.render.resolution_x}")
-        log.debug(f"- context.scene.render.resolution_y={context.scene.render.resolution_y}")
-        log.debug(f"- context.scene.render.resolution_percentage={context.scene.render.resolution_percentage}")
-        log.debug(f"- context.scene.unit_settings.scale_length={context.scene.unit_settings.scale_length}")
+        log.debug("- context.scene.render.resolution_x=%s", context.scene.render.resolution_x)
+        log.debug("- context.scene.render.resolution_y=%s", context.scene.render.resolution_y)
+        log.debug("- context.scene.render.resolution_percentage=%s", context.scene.render.resolution_percentage)
+        log.debug("- context.scene.unit_settings.scale_length=%s", context.scene.unit_settings.scale_length)
 
     # endregion
 
@@ -118,6 +183,11 @@ class VLIPSSimulation:
         log.info("Zoom to scene")
         log.debug("VLIPSSimulation.zoom_to_scene()")
 
+        # There is no screen when Blender runs in background mode
+        if bpy.context.screen is None:
+            log.debug("- no screen available: skip")
+            return
+
         for area in bpy.context.screen.areas:
             if area.type == "VIEW_3D":
                 for region in area.regions:
@@ -148,21 +218,19 @@ class VLIPSSimulation:
         """
 
         log.info("Set the room up")
-        log.debug(f"VLIPSSimulation.setup_room("
-                  f"context={context}, "
-                  f"name={name}, "
-                  f"width={width}, "
-                  f"depth={depth}, "
-                  f"height={height}, "
-                  f"thickness={thickness})")
+        CallTrace.log(log, "VLIPSSimulation.setup_room",
+                      context=context,
+                      name=name,
+                      width=width,
+                      depth=depth,
+                      height=height,
+                      thickness=thickness)
 
         # Create the room if it doesn't exist
         if name not in context.scene.objects:
             log.debug("- room doesn't exist: create")
 
-            bpy.ops.mesh.primitive_cube_add()
-            room = context.active_object
-            room.name = name
+            room = VLIPSSimulation._add_mesh_object(context, name, MeshGeometry.get_cube())
             room.modifiers.new(name="Wireframe", type="WIREFRAME")
         else:
             log.debug("- room already exists")
@@ -174,9 +242,9 @@ class VLIPSSimulation:
         room.location = (0, 0, height / 2)
         # room.modifiers["Wireframe"].thickness = thickness
 
-        log.debug(f"- room.dimensions={room.dimensions}")
-        log.debug(f"- room.location={room.location}")
-        log.debug(f"- room.modifiers[\"Wireframe\"].thickness={room.modifiers['Wireframe'].thickness}")
+        log.debug("- room.dimensions=%s", room.dimensions)
+        log.debug("- room.location=%s", room.location)
+        log.debug("- room.modifiers[\"Wireframe\"].thickness=%s", room.modifiers['Wireframe'].thickness)
 
     @staticmethod
     def setup_beacon(
@@ -201,20 +269,18 @@ class VLIPSSimulation:
         """
 
         log.info("Set the beacon up")
-        log.debug(f"VLIPSSimulation.setup_beacon("
-                  f"context={context}, "
-                  f"name={name}, "
-                  f"width={width}, "
-                  f"height={height}, "
-                  f"room_properties={room_properties})")
+        CallTrace.log(log, "VLIPSSimulation.setup_beacon",
+                      context=context,
+                      name=name,
+                      width=width,
+                      height=height,
+                      room_properties=room_properties)
 
         # Create the beacon if it doesn't exist
         if name not in context.scene.objects:
             log.debug("- beacon doesn't exist: create")
 
-            bpy.ops.mesh.primitive_plane_add()
-            beacon = context.active_object
-            beacon.name = name
+            beacon = VLIPSSimulation._add_mesh_object(context, name, MeshGeometry.get_grid())
         else:
             log.debug("- beacon already exists")
 
@@ -238,20 +304,15 @@ class VLIPSSimulation:
             math.radians(beacon_rotation[1]),
             math.radians(beacon_rotation[2]))
 
-        # Configure the beacon so it is a light source
-        material = bpy.data.materials.new(name="Plane Light Emission Shader")
-        material.use_nodes = True
-        material_output = material.node_tree.nodes.get("Material Output")
-        emission = material.node_tree.nodes.new("ShaderNodeEmission")
-        emission.inputs["Strength"].default_value = 1.0
-        material.node_tree.links.new(material_output.inputs[0], emission.outputs[0])
-        material.diffuse_color = (1, 1, 1, 1)
-        beacon.active_material = material
+        # Configure the beacon so it is a light source. The material is created
+        # only once
+        beacon.active_material = VLIPSSimulation._datablock_pool.get(
+            "material", BEACON_MATERIAL_NAME, VLIPSSimulation._create_beacon_material)
 
-        log.debug(f"- beacon.dimensions={beacon.dimensions}")
-        log.debug(f"- beacon.location={beacon.location}")
-        log.debug(f"- beacon.rotation_euler={beacon.rotation_euler}")
-        log.debug(f"- beacon.active_material={beacon.active_material}")
+        log.debug("- beacon.dimensions=%s", beacon.dimensions)
+        log.debug("- beacon.location=%s", beacon.location)
+        log.debug("- beacon.rotation_euler=%s", beacon.rotation_euler)
+        log.debug("- beacon.active_material=%s", beacon.active_material)
 
     @staticmethod
     def setup_camera(
@@ -316,34 +377,33 @@ class VLIPSSimulation:
         """
 
         log.info("Set the camera up")
-        log.debug(f"VLIPSSimulation.setup_camera("
-                  f"context={context}, "
-                  f"name={name}, "
-                  f"make={make}, "
-                  f"model={model}, "
-                  f"orientation={orientation}, "
-                  f"facing={facing}, "
-                  f"resolution_width={resolution_width}, "
-                  f"resolution_height={resolution_height}, "
-                  f"focal_length={focal_length}, "
-                  f"pixel_size={pixel_size}, "
-                  f"beacon_distance={beacon_distance}, "
-                  f"rotation_x_angle={rotation_x_angle}, "
-                  f"rotation_z_angle={rotation_z_angle}, "
-                  f"show_fov={show_fov}, "
-                  f"scene_properties={scene_properties}, "
-                  f"room_properties={room_properties}, "
-                  f"beacon_properties={beacon_properties}, "
-                  f"x={x}, "
-                  f"y={y})")
+        CallTrace.log(log, "VLIPSSimulation.setup_camera",
+                      context=context,
+                      name=name,
+                      make=make,
+                      model=model,
+                      orientation=orientation,
+                      facing=facing,
+                      resolution_width=resolution_width,
+                      resolution_height=resolution_height,
+                      focal_length=focal_length,
+                      pixel_size=pixel_size,
+                      beacon_distance=beacon_distance,
+                      rotation_x_angle=rotation_x_angle,
+                      rotation_z_angle=rotation_z_angle,
+                      show_fov=show_fov,
+                      scene_properties=scene_properties,
+                      room_properties=room_properties,
+                      beacon_properties=beacon_properties,
+                      x=x,
+                      y=y)
 
         # Create the camera if it doesn't exist
         if name not in context.scene.objects:
             log.debug("- camera doesn't exist: create")
 
-            bpy.ops.object.camera_add()
-            camera = context.active_object
-            camera.name = name
+            camera = bpy.data.objects.new(name, bpy.data.cameras.new(name))
+            context.scene.collection.objects.link(camera)
         else:
             log.debug("- camera already exists")
 
@@ -378,27 +438,18 @@ class VLIPSSimulation:
             math.radians(camera_rotation[2])
         )
 
-        log.debug(f"- camera.location={camera.dimensions}")
-        log.debug(f"- camera.rotation_euler={camera.rotation_euler}")
+        log.debug("- camera.location=%s", camera.dimensions)
+        log.debug("- camera.rotation_euler=%s", camera.rotation_euler)
 
         # Set scene and camera configuration given the camera properties
-        camera.data.lens = focal_length
-        camera.data.sensor_width = resolution_width * pixel_size
-        camera.data.display_size = 150
-        camera.data.clip_end = 1e+06
-
-        context.scene.camera = camera
-        if orientation == CameraOrientation.LANDSCAPE.value.identifier:
-            context.scene.render.resolution_x = resolution_width
-            context.scene.render.resolution_y = resolution_height
-        else:
-            context.scene.render.resolution_x = resolution_height
-            context.scene.render.resolution_y = resolution_width
-
-        log.debug(f"- camera.data.lens={camera.data.lens}")
-        log.debug(f"- camera.data.sensor_width={camera.data.sensor_width}")
-        log.debug(f"- context.scene.render.resolution_x={context.scene.render.resolution_x}")
-        log.debug(f"- context.scene.render.resolution_y={context.scene.render.resolution_y}")
+        VLIPSSimulation._setup_camera_lens(
+            context=context,
+            camera=camera,
+            orientation=orientation,
+            resolution_width=resolution_width,
+            resolution_height=resolution_height,
+            focal_length=focal_length,
+            pixel_size=pixel_size)
 
         # FOV
         VLIPSSimulation.update_camera_fov(
@@ -416,7 +467,7 @@ class VLIPSSimulation:
         texts_properties = context.window_manager.operator_properties_last(
             SETUP_TEXTS_OPERATOR_NAME)
 
-        VLIPSSimulation.setup_texts(
+        texts = VLIPSSimulation.setup_texts(
             context=context,
             font_size=texts_properties.font_size,
             camera_beacon_distance=beacon_distance,
@@ -428,6 +479,318 @@ class VLIPSSimulation:
         camera.select_set(True)
         context.view_layer.objects.active = camera
 
+        # Remember what the camera has been set up with, so later pose updates
+        # can skip whatever didn't change
+        camera_inputs = VLIPSSimulation._get_camera_inputs(
+            context=context,
+            orientation=orientation,
+            resolution_width=resolution_width,
+            resolution_height=resolution_height,
+            focal_length=focal_length,
+            pixel_size=pixel_size,
+            beacon_distance=beacon_distance,
+            show_fov=show_fov,
+            scene_properties=scene_properties,
+            room_properties=room_properties,
+            beacon_properties=beacon_properties,
+            texts_properties=texts_properties)
+        camera_inputs["texts"] = texts
+        VLIPSSimulation._camera_inputs[name] = camera_inputs
+
+    @staticmethod
+    def update_camera_pose(
+            context,
+            name,
+            make,
+            model,
+            orientation,
+            facing,
+            resolution_width,
+            resolution_height,
+            focal_length,
+            pixel_size,
+            beacon_distance,
+            rotation_x_angle,
+            rotation_z_angle,
+            show_fov,
+            x=None,
+            y=None
+    ):
+        """
+        Move and rotate the camera of the simulation, leaving everything else
+        as it is unless it depends on something that changed since the camera
+        was last set up: the lens and render resolution are only set when the
+        camera properties change, the FOV is only rebuilt when the distance to
+        the beacon or its own inputs change, and only the texts whose content
+        changes are rewritten.
+
+        Takes the same parameters as `setup_camera`, which it falls back to if
+        the camera hasn't been set up yet.
+
+        :param context: Blender's current context containing the scene where
+        the simulation must reside.
+        :param name: name given to the camera, so it can be later accessed.
+        :param make: name of the make this camera tries to mimic.
+        :param model: name of the model this camera tries to mimic.
+        :param orientation: portrait or landscape.
+        :param facing: is the camera front of back facing?
+        :param resolution_width: width of the photos taken by the camera, in
+        pixels.
+        :param resolution_height: height of the photos taken by the camera, in
+        pixels.
+        :param focal_length: focal length of the lens/sensor couple, in
+        millimeters.
+        :param pixel_size: size of each pixel in the sensor, in millimeters.
+        :param beacon_distance: distance between the beacon and the camera, in
+        millimeters.
+        :param rotation_x_angle: rotation around camera's X axis, in degrees
+        (pitch).
+        :param rotation_z_angle: rotation around camera's Z axis, in degrees
+        (yaw).
+        :param show_fov: draw camera's field of vision on the floor.
+        :param x: if provided, it will change the position of the camera to that
+        x coordinate when the beacon is on the ceiling.
+        :param y: if provided, it will change the position of the camera to that
+        y coordinate when the beacon is on the ceiling.
+        """
+
+        log.info("Update the camera pose")
+        CallTrace.log(log, "VLIPSSimulation.update_camera_pose",
+                      context=context,
+                      name=name,
+                      beacon_distance=beacon_distance,
+                      rotation_x_angle=rotation_x_angle,
+                      rotation_z_angle=rotation_z_angle,
+                      x=x,
+                      y=y)
+
+        previous_camera_inputs = VLIPSSimulation._camera_inputs.get(name)
+        if previous_camera_inputs is None or name not in context.scene.objects:
+            log.debug("- camera not set up yet: set it up")
+
+            with VLIPSSimulation._time_stage("setup_camera"):
+                VLIPSSimulation.setup_camera(
+                    context=context,
+                    name=name,
+                    make=make,
+                    model=model,
+                    orientation=orientation,
+                    facing=facing,
+                    resolution_width=resolution_width,
+                    resolution_height=resolution_height,
+                    focal_length=focal_length,
+                    pixel_size=pixel_size,
+                    beacon_distance=beacon_distance,
+                    rotation_x_angle=rotation_x_angle,
+                    rotation_z_angle=rotation_z_angle,
+                    show_fov=show_fov,
+                    x=x,
+                    y=y)
+            return
+
+        camera = context.scene.objects[name]
+
+        scene_properties = context.window_manager.operator_properties_last(
+            SETUP_SCENE_OPERATOR_NAME)
+        room_properties = context.window_manager.operator_properties_last(
+            SETUP_ROOM_OPERATOR_NAME)
+        beacon_properties = context.window_manager.operator_properties_last(
+            SETUP_BEACON_OPERATOR_NAME)
+        texts_properties = context.window_manager.operator_properties_last(
+            SETUP_TEXTS_OPERATOR_NAME)
+
+        # Set camera location and rotation, as setup_camera does
+        if x is None and y is None:
+            beacon = context.scene.objects[beacon_properties.name]
+            x = beacon.location.x
+            y = beacon.location.y
+        camera.location = (x, y, room_properties.height - beacon_distance)
+        camera.rotation_euler = (
+            math.radians(DEFAULT_CAMERA_ROTATION[0] - rotation_x_angle),
+            math.radians(DEFAULT_CAMERA_ROTATION[1]),
+            math.radians(DEFAULT_CAMERA_ROTATION[2] - rotation_z_angle)
+        )
+
+        camera_inputs = VLIPSSimulation._get_camera_inputs(
+            context=context,
+            orientation=orientation,
+            resolution_width=resolution_width,
+            resolution_height=resolution_height,
+            focal_length=focal_length,
+            pixel_size=pixel_size,
+            beacon_distance=beacon_distance,
+            show_fov=show_fov,
+            scene_properties=scene_properties,
+            room_properties=room_properties,
+            beacon_properties=beacon_properties,
+            texts_properties=texts_properties)
+
+        if camera_inputs["lens"] != previous_camera_inputs["lens"]:
+            log.debug("- lens changed: update it")
+
+            with VLIPSSimulation._time_stage("setup_camera_lens"):
+                VLIPSSimulation._setup_camera_lens(
+                    context=context,
+                    camera=camera,
+                    orientation=orientation,
+                    resolution_width=resolution_width,
+                    resolution_height=resolution_height,
+                    focal_length=focal_length,
+                    pixel_size=pixel_size)
+
+        if camera_inputs["fov"] != previous_camera_inputs["fov"] or \
+                CAMERA_FOV_EVEN_TILES_NAME not in context.scene.objects:
+            log.debug("- FOV changed: update it")
+
+            with VLIPSSimulation._time_stage("update_camera_fov"):
+                VLIPSSimulation.update_camera_fov(
+                    context=context,
+                    name=name,
+                    focal_length=focal_length,
+                    pixel_size=pixel_size,
+                    beacon_distance=beacon_distance,
+                    show_fov=show_fov,
+                    scene_properties=scene_properties,
+                    room_properties=room_properties,
+                    beacon_properties=beacon_properties)
+
+        texts = VLIPSSimulation._get_texts(
+            context=context,
+            camera_beacon_distance=beacon_distance,
+            camera_x=x,
+            camera_y=y,
+            camera_rotation_x_angle=rotation_x_angle,
+            camera_rotation_z_angle=rotation_z_angle)
+
+        if camera_inputs["texts_layout"] != previous_camera_inputs["texts_layout"] or \
+                any(key not in context.scene.objects for key in texts):
+            log.debug("- texts layout changed: set the texts up")
+
+            with VLIPSSimulation._time_stage("setup_texts"):
+                VLIPSSimulation.setup_texts(
+                    context=context,
+                    font_size=texts_properties.font_size,
+                    camera_beacon_distance=beacon_distance,
+                    camera_x=x,
+                    camera_y=y,
+                    camera_rotation_x_angle=rotation_x_angle,
+                    camera_rotation_z_angle=rotation_z_angle)
+        else:
+            with VLIPSSimulation._time_stage("update_texts"):
+                for key, value in texts.items():
+                    if value != previous_camera_inputs["texts"].get(key):
+                        context.scene.objects[key].data.body = value
+
+        camera_inputs["texts"] = texts
+        VLIPSSimulation._camera_inputs[name] = camera_inputs
+
+    @staticmethod
+    def _setup_camera_lens(
+            context,
+            camera,
+            orientation,
+            resolution_width,
+            resolution_height,
+            focal_length,
+            pixel_size
+    ):
+        """
+        Set the lens of the camera and the resolution of the renders.
+
+        :param context: Blender's current context containing the scene where
+        the simulation must reside.
+        :param camera: camera object to set up.
+        :param orientation: portrait or landscape.
+        :param resolution_width: width of the photos taken by the camera, in
+        pixels.
+        :param resolution_height: height of the photos taken by the camera, in
+        pixels.
+        :param focal_length: focal length of the lens/sensor couple, in
+        millimeters.
+        :param pixel_size: size of each pixel in the sensor, in millimeters.
+        """
+
+        camera.data.lens = focal_length
+        camera.data.sensor_width = resolution_width * pixel_size
+        camera.data.display_size = 150
+        camera.data.clip_end = 1e+06
+
+        context.scene.camera = camera
+        if orientation == CameraOrientation.LANDSCAPE.value.identifier:
+            context.scene.render.resolution_x = resolution_width
+            context.scene.render.resolution_y = resolution_height
+        else:
+            context.scene.render.resolution_x = resolution_height
+            context.scene.render.resolution_y = resolution_width
+
+        log.debug("- camera.data.lens=%s", camera.data.lens)
+        log.debug("- camera.data.sensor_width=%s", camera.data.sensor_width)
+        log.debug("- context.scene.render.resolution_x=%s", context.scene.render.resolution_x)
+        log.debug("- context.scene.render.resolution_y=%s", context.scene.render.resolution_y)
+
+    @staticmethod
+    def _get_camera_inputs(
+            context,
+            orientation,
+            resolution_width,
+            resolution_height,
+            focal_length,
+            pixel_size,
+            beacon_distance,
+            show_fov,
+            scene_properties,
+            room_properties,
+            beacon_properties,
+            texts_properties
+    ) -> dict:
+        """
+        Gather the values the lens, the FOV, and the layout of the texts depend
+        on, so they can be compared with the ones the camera was last set up
+        with.
+
+        :param context: Blender's current context containing the scene where
+        the simulation must reside.
+        :param orientation: portrait or landscape.
+        :param resolution_width: width of the photos taken by the camera, in
+        pixels.
+        :param resolution_height: height of the photos taken by the camera, in
+        pixels.
+        :param focal_length: focal length of the lens/sensor couple, in
+        millimeters.
+        :param pixel_size: size of each pixel in the sensor, in millimeters.
+        :param beacon_distance: distance between the beacon and the camera, in
+        millimeters.
+        :param show_fov: draw camera's field of vision on the floor.
+        :param scene_properties: properties of the scene, or None to load them.
+        :param room_properties: properties of the room.
+        :param beacon_properties: properties of the beacon.
+        :param texts_properties: properties of the texts.
+
+        :return: values grouped by what depends on them.
+        :rtype: dict
+        """
+
+        if scene_properties is None:
+            scene_properties = context.window_manager.operator_properties_last(
+                SETUP_SCENE_OPERATOR_NAME)
+
+        lens_inputs = (orientation, resolution_width, resolution_height, focal_length, pixel_size)
+
+        return {
+            "lens": lens_inputs,
+            "fov": lens_inputs + (
+                beacon_distance,
+                show_fov,
+                scene_properties.tile_side,
+                room_properties.height,
+                beacon_properties.width,
+                beacon_properties.height),
+            "texts_layout": (
+                texts_properties.font_size,
+                room_properties.width,
+                room_properties.depth)
+        }
+
     @staticmethod
     def update_camera_fov(
             context,
@@ -462,16 +825,16 @@ class VLIPSSimulation:
         """
 
         log.info("Update camera's Field of Vision (FOV)")
-        log.debug(f"VLIPSSimulation.update_camera_fov("
-                  f"context={context}, "
-                  f"name={name}, "
-                  f"focal_length={focal_length}, "
-                  f"pixel_size={pixel_size}, "
-                  f"beacon_distance={beacon_distance}, "
-                  f"show_fov={show_fov}, "
-                  f"scene_properties={scene_properties}, "
-                  f"room_properties={room_properties}, "
-                  f"beacon_properties={beacon_properties})")
+        CallTrace.log(log, "VLIPSSimulation.update_camera_fov",
+                      context=context,
+                      name=name,
+                      focal_length=focal_length,
+                      pixel_size=pixel_size,
+                      beacon_distance=beacon_distance,
+                      show_fov=show_fov,
+                      scene_properties=scene_properties,
+                      room_properties=room_properties,
+                      beacon_properties=beacon_properties)
 
         # Add the collection that will contain the different steps needed to
         # calculate the FOV.
@@ -489,48 +852,14 @@ class VLIPSSimulation:
 
         # Calculate camera sensor dimensions, resolution_x and y are set
         # depending on camera orientation.
-        camera_sensor_width = context.scene.render.resolution_x * pixel_size
-        camera_sensor_height = context.scene.render.resolution_y * pixel_size
-
-        # Calculate the dimensions of the area covered by the lens, this is,
-        # the FOV, as we know the distance between the camera and the
-        # beacon. This is done with basic trigonometry, as the triangles are
-        # similar.
-        fov_full_width = camera_sensor_width * beacon_distance / focal_length
-        fov_full_height = camera_sensor_height * beacon_distance / focal_length
-
-        # Subtract half a beacon around the perimeter of the FOV to count
-        # for the need of having to move the camera to the fringe of said
-        # FOV. Half in one side, half in the other, is a full beacon.
-        fov_beacon_width = fov_full_width - beacon_properties.width
-        fov_beacon_height = fov_full_height - beacon_properties.height
-
-        # Adjust the dimensions of the FOV so only full tiles can fit into
-        # it.
-        fov_width_in_tiles_original = fov_beacon_width // tile_side
-        fov_height_in_tiles_original = fov_beacon_height // tile_side
-
-        # Make the number of tiles even, so the corners of four tiles always
-        # are in the coordinates' origin.
-        if fov_width_in_tiles_original % 2 != 0:
-            fov_width_in_tiles = fov_width_in_tiles_original - 1
-        else:
-            fov_width_in_tiles = fov_width_in_tiles_original
-
-        if fov_height_in_tiles_original % 2 != 0:
-            fov_height_in_tiles = fov_height_in_tiles_original - 1
-        else:
-            fov_height_in_tiles = fov_height_in_tiles_original
-
-        # If any of the dimensions of the FOV in tiles is 0, set both to 0.
-        if fov_width_in_tiles <= 0 or fov_height_in_tiles <= 0:
-            log.debug("- one of FOV's dimensions is 0: set both to 0")
-            fov_width_in_tiles = 0
-            fov_height_in_tiles = 0
-
-        # Calculate the final dimensions of the FOV, again in metric units.
-        fov_width = fov_width_in_tiles * tile_side
-        fov_height = fov_height_in_tiles * tile_side
+        camera_fov = CameraFOV(
+            sensor_width=context.scene.render.resolution_x * pixel_size,
+            sensor_height=context.scene.render.resolution_y * pixel_size,
+            focal_length=focal_length,
+            beacon_distance=beacon_distance,
+            beacon_dimensions=(beacon_properties.width, beacon_properties.height),
+            tile_side=tile_side)
+        log.debug("- camera_fov=%s", camera_fov)
 
         # Add FOVs
 
@@ -540,8 +869,8 @@ class VLIPSSimulation:
             beacon_distance=beacon_distance,
             show_fov=show_fov,
             room_properties=room_properties,
-            width=fov_full_width,
-            height=fov_full_height,
+            width=camera_fov.full_width,
+            height=camera_fov.full_height,
             color=CAMERA_FOV_FULL_COLOR,
             collection=fov_collection)
 
@@ -551,8 +880,8 @@ class VLIPSSimulation:
             beacon_distance=beacon_distance,
             show_fov=show_fov,
             room_properties=room_properties,
-            width=fov_beacon_width,
-            height=fov_beacon_height,
+            width=camera_fov.beacon_width,
+            height=camera_fov.beacon_height,
             color=CAMERA_FOV_BEACON_COLOR,
             collection=fov_collection)
 
@@ -562,8 +891,8 @@ class VLIPSSimulation:
             beacon_distance=beacon_distance,
             show_fov=show_fov,
             room_properties=room_properties,
-            width=fov_width_in_tiles_original * tile_side,
-            height=fov_height_in_tiles_original * tile_side,
+            width=camera_fov.width_in_tiles_original * tile_side,
+            height=camera_fov.height_in_tiles_original * tile_side,
             color=CAMERA_FOV_TILES_COLOR,
             collection=fov_collection)
 
@@ -573,13 +902,13 @@ class VLIPSSimulation:
             beacon_distance=beacon_distance,
             show_fov=show_fov,
             room_properties=room_properties,
-            width=fov_width,
-            height=fov_height,
+            width=camera_fov.width,
+            height=camera_fov.height,
             color=CAMERA_FOV_EVEN_TILES_COLOR,
             collection=fov_collection,
             show_wire=True,
-            x_subdivisions=fov_width_in_tiles,
-            y_subdivisions=fov_height_in_tiles)
+            x_subdivisions=camera_fov.width_in_tiles,
+            y_subdivisions=camera_fov.height_in_tiles)
 
     @staticmethod
     def add_fov(
@@ -621,46 +950,48 @@ class VLIPSSimulation:
         """
 
         log.info("Add camera's Field of Vision (FOV)")
-        log.debug(f"VLIPSSimulation.add_fov("
-                  f"context={context}, "
-                  f"name={name}, "
-                  f"beacon_distance={beacon_distance}, "
-                  f"show_fov={show_fov}, "
-                  f"room_properties={room_properties}, "
-                  f"width={width}, "
-                  f"height={height}, "
-                  f"color={color}, "
-                  f"collection={collection}, "
-                  f"show_wire={show_wire}, "
-                  f"x_subdivisions={x_subdivisions}, "
-                  f"y_subdivisions={y_subdivisions})")
-
-        previous_hide_state = True
-        if name in context.scene.objects:
-            log.debug(f"- FOV named \"{name}\" already exists: destroy it")
-
-            for ob in context.selected_objects:
-                ob.select_set(False)
-
-            previous_hide_state = context.scene.objects[name].hide_get()
-            context.scene.objects[name].hide_set(False)
-            context.scene.objects[name].select_set(True)
-            bpy.ops.object.delete()
-
+        CallTrace.log(log, "VLIPSSimulation.add_fov",
+                      context=context,
+                      name=name,
+                      beacon_distance=beacon_distance,
+                      show_fov=show_fov,
+                      room_properties=room_properties,
+                      width=width,
+                      height=height,
+                      color=color,
+                      collection=collection,
+                      show_wire=show_wire,
+                      x_subdivisions=x_subdivisions,
+                      y_subdivisions=y_subdivisions)
+
+        # The FOV object, its mesh, and its material are created only once
+        def create_fov():
+            if name in context.scene.objects:
+                log.debug("- FOV named \"%s\" already exists: reuse it", name)
+                return context.scene.objects[name]
+
+            log.debug("- FOV named \"%s\" doesn't exist: create", name)
+            fov_object = bpy.data.objects.new(name, bpy.data.meshes.new(name))
+            collection.objects.link(fov_object)
+            fov_object.hide_set(True)
+            return fov_object
+
+        fov = VLIPSSimulation._datablock_pool.get("object", name, create_fov)
+
+        # Meshes are a plane, or a grid with a face per tile, of side 2, like
+        # Blender's primitives. They are scaled to the FOV by its dimensions.
+        # Close to the beacon, not even a whole tile fits in the FOV, and the
+        # grid is left with a single face, as Blender's primitive did
         if show_wire:
-            bpy.ops.mesh.primitive_grid_add(
-                x_subdivisions=x_subdivisions,
-                y_subdivisions=y_subdivisions)
+            x_subdivisions = max(1, x_subdivisions)
+            y_subdivisions = max(1, y_subdivisions)
         else:
-            bpy.ops.mesh.primitive_plane_add(location=[0, 0, 0])
+            x_subdivisions = y_subdivisions = 1
+        if tuple(fov.data.get(FOV_SUBDIVISIONS_PROPERTY, ())) != (x_subdivisions, y_subdivisions):
+            VLIPSSimulation._set_mesh_geometry(fov.data, MeshGeometry.get_grid(x_subdivisions, y_subdivisions))
+            fov.data[FOV_SUBDIVISIONS_PROPERTY] = (x_subdivisions, y_subdivisions)
+        fov.show_wire = show_wire
 
-        fov = context.active_object
-        fov.hide_set(True)
-
-        if show_wire:
-            fov.show_wire = True
-
-        fov.name = name
         fov.location = [
             DEFAULT_CAMERA_FOV_LOCATION[0],
             DEFAULT_CAMERA_FOV_LOCATION[1],
@@ -673,21 +1004,84 @@ class VLIPSSimulation:
         ]
         fov.dimensions = (width, height, 0)
 
-        material = bpy.data.materials.new(name)
+        material = VLIPSSimulation._datablock_pool.get(
+            "material", name, lambda: bpy.data.materials.new(name))
         material.diffuse_color = color
         fov.active_material = material
 
-        collection.objects.link(fov)
+        if name == CAMERA_FOV_EVEN_TILES_NAME:
+            fov.hide_set(not show_fov)
+
+    @staticmethod
+    def _add_mesh_object(context, name, geometry: MeshGeometry):
+        """
+        Add an object with a mesh of its own to the scene, without Blender's
+        operators, so no 3D viewport is needed.
 
-        context.collection.objects.unlink(fov)
+        :param context: Blender's current context containing the scene where
+        the simulation must reside.
+        :param name: name given to the object and its mesh.
+        :param geometry: vertices and faces of the mesh.
 
-        if name == CAMERA_FOV_EVEN_TILES_NAME:
-            if show_fov:
-                fov.hide_set(False)
-            else:
-                fov.hide_set(True)
-        else:
-            fov.hide_set(previous_hide_state)
+        :return: object added.
+        """
+
+        CallTrace.log(log, "VLIPSSimulation._add_mesh_object",
+                      context=context,
+                      name=name,
+                      geometry=geometry)
+
+        mesh = bpy.data.meshes.new(name)
+        VLIPSSimulation._set_mesh_geometry(mesh, geometry)
+        mesh_object = bpy.data.objects.new(name, mesh)
+        context.scene.collection.objects.link(mesh_object)
+        return mesh_object
+
+    @staticmethod
+    def _set_mesh_geometry(mesh, geometry: MeshGeometry):
+        """
+        Replace the geometry of a mesh, copying the buffers of the vertices
+        and faces in bulk.
+
+        :param mesh: mesh whose geometry is replaced.
+        :param geometry: vertices and faces of the mesh.
+        """
+
+        CallTrace.log(log, "VLIPSSimulation._set_mesh_geometry",
+                      mesh=mesh,
+                      geometry=geometry)
+
+        mesh.clear_geometry()
+        mesh.vertices.add(len(geometry.vertices))
+        mesh.vertices.foreach_set("co", geometry.coordinates)
+        mesh.loops.add(len(geometry.loop_vertex_indices))
+        mesh.loops.foreach_set("vertex_index", geometry.loop_vertex_indices)
+        mesh.polygons.add(len(geometry.faces))
+        mesh.polygons.foreach_set("loop_start", geometry.loop_starts)
+        # Since Blender 4.0, the loop totals follow from the loop starts
+        if not mesh.polygons.bl_rna.properties["loop_total"].is_readonly:
+            mesh.polygons.foreach_set("loop_total", geometry.loop_totals)
+        mesh.update(calc_edges=True)
+
+    @staticmethod
+    def _create_beacon_material():
+        """
+        Create the material that turns the beacon into a light source.
+
+        :return: material of the beacon.
+        """
+
+        log.info("Create the beacon material")
+        log.debug("VLIPSSimulation._create_beacon_material()")
+
+        material = bpy.data.materials.new(name=BEACON_MATERIAL_NAME)
+        material.use_nodes = True
+        material_output = material.node_tree.nodes.get("Material Output")
+        emission = material.node_tree.nodes.new("ShaderNodeEmission")
+        emission.inputs["Strength"].default_value = 1.0
+        material.node_tree.links.new(material_output.inputs[0], emission.outputs[0])
+        material.diffuse_color = (1, 1, 1, 1)
+        return material
 
     @staticmethod
     def setup_texts(
@@ -712,17 +1106,20 @@ class VLIPSSimulation:
         :param camera_y: y coordinate of the position of the camera.
         :param camera_rotation_x_angle: rotation around camera's X axis, in degrees.
         :param camera_rotation_z_angle: rotation around camera's Z axis, in degrees.
+
+        :return: content of each text, by text key.
+        :rtype: dict
         """
 
         log.info("Set the texts up")
-        log.debug(f"VLIPSSimulation.setup_texts("
-                  f"context={context}, "
-                  f"font_size={font_size}, "
-                  f"camera_beacon_distance={camera_beacon_distance}, "
-                  f"camera_x={camera_x}, "
-                  f"camera_y={camera_y}, "
-                  f"camera_rotation_x_angle={camera_rotation_x_angle}, "
-                  f"camera_rotation_z_angle={camera_rotation_z_angle})")
+        CallTrace.log(log, "VLIPSSimulation.setup_texts",
+                      context=context,
+                      font_size=font_size,
+                      camera_beacon_distance=camera_beacon_distance,
+                      camera_x=camera_x,
+                      camera_y=camera_y,
+                      camera_rotation_x_angle=camera_rotation_x_angle,
+                      camera_rotation_z_angle=camera_rotation_z_angle)
 
         # Add the collection that will contain the different steps needed to
         # calculate the FOV
@@ -749,21 +1146,91 @@ class VLIPSSimulation:
             camera_rotation_x_angle = camera_properties.rotation_x_angle
             camera_rotation_z_angle = camera_properties.rotation_z_angle
 
-            log.debug(f"- camera_x={camera_x}")
-            log.debug(f"- camera_y={camera_y}")
-            log.debug(f"- camera_beacon_distance={camera_beacon_distance}")
-            log.debug(f"- camera_rotation_x_angle={camera_rotation_x_angle}")
-            log.debug(f"- camera_rotation_z_angle={camera_rotation_z_angle}")
+            log.debug("- camera_x=%s", camera_x)
+            log.debug("- camera_y=%s", camera_y)
+            log.debug("- camera_beacon_distance=%s", camera_beacon_distance)
+            log.debug("- camera_rotation_x_angle=%s", camera_rotation_x_angle)
+            log.debug("- camera_rotation_z_angle=%s", camera_rotation_z_angle)
+
+        texts = VLIPSSimulation._get_texts(
+            context=context,
+            camera_beacon_distance=camera_beacon_distance,
+            camera_x=camera_x,
+            camera_y=camera_y,
+            camera_rotation_x_angle=camera_rotation_x_angle,
+            camera_rotation_z_angle=camera_rotation_z_angle)
+
+        log.debug("- texts=%s", texts)
 
-        scene_properties = context.window_manager.operator_properties_last(
-            SETUP_SCENE_OPERATOR_NAME)
         room_properties = context.window_manager.operator_properties_last(
             SETUP_ROOM_OPERATOR_NAME)
-        tile_side = scene_properties.tile_side
 
-        if camera_x != 0:
-            grid_x = int(camera_x / tile_side)
-        else:
+        for index, (key, value) in enumerate(texts.items()):
+            # Create the font object if it doesn't exist
+            if key not in context.scene.objects:
+                log.debug("- text %s doesn't exist: create", key)
+
+                curve = bpy.data.curves.new(type="FONT", name=key)
+                font = bpy.data.objects.new("Font Object", curve)
+                font.name = key
+                text_collection.objects.link(font)
+            else:
+                log.debug("- text %s already exists", key)
+
+                font = context.scene.objects[key]
+
+            # Set object text, size, location, and rotation
+            font.data.body = value
+            font.data.size = font_size
+
+            font.location = (
+                -(room_properties.width / 2) + font_size,
+                (room_properties.depth / 2),
+                font_size * (len(texts) - index))
+            font.rotation_euler = (math.radians(90), 0, 0)
+
+            log.debug("- font.data.body: %s", font.data.body)
+            log.debug("- font.data.size: %s", font.data.size)
+            log.debug("- font.location: %s", font.location)
+            log.debug("- font.rotation_euler: %s", font.rotation_euler)
+
+        return texts
+
+    @staticmethod
+    def _get_texts(
+            context,
+            camera_beacon_distance,
+            camera_x,
+            camera_y,
+            camera_rotation_x_angle,
+            camera_rotation_z_angle
+    ) -> dict:
+        """
+        Compose the lines shown in the floor of the room for a camera
+        placement.
+
+        :param context: Blender's current context containing the scene where
+        the simulation must reside.
+        :param camera_beacon_distance: distance from the camera to the beacon,
+        in millimeters.
+        :param camera_x: x coordinate of the position of the camera.
+        :param camera_y: y coordinate of the position of the camera.
+        :param camera_rotation_x_angle: rotation around camera's X axis, in degrees.
+        :param camera_rotation_z_angle: rotation around camera's Z axis, in degrees.
+
+        :return: content of each text, by text key.
+        :rtype: dict
+        """
+
+        scene_properties = context.window_manager.operator_properties_last(
+            SETUP_SCENE_OPERATOR_NAME)
+        room_properties = context.window_manager.operator_properties_last(
+            SETUP_ROOM_OPERATOR_NAME)
+        tile_side = scene_properties.tile_side
+
+        if camera_x != 0:
+            grid_x = int(camera_x / tile_side)
+        else:
             grid_x = 0
 
         if camera_y != 0:
@@ -788,39 +1255,7 @@ class VLIPSSimulation:
                 f"- {TEXT_ROTATION_Z}: {camera_rotation_z_angle:.2f}º"
         }
 
-        log.debug(f"- texts={texts}")
-
-        room_properties = context.window_manager.operator_properties_last(
-            SETUP_ROOM_OPERATOR_NAME)
-
-        for index, (key, value) in enumerate(texts.items()):
-            # Create the font object if it doesn't exist
-            if key not in context.scene.objects:
-                log.debug(f"- text {key} doesn't exist: create")
-
-                curve = bpy.data.curves.new(type="FONT", name=key)
-                font = bpy.data.objects.new("Font Object", curve)
-                font.name = key
-                text_collection.objects.link(font)
-            else:
-                log.debug(f"- text {key} already exists")
-
-                font = context.scene.objects[key]
-
-            # Set object text, size, location, and rotation
-            font.data.body = value
-            font.data.size = font_size
-
-            font.location = (
-                -(room_properties.width / 2) + font_size,
-                (room_properties.depth / 2),
-                font_size * (len(texts) - index))
-            font.rotation_euler = (math.radians(90), 0, 0)
-
-            log.debug(f"- font.data.body: {font.data.body}")
-            log.debug(f"- font.data.size: {font.data.size}")
-            log.debug(f"- font.location: {font.location}")
-            log.debug(f"- font.rotation_euler: {font.rotation_euler}")
+        return texts
 
     @staticmethod
     def create_scene(
@@ -835,8 +1270,8 @@ class VLIPSSimulation:
         """
 
         log.info("Set the camera up")
-        log.debug(f"VLIPSSimulation.setup_camera("
-                  f"context={context})")
+        CallTrace.log(log, "VLIPSSimulation.setup_camera",
+                      context=context)
 
         # Set the scene up
         scene_properties = context.window_manager.operator_properties_last(
@@ -904,51 +1339,424 @@ class VLIPSSimulation:
     @staticmethod
     def render_scene(
             context,
-            filepath
+            filepath,
+            writer: ImageWriterPool = None,
+            tag=None,
+            render_profile: str = None
     ):
         """
         Render the scene in the context, save it as an image in the path
         provided. All the details needed to recreate the scene are stored as
         EXIF data in the image.
 
+        If the scene limits renders to a region of interest, only the region
+        of the image where the beacon shows up is rendered. The image is then
+        either cropped to the region, which is stored as EXIF data, or placed
+        in an image of the full size.
+
         :param context: Blender's current context containing the scene to be
         rendered.
         :param filepath: path to the file where the rendered scene should be
         saved.
+        :param writer: pool the image is handed off to, so it is saved in the
+        background. Optional. If not provided, the image is saved before
+        returning.
+        :param tag: value the writer returns once the image is saved. Only used
+        with a writer.
+        :param render_profile: identifier of the render profile applied while
+        rendering. Optional. If not provided, the scene's one is applied.
         """
 
         log.info("Render scene")
-        log.debug(f"VLIPSSimulation.render_scene("
-                  f"context={context}, "
-                  f"filepath={filepath})")
-
-        # Load all the properties needed to both render the image and recreate
-        # the scene later if needed
+        CallTrace.log(log, "VLIPSSimulation.render_scene",
+                      context=context,
+                      filepath=filepath,
+                      writer=writer,
+                      tag=tag,
+                      render_profile=render_profile)
+
+        # Load all the properties needed to render the image
         scene_properties = context.window_manager.operator_properties_last(
             SETUP_SCENE_OPERATOR_NAME)
         room_properties = context.window_manager.operator_properties_last(
             SETUP_ROOM_OPERATOR_NAME)
-        beacon_properties = context.window_manager.operator_properties_last(
-            SETUP_BEACON_OPERATOR_NAME)
-        beacon = context.scene.objects[beacon_properties.name]
         camera_properties = context.window_manager.operator_properties_last(
             SETUP_CAMERA_OPERATOR_NAME)
-        camera = context.scene.objects[camera_properties.name]
+        camera_object = context.scene.objects[camera_properties.name]
         camera_rotation = (
-            math.degrees(camera.rotation_euler[0]),
-            math.degrees(camera.rotation_euler[1]),
-            math.degrees(camera.rotation_euler[2])
+            math.degrees(camera_object.rotation_euler[0]),
+            math.degrees(camera_object.rotation_euler[1]),
+            math.degrees(camera_object.rotation_euler[2])
         )
 
+        with VLIPSSimulation._time_stage("render_metadata"):
+            scene, beacon, camera = VLIPSSimulation.get_render_metadata(
+                context=context,
+                camera_location=tuple(camera_object.location),
+                camera_rotation=camera_rotation,
+                rotation_x_angle=camera_properties.rotation_x_angle,
+                rotation_z_angle=camera_properties.rotation_z_angle)
+
         # Render and save as image. First, hide the room, so it doesn't show in
         # the resulting image
         room = context.scene.objects[room_properties.name]
         room.hide_render = True
-        context.scene.render.image_settings.file_format = "JPEG"
-        context.scene.render.image_settings.quality = 100
-        context.scene.render.filepath = filepath
-        bpy.ops.render.render(write_still=True)
-        room.hide_render = False
+
+        if render_profile is None:
+            render_profile = scene_properties.render_profile
+        previous_render_settings = VLIPSSimulation.apply_render_profile(context, render_profile)
+
+        render_settings = context.scene.render
+        border_settings = (
+            render_settings.use_border,
+            render_settings.use_crop_to_border,
+            render_settings.border_min_x,
+            render_settings.border_max_x,
+            render_settings.border_min_y,
+            render_settings.border_max_y)
+
+        try:
+            with VLIPSSimulation._time_stage("region_of_interest"):
+                region_of_interest = VLIPSSimulation._setup_region_of_interest(
+                    context=context,
+                    camera=camera,
+                    beacon=beacon,
+                    mode=scene_properties.region_of_interest_mode,
+                    margin=scene_properties.region_of_interest_margin)
+            crop = region_of_interest \
+                if scene_properties.region_of_interest_mode == RegionOfInterestMode.CROP.value.identifier \
+                else None
+
+            if VLIPSSimulation._is_view_transform_reproducible(context):
+                # Take the pixels from memory, so the image is encoded and
+                # written to disk only once, with the EXIF data already
+                # included
+                VLIPSSimulation._setup_viewer_node(context)
+                with VLIPSSimulation._time_stage("render"):
+                    bpy.ops.render.render()
+
+                with VLIPSSimulation._time_stage("read_pixels"):
+                    pixels = VLIPSSimulation._get_viewer_pixels()
+                    if region_of_interest is not None and crop is None:
+                        pixels = region_of_interest.paste(pixels)
+
+                # The writer times the image as it saves it
+                if writer is not None:
+                    writer.save_image(
+                        filepath=filepath,
+                        pixels=pixels,
+                        scene=scene,
+                        beacon=beacon,
+                        camera=camera,
+                        crop=crop,
+                        tag=tag)
+                else:
+                    with VLIPSSimulation._time_stage("save_image"):
+                        ExifWriter.save_image(
+                            filepath=filepath,
+                            pixels=pixels,
+                            scene=scene,
+                            beacon=beacon,
+                            camera=camera,
+                            crop=crop)
+                return
+
+            # Blender's color management can't be reproduced, so let Blender
+            # save the image and add the EXIF data afterwards
+            render_settings.image_settings.file_format = "JPEG"
+            render_settings.image_settings.quality = 100
+            render_settings.filepath = filepath
+            with VLIPSSimulation._time_stage("render_and_write_jpeg"):
+                bpy.ops.render.render(write_still=True)
+
+            if writer is not None:
+                writer.save_exif_data(
+                    filepath=filepath,
+                    scene=scene,
+                    beacon=beacon,
+                    camera=camera,
+                    crop=crop,
+                    tag=tag)
+            else:
+                with VLIPSSimulation._time_stage("save_exif_data"):
+                    ExifWriter.save_exif_data(
+                        filepath=filepath,
+                        scene=scene,
+                        beacon=beacon,
+                        camera=camera,
+                        crop=crop)
+        finally:
+            room.hide_render = False
+            VLIPSSimulation.restore_render_settings(context, previous_render_settings)
+            (render_settings.use_border,
+             render_settings.use_crop_to_border,
+             render_settings.border_min_x,
+             render_settings.border_max_x,
+             render_settings.border_min_y,
+             render_settings.border_max_y) = border_settings
+
+    @staticmethod
+    def apply_render_profile(context, render_profile: str) -> dict:
+        """
+        Change the render settings of the scene as a render profile says.
+
+        :param context: Blender's current context containing the scene to be
+        rendered.
+        :param render_profile: identifier of the render profile.
+
+        :return: previous value of every setting changed, so they can be
+        restored with `restore_render_settings`.
+        :rtype: dict
+        """
+
+        log.info("Apply render profile")
+        CallTrace.log(log, "VLIPSSimulation.apply_render_profile",
+                      context=context,
+                      render_profile=render_profile)
+
+        previous_settings = {}
+        for path, value in RENDER_PROFILE_SETTINGS[render_profile].items():
+            owner_path, name = path.rsplit(".", 1)
+            owner = context.scene.path_resolve(owner_path)
+            previous_settings[path] = getattr(owner, name)
+            setattr(owner, name, value)
+
+        return previous_settings
+
+    @staticmethod
+    def restore_render_settings(context, previous_settings: dict):
+        """
+        Restore the render settings changed by a render profile.
+
+        :param context: Blender's current context containing the rendered
+        scene.
+        :param previous_settings: settings returned by `apply_render_profile`.
+        """
+
+        # The engine goes last, so the settings of every engine are restored
+        # before switching back to it
+        for path, value in reversed(list(previous_settings.items())):
+            owner_path, name = path.rsplit(".", 1)
+            setattr(context.scene.path_resolve(owner_path), name, value)
+
+    @staticmethod
+    def _setup_region_of_interest(
+            context,
+            camera: Camera,
+            beacon: Beacon,
+            mode: str,
+            margin: int
+    ) -> RegionOfInterest:
+        """
+        Limit the next render to the region of the image where the beacon
+        shows up, as Blender's render border.
+
+        :param context: Blender's current context containing the scene to be
+        rendered.
+        :param camera: camera the scene is rendered from.
+        :param beacon: beacon shown in the scene.
+        :param mode: identifier of the region of interest mode.
+        :param margin: pixels rendered around the beacon.
+
+        :return: region rendered, or None if the whole image is rendered.
+        :rtype: RegionOfInterest
+        """
+
+        render_settings = context.scene.render
+        render_settings.use_border = False
+
+        if mode == RegionOfInterestMode.OFF.value.identifier:
+            return None
+
+        # The border is a fraction of the image size actually rendered
+        scale = render_settings.resolution_percentage / 100
+        region_of_interest = RegionOfInterest.around_beacon(
+            camera=camera,
+            beacon=beacon,
+            image_width=int(render_settings.resolution_x * scale),
+            image_height=int(render_settings.resolution_y * scale),
+            margin=margin)
+        log.debug("- region_of_interest=%s", region_of_interest)
+        if region_of_interest is None:
+            return None
+
+        # The image is always cropped, so the pixels read from memory are only
+        # the ones rendered. Images saved by Blender are only cropped if asked
+        render_settings.use_border = True
+        render_settings.use_crop_to_border = \
+            mode == RegionOfInterestMode.CROP.value.identifier or \
+            VLIPSSimulation._is_view_transform_reproducible(context)
+        (render_settings.border_min_x,
+         render_settings.border_max_x,
+         render_settings.border_min_y,
+         render_settings.border_max_y) = region_of_interest.get_border()
+
+        return region_of_interest
+
+    @staticmethod
+    def _is_view_transform_reproducible(context) -> bool:
+        """
+        Check whether the scene's color management only applies the sRGB
+        transfer function to the rendered pixels, so images can be encoded
+        from the pixels in memory and look the same as the ones Blender saves.
+
+        :param context: Blender's current context containing the scene to be
+        rendered.
+
+        :return: True if the view transform is Standard and nothing else alters
+        the colors.
+        :rtype: bool
+        """
+
+        view_settings = context.scene.view_settings
+        return context.scene.display_settings.display_device == "sRGB" and \
+            view_settings.view_transform == "Standard" and \
+            view_settings.look == "None" and \
+            view_settings.exposure == 0 and \
+            view_settings.gamma == 1 and \
+            not view_settings.use_curve_mapping
+
+    @staticmethod
+    def _setup_viewer_node(context):
+        """
+        Make the compositor keep a copy of the render in the viewer node image,
+        where its pixels can be read from.
+
+        :param context: Blender's current context containing the scene to be
+        rendered.
+        """
+
+        context.scene.use_nodes = True
+        node_tree = context.scene.node_tree
+        nodes = {node.type: node for node in node_tree.nodes}
+
+        render_layers = nodes.get("R_LAYERS")
+        if render_layers is None:
+            render_layers = node_tree.nodes.new("CompositorNodeRLayers")
+
+        # Without a composite node there is no render result
+        composite = nodes.get("COMPOSITE")
+        if composite is None:
+            composite = node_tree.nodes.new("CompositorNodeComposite")
+            node_tree.links.new(render_layers.outputs["Image"], composite.inputs["Image"])
+
+        viewer = nodes.get("VIEWER")
+        if viewer is None:
+            viewer = node_tree.nodes.new("CompositorNodeViewer")
+            viewer.use_alpha = False
+        if not viewer.inputs["Image"].is_linked:
+            node_tree.links.new(render_layers.outputs["Image"], viewer.inputs["Image"])
+
+    @staticmethod
+    def _get_viewer_pixels() -> np.ndarray:
+        """
+        Read the pixels of the last render from the viewer node image and
+        convert them to the sRGB values an image file stores.
+
+        :return: RGB pixels as unsigned bytes, with shape (height, width, 3),
+        top row first.
+        :rtype: np.ndarray
+        """
+
+        image = bpy.data.images[VIEWER_NODE_IMAGE_NAME]
+        width, height = image.size
+
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+
+        # Blender stores the bottom row first, with linear RGBA values
+        linear = np.clip(pixels.reshape(height, width, 4)[::-1, :, :3], 0.0, 1.0)
+        srgb = np.where(
+            linear <= 0.0031308,
+            linear * 12.92,
+            1.055 * np.power(linear, 1 / 2.4) - 0.055)
+
+        return np.ascontiguousarray(np.round(srgb * 255).astype(np.uint8))
+
+    @staticmethod
+    def save_render_exif(
+            context,
+            filepath,
+            camera_location,
+            camera_rotation,
+            rotation_x_angle,
+            rotation_z_angle
+    ):
+        """
+        Store as EXIF data in a render all the details needed to recreate the
+        scene it shows.
+
+        :param context: Blender's current context containing the rendered
+        scene.
+        :param filepath: path to the render.
+        :param camera_location: camera's X, Y, and Z location when the render
+        was made, in millimeters.
+        :param camera_rotation: camera's rotation around its X, Y, and Z axes
+        when the render was made, in degrees.
+        :param rotation_x_angle: rotation around camera's X axis, in degrees,
+        relative to its default rotation.
+        :param rotation_z_angle: rotation around camera's Z axis, in degrees,
+        relative to its default rotation.
+        """
+
+        log.info("Save render EXIF data")
+        CallTrace.log(log, "VLIPSSimulation.save_render_exif",
+                      context=context,
+                      filepath=filepath,
+                      camera_location=camera_location,
+                      camera_rotation=camera_rotation,
+                      rotation_x_angle=rotation_x_angle,
+                      rotation_z_angle=rotation_z_angle)
+
+        scene, beacon, camera = VLIPSSimulation.get_render_metadata(
+            context=context,
+            camera_location=camera_location,
+            camera_rotation=camera_rotation,
+            rotation_x_angle=rotation_x_angle,
+            rotation_z_angle=rotation_z_angle)
+
+        # Store the data as EXIF in the image
+        ExifWriter().save_exif_data(
+            filepath=filepath,
+            scene=scene,
+            beacon=beacon,
+            camera=camera)
+
+    @staticmethod
+    def get_render_metadata(
+            context,
+            camera_location,
+            camera_rotation,
+            rotation_x_angle,
+            rotation_z_angle
+    ) -> (Scene, Beacon, Camera):
+        """
+        Describe the scene shown in a render with the helper classes used to
+        store it as EXIF data.
+
+        :param context: Blender's current context containing the rendered
+        scene.
+        :param camera_location: camera's X, Y, and Z location when the render
+        was made, in millimeters.
+        :param camera_rotation: camera's rotation around its X, Y, and Z axes
+        when the render was made, in degrees.
+        :param rotation_x_angle: rotation around camera's X axis, in degrees,
+        relative to its default rotation.
+        :param rotation_z_angle: rotation around camera's Z axis, in degrees,
+        relative to its default rotation.
+
+        :return: scene, beacon, and camera shown in the render.
+        :rtype: (Scene, Beacon, Camera)
+        """
+
+        # Load all the properties needed to recreate the scene later if needed
+        scene_properties = context.window_manager.operator_properties_last(
+            SETUP_SCENE_OPERATOR_NAME)
+        beacon_properties = context.window_manager.operator_properties_last(
+            SETUP_BEACON_OPERATOR_NAME)
+        beacon = context.scene.objects[beacon_properties.name]
+        camera_properties = context.window_manager.operator_properties_last(
+            SETUP_CAMERA_OPERATOR_NAME)
 
         # Create helper instances of objects that ease the storage of the data
         # as EXIF in the image
@@ -963,14 +1771,14 @@ class VLIPSSimulation:
             location=(round(beacon.location.x), round(beacon.location.y), round(beacon.location.z)),
             rotation=DEFAULT_BEACON_ROTATION)
 
-        camera_location_x = round(camera.location.x)
-        camera_location_y = round(camera.location.y)
-        camera_location_z = round(camera.location.z)
+        camera_location_x = round(camera_location[0])
+        camera_location_y = round(camera_location[1])
+        camera_location_z = round(camera_location[2])
         tile_side = scene_properties.tile_side
-        grid_location_x = round(camera.location.x / tile_side)
-        grid_location_y = round(camera.location.y / tile_side)
-        camera_rotation_x_angle = camera_properties.rotation_x_angle
-        camera_rotation_z_angle = camera_properties.rotation_z_angle
+        grid_location_x = round(camera_location[0] / tile_side)
+        grid_location_y = round(camera_location[1] / tile_side)
+        camera_rotation_x_angle = rotation_x_angle
+        camera_rotation_z_angle = rotation_z_angle
         camera = Camera(
             name=camera_properties.name,
             facing=Camera.Facing.from_str(camera_properties.facing),
@@ -987,58 +1795,7 @@ class VLIPSSimulation:
             rotation_x_angle=camera_rotation_x_angle,
             rotation_z_angle=camera_rotation_z_angle)
 
-        # Store the data as EXIF in the image
-        ExifWriter().save_exif_data(
-            filepath=filepath,
-            scene=scene,
-            beacon=beacon,
-            camera=camera)
-
-    @staticmethod
-    def get_camera_movement_steps(
-            context: bpy.types.Context,
-            camera_movement: CameraMovement) -> [float]:
-        """
-        Get the list of steps of the camera movement.
-
-        :param context: Blender's current context containing the scene to be
-        rendered.
-        :param camera_movement: type of movement the camera will describe.
-
-        :return: list of steps the camera movement will describe.
-        :rtype: [float]
-        """
-
-        log.info("Get camera movement steps")
-        log.debug(f"VLIPSSimulation.get_camera_movement_steps("
-                  f"context={context}, "
-                  f"camera_movement={camera_movement})")
-
-        if camera_movement == CameraMovement.BEACON_DISTANCE:
-            camera_movement_beacon_distance_properties = context.window_manager.operator_properties_last(
-                SETUP_CAMERA_MOVEMENT_DISTANCE_OPERATOR_NAME)
-            distance_start = camera_movement_beacon_distance_properties.camera_beacon_distance_start
-            distance_end = camera_movement_beacon_distance_properties.camera_beacon_distance_end
-            distance_step = camera_movement_beacon_distance_properties.camera_beacon_distance_step
-            camera_movement_steps = arange(distance_start, distance_end + distance_step, distance_step)
-        elif camera_movement == CameraMovement.ROTATION_X_ANGLE:
-            camera_movement_rotation_x_angle_properties = context.window_manager.operator_properties_last(
-                SETUP_CAMERA_MOVEMENT_ROTATION_X_ANGLE_OPERATOR_NAME)
-            angle_start = camera_movement_rotation_x_angle_properties.camera_rotation_x_angle_start
-            angle_end = camera_movement_rotation_x_angle_properties.camera_rotation_x_angle_end
-            angle_step = camera_movement_rotation_x_angle_properties.camera_rotation_x_angle_step
-            camera_movement_steps = arange(angle_start, angle_end + angle_step, angle_step)
-        elif camera_movement == CameraMovement.ROTATION_Z_ANGLE:
-            camera_movement_rotation_z_angle_properties = context.window_manager.operator_properties_last(
-                SETUP_CAMERA_MOVEMENT_ROTATION_Z_ANGLE_OPERATOR_NAME)
-            angle_start = camera_movement_rotation_z_angle_properties.camera_rotation_z_angle_start
-            angle_end = camera_movement_rotation_z_angle_properties.camera_rotation_z_angle_end
-            angle_step = camera_movement_rotation_z_angle_properties.camera_rotation_z_angle_step
-            camera_movement_steps = arange(angle_start, angle_end + angle_step, angle_step)
-        else:
-            camera_movement_steps = []
-
-        return camera_movement_steps
+        return scene, beacon, camera
 
     @staticmethod
     def get_camera_movement_steps_digits(camera_movement_steps: list) -> int:
@@ -1052,8 +1809,8 @@ class VLIPSSimulation:
         """
 
         log.info("Get file path")
-        log.debug(f"VLIPSSimulation.get_camera_movement_steps_digits("
-                  f"camera_movement_steps={len(camera_movement_steps)} items)")
+        CallTrace.log(log, "VLIPSSimulation.get_camera_movement_steps_digits",
+                      camera_movement_steps=camera_movement_steps)
 
         max_index = len(camera_movement_steps) - 1
         max_index_as_string = str(max_index)
@@ -1067,10 +1824,8 @@ class VLIPSSimulation:
             file_prefix: str,
             output_path: str,
             fov_scan_enabled: bool,
-            beacon_distance_enabled: bool,
-            rotation_x_angle_enabled: bool,
-            rotation_z_angle_enabled: bool,
-            camera_movement_step: dict
+            directory: str,
+            grid_coordinates: (int, int)
     ) -> str:
         """
         Compose the file path for the output render in a camera movement
@@ -1083,30 +1838,24 @@ class VLIPSSimulation:
         :param output_path: folder where the renders will be saved to.
         :param fov_scan_enabled: True if the camera is going to go through
         the entire FOV, False otherwise.
-        :param beacon_distance_enabled: True if the distance between the camera
-        and the beacon is going to go change, False otherwise.
-        :param rotation_x_angle_enabled: True if rotation of the camera around the X
-        axis is going to go change, False otherwise.
-        :param rotation_z_angle_enabled: True if rotation of the camera around the Z
-        axis is going to go change, False otherwise.
-        :param camera_movement_step: dictionary describing the current step of
-        the camera movement.
+        :param directory: folder of the step, relative to the output path, as
+        composed by the sweep of the camera movement.
+        :param grid_coordinates: coordinates of the camera in the FOV grid, in
+        tiles.
 
         :return: full file path, file name included, where the render will be
         saved to.
         """
 
         log.info("Get file path")
-        log.debug(f"VLIPSSimulation.get_camera_movement_file_path("
-                  f"index={index}, "
-                  f"max_index_digits={max_index_digits}, "
-                  f"file_prefix={file_prefix}, "
-                  f"output_path={output_path}, "
-                  f"fov_scan_enabled={fov_scan_enabled}, "
-                  f"beacon_distance_enabled={beacon_distance_enabled}, "
-                  f"rotation_x_angle_enabled={rotation_x_angle_enabled}, "
-                  f"rotation_z_angle_enabled={rotation_z_angle_enabled}, "
-                  f"camera_movement_step={camera_movement_step})")
+        CallTrace.log(log, "VLIPSSimulation.get_camera_movement_file_path",
+                      index=index,
+                      max_index_digits=max_index_digits,
+                      file_prefix=file_prefix,
+                      output_path=output_path,
+                      fov_scan_enabled=fov_scan_enabled,
+                      directory=directory,
+                      grid_coordinates=grid_coordinates)
 
         file_suffix = str(index).zfill(max_index_digits)
         if file_prefix == "":
@@ -1115,21 +1864,1131 @@ class VLIPSSimulation:
             file_name = f"{file_prefix}_{file_suffix}"
 
         if fov_scan_enabled:
-            grid_x, grid_y = camera_movement_step[CAMERA_MOVEMENT_FOV_GRID_COORDINATES]
+            grid_x, grid_y = grid_coordinates
             file_name = f"{file_name}_{grid_x:+}_{grid_y:+}"
 
         file_name = f"{file_name}.jpg"
 
-        if beacon_distance_enabled:
-            beacon_distance = camera_movement_step[CAMERA_MOVEMENT_BEACON_DISTANCE]
-            output_path = os.path.join(output_path, f"distance_{int(beacon_distance):+}")
+        return os.path.join(output_path, directory, file_name)
 
-        if rotation_x_angle_enabled:
-            rotation_x = camera_movement_step[CAMERA_MOVEMENT_ROTATION_X_ANGLE]
-            output_path = os.path.join(output_path, f"rotation_x_{int(rotation_x):+}")
+    @staticmethod
+    def get_camera_fov_inputs(context: bpy.types.Context) -> dict:
+        """
+        Gather the properties of the camera, the beacon, and the scene the FOV
+        depends on, apart from the distance between the camera and the
+        beacon.
 
-        if rotation_z_angle_enabled:
-            rotation_z = camera_movement_step[CAMERA_MOVEMENT_ROTATION_Z_ANGLE]
-            output_path = os.path.join(output_path, f"rotation_z_{int(rotation_z):+}")
+        :param context: Blender's current context containing the scene to be
+        rendered.
 
-        return os.path.join(output_path, file_name)
+        :return: keyword arguments for `CameraFOV`, but the beacon distance.
+        :rtype: dict
+        """
+
+        camera_properties = context.window_manager.operator_properties_last(
+            SETUP_CAMERA_OPERATOR_NAME)
+        beacon_properties = context.window_manager.operator_properties_last(
+            SETUP_BEACON_OPERATOR_NAME)
+        scene_properties = context.window_manager.operator_properties_last(
+            SETUP_SCENE_OPERATOR_NAME)
+
+        # Sensor dimensions follow the render resolution, which depends on
+        # the camera orientation
+        if camera_properties.orientation == CameraOrientation.LANDSCAPE.value.identifier:
+            resolution_x, resolution_y = camera_properties.resolution_width, camera_properties.resolution_height
+        else:
+            resolution_x, resolution_y = camera_properties.resolution_height, camera_properties.resolution_width
+
+        return {
+            "sensor_width": resolution_x * camera_properties.pixel_size,
+            "sensor_height": resolution_y * camera_properties.pixel_size,
+            "focal_length": camera_properties.focal_length,
+            "beacon_dimensions": (beacon_properties.width, beacon_properties.height),
+            "tile_side": scene_properties.tile_side
+        }
+
+    @staticmethod
+    def get_camera_movement_sweep(context: bpy.types.Context) -> Sweep:
+        """
+        Describe the camera movement configured in the add-on settings as a
+        sweep. Its axes are, from outermost to innermost, the distance, the
+        rotation X angle, the rotation Z angle, and the camera location in the
+        FOV grid. Movements that aren't enabled keep the camera's value, and
+        add no folder to the file paths.
+
+        Each axis sets its value in the camera settings, or moves the camera,
+        when a step is rendered, and is a column of the step table, so adding
+        a dimension to the camera movement is a matter of registering another
+        axis here.
+
+        :param context: Blender's current context containing the scene to be
+        rendered.
+
+        :return: sweep of the camera movement.
+        :rtype: Sweep
+        """
+
+        log.info("Get camera movement sweep")
+        CallTrace.log(log, "VLIPSSimulation.get_camera_movement_sweep",
+                      context=context)
+
+        camera_movement_properties = context.window_manager.operator_properties_last(
+            SETUP_CAMERA_MOVEMENT_OPERATOR_NAME)
+        camera_properties = context.window_manager.operator_properties_last(
+            SETUP_CAMERA_OPERATOR_NAME)
+
+        def get_folder(prefix):
+            return lambda value: f"{prefix}_{int(value):+}"
+
+        def get_camera_property_setter(camera_property):
+            def apply(apply_context, value):
+                setattr(
+                    apply_context.window_manager.operator_properties_last(SETUP_CAMERA_OPERATOR_NAME),
+                    camera_property,
+                    value)
+            return apply
+
+        def set_camera_location(apply_context, location):
+            apply_context.scene.objects[camera_properties.name].location.xy = location
+
+        sweep = Sweep()
+        for name, label, enabled, operator_name, property_prefix, camera_property, folder_prefix, exif_field, \
+                cost in (
+                    (SWEEP_DISTANCE_AXIS, "Distance",
+                     camera_movement_properties.camera_movement_beacon_distance_enabled,
+                     SETUP_CAMERA_MOVEMENT_DISTANCE_OPERATOR_NAME, "camera_beacon_distance",
+                     "beacon_distance", "distance", None, SWEEP_DISTANCE_TRANSITION_COST),
+                    (SWEEP_ROTATION_X_ANGLE_AXIS, "Rotation X angle",
+                     camera_movement_properties.camera_movement_rotation_x_angle_enabled,
+                     SETUP_CAMERA_MOVEMENT_ROTATION_X_ANGLE_OPERATOR_NAME, "camera_rotation_x_angle",
+                     "rotation_x_angle", "rotation_x", "rotation_x_angle", SWEEP_ROTATION_TRANSITION_COST),
+                    (SWEEP_ROTATION_Z_ANGLE_AXIS, "Horizontal rotation angle",
+                     camera_movement_properties.camera_movement_rotation_z_angle_enabled,
+                     SETUP_CAMERA_MOVEMENT_ROTATION_Z_ANGLE_OPERATOR_NAME, "camera_rotation_z_angle",
+                     "rotation_z_angle", "rotation_z", "rotation_z_angle", SWEEP_ROTATION_TRANSITION_COST)):
+            if enabled:
+                properties = context.window_manager.operator_properties_last(operator_name)
+                sweep.register(SweepAxis.from_range(
+                    name=name,
+                    start=getattr(properties, f"{property_prefix}_start"),
+                    end=getattr(properties, f"{property_prefix}_end"),
+                    step=getattr(properties, f"{property_prefix}_step"),
+                    label=label,
+                    apply=get_camera_property_setter(camera_property),
+                    folder=get_folder(folder_prefix),
+                    exif_field=exif_field,
+                    cost=cost))
+            else:
+                sweep.register(SweepAxis(
+                    name=name,
+                    values=[getattr(camera_properties, camera_property)],
+                    apply=get_camera_property_setter(camera_property),
+                    exif_field=exif_field,
+                    cost=cost))
+
+        fov_scan_enabled = camera_movement_properties.camera_movement_fov_scan_enabled
+        camera = context.scene.objects[camera_properties.name]
+        camera_x, camera_y = camera.location[0], camera.location[1]
+        camera_fov_inputs = VLIPSSimulation.get_camera_fov_inputs(context)
+        fov_grids = {}
+
+        # The FOV only depends on the distance, so the same grid is used for
+        # every rotation angle
+        def get_locations(outer_values):
+            if not fov_scan_enabled:
+                return [(camera_x, camera_y)]
+
+            beacon_distance = outer_values[SWEEP_DISTANCE_AXIS]
+            if beacon_distance not in fov_grids:
+                camera_fov = CameraFOV(beacon_distance=beacon_distance, **camera_fov_inputs)
+                fov_grids[beacon_distance] = [(x, y) for y in camera_fov.get_grid_y() for x in camera_fov.get_grid_x()]
+            return fov_grids[beacon_distance]
+
+        sweep.register(SweepAxis(
+            name=SWEEP_LOCATION_AXIS,
+            values=get_locations,
+            apply=set_camera_location,
+            cost=SWEEP_LOCATION_TRANSITION_COST,
+            shape=(2,)))
+
+        return sweep
+
+    @staticmethod
+    def iter_camera_movement_plan(context: bpy.types.Context) -> Iterator[dict]:
+        """
+        Expand the camera movement configured in the add-on settings into the
+        steps the camera will describe, one per render. Every combination of
+        distance, rotation X angle, and rotation Z angle is considered and, if
+        the FOV scan is enabled, every tile in the FOV grid for each of them.
+        If another sampling mode is selected, only the number of poses
+        requested is drawn instead, inside the same limits.
+
+        The grid is the sweep of `get_camera_movement_sweep`, and every step
+        has the value of each of its axes, by name. Settings are read when
+        this method is called, but steps are only composed, and the steps of
+        each movement checked, as they are iterated, so no list of them is
+        ever kept. The FOV is calculated, not measured in the viewport, so the
+        camera isn't moved.
+
+        :param context: Blender's current context containing the scene to be
+        rendered.
+
+        :return: iterator over the steps the camera movement will describe.
+        :rtype: Iterator[dict]
+        """
+
+        log.info("Iterate camera movement plan")
+        CallTrace.log(log, "VLIPSSimulation.iter_camera_movement_plan",
+                      context=context)
+
+        camera_movement_properties = context.window_manager.operator_properties_last(
+            SETUP_CAMERA_MOVEMENT_OPERATOR_NAME)
+        fov_scan_enabled = camera_movement_properties.camera_movement_fov_scan_enabled
+        beacon_distance_enabled = camera_movement_properties.camera_movement_beacon_distance_enabled
+        rotation_x_angle_enabled = camera_movement_properties.camera_movement_rotation_x_angle_enabled
+        rotation_z_angle_enabled = camera_movement_properties.camera_movement_rotation_z_angle_enabled
+
+        if not fov_scan_enabled and \
+                not beacon_distance_enabled and \
+                not rotation_x_angle_enabled and \
+                not rotation_z_angle_enabled:
+            raise ValueError("No camera movement selected")
+
+        if camera_movement_properties.sampling_mode != SamplingMode.GRID.value.identifier:
+            return VLIPSSimulation.iter_sampled_camera_movement_plan(
+                context=context,
+                sampling_mode=camera_movement_properties.sampling_mode,
+                sample_count=camera_movement_properties.sample_count,
+                seed=camera_movement_properties.sampling_seed)
+
+        return iter(VLIPSSimulation.get_camera_movement_sweep(context))
+
+    @staticmethod
+    def get_camera_movement_plan(context: bpy.types.Context) -> [dict]:
+        """
+        Expand the camera movement configured in the add-on settings into the
+        list of steps the camera will describe, one per render. See
+        `iter_camera_movement_plan`, which doesn't keep them all in memory.
+
+        :param context: Blender's current context containing the scene to be
+        rendered.
+
+        :return: list of steps the camera movement will describe.
+        :rtype: [dict]
+        """
+
+        log.info("Get camera movement plan")
+        CallTrace.log(log, "VLIPSSimulation.get_camera_movement_plan",
+                      context=context)
+
+        camera_movement_steps = list(VLIPSSimulation.iter_camera_movement_plan(context))
+
+        log.debug("- len(camera_movement_steps)=%s", len(camera_movement_steps))
+
+        return camera_movement_steps
+
+    @staticmethod
+    def get_camera_movement_bounds(
+            context: bpy.types.Context,
+            camera_movement: CameraMovement) -> (float, float):
+        """
+        Get the limits of the camera movement, as configured in its operator.
+
+        :param context: Blender's current context containing the scene to be
+        rendered.
+        :param camera_movement: type of movement the camera will describe.
+
+        :return: first and last value of the camera movement.
+        :rtype: (float, float)
+        """
+
+        if camera_movement == CameraMovement.BEACON_DISTANCE:
+            properties = context.window_manager.operator_properties_last(
+                SETUP_CAMERA_MOVEMENT_DISTANCE_OPERATOR_NAME)
+            return properties.camera_beacon_distance_start, properties.camera_beacon_distance_end
+        elif camera_movement == CameraMovement.ROTATION_X_ANGLE:
+            properties = context.window_manager.operator_properties_last(
+                SETUP_CAMERA_MOVEMENT_ROTATION_X_ANGLE_OPERATOR_NAME)
+            return properties.camera_rotation_x_angle_start, properties.camera_rotation_x_angle_end
+        elif camera_movement == CameraMovement.ROTATION_Z_ANGLE:
+            properties = context.window_manager.operator_properties_last(
+                SETUP_CAMERA_MOVEMENT_ROTATION_Z_ANGLE_OPERATOR_NAME)
+            return properties.camera_rotation_z_angle_start, properties.camera_rotation_z_angle_end
+        else:
+            raise ValueError(f"Camera movement {camera_movement} has no limits")
+
+    @staticmethod
+    def iter_sampled_camera_movement_plan(
+            context: bpy.types.Context,
+            sampling_mode: str,
+            sample_count: int,
+            seed: int) -> Iterator[dict]:
+        """
+        Draw the poses of the camera movement from the limits of each enabled
+        movement, instead of going through all their combinations. Distance
+        and rotation angles are drawn first, then the camera location, inside
+        the FOV grid the camera has with them.
+
+        Steps are described as in the grid, with the value of every axis of
+        the sweep of `get_camera_movement_sweep`, so file names and EXIF data
+        are the same. Axes that aren't sampled keep their first value. Samples
+        are drawn when this method is called, but steps are only composed as
+        they are iterated.
+
+        :param context: Blender's current context containing the scene to be
+        rendered.
+        :param sampling_mode: identifier of the sampling mode.
+        :param sample_count: number of poses drawn.
+        :param seed: seed of the sampling.
+
+        :return: iterator over the steps the camera movement will describe.
+        :rtype: Iterator[dict]
+        """
+
+        log.info("Iterate sampled camera movement plan")
+        CallTrace.log(log, "VLIPSSimulation.iter_sampled_camera_movement_plan",
+                      context=context,
+                      sampling_mode=sampling_mode,
+                      sample_count=sample_count,
+                      seed=seed)
+
+        camera_movement_properties = context.window_manager.operator_properties_last(
+            SETUP_CAMERA_MOVEMENT_OPERATOR_NAME)
+        camera_properties = context.window_manager.operator_properties_last(
+            SETUP_CAMERA_OPERATOR_NAME)
+        fov_scan_enabled = camera_movement_properties.camera_movement_fov_scan_enabled
+        sweep = VLIPSSimulation.get_camera_movement_sweep(context)
+
+        # Every enabled movement is a dimension of the sampled space. The FOV
+        # takes two, as fractions of its width and height
+        camera_movements = [
+            (axis_name, camera_movement) for axis_name, camera_movement, enabled in (
+                (SWEEP_DISTANCE_AXIS, CameraMovement.BEACON_DISTANCE,
+                 camera_movement_properties.camera_movement_beacon_distance_enabled),
+                (SWEEP_ROTATION_X_ANGLE_AXIS, CameraMovement.ROTATION_X_ANGLE,
+                 camera_movement_properties.camera_movement_rotation_x_angle_enabled),
+                (SWEEP_ROTATION_Z_ANGLE_AXIS, CameraMovement.ROTATION_Z_ANGLE,
+                 camera_movement_properties.camera_movement_rotation_z_angle_enabled))
+            if enabled]
+        sampled_axes = [axis_name for axis_name, _ in camera_movements]
+        bounds = [
+            VLIPSSimulation.get_camera_movement_bounds(context=context, camera_movement=camera_movement)
+            for _, camera_movement in camera_movements]
+        if fov_scan_enabled:
+            bounds += [(-0.5, 0.5), (-0.5, 0.5)]
+
+        pose_sampler = PoseSampler(method=sampling_mode, seed=seed)
+        samples = pose_sampler.sample(count=sample_count, bounds=bounds)
+
+        camera = context.scene.objects[camera_properties.name]
+        camera_x, camera_y = camera.location[0], camera.location[1]
+        camera_fov_inputs = VLIPSSimulation.get_camera_fov_inputs(context)
+        default_step = {
+            axis.name: axis.get_values({})[0]
+            for axis in sweep.axes if axis.name != SWEEP_LOCATION_AXIS}
+
+        def camera_movement_plan():
+            for sample in samples:
+                step = dict(default_step)
+                step.update(zip(sampled_axes, (float(value) for value in sample)))
+
+                if fov_scan_enabled:
+                    camera_fov = CameraFOV(beacon_distance=step[SWEEP_DISTANCE_AXIS], **camera_fov_inputs)
+                    step[SWEEP_LOCATION_AXIS] = (
+                        float(sample[-2]) * camera_fov.width,
+                        float(sample[-1]) * camera_fov.height)
+                else:
+                    step[SWEEP_LOCATION_AXIS] = (camera_x, camera_y)
+
+                yield step
+
+        return camera_movement_plan()
+
+    @staticmethod
+    def get_camera_movement_step_table(
+            camera_movement_steps: Iterable[dict],
+            sweep: Sweep,
+            group_fields: [str] = ()
+    ) -> CameraMovementStepTable:
+        """
+        Keep the steps of a camera movement in a table, a row per step and a
+        column per axis of its sweep, with the numbering of the file of every
+        step calculated once for all of them.
+
+        :param camera_movement_steps: steps the camera movement will describe,
+        with the value of every axis of the sweep.
+        :param sweep: sweep of the camera movement.
+        :param group_fields: columns of the table whose runs of equal values
+        the file index starts over with. If empty, files are numbered by the
+        position of their step in the camera movement.
+
+        :return: table with a row per step.
+        :rtype: CameraMovementStepTable
+        """
+
+        log.info("Get camera movement step table")
+        log.debug("VLIPSSimulation.get_camera_movement_step_table()")
+
+        rows = (sweep.get_row(camera_movement_step) for camera_movement_step in camera_movement_steps)
+        step_table = CameraMovementStepTable.from_rows(rows, dtype=sweep.get_dtype(), group_fields=group_fields)
+
+        log.debug("- len(step_table)=%s", len(step_table))
+
+        return step_table
+
+    @staticmethod
+    def get_pose_camera_movement_step(
+            x: float,
+            y: float,
+            distance: float,
+            rotation_x_angle: float,
+            rotation_z_angle: float
+    ) -> dict:
+        """
+        Describe a single camera pose, outside of any camera movement plan, as
+        the dictionary the render methods expect.
+
+        :param x: camera's X location, in millimeters.
+        :param y: camera's Y location, in millimeters.
+        :param distance: distance between the camera and the beacon, in
+        millimeters.
+        :param rotation_x_angle: rotation around camera's X axis, in degrees.
+        :param rotation_z_angle: rotation around camera's Z axis, in degrees.
+
+        :return: dictionary describing the step.
+        :rtype: dict
+        """
+
+        return {
+            SWEEP_DISTANCE_AXIS: float(distance),
+            SWEEP_ROTATION_X_ANGLE_AXIS: float(rotation_x_angle),
+            SWEEP_ROTATION_Z_ANGLE_AXIS: float(rotation_z_angle),
+            SWEEP_LOCATION_AXIS: (float(x), float(y))
+        }
+
+    @staticmethod
+    def get_camera_movement_manifest_step(
+            step_table: CameraMovementStepTable,
+            index: int,
+            sweep: Sweep,
+            file_prefix: str,
+            output_path: str,
+            fov_scan_enabled: bool,
+            tile_side: float,
+            room_height: float
+    ) -> dict:
+        """
+        Describe a step of a camera movement as stored in its manifest, with
+        the file path of its render and the camera placement the EXIF data of
+        the render will show. The file index is already in the table: it
+        starts over with every folder, and it is padded to the number of
+        digits of the largest index in its folder, as the render operator
+        does, or, for sampled camera movements, it is the position of the
+        step.
+
+        :param step_table: table with the steps of the camera movement.
+        :param index: position of the step in the table.
+        :param sweep: sweep of the camera movement, which lays out the folders
+        of the renders, and whose axes fill EXIF fields.
+        :param file_prefix: name of the file used for the renders.
+        :param output_path: folder where the renders will be saved to.
+        :param fov_scan_enabled: True if the camera is going to go through
+        the entire FOV, False otherwise.
+        :param tile_side: size of the side of each tile, to get the grid
+        coordinates of the camera.
+        :param room_height: height of the room, to get the Z location of the
+        camera.
+
+        :return: dictionary describing the step.
+        :rtype: dict
+        """
+
+        step = step_table[index]
+        camera_x, camera_y = step[SWEEP_LOCATION_AXIS].tolist()
+        filepath = VLIPSSimulation.get_camera_movement_file_path(
+            index=int(step["file_index"]),
+            max_index_digits=int(step["file_index_digits"]),
+            file_prefix=file_prefix,
+            output_path=output_path,
+            fov_scan_enabled=fov_scan_enabled,
+            directory=sweep.get_directory(step),
+            grid_coordinates=(int(camera_x / tile_side), int(camera_y / tile_side)))
+
+        return CameraMovementManifest.create_step(
+            index=index,
+            filepath=filepath,
+            camera_location=(camera_x, camera_y, room_height - float(step[SWEEP_DISTANCE_AXIS])),
+            **sweep.get_exif_fields(step))
+
+    @staticmethod
+    def plan_camera_movement(context: bpy.types.Context) -> CameraMovementPlan:
+        """
+        Plan the camera movement configured in the add-on settings: the table
+        with its steps, in the order they must be rendered in, see
+        `order_camera_movement_steps`. The plan is streamed into the table,
+        and the file path and manifest step of every row are composed only
+        when they are needed, so the plan keeps a row per step instead of a
+        dictionary. The labels of the camera movement are the only ones to
+        keep the path of every render, see `get_camera_movement_labels`.
+
+        :param context: Blender's current context containing the scene to be
+        rendered.
+
+        :return: plan of the camera movement.
+        :rtype: CameraMovementPlan
+        """
+
+        log.info("Plan camera movement")
+        CallTrace.log(log, "VLIPSSimulation.plan_camera_movement",
+                      context=context)
+
+        camera_movement_properties = context.window_manager.operator_properties_last(
+            SETUP_CAMERA_MOVEMENT_OPERATOR_NAME)
+        scene_properties = context.window_manager.operator_properties_last(
+            SETUP_SCENE_OPERATOR_NAME)
+        room_properties = context.window_manager.operator_properties_last(
+            SETUP_ROOM_OPERATOR_NAME)
+
+        # Sampled camera movements draw their own values, but their renders
+        # are laid out by the same sweep. Their poses are continuous, and
+        # folders and grid coordinates are truncated, so files are numbered
+        # by sample instead of starting over with every folder
+        sweep = VLIPSSimulation.get_camera_movement_sweep(context)
+        sampled = camera_movement_properties.sampling_mode != SamplingMode.GRID.value.identifier
+        step_table = VLIPSSimulation.get_camera_movement_step_table(
+            VLIPSSimulation.iter_camera_movement_plan(context),
+            sweep=sweep,
+            group_fields=() if sampled else [axis.name for axis in sweep.axes if axis.folder is not None])
+
+        # Settings are read now, so the plan doesn't change if they do later
+        file_prefix = camera_movement_properties.file_prefix
+        output_path = camera_movement_properties.output_path
+        fov_scan_enabled = camera_movement_properties.camera_movement_fov_scan_enabled
+        tile_side = scene_properties.tile_side
+        room_height = room_properties.height
+
+        def get_manifest_step(table, index):
+            return VLIPSSimulation.get_camera_movement_manifest_step(
+                step_table=table,
+                index=index,
+                sweep=sweep,
+                file_prefix=file_prefix,
+                output_path=output_path,
+                fov_scan_enabled=fov_scan_enabled,
+                tile_side=tile_side,
+                room_height=room_height)
+
+        # File paths come from the rows, so they don't depend on the order
+        order, transitions = VLIPSSimulation.order_camera_movement_steps(
+            step_table=step_table,
+            sweep=sweep)
+        plan = CameraMovementPlan(
+            sweep=sweep,
+            step_table=step_table,
+            get_manifest_step=get_manifest_step,
+            order=order,
+            transitions=transitions)
+
+        # Renders sharing a file would overwrite each other, while the
+        # manifest records all of them as completed
+        shared_file_path = plan.find_shared_file_path()
+        if shared_file_path is not None:
+            raise ValueError(f"Several steps of the camera movement would be rendered to {shared_file_path}")
+
+        return plan
+
+    @staticmethod
+    def order_camera_movement_steps(
+            step_table: CameraMovementStepTable,
+            sweep: Sweep
+    ) -> (np.ndarray, dict):
+        """
+        Order the steps of a camera movement so the axes of its sweep that are
+        expensive to change, like the distance, which rebuilds the FOV, change
+        as rarely as possible, and the cheap ones are gone through forth and
+        back. Steps are ordered from the columns of the table, so no
+        dictionary is composed per step.
+
+        :param step_table: table with the steps of the camera movement.
+        :param sweep: sweep of the camera movement, with the cost of each
+        axis.
+
+        :return: rows of the table, in the order they must be rendered in,
+        and the estimated number of expensive transitions, and the cost of
+        all of them, before and after ordering, see
+        `Sweep.compare_transitions`.
+        :rtype: (np.ndarray, dict)
+        """
+
+        log.info("Order camera movement steps")
+        CallTrace.log(log, "VLIPSSimulation.order_camera_movement_steps",
+                      step_table=step_table,
+                      sweep=sweep)
+
+        order = sweep.order_by_cost(step_table.steps)
+        transitions = sweep.compare_transitions(
+            step_table.steps, order, min_cost=SWEEP_EXPENSIVE_TRANSITION_COST)
+
+        log.info(f"Steps ordered by transition cost: {transitions['expensive_transitions_before']} expensive "
+                 f"transitions before, {transitions['expensive_transitions_after']} after (estimated cost "
+                 f"{transitions['transition_cost_before']:g} ms before, "
+                 f"{transitions['transition_cost_after']:g} ms after)")
+
+        return order, transitions
+
+    @staticmethod
+    def get_camera_movement_labels(
+            context: bpy.types.Context,
+            plan: CameraMovementPlan
+    ) -> dict:
+        """
+        Calculate where the beacon shows up in the render of every step of a
+        camera movement, for all the steps at once, from the camera and beacon
+        of the scene instead of rendering them.
+
+        :param context: Blender's current context containing the scene to be
+        rendered.
+        :param plan: plan of the camera movement. Labels have a row per step,
+        in render order.
+
+        :return: labels as columns, with a row per step.
+        :rtype: dict
+        """
+
+        log.info("Get camera movement labels")
+        CallTrace.log(log, "VLIPSSimulation.get_camera_movement_labels",
+                      context=context,
+                      plan=plan)
+
+        room_properties = context.window_manager.operator_properties_last(
+            SETUP_ROOM_OPERATOR_NAME)
+
+        # Only the intrinsics of the camera are used, so any placement does
+        _, beacon, camera = VLIPSSimulation.get_render_metadata(
+            context=context,
+            camera_location=(0, 0, 0),
+            camera_rotation=(0, 0, 0),
+            rotation_x_angle=0.0,
+            rotation_z_angle=0.0)
+
+        steps = plan.step_table[plan.order]
+        camera_locations = np.column_stack((
+            steps[SWEEP_LOCATION_AXIS],
+            room_properties.height - steps[SWEEP_DISTANCE_AXIS]))
+        labels = BeaconLabels.compute(
+            camera=camera,
+            beacon=beacon,
+            image_width=context.scene.render.resolution_x,
+            image_height=context.scene.render.resolution_y,
+            camera_locations=camera_locations,
+            rotation_x_angles=steps[SWEEP_ROTATION_X_ANGLE_AXIS],
+            rotation_z_angles=steps[SWEEP_ROTATION_Z_ANGLE_AXIS])
+
+        labels["index"] = plan.order.copy()
+        labels["filepath"] = np.array(
+            [manifest_step["filepath"] for manifest_step in plan.iter_manifest_steps()], dtype=str)
+
+        return labels
+
+    @staticmethod
+    def save_camera_movement_labels(
+            labels: dict,
+            output_path: str
+    ) -> str:
+        """
+        Save the labels of a camera movement next to its renders.
+
+        :param labels: labels as columns, as returned by
+        `get_camera_movement_labels`.
+        :param output_path: path to the folder where the labels must be saved.
+
+        :return: path to the file with the labels.
+        :rtype: str
+        """
+
+        log.info("Save camera movement labels")
+        CallTrace.log(log, "VLIPSSimulation.save_camera_movement_labels",
+                      labels=labels,
+                      output_path=output_path)
+
+        filepath = str(Path(output_path) / BeaconLabels.FILE_NAME)
+        BeaconLabels.save(filepath, labels)
+
+        return filepath
+
+    @staticmethod
+    def cull_camera_movement_steps(
+            plan: CameraMovementPlan,
+            labels: dict,
+            visibility_policy: str,
+            culling_action: str
+    ) -> (dict, int):
+        """
+        Leave out of the render the steps where the beacon isn't visible
+        enough, as predicted by their labels. File paths are kept, so renders
+        get the same names they would get without culling.
+
+        :param plan: plan of the camera movement. Culled steps are marked as
+        such, or removed from it, depending on the culling action.
+        :param labels: labels of the steps, as returned by
+        `get_camera_movement_labels`.
+        :param visibility_policy: identifier of the visibility policy.
+        :param culling_action: identifier of the culling action.
+
+        :return: labels of the steps in the plan, and the number of steps
+        culled.
+        :rtype: (dict, int)
+        """
+
+        log.info("Cull camera movement steps")
+        CallTrace.log(log, "VLIPSSimulation.cull_camera_movement_steps",
+                      plan=plan,
+                      labels=labels,
+                      visibility_policy=visibility_policy,
+                      culling_action=culling_action)
+
+        if visibility_policy == VisibilityPolicy.FULLY_VISIBLE.value.identifier:
+            visible = labels["in_image"]
+        elif visibility_policy == VisibilityPolicy.PARTIALLY_VISIBLE.value.identifier:
+            visible = labels["partially_in_image"]
+        else:
+            return labels, 0
+
+        tag = culling_action == CullingAction.TAG.value.identifier
+        culled_steps = plan.cull(visible, tag=tag)
+        log.debug("- culled_steps=%s", culled_steps)
+
+        if tag:
+            labels = dict(labels, culled=~visible)
+        else:
+            labels = BeaconLabels.select(labels, visible)
+
+        return labels, culled_steps
+
+    @staticmethod
+    def render_camera_movement_step(
+            context: bpy.types.Context,
+            sweep: Sweep,
+            camera_movement_step: dict,
+            filepath: str,
+            writer: ImageWriterPool = None,
+            tag=None,
+            render_profile: str = None
+    ):
+        """
+        Apply a step of the camera movement to the scene, an axis of its sweep
+        after the other, place the camera accordingly, and render the scene.
+
+        :param context: Blender's current context containing the scene to be
+        rendered.
+        :param sweep: sweep of the camera movement.
+        :param camera_movement_step: dictionary describing the step of the
+        camera movement, with the value of every axis of the sweep.
+        :param filepath: path to the file where the rendered scene should be
+        saved.
+        :param writer: pool the render is handed off to, so it is saved in the
+        background. Optional.
+        :param tag: value the writer returns once the render is saved. Only
+        used with a writer.
+        :param render_profile: identifier of the render profile applied while
+        rendering. Optional. If not provided, the scene's one is applied.
+        """
+
+        log.info("Render camera movement step")
+        CallTrace.log(log, "VLIPSSimulation.render_camera_movement_step",
+                      context=context,
+                      sweep=sweep,
+                      camera_movement_step=camera_movement_step,
+                      filepath=filepath,
+                      writer=writer,
+                      tag=tag,
+                      render_profile=render_profile)
+
+        camera_properties = context.window_manager.operator_properties_last(
+            SETUP_CAMERA_OPERATOR_NAME)
+
+        sweep.apply(context, camera_movement_step)
+        camera = context.scene.objects[camera_properties.name]
+
+        with VLIPSSimulation._time_stage("update_camera_pose"):
+            VLIPSSimulation.update_camera_pose(
+                context=context,
+                name=camera_properties.name,
+                make=camera_properties.make,
+                model=camera_properties.model,
+                orientation=camera_properties.orientation,
+                facing=camera_properties.facing,
+                resolution_width=camera_properties.resolution_width,
+                resolution_height=camera_properties.resolution_height,
+                focal_length=camera_properties.focal_length,
+                pixel_size=camera_properties.pixel_size,
+                beacon_distance=camera_properties.beacon_distance,
+                rotation_x_angle=camera_properties.rotation_x_angle,
+                rotation_z_angle=camera_properties.rotation_z_angle,
+                show_fov=camera_properties.show_fov,
+                x=camera.location.x,
+                y=camera.location.y)
+
+        VLIPSSimulation.render_scene(
+            context=context,
+            filepath=filepath,
+            writer=writer,
+            tag=tag,
+            render_profile=render_profile)
+
+    @staticmethod
+    def get_camera_movement_step_pose(
+            context: bpy.types.Context,
+            camera_movement_step: dict
+    ) -> ((float, float, float), (float, float, float)):
+        """
+        Calculate where the camera is placed for a step of the camera movement.
+
+        :param context: Blender's current context containing the scene to be
+        rendered.
+        :param camera_movement_step: dictionary describing the step of the
+        camera movement, with the value of every axis of its sweep.
+
+        :return: camera's location, in millimeters, and its rotation around its
+        X, Y, and Z axes, in degrees.
+        :rtype: ((float, float, float), (float, float, float))
+        """
+
+        room_properties = context.window_manager.operator_properties_last(
+            SETUP_ROOM_OPERATOR_NAME)
+
+        camera_x, camera_y = camera_movement_step[SWEEP_LOCATION_AXIS]
+        camera_location = (camera_x, camera_y, room_properties.height - camera_movement_step[SWEEP_DISTANCE_AXIS])
+        camera_rotation = (
+            DEFAULT_CAMERA_ROTATION[0] - camera_movement_step[SWEEP_ROTATION_X_ANGLE_AXIS],
+            DEFAULT_CAMERA_ROTATION[1],
+            DEFAULT_CAMERA_ROTATION[2] - camera_movement_step[SWEEP_ROTATION_Z_ANGLE_AXIS])
+
+        return camera_location, camera_rotation
+
+    @staticmethod
+    def render_camera_movement_animation(
+            context: bpy.types.Context,
+            plan: CameraMovementPlan,
+            rows: np.ndarray,
+            output_path: str,
+            step_rendered=None
+    ) -> [dict]:
+        """
+        Render several steps of a camera movement as a single animation, so
+        Blender sets the render up only once for all of them. The camera poses
+        are baked as keyframes, one frame per step, and each frame is moved to
+        the file path of its step and gets its EXIF data as soon as it is
+        written.
+
+        Only the camera is animated: the FOV and the texts shown in the
+        viewport are left as they are, and hidden from the render, since they
+        stay where they were set up while the camera moves. Axes of the sweep
+        other than the camera pose are applied once, so they must have the
+        same value in every step.
+
+        :param context: Blender's current context containing the scene to be
+        rendered.
+        :param plan: plan of the camera movement.
+        :param rows: rows of the steps to render in the table of the plan, in
+        the order they are rendered.
+        :param output_path: folder where the renders will be saved to. Frames
+        are written to a temporary folder inside it.
+        :param step_rendered: function called with the manifest step of every
+        render saved. Optional.
+
+        :return: manifest steps whose render couldn't be saved.
+        :rtype: [dict]
+        """
+
+        log.info("Render camera movement animation")
+        CallTrace.log(log, "VLIPSSimulation.render_camera_movement_animation",
+                      context=context,
+                      plan=plan,
+                      rows=rows,
+                      output_path=output_path,
+                      step_rendered=step_rendered)
+
+        if len(rows) == 0:
+            return []
+
+        scene = context.scene
+        room_properties = context.window_manager.operator_properties_last(
+            SETUP_ROOM_OPERATOR_NAME)
+        camera_properties = context.window_manager.operator_properties_last(
+            SETUP_CAMERA_OPERATOR_NAME)
+        camera = scene.objects[camera_properties.name]
+        room = scene.objects[room_properties.name]
+
+        # Frame N + 1 shows the N-th step. Manifest steps are composed as
+        # their frames are saved
+        camera_movement_steps = [plan.get_step(row) for row in rows]
+        poses = [
+            VLIPSSimulation.get_camera_movement_step_pose(
+                context=context,
+                camera_movement_step=camera_movement_step)
+            for camera_movement_step in camera_movement_steps]
+
+        # Keyframes only move the camera
+        pose_axes = (SWEEP_DISTANCE_AXIS, SWEEP_ROTATION_X_ANGLE_AXIS, SWEEP_ROTATION_Z_ANGLE_AXIS, SWEEP_LOCATION_AXIS)
+        scene_step = {
+            name: value for name, value in camera_movement_steps[0].items() if name not in pose_axes}
+        for camera_movement_step in camera_movement_steps:
+            for name, value in scene_step.items():
+                if camera_movement_step[name] != value:
+                    raise ValueError(f"Axis {name} changes along the camera movement, so it can't be animated")
+        plan.sweep.apply(context, scene_step)
+
+        Path(output_path).mkdir(parents=True, exist_ok=True)
+        frames_path = tempfile.mkdtemp(dir=output_path, prefix=".frames_")
+        VLIPSSimulation._bake_camera_poses(camera, poses)
+
+        previous_frame_start = scene.frame_start
+        previous_frame_end = scene.frame_end
+        previous_frame_step = scene.frame_step
+        previous_frame_current = scene.frame_current
+        previous_filepath = scene.render.filepath
+
+        failed_steps = []
+        saved_frames = set()
+
+        def save_frame(rendered_scene, *args):
+            frame = rendered_scene.frame_current
+            manifest_step = plan.get_manifest_step(rows[frame - 1])
+            camera_movement_step = camera_movement_steps[frame - 1]
+            camera_location, camera_rotation = poses[frame - 1]
+            filepath = manifest_step["filepath"]
+            try:
+                Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+                os.replace(rendered_scene.render.frame_path(frame=frame), filepath)
+                with VLIPSSimulation._time_stage("save_exif_data"):
+                    VLIPSSimulation.save_render_exif(
+                        context=context,
+                        filepath=filepath,
+                        camera_location=camera_location,
+                        camera_rotation=camera_rotation,
+                        **plan.sweep.get_exif_fields(camera_movement_step))
+                if step_rendered is not None:
+                    step_rendered(manifest_step)
+            except OSError as error:
+                # Exceptions raised by handlers don't reach the caller of the
+                # render, so failures are collected instead
+                log.error(f"Render {manifest_step['index']} couldn't be saved: {error}")
+                failed_steps.append(manifest_step)
+            saved_frames.add(frame)
+
+        scene_properties = context.window_manager.operator_properties_last(
+            SETUP_SCENE_OPERATOR_NAME)
+        previous_render_settings = VLIPSSimulation.apply_render_profile(context, scene_properties.render_profile)
+
+        # FOVs aren't rebuilt for every step, so, at distances farther than
+        # the one they were set up at, they would sit between the camera and
+        # the beacon
+        overlays = [
+            overlay
+            for collection_name in (CAMERA_FOV_COLLECTION_NAME, TEXT_COLLECTION_NAME)
+            if collection_name in bpy.data.collections
+            for overlay in bpy.data.collections[collection_name].all_objects]
+        previous_overlay_hide_render = [overlay.hide_render for overlay in overlays]
+
+        room.hide_render = True
+        for overlay in overlays:
+            overlay.hide_render = True
+        scene.frame_start = 1
+        scene.frame_end = len(rows)
+        scene.frame_step = 1
+        scene.render.image_settings.file_format = "JPEG"
+        scene.render.image_settings.quality = 100
+        scene.render.filepath = os.path.join(frames_path, "frame_")
+        bpy.app.handlers.render_write.append(save_frame)
+        try:
+            with VLIPSSimulation._time_stage("render_animation"):
+                bpy.ops.render.render(animation=True)
+        finally:
+            bpy.app.handlers.render_write.remove(save_frame)
+            room.hide_render = False
+            for overlay, hide_render in zip(overlays, previous_overlay_hide_render):
+                overlay.hide_render = hide_render
+            VLIPSSimulation.restore_render_settings(context, previous_render_settings)
+            scene.frame_start = previous_frame_start
+            scene.frame_end = previous_frame_end
+            scene.frame_step = previous_frame_step
+            scene.frame_set(previous_frame_current)
+            scene.render.filepath = previous_filepath
+            action = camera.animation_data.action
+            camera.animation_data_clear()
+            bpy.data.actions.remove(action)
+            shutil.rmtree(frames_path, ignore_errors=True)
+
+        # Frames never written, for example because the render was cancelled
+        failed_steps.extend(
+            plan.get_manifest_step(row) for frame, row in enumerate(rows, start=1)
+            if frame not in saved_frames)
+
+        return failed_steps
+
+    @staticmethod
+    def _bake_camera_poses(
+            camera: bpy.types.Object,
+            poses: [((float, float, float), (float, float, float))]
+    ):
+        """
+        Animate the camera through a list of poses, one per frame starting at
+        frame 1. The camera jumps from a pose to the next one, without
+        interpolating between them. Any previous animation of the camera is
+        replaced.
+
+        :param camera: camera object to animate.
+        :param poses: camera's location, in millimeters, and rotation around
+        its X, Y, and Z axes, in degrees, for every frame.
+        """
+
+        log.info("Bake camera poses")
+        CallTrace.log(log, "VLIPSSimulation._bake_camera_poses",
+                      camera=camera,
+                      poses=poses)
+
+        camera.animation_data_clear()
+        action = bpy.data.actions.new(f"{camera.name} Camera Movement")
+        camera.animation_data_create().action = action
+
+        frames = range(1, len(poses) + 1)
+        for data_path, values in (
+                ("location", [location for location, _ in poses]),
+                ("rotation_euler", [[math.radians(angle) for angle in rotation] for _, rotation in poses])):
+            for axis in range(3):
+                fcurve = action.fcurves.new(data_path, index=axis)
+                fcurve.keyframe_points.add(len(poses))
+                fcurve.keyframe_points.foreach_set(
+                    "co",
+                    [coordinate for frame, value in zip(frames, values) for coordinate in (frame, value[axis])])
+                for keyframe_point in fcurve.keyframe_points:
+                    keyframe_point.interpolation = "CONSTANT"
+                fcurve.update()
+
+    @staticmethod
+    def benchmark_render_profiles(
+            context: bpy.types.Context,
+            render_profiles: [str],
+            output_path: str
+    ) -> dict:
+        """
+        Render the same camera poses with each render profile, timing the
+        renders and comparing the region around the beacon with a reference
+        render made analytically from the camera model, which has the exact
+        geometry of the beacon.
+
+        The first render of each profile isn't timed, since it includes
+        setting the engine up, for example, compiling shaders.
+
+        :param context: Blender's current context containing the scene to be
+        rendered.
+        :param render_profiles: identifiers of the render profiles to compare.
+        :param output_path: folder where the renders will be saved to.
+
+        :return: seconds per frame and differences with the reference of every
+        profile.
+        :rtype: dict
+        """
+
+        log.info("Benchmark render profiles")
+        CallTrace.log(log, "VLIPSSimulation.benchmark_render_profiles",
+                      context=context,
+                      render_profiles=render_profiles,
+                      output_path=output_path)
+
+        scene_properties = context.window_manager.operator_properties_last(
+            SETUP_SCENE_OPERATOR_NAME)
+        render_settings = context.scene.render
+        scale = render_settings.resolution_percentage / 100
+        image_width = int(render_settings.resolution_x * scale)
+        image_height = int(render_settings.resolution_y * scale)
+        analytic_renderer = AnalyticRenderer(image_width=image_width, image_height=image_height)
+
+        sweep = VLIPSSimulation.get_camera_movement_sweep(context)
+        camera_movement_steps = [
+            VLIPSSimulation.get_pose_camera_movement_step(
+                x=x,
+                y=y,
+                distance=beacon_distance,
+                rotation_x_angle=rotation_x_angle,
+                rotation_z_angle=rotation_z_angle)
+            for x, y, beacon_distance, rotation_x_angle, rotation_z_angle in BENCHMARK_RENDER_PROFILES_POSES]
+
+        profiles = []
+        for render_profile in render_profiles:
+            profile_path = Path(output_path) / BENCHMARK_RENDER_PROFILES_FOLDER_NAME / render_profile
+            VLIPSSimulation.render_camera_movement_step(
+                context=context,
+                sweep=sweep,
+                camera_movement_step=camera_movement_steps[0],
+                filepath=str(profile_path / "warm_up.jpg"),
+                render_profile=render_profile)
+
+            steps = []
+            for index, camera_movement_step in enumerate(camera_movement_steps):
+                filepath = str(profile_path / f"{index}.jpg")
+                start_time = time.perf_counter()
+                VLIPSSimulation.render_camera_movement_step(
+                    context=context,
+                    sweep=sweep,
+                    camera_movement_step=camera_movement_step,
+                    filepath=filepath,
+                    render_profile=render_profile)
+                elapsed_time = time.perf_counter() - start_time
+
+                camera_location, camera_rotation = VLIPSSimulation.get_camera_movement_step_pose(
+                    context=context,
+                    camera_movement_step=camera_movement_step)
+                _, beacon, camera = VLIPSSimulation.get_render_metadata(
+                    context=context,
+                    camera_location=camera_location,
+                    camera_rotation=camera_rotation,
+                    **sweep.get_exif_fields(camera_movement_step))
+                camera.location = camera_location
+
+                with Image.open(filepath) as image:
+                    pixels = np.asarray(image.convert("RGB"))
+                crop = ExifReader(filepath).get_crop()
+                if crop is not None:
+                    pixels = crop.paste(pixels)
+
+                # Only the region around the beacon is compared, so the empty
+                # background doesn't hide the differences
+                region = RegionOfInterest.around_beacon(
+                    camera=camera,
+                    beacon=beacon,
+                    image_width=image_width,
+                    image_height=image_height,
+                    margin=scene_properties.region_of_interest_margin)
+                if region is None:
+                    region = RegionOfInterest(
+                        width=image_width, height=image_height, image_width=image_width, image_height=image_height)
+                rows = slice(region.y, region.y + region.height)
+                columns = slice(region.x, region.x + region.width)
+                comparison = AnalyticRenderer.compare(
+                    pixels[rows, columns],
+                    analytic_renderer.render(camera, beacon)[rows, columns])
+                comparison.update(index=index, filepath=filepath, elapsed_time=elapsed_time)
+                steps.append(comparison)
+
+            centroid_distances = [
+                step["centroid_distance"] for step in steps if step["centroid_distance"] is not None]
+            profiles.append({
+                "render_profile": render_profile,
+                "engine": RENDER_PROFILE_SETTINGS[render_profile].get("render.engine", render_settings.engine),
+                "seconds_per_frame": float(np.mean([step["elapsed_time"] for step in steps])),
+                "mean_absolute_difference": float(np.mean([step["mean_absolute_difference"] for step in steps])),
+                "min_intersection_over_union": min(step["intersection_over_union"] for step in steps),
+                "max_centroid_distance": max(centroid_distances) if centroid_distances else None,
+                "steps": steps
+            })
+            log.info(f"Render profile {render_profile}: {profiles[-1]['seconds_per_frame']:.3f} s/frame, "
+                     f"minimum IoU {profiles[-1]['min_intersection_over_union']:.4f}")
+
+        return {
+            "image_width": image_width,
+            "image_height": image_height,
+            "poses": len(camera_movement_steps),
+            "profiles": profiles
+        }
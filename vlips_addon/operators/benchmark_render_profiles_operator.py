@@ -0,0 +1,112 @@
+import json
+import logging
+from pathlib import Path
+
+import bpy
+
+from vlips_addon.modules.constants import *
+from vlips_addon.modules.render_profile import RenderProfile
+from vlips_addon.modules.vlips_simulation import VLIPSSimulation
+
+log = logging.getLogger(__name__)
+
+
+class BenchmarkRenderProfilesOperator(bpy.types.Operator):
+    """Visible Light Indoor Positioning Simulation: benchmark render profiles"""
+
+    bl_idname = BENCHMARK_RENDER_PROFILES_OPERATOR_NAME
+    bl_label = "Benchmark Render Profiles"
+    bl_options = {"REGISTER"}
+
+    render_profiles: bpy.props.EnumProperty(
+        name="Render Profiles",
+        description="Render profiles to compare",
+        options={"ENUM_FLAG"},
+        default={
+            RenderProfile.WORKBENCH_FLAT.value.identifier,
+            RenderProfile.EEVEE.value.identifier,
+            RenderProfile.CYCLES_CPU.value.identifier},
+        items=RenderProfile.to_list()
+    )
+    min_intersection_over_union: bpy.props.FloatProperty(
+        name="Minimum IoU",
+        description="Lowest intersection over union between the beacon rendered and the reference one accepted for "
+                    "a profile to be recommended",
+        default=DEFAULT_BENCHMARK_MIN_INTERSECTION_OVER_UNION,
+        min=0.0,
+        max=1.0
+    )
+
+    def execute(self, context):
+        camera_movement_properties = context.window_manager.operator_properties_last(
+            SETUP_CAMERA_MOVEMENT_OPERATOR_NAME)
+
+        if not camera_movement_properties.output_path:
+            self.report({"ERROR"}, "Output path is empty")
+            return {"CANCELLED"}
+
+        if not self.render_profiles:
+            self.report({"ERROR"}, "No render profile selected")
+            return {"CANCELLED"}
+
+        # Profiles are benchmarked in the order they are listed
+        render_profiles = [
+            identifier for identifier, _, _ in RenderProfile.to_list() if identifier in self.render_profiles]
+
+        camera_properties = context.window_manager.operator_properties_last(SETUP_CAMERA_OPERATOR_NAME)
+        beacon_distance = camera_properties.beacon_distance
+        rotation_x_angle = camera_properties.rotation_x_angle
+        rotation_z_angle = camera_properties.rotation_z_angle
+        try:
+            report = VLIPSSimulation.benchmark_render_profiles(
+                context=context,
+                render_profiles=render_profiles,
+                output_path=camera_movement_properties.output_path)
+        finally:
+            # Move the camera back to where it was before
+            camera_properties.beacon_distance = beacon_distance
+            camera_properties.rotation_x_angle = rotation_x_angle
+            camera_properties.rotation_z_angle = rotation_z_angle
+            VLIPSSimulation.setup_camera(
+                context=context,
+                name=camera_properties.name,
+                make=camera_properties.make,
+                model=camera_properties.model,
+                orientation=camera_properties.orientation,
+                facing=camera_properties.facing,
+                resolution_width=camera_properties.resolution_width,
+                resolution_height=camera_properties.resolution_height,
+                focal_length=camera_properties.focal_length,
+                pixel_size=camera_properties.pixel_size,
+                beacon_distance=beacon_distance,
+                rotation_x_angle=rotation_x_angle,
+                rotation_z_angle=rotation_z_angle,
+                show_fov=camera_properties.show_fov)
+
+        # The fastest profile whose beacon matches the reference closely enough
+        accurate_profiles = [
+            profile for profile in report["profiles"]
+            if profile["min_intersection_over_union"] >= self.min_intersection_over_union]
+        recommended_profile = min(accurate_profiles, key=lambda profile: profile["seconds_per_frame"]) \
+            if accurate_profiles else None
+        report["min_intersection_over_union"] = self.min_intersection_over_union
+        report["recommended_render_profile"] = \
+            recommended_profile["render_profile"] if recommended_profile is not None else None
+
+        report_path = Path(camera_movement_properties.output_path) / BENCHMARK_RENDER_PROFILES_REPORT_FILE_NAME
+        with open(report_path, "w") as file:
+            json.dump(report, file, indent=2)
+
+        for profile in report["profiles"]:
+            log.info(f"{profile['render_profile']}: {profile['seconds_per_frame']:.3f} s/frame, "
+                     f"mean absolute difference {profile['mean_absolute_difference']:.2f}, "
+                     f"minimum IoU {profile['min_intersection_over_union']:.4f}")
+
+        if recommended_profile is None:
+            self.report({"WARNING"}, f"No profile is accurate enough. Report saved to {report_path}")
+        else:
+            self.report(
+                {"INFO"},
+                f"Fastest accurate profile: {recommended_profile['render_profile']} "
+                f"({recommended_profile['seconds_per_frame']:.3f} s/frame). Report saved to {report_path}")
+        return {"FINISHED"}
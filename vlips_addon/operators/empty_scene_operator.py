@@ -12,5 +12,9 @@ class EmptySceneOperator(bpy.types.Operator):
     bl_options = {"REGISTER", "UNDO"}
 
     def execute(self, context):
-        VLIPSSimulation.empty_scene(context)
+        report = VLIPSSimulation.empty_scene(context)
+        self.report(
+            {"INFO"},
+            f"Removed {sum(count for kind, count in report.items() if kind != 'elapsed_time')} datablocks "
+            f"in {report['elapsed_time']:.3f} s")
         return {"FINISHED"}
@@ -3,6 +3,7 @@ import os
 from pathlib import Path
 
 import bpy
+from vlips import CallTrace, StageTimer
 
 from vlips_addon.modules.constants import *
 from vlips_addon.modules.settings import Settings
@@ -29,6 +30,7 @@ class RenderCameraFOVCornersOperator(bpy.types.Operator):
     _camera_movement_max_index_digits = None
 
     _timer = None
+    _stage_timer = None
 
     def execute(self, context):
 
@@ -101,7 +103,7 @@ class RenderCameraFOVCornersOperator(bpy.types.Operator):
                         f"{normalized_fov_name}_lower_left.jpg"
                 })
 
-        log.debug(f"- camera_movement_steps: {self._camera_movement_steps}")
+        log.debug("- camera_movement_steps: %s", self._camera_movement_steps)
 
         camera_movement_properties = context.window_manager.operator_properties_last(
             SETUP_CAMERA_MOVEMENT_OPERATOR_NAME)
@@ -113,6 +115,10 @@ class RenderCameraFOVCornersOperator(bpy.types.Operator):
         self._camera_movement_max_index_digits = VLIPSSimulation.get_camera_movement_steps_digits(
             self._camera_movement_steps)
 
+        # Time every stage of the renders
+        self._stage_timer = StageTimer()
+        VLIPSSimulation.set_stage_timer(self._stage_timer)
+
         # Prepare timer
         wm = context.window_manager
         self._timer = wm.event_timer_add(0.1, window=context.window)
@@ -141,22 +147,22 @@ class RenderCameraFOVCornersOperator(bpy.types.Operator):
         """
 
         log.info("Execute step of the operator")
-        log.debug(f"RenderCameraFOVCornersOperator.modal("
-                  f"context={context}, "
-                  f"event={event})")
+        CallTrace.log(log, "RenderCameraFOVCornersOperator.modal",
+                      context=context,
+                      event=event)
 
         if event.type == "ESC":
             self.report({"WARNING"}, "Render cancelled")
-            self._finish(context)
+            self._finish(context, cancelled=True)
             return {"CANCELLED"}
         elif event.type == "TIMER":
             camera_movement_step = self._camera_movement_steps[self._camera_movement_index]
             camera_location = camera_movement_step[CAMERA_MOVEMENT_FOV_SCAN_LOCATION_KEY]
             file_name = camera_movement_step[CAMERA_MOVEMENT_FOV_SCAN_FILE_NAME_KEY]
 
-            log.debug(f"- camera_movement_step: {camera_movement_step}")
-            log.debug(f"- camera_location: {camera_location}")
-            log.debug(f"- file_name: {file_name}")
+            log.debug("- camera_movement_step: %s", camera_movement_step)
+            log.debug("- camera_location: %s", camera_location)
+            log.debug("- file_name: %s", file_name)
 
             camera_properties = context.window_manager.operator_properties_last(
                 SETUP_CAMERA_OPERATOR_NAME)
@@ -170,9 +176,11 @@ class RenderCameraFOVCornersOperator(bpy.types.Operator):
                 render_file_name = f"{self._file_prefix}_{file_number}_{file_name}"
             file_path = os.path.join(self._output_path, render_file_name)
 
-            log.debug(f"- file_path: {file_path}")
+            log.debug("- file_path: %s", file_path)
 
-            VLIPSSimulation.render_scene(context=context, filepath=file_path)
+            with self._stage_timer.stage("modal_step"):
+                VLIPSSimulation.render_scene(context=context, filepath=file_path)
+            self._stage_timer.count_renders()
 
             text_info = f"Render {self._camera_movement_index + 1}/{self._camera_movement_max_index} " \
                         f"saved to {file_path}"
@@ -187,22 +195,36 @@ class RenderCameraFOVCornersOperator(bpy.types.Operator):
 
         return {"PASS_THROUGH"}
 
-    def _finish(self, context):
+    def _finish(self, context, cancelled: bool = False):
         """
         Stop the current modal operator with timer.
 
         :param context: Blender's current context.
+        :param cancelled: True if the render was cancelled before the last
+        step.
         """
 
         log.info("Finish modal operator")
-        log.debug(f"RenderCameraFOVCornersOperator._finish("
-                  f"context={context})")
+        CallTrace.log(log, "RenderCameraFOVCornersOperator._finish",
+                      context=context,
+                      cancelled=cancelled)
 
         wm = context.window_manager
         wm.event_timer_remove(self._timer)
+        VLIPSSimulation.set_stage_timer(None)
         self._restore_camera_status(context)
         context.workspace.status_text_set(None)
 
+        # Save the time spent in each stage next to the settings
+        report_path = Path(self._output_path) / StageTimer.REPORT_FILE_NAME
+        try:
+            self._stage_timer.save_report(
+                report_path,
+                pending=self._camera_movement_max_index,
+                cancelled=cancelled)
+        except OSError as error:
+            log.error(f"Timing report couldn't be saved to {report_path}: {error}")
+
     def _save_camera_status(self, context: bpy.types.Context):
         """
         Save camera properties so they can be restored them.
@@ -211,8 +233,8 @@ class RenderCameraFOVCornersOperator(bpy.types.Operator):
         """
 
         log.info("Save camera status")
-        log.debug(f"RenderCameraFOVCornersOperator._save_camera_status("
-                  f"context={context})")
+        CallTrace.log(log, "RenderCameraFOVCornersOperator._save_camera_status",
+                      context=context)
 
         camera_properties = context.window_manager.operator_properties_last(SETUP_CAMERA_OPERATOR_NAME)
         camera = context.scene.objects[camera_properties.name]
@@ -226,8 +248,8 @@ class RenderCameraFOVCornersOperator(bpy.types.Operator):
         """
 
         log.info("Restore camera status")
-        log.debug(f"RenderCameraFOVCornersOperator._restore_camera_status("
-                  f"context={context})")
+        CallTrace.log(log, "RenderCameraFOVCornersOperator._restore_camera_status",
+                      context=context)
 
         camera_properties = context.window_manager.operator_properties_last(SETUP_CAMERA_OPERATOR_NAME)
         camera = context.scene.objects[camera_properties.name]
@@ -1,10 +1,12 @@
+import itertools
 import logging
 from pathlib import Path
 
 import bpy
-from numpy import arange
+import numpy as np
+from vlips import CallTrace, CameraMovementManifest, ImageWriterPool, StageTimer
 
-from vlips_addon.modules.camera_movement import CameraMovement
+from vlips_addon.modules.camera_movement_render_mode import CameraMovementRenderMode
 from vlips_addon.modules.constants import *
 from vlips_addon.modules.settings import Settings
 from vlips_addon.modules.vlips_simulation import VLIPSSimulation
@@ -27,19 +29,19 @@ class RenderCameraMovementOperator(bpy.types.Operator):
     _camera_properties_beacon_distance = None
     _camera_properties_rotation_x_angle = None
     _camera_properties_rotation_z_angle = None
-    _previous_beacon_distance = None
-    _previous_rotation_x_angle = None
-    _previous_rotation_z_angle = None
 
-    _camera_movement_steps = None
+    _camera_movement_plan = None
+    _camera_movement_pending_rows = None
+    _camera_movement_next_row = None
     _camera_movement_index = None
-    _camera_movement_file_index = None
-    _camera_movement_max_file_index_digits = None
+    _camera_movement_manifest = None
+    _image_writer_pool = None
+    _failures = None
+    _stage_timer = None
 
     _file_prefix = None
     _output_path = None
     _camera_movement_max_index = None
-    _camera_movement_max_index_digits = None
 
     _timer = None
 
@@ -55,141 +57,74 @@ class RenderCameraMovementOperator(bpy.types.Operator):
         self._camera_movement_rotation_z_angle_enabled = \
             camera_movement_properties.camera_movement_rotation_z_angle_enabled
 
-        if not self._camera_movement_fov_scan_enabled and \
-                not self._camera_movement_beacon_distance_enabled and \
-                not self._camera_movement_rotation_x_angle_enabled and \
-                not self._camera_movement_rotation_z_angle_enabled:
-            self.report({"ERROR"}, "No camera movement selected")
-            return {"CANCELLED"}
-
         if not camera_movement_properties.output_path:
             self.report({"ERROR"}, "Output path is empty")
             return {"CANCELLED"}
 
         self._save_camera_status(context)
 
-        if self._camera_movement_beacon_distance_enabled:
-            camera_movement_beacon_distance_properties = context.window_manager.operator_properties_last(
-                SETUP_CAMERA_MOVEMENT_DISTANCE_OPERATOR_NAME)
-            if camera_movement_beacon_distance_properties.camera_beacon_distance_step == 0:
-                self.report({"ERROR"}, "Distance step cannot be zero")
-                return {"CANCELLED"}
-            camera_movement_beacon_distance_steps = VLIPSSimulation.get_camera_movement_steps(
-                context=context,
-                camera_movement=CameraMovement.BEACON_DISTANCE)
-        else:
-            camera_movement_beacon_distance_steps = [self._camera_properties_beacon_distance]
-
-        if self._camera_movement_rotation_x_angle_enabled:
-            camera_movement_rotation_x_angle_properties = context.window_manager.operator_properties_last(
-                SETUP_CAMERA_MOVEMENT_ROTATION_X_ANGLE_OPERATOR_NAME)
-            if camera_movement_rotation_x_angle_properties.camera_rotation_x_angle_step == 0:
-                self.report({"ERROR"}, "Rotation X angle step cannot be zero")
-                return {"CANCELLED"}
-            camera_movement_rotation_x_angle_steps = VLIPSSimulation.get_camera_movement_steps(
-                context=context,
-                camera_movement=CameraMovement.ROTATION_X_ANGLE)
-        else:
-            camera_movement_rotation_x_angle_steps = [self._camera_properties_rotation_x_angle]
-
-        if self._camera_movement_rotation_z_angle_enabled:
-            camera_movement_rotation_z_angle_properties = context.window_manager.operator_properties_last(
-                SETUP_CAMERA_MOVEMENT_ROTATION_Z_ANGLE_OPERATOR_NAME)
-            if camera_movement_rotation_z_angle_properties.camera_rotation_z_angle_step == 0:
-                self.report({"ERROR"}, "Horizontal rotation angle step cannot be zero")
-                return {"CANCELLED"}
-            camera_movement_rotation_z_angle_steps = VLIPSSimulation.get_camera_movement_steps(
-                context=context,
-                camera_movement=CameraMovement.ROTATION_Z_ANGLE)
-        else:
-            camera_movement_rotation_z_angle_steps = [self._camera_properties_rotation_z_angle]
-
         # Reset the index
         self._camera_movement_index = 0
 
-        self._camera_movement_steps = []
-        # Prepare all the combinations of camera placement in the FOV grid
-
-        scene_properties = context.window_manager.operator_properties_last(
-            SETUP_SCENE_OPERATOR_NAME)
-        tile_side = scene_properties.tile_side
-
-        camera_properties = context.window_manager.operator_properties_last(
-            SETUP_CAMERA_OPERATOR_NAME)
-
-        camera_name = camera_properties.name
-        camera = context.scene.objects[camera_name]
-        camera_fov_name = CAMERA_FOV_EVEN_TILES_NAME
-
-        for beacon_distance in camera_movement_beacon_distance_steps:
-            for rotation_x_angle in camera_movement_rotation_x_angle_steps:
-                for rotation_z_angle in camera_movement_rotation_z_angle_steps:
-
-                    # Move camera to distance, so FOV gets update
-                    if self._camera_movement_fov_scan_enabled:
-                        VLIPSSimulation.setup_camera(
-                            context=context,
-                            name=camera_properties.name,
-                            make=camera_properties.make,
-                            model=camera_properties.model,
-                            orientation=camera_properties.orientation,
-                            facing=camera_properties.facing,
-                            resolution_width=camera_properties.resolution_width,
-                            resolution_height=camera_properties.resolution_height,
-                            focal_length=camera_properties.focal_length,
-                            pixel_size=camera_properties.pixel_size,
-                            beacon_distance=beacon_distance,
-                            rotation_x_angle=rotation_x_angle,
-                            rotation_z_angle=rotation_z_angle,
-                            show_fov=camera_properties.show_fov)
-
-                        # bpy.context.view_layer.update()
-                        context.view_layer.update()
-
-                        camera_fov = context.scene.objects[camera_fov_name]
-                        camera_fov_width = camera_fov.dimensions[0]
-                        camera_fov_height = camera_fov.dimensions[1]
-
-                        range_start = -camera_fov_width / 2
-                        range_stop = camera_fov_width / 2
-                        range_step = tile_side
-                        range_x = arange(range_start, range_stop + tile_side, range_step)
-
-                        range_start = camera_fov_height / 2
-                        range_stop = -camera_fov_height / 2
-                        range_step = -tile_side
-                        range_y = arange(range_start, range_stop - tile_side, range_step)
-                    else:
-                        range_x = [camera.location[0]]
-                        range_y = [camera.location[1]]
-
-                    for y in range_y:
-                        for x in range_x:
-                            camera_location = (x, y, beacon_distance)
-                            fov_grid_coordinates = int(x / tile_side), int(y / tile_side)
-                            self._camera_movement_steps.append({
-                                CameraMovement.FOV_SCAN.value: camera_location,
-                                CAMERA_MOVEMENT_FOV_GRID_COORDINATES: fov_grid_coordinates,
-                                CAMERA_MOVEMENT_BEACON_DISTANCE: beacon_distance,
-                                CAMERA_MOVEMENT_ROTATION_X_ANGLE: rotation_x_angle,
-                                CAMERA_MOVEMENT_ROTATION_Z_ANGLE: rotation_z_angle
-                            })
-
-        self._restore_camera_status(context)
-
         # Recover the data needed to perform this task
         self._file_prefix = camera_movement_properties.file_prefix
         self._output_path = camera_movement_properties.output_path
 
-        # Prepare the file suffix
-        self._camera_movement_max_index = len(self._camera_movement_steps)
-        self._camera_movement_max_index_digits = VLIPSSimulation.get_camera_movement_steps_digits(
-            self._camera_movement_steps)
+        # Time every stage of the sweep, planning included
+        self._stage_timer = StageTimer()
 
-        # Prepare timer
-        wm = context.window_manager
-        self._timer = wm.event_timer_add(0.1, window=context.window)
-        wm.modal_handler_add(self)
+        # Write down every step before rendering, so the render can be resumed
+        # if it is interrupted
+        try:
+            with self._stage_timer.stage("plan"):
+                self._camera_movement_plan = VLIPSSimulation.plan_camera_movement(context)
+        except ValueError as error:
+            self.report({"ERROR"}, str(error))
+            return {"CANCELLED"}
+        transitions = self._camera_movement_plan.transitions
+        self.report(
+            {"INFO"},
+            f"Steps ordered by transition cost: {transitions['expensive_transitions_before']} expensive "
+            f"transitions before, {transitions['expensive_transitions_after']} after")
+
+        with self._stage_timer.stage("labels"):
+            labels = VLIPSSimulation.get_camera_movement_labels(
+                context=context,
+                plan=self._camera_movement_plan)
+
+            # Steps where the beacon won't be visible enough aren't rendered
+            labels, culled_steps = VLIPSSimulation.cull_camera_movement_steps(
+                plan=self._camera_movement_plan,
+                labels=labels,
+                visibility_policy=camera_movement_properties.visibility_policy,
+                culling_action=camera_movement_properties.culling_action)
+        if culled_steps > 0:
+            self.report({"INFO"}, f"{culled_steps} steps culled by visibility, renders saved")
+
+        with self._stage_timer.stage("manifest"):
+            self._camera_movement_manifest = CameraMovementManifest(self._output_path)
+            self._camera_movement_manifest.write(self._camera_movement_plan.iter_manifest_steps())
+            VLIPSSimulation.save_camera_movement_labels(
+                labels=labels,
+                output_path=self._output_path)
+
+            # Renders already saved are looked for as the steps are rendered,
+            # so resuming doesn't check every step before the first render
+            renderable_rows = self._camera_movement_plan.get_renderable_rows()
+            if camera_movement_properties.camera_movement_resume_enabled:
+                self._camera_movement_pending_rows = self._camera_movement_plan.iter_pending_rows(
+                    manifest=self._camera_movement_manifest,
+                    rows=renderable_rows)
+            else:
+                self._camera_movement_pending_rows = iter(renderable_rows)
+
+        with self._stage_timer.stage("pending"):
+            self._camera_movement_next_row = next(self._camera_movement_pending_rows, None)
+        if self._camera_movement_next_row is None:
+            self.report({"INFO"}, "Every step is already rendered")
+            return {"FINISHED"}
+
+        self._camera_movement_max_index = len(renderable_rows)
 
         filepath = Path(self._output_path)
 
@@ -203,6 +138,48 @@ class RenderCameraMovementOperator(bpy.types.Operator):
             context=context,
             filepath=settings_filepath)
 
+        # Render every step at once, as frames of an animation
+        if camera_movement_properties.render_mode == CameraMovementRenderMode.ANIMATION.value.identifier:
+            # Every frame is set up before rendering, so every pending step
+            # is needed at once
+            with self._stage_timer.stage("pending"):
+                rows = np.fromiter(
+                    itertools.chain([self._camera_movement_next_row], self._camera_movement_pending_rows),
+                    dtype=np.int64)
+            self._report_skipped_steps(len(rows))
+            self._camera_movement_index = len(rows)
+
+            VLIPSSimulation.set_stage_timer(self._stage_timer)
+            try:
+                failed_steps = VLIPSSimulation.render_camera_movement_animation(
+                    context=context,
+                    plan=self._camera_movement_plan,
+                    rows=rows,
+                    output_path=self._output_path,
+                    step_rendered=self._camera_movement_manifest.record_completion)
+            finally:
+                VLIPSSimulation.set_stage_timer(None)
+            self._stage_timer.count_renders(len(rows) - len(failed_steps))
+            self._restore_camera_status(context)
+            self._save_timing_report(cancelled=False, failed=len(failed_steps))
+
+            if failed_steps:
+                self.report({"ERROR"}, f"{len(failed_steps)} renders couldn't be saved")
+                return {"CANCELLED"}
+
+            self.report({"INFO"}, "Render finished")
+            return {"FINISHED"}
+
+        # Renders are saved in the background while the next ones are made
+        self._image_writer_pool = ImageWriterPool(stage_timer=self._stage_timer)
+        self._failures = []
+        VLIPSSimulation.set_stage_timer(self._stage_timer)
+
+        # Prepare timer
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+
         return {"RUNNING_MODAL"}
 
     def modal(self, context, event):
@@ -214,122 +191,144 @@ class RenderCameraMovementOperator(bpy.types.Operator):
         """
 
         log.info("Execute step of the operator")
-        log.debug(f"RenderCameraFOVCornersOperator.modal("
-                  f"context={context}, "
-                  f"event={event})")
+        CallTrace.log(log, "RenderCameraFOVCornersOperator.modal",
+                      context=context,
+                      event=event)
 
         if event.type == "ESC":
+            self._finish(context, cancelled=True)
             self.report({"WARNING"}, "Render cancelled")
-            self._finish(context)
+            self._report_failures()
             return {"CANCELLED"}
         elif event.type == "TIMER":
             # Move a step and render the scene
-            camera_properties = context.window_manager.operator_properties_last(
-                SETUP_CAMERA_OPERATOR_NAME)
-
-            camera_movement_step = self._camera_movement_steps[self._camera_movement_index]
-
-            camera_x = camera_movement_step[CameraMovement.FOV_SCAN.value][0]
-            camera_y = camera_movement_step[CameraMovement.FOV_SCAN.value][1]
-            beacon_distance = camera_movement_step[CAMERA_MOVEMENT_BEACON_DISTANCE]
-            rotation_x_angle = camera_movement_step[CAMERA_MOVEMENT_ROTATION_X_ANGLE]
-            rotation_z_angle = camera_movement_step[CAMERA_MOVEMENT_ROTATION_Z_ANGLE]
-
-            camera_properties.beacon_distance = beacon_distance
-            camera_properties.rotation_x_angle = rotation_x_angle
-            camera_properties.rotation_z_angle = rotation_z_angle
-
-            log.debug(f"- camera_movement_step: {camera_movement_step}")
-            log.debug(f"- camera_x: {camera_x}")
-            log.debug(f"- camera_y: {camera_y}")
-            log.debug(f"- beacon_distance: {beacon_distance}")
-            log.debug(f"- rotation_x_angle: {rotation_x_angle}")
-            log.debug(f"- rotation_z_angle: {rotation_z_angle}")
-
-            VLIPSSimulation.setup_camera(
-                context=context,
-                name=camera_properties.name,
-                make=camera_properties.make,
-                model=camera_properties.model,
-                orientation=camera_properties.orientation,
-                facing=camera_properties.facing,
-                resolution_width=camera_properties.resolution_width,
-                resolution_height=camera_properties.resolution_height,
-                focal_length=camera_properties.focal_length,
-                pixel_size=camera_properties.pixel_size,
-                beacon_distance=camera_properties.beacon_distance,
-                rotation_x_angle=camera_properties.rotation_x_angle,
-                rotation_z_angle=camera_properties.rotation_z_angle,
-                show_fov=camera_properties.show_fov,
-                x=camera_x,
-                y=camera_y)
-
-            if camera_properties.beacon_distance != self._previous_beacon_distance or \
-                    camera_properties.rotation_x_angle != self._previous_rotation_x_angle or \
-                    camera_properties.rotation_z_angle != self._previous_rotation_z_angle:
-                self._previous_beacon_distance = camera_properties.beacon_distance
-                self._previous_rotation_x_angle = camera_properties.rotation_x_angle
-                self._previous_rotation_z_angle = camera_properties.rotation_z_angle
-                self._camera_movement_file_index = 0
-                filtered_camera_movements = list(filter(
-                    lambda step:
-                    step[
-                        CAMERA_MOVEMENT_BEACON_DISTANCE] == camera_properties.beacon_distance and
-                    step[
-                        CAMERA_MOVEMENT_ROTATION_X_ANGLE] == camera_properties.rotation_x_angle and
-                    step[
-                        CAMERA_MOVEMENT_ROTATION_Z_ANGLE] == camera_properties.rotation_z_angle,
-                    self._camera_movement_steps))
-                camera_movement_max_file_index_digits = VLIPSSimulation.get_camera_movement_steps_digits(
-                    filtered_camera_movements)
-                self._camera_movement_max_file_index_digits = camera_movement_max_file_index_digits
-            else:
-                self._camera_movement_file_index += 1
-
-            filepath = VLIPSSimulation.get_camera_movement_file_path(
-                index=self._camera_movement_file_index,
-                max_index_digits=self._camera_movement_max_file_index_digits,
-                file_prefix=self._file_prefix,
-                output_path=self._output_path,
-                fov_scan_enabled=self._camera_movement_fov_scan_enabled,
-                beacon_distance_enabled=self._camera_movement_beacon_distance_enabled,
-                rotation_x_angle_enabled=self._camera_movement_rotation_x_angle_enabled,
-                rotation_z_angle_enabled=self._camera_movement_rotation_z_angle_enabled,
-                camera_movement_step=camera_movement_step)
-
-            log.debug(f"- filepath: {filepath}")
-
-            VLIPSSimulation.render_scene(context, filepath)
+            row = self._camera_movement_next_row
+            manifest_step = self._camera_movement_plan.get_manifest_step(row)
+            camera_movement_step = self._camera_movement_plan.get_step(row)
+            filepath = manifest_step["filepath"]
+
+            log.debug("- camera_movement_step: %s", camera_movement_step)
+            log.debug("- filepath: %s", filepath)
+
+            with self._stage_timer.stage("modal_step"):
+                VLIPSSimulation.render_camera_movement_step(
+                    context=context,
+                    sweep=self._camera_movement_plan.sweep,
+                    camera_movement_step=camera_movement_step,
+                    filepath=filepath,
+                    writer=self._image_writer_pool,
+                    tag=manifest_step)
+                self._collect_saved_steps()
 
             text_info = f"Render {self._camera_movement_index + 1}/{self._camera_movement_max_index} " \
-                        f"saved to {filepath}"
+                        f"rendered to {filepath}"
             text_cancel = "ESC to cancel"
             context.workspace.status_text_set(f"{text_info} ({text_cancel})")
 
             self._camera_movement_index += 1
-            if self._camera_movement_index == self._camera_movement_max_index:
-                self.report({"INFO"}, "Render finished")
+            with self._stage_timer.stage("pending"):
+                self._camera_movement_next_row = next(self._camera_movement_pending_rows, None)
+            if self._camera_movement_next_row is None:
                 self._finish(context)
+                self._report_skipped_steps(self._camera_movement_index)
+                if self._report_failures():
+                    return {"CANCELLED"}
+                self.report({"INFO"}, "Render finished")
                 return {"FINISHED"}
 
         return {"PASS_THROUGH"}
 
-    def _finish(self, context):
+    def _finish(self, context, cancelled: bool = False):
         """
         Finish the current modal operator with timer.
 
         :param context: Blender's current context.
+        :param cancelled: True if the render was cancelled before the last
+        step.
         """
 
         log.info("Stop modal operator")
-        log.debug(f"RenderCameraMovementOperator._finish("
-                  f"context={context})")
+        CallTrace.log(log, "RenderCameraMovementOperator._finish",
+                      context=context,
+                      cancelled=cancelled)
 
         wm = context.window_manager
         wm.event_timer_remove(self._timer)
+
+        # Wait for the renders still being saved
+        self._image_writer_pool.close()
+        self._collect_saved_steps()
+
+        VLIPSSimulation.set_stage_timer(None)
         self._restore_camera_status(context)
         context.workspace.status_text_set(None)
 
+        self._save_timing_report(cancelled=cancelled, failed=len(self._failures))
+
+    def _save_timing_report(self, cancelled: bool, failed: int):
+        """
+        Save the time spent in each stage of the render next to the settings.
+
+        :param cancelled: True if the render was cancelled before the last
+        step.
+        :param failed: number of renders that couldn't be saved.
+        """
+
+        report_path = Path(self._output_path) / StageTimer.REPORT_FILE_NAME
+        try:
+            report = self._stage_timer.save_report(
+                report_path,
+                pending=self._camera_movement_index,
+                failed=failed,
+                cancelled=cancelled,
+                **self._camera_movement_plan.transitions)
+        except OSError as error:
+            log.error(f"Timing report couldn't be saved to {report_path}: {error}")
+            return
+
+        log.info(f"Timing report saved to {report_path}: {report['renders_per_second']:.2f} renders/s")
+
+    def _collect_saved_steps(self):
+        """
+        Log the renders saved in the background to the manifest, and keep the
+        ones that couldn't be saved.
+        """
+
+        saved_steps, failures = self._image_writer_pool.collect()
+        for manifest_step in saved_steps:
+            self._camera_movement_manifest.record_completion(manifest_step)
+        self._stage_timer.count_renders(len(saved_steps))
+        self._failures.extend(failures)
+
+    def _report_skipped_steps(self, rendered_steps: int):
+        """
+        Report the steps skipped because their render was already saved.
+
+        :param rendered_steps: number of steps rendered, or to render, once
+        every pending step has been found.
+        """
+
+        skipped_steps = self._camera_movement_max_index - rendered_steps
+        if skipped_steps > 0:
+            self.report({"INFO"}, f"{skipped_steps} steps already rendered, skipped")
+
+    def _report_failures(self) -> bool:
+        """
+        Report the renders that couldn't be saved.
+
+        :return: True if any render couldn't be saved.
+        :rtype: bool
+        """
+
+        if not self._failures:
+            return False
+
+        manifest_step, error = self._failures[0]
+        self.report(
+            {"ERROR"},
+            f"{len(self._failures)} renders couldn't be saved. {manifest_step['filepath']}: {error}")
+        return True
+
     def _save_camera_status(self, context: bpy.types.Context):
         """
         Save camera properties so they can be restored them.
@@ -338,8 +337,8 @@ class RenderCameraMovementOperator(bpy.types.Operator):
         """
 
         log.info("Save camera status")
-        log.debug(f"RenderCameraMovementOperator._save_camera_status("
-                  f"context={context})")
+        CallTrace.log(log, "RenderCameraMovementOperator._save_camera_status",
+                      context=context)
 
         camera_properties = context.window_manager.operator_properties_last(SETUP_CAMERA_OPERATOR_NAME)
         self._camera_properties_beacon_distance = camera_properties.beacon_distance
@@ -354,8 +353,8 @@ class RenderCameraMovementOperator(bpy.types.Operator):
         """
 
         log.info("Restore camera status")
-        log.debug(f"RenderCameraMovementOperator._restore_camera_status("
-                  f"context={context})")
+        CallTrace.log(log, "RenderCameraMovementOperator._restore_camera_status",
+                      context=context)
 
         camera_properties = context.window_manager.operator_properties_last(SETUP_CAMERA_OPERATOR_NAME)
 
@@ -1,6 +1,10 @@
 import bpy
 
+from vlips_addon.modules.camera_movement_render_mode import CameraMovementRenderMode
 from vlips_addon.modules.constants import *
+from vlips_addon.modules.culling_action import CullingAction
+from vlips_addon.modules.sampling_mode import SamplingMode
+from vlips_addon.modules.visibility_policy import VisibilityPolicy
 
 
 class SetupCameraMovementOperator(bpy.types.Operator):
@@ -30,6 +34,48 @@ class SetupCameraMovementOperator(bpy.types.Operator):
         description="The camera's rotation Z angle (yaw) will change",
         default=DEFAULT_CAMERA_MOVEMENT_ROTATION_Z_ANGLE_ENABLED
     )
+    camera_movement_resume_enabled: bpy.props.BoolProperty(
+        name="Resume",
+        description="Skip the steps already rendered to the output path with the same camera placement",
+        default=DEFAULT_CAMERA_MOVEMENT_RESUME_ENABLED
+    )
+    sampling_mode: bpy.props.EnumProperty(
+        name="Sampling",
+        description="How the poses of the camera are chosen inside the limits of the enabled movements",
+        default=DEFAULT_CAMERA_MOVEMENT_SAMPLING_MODE,
+        items=SamplingMode.to_list()
+    )
+    sample_count: bpy.props.IntProperty(
+        name="Samples",
+        description="Number of poses drawn, if the sampling isn't a grid",
+        default=DEFAULT_CAMERA_MOVEMENT_SAMPLE_COUNT,
+        min=MIN_CAMERA_MOVEMENT_SAMPLE_COUNT,
+        max=MAX_CAMERA_MOVEMENT_SAMPLE_COUNT
+    )
+    sampling_seed: bpy.props.IntProperty(
+        name="Seed",
+        description="Seed of the sampling. The same seed always draws the same poses",
+        default=DEFAULT_CAMERA_MOVEMENT_SAMPLING_SEED,
+        min=0
+    )
+    render_mode: bpy.props.EnumProperty(
+        name="Render Mode",
+        description="How the steps of the camera movement are rendered",
+        default=DEFAULT_CAMERA_MOVEMENT_RENDER_MODE,
+        items=CameraMovementRenderMode.to_list()
+    )
+    visibility_policy: bpy.props.EnumProperty(
+        name="Visibility",
+        description="Steps rendered, depending on how much of the beacon is inside the image",
+        default=DEFAULT_CAMERA_MOVEMENT_VISIBILITY_POLICY,
+        items=VisibilityPolicy.to_list()
+    )
+    culling_action: bpy.props.EnumProperty(
+        name="Culled Steps",
+        description="What to do with the steps not rendered because of their visibility",
+        default=DEFAULT_CAMERA_MOVEMENT_CULLING_ACTION,
+        items=CullingAction.to_list()
+    )
     output_path: bpy.props.StringProperty(
         name="Output Path",
         description="Path where the renders will be saved to (JPEG)",
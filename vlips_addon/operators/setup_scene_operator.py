@@ -1,6 +1,8 @@
 import bpy
 
 from vlips_addon.modules.constants import *
+from vlips_addon.modules.region_of_interest_mode import RegionOfInterestMode
+from vlips_addon.modules.render_profile import RenderProfile
 from vlips_addon.modules.vlips_simulation import VLIPSSimulation
 
 
@@ -26,6 +28,26 @@ class SetupSceneOperator(bpy.types.Operator):
         min=MIN_FLOOR_SIDE_TILES,
         soft_max=MAX_FLOOR_SIDE_TILES
     )
+    render_profile: bpy.props.EnumProperty(
+        name="Render Profile",
+        description="Render engine and settings applied before every render",
+        default=DEFAULT_RENDER_PROFILE,
+        items=RenderProfile.to_list()
+    )
+    region_of_interest_mode: bpy.props.EnumProperty(
+        name="Region of Interest",
+        description="Whether renders are limited to the region where the beacon shows up",
+        default=DEFAULT_REGION_OF_INTEREST_MODE,
+        items=RegionOfInterestMode.to_list()
+    )
+    region_of_interest_margin: bpy.props.IntProperty(
+        name="Region of Interest Margin",
+        description="Pixels rendered around the beacon when renders are limited to its region",
+        subtype="PIXEL",
+        default=DEFAULT_REGION_OF_INTEREST_MARGIN,
+        min=MIN_REGION_OF_INTEREST_MARGIN,
+        soft_max=MAX_REGION_OF_INTEREST_MARGIN
+    )
 
     def execute(self, context):
         VLIPSSimulation.setup_scene(
@@ -30,3 +30,8 @@ class VIEW3D_PT_render(bpy.types.Panel):
             text="FOV Corners",
             icon="SHADING_BBOX"
         )
+        column.operator(
+            BENCHMARK_RENDER_PROFILES_OPERATOR_NAME,
+            text="Benchmark Profiles",
+            icon="TIME"
+        )
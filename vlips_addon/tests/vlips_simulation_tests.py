@@ -0,0 +1,147 @@
+# Tests of the add-on that need Blender. The add-on must be installed in
+# Blender. Run them with:
+#
+# blender -b --python-exit-code 1 --python vlips_addon/tests/vlips_simulation_tests.py
+#
+# Outside of Blender, they are skipped.
+
+import sys
+import unittest
+
+try:
+    import addon_utils
+    import bpy
+except ImportError:
+    bpy = None
+
+
+@unittest.skipIf(bpy is None, "Blender is needed")
+class TestVLIPSSimulation(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        addon_utils.enable("vlips_addon", default_set=False)
+
+    def setUp(self):
+        from vlips_addon.modules.vlips_simulation import VLIPSSimulation
+
+        self.context = bpy.context
+        VLIPSSimulation.empty_scene(self.context)
+        VLIPSSimulation.create_scene(self.context)
+
+    @staticmethod
+    def count_datablocks() -> dict:
+        return {
+            "objects": len(bpy.data.objects),
+            "meshes": len(bpy.data.meshes),
+            "materials": len(bpy.data.materials),
+            "curves": len(bpy.data.curves)
+        }
+
+    def setup_camera(self, beacon_distance, show_fov=True):
+        from vlips_addon.modules.constants import SETUP_CAMERA_OPERATOR_NAME
+        from vlips_addon.modules.vlips_simulation import VLIPSSimulation
+
+        camera_properties = self.context.window_manager.operator_properties_last(SETUP_CAMERA_OPERATOR_NAME)
+        VLIPSSimulation.setup_camera(
+            context=self.context,
+            name=camera_properties.name,
+            make=camera_properties.make,
+            model=camera_properties.model,
+            orientation=camera_properties.orientation,
+            facing=camera_properties.facing,
+            resolution_width=camera_properties.resolution_width,
+            resolution_height=camera_properties.resolution_height,
+            focal_length=camera_properties.focal_length,
+            pixel_size=camera_properties.pixel_size,
+            beacon_distance=beacon_distance,
+            rotation_x_angle=camera_properties.rotation_x_angle,
+            rotation_z_angle=camera_properties.rotation_z_angle,
+            show_fov=show_fov)
+
+    def test_setup_camera_keeps_datablock_counts(self):
+        self.setup_camera(beacon_distance=1000)
+        datablock_counts = self.count_datablocks()
+
+        # Distances change the FOVs, including the subdivisions of their grid
+        for index in range(1000):
+            self.setup_camera(beacon_distance=500 + index % 1500, show_fov=index % 2 == 0)
+
+        self.assertEqual(
+            datablock_counts, self.count_datablocks(),
+            "Setting the camera up again shouldn't create datablocks")
+
+    def test_fov_without_tiles_is_a_single_face(self):
+        from vlips_addon.modules.constants import CAMERA_FOV_EVEN_TILES_NAME
+        from vlips_addon.modules.vlips_simulation import VLIPSSimulation
+        from vlips import CameraFOV
+
+        # Not even a whole tile fits in the FOV this close to the beacon
+        beacon_distance = 150
+        camera_fov = CameraFOV(
+            beacon_distance=beacon_distance, **VLIPSSimulation.get_camera_fov_inputs(self.context))
+        self.assertEqual((0, 0), (camera_fov.width_in_tiles, camera_fov.height_in_tiles))
+
+        self.setup_camera(beacon_distance=beacon_distance)
+
+        fov = self.context.scene.objects[CAMERA_FOV_EVEN_TILES_NAME]
+        self.assertEqual(1, len(fov.data.polygons), "FOV without tiles should be a single face")
+
+    def test_sampled_camera_movement_files_are_unique(self):
+        from vlips_addon.modules.constants import SETUP_CAMERA_MOVEMENT_OPERATOR_NAME
+        from vlips_addon.modules.sampling_mode import SamplingMode
+        from vlips_addon.modules.vlips_simulation import VLIPSSimulation
+
+        self.setup_camera(beacon_distance=1000)
+        camera_movement_properties = self.context.window_manager.operator_properties_last(
+            SETUP_CAMERA_MOVEMENT_OPERATOR_NAME)
+        camera_movement_properties.camera_movement_fov_scan_enabled = True
+        camera_movement_properties.camera_movement_beacon_distance_enabled = False
+        camera_movement_properties.camera_movement_rotation_x_angle_enabled = True
+        camera_movement_properties.camera_movement_rotation_z_angle_enabled = False
+        camera_movement_properties.camera_rotation_x_angle_start = -45
+        camera_movement_properties.camera_rotation_x_angle_end = 45
+        camera_movement_properties.sample_count = 100
+
+        # Poses drawn close to each other share folders and grid coordinates
+        for sampling_mode in (SamplingMode.SOBOL, SamplingMode.HALTON, SamplingMode.LATIN_HYPERCUBE):
+            camera_movement_properties.sampling_mode = sampling_mode.value.identifier
+            plan = VLIPSSimulation.plan_camera_movement(self.context)
+            file_paths = [manifest_step["filepath"] for manifest_step in plan.iter_manifest_steps()]
+            self.assertEqual(
+                len(file_paths), len(set(file_paths)),
+                f"Every {sampling_mode.value.identifier} sample should be rendered to its own file")
+
+    def test_setup_beacon_reuses_material(self):
+        from vlips_addon.modules.constants import SETUP_BEACON_OPERATOR_NAME
+        from vlips_addon.modules.vlips_simulation import VLIPSSimulation
+
+        beacon_properties = self.context.window_manager.operator_properties_last(SETUP_BEACON_OPERATOR_NAME)
+        materials = len(bpy.data.materials)
+        for _ in range(100):
+            VLIPSSimulation.setup_beacon(
+                context=self.context,
+                name=beacon_properties.name,
+                width=beacon_properties.width,
+                height=beacon_properties.height)
+        self.assertEqual(materials, len(bpy.data.materials), "Beacon material should be created only once")
+
+    def test_empty_scene_leaves_no_orphans(self):
+        from vlips_addon.modules.vlips_simulation import VLIPSSimulation
+
+        # Orphans, like the ones leaked by previous versions
+        bpy.data.meshes.new("Orphan Mesh")
+        bpy.data.curves.new(type="FONT", name="Orphan Font")
+
+        report = VLIPSSimulation.empty_scene(self.context)
+
+        self.assertEqual(0, len(self.context.scene.objects), "Scene should be empty")
+        self.assertEqual(0, len(bpy.data.meshes), "Meshes should be removed")
+        self.assertEqual(0, len(bpy.data.curves), "Font curves should be removed")
+        self.assertGreater(report["meshes"], 1, "Removed meshes should be reported")
+        self.assertIn("elapsed_time", report)
+
+
+if __name__ == "__main__":
+    result = unittest.main(argv=[sys.argv[0]], exit=False).result
+    sys.exit(0 if result.wasSuccessful() else 1)
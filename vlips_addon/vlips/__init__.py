@@ -1,11 +1,30 @@
+from .analytic_renderer import *
 from .argparse_helper import *
 from .beacon import *
+from .beacon_labels import *
+from .call_trace import *
 from .camera import *
+from .camera_fov import *
+from .camera_movement_manifest import *
+from .camera_movement_plan import *
+from .camera_movement_step_table import *
+from .camera_projection import *
 from .constants import *
+from .datablock_pool import *
 from .exif_reader import *
 from .exif_writer import *
+from .fake_render_worker import *
+from .image_writer_pool import *
+from .mesh_geometry import *
+from .pose_sampler import *
 from .pyplot_helper import *
+from .region_of_interest import *
+from .render_job_protocol import *
+from .render_worker_client import *
 from .scene import *
 from .smartphone import *
+from .stage_timer import *
+from .sweep import *
 from .timestamp import *
 from .version import *
+from .work_queue import *
@@ -0,0 +1,259 @@
+import logging
+
+import numpy as np
+
+from .beacon import Beacon
+from .call_trace import CallTrace
+from .camera import Camera
+from .camera_projection import CameraProjection
+
+log = logging.getLogger(__name__)
+
+
+class AnalyticRenderer:
+    """
+    Render the simulated scene without Blender. The only thing visible in the
+    renders is the beacon, an emissive rectangle, so it is projected with the
+    camera model Blender uses and rasterized with supersampled anti-aliasing
+    over a flat background.
+    """
+
+    DEFAULT_SUPERSAMPLING = 4
+    DEFAULT_BEACON_COLOR = (255, 255, 255)
+    DEFAULT_BACKGROUND_COLOR = (0, 0, 0)
+
+    # Distance in front of the camera where the beacon is clipped, so parts of
+    # it behind the camera aren't projected
+    NEAR_CLIP = 1.0  # millimeters
+
+    # Rows rasterized at once, so large beacons don't need huge sample arrays
+    ROWS_PER_CHUNK = 128
+
+    image_width = 0  # pixels
+    image_height = 0  # pixels
+    supersampling = DEFAULT_SUPERSAMPLING
+    beacon_color = DEFAULT_BEACON_COLOR
+    background_color = DEFAULT_BACKGROUND_COLOR
+
+    def __init__(
+            self,
+            image_width: int,
+            image_height: int,
+            supersampling: int = DEFAULT_SUPERSAMPLING,
+            beacon_color: (int, int, int) = DEFAULT_BEACON_COLOR,
+            background_color: (int, int, int) = DEFAULT_BACKGROUND_COLOR
+    ):
+        """
+        Create an instance of the AnalyticRenderer class.
+
+        :param image_width: width of the renders, in pixels.
+        :param image_height: height of the renders, in pixels.
+        :param supersampling: samples taken per pixel along each axis, so each
+        pixel gets the square of this value.
+        :param beacon_color: RGB color of the beacon in the renders.
+        :param background_color: RGB color of everything else.
+        """
+
+        log.info("Create instance of AnalyticRenderer class")
+        CallTrace.log(log, "AnalyticRenderer.__init__",
+                      image_width=image_width,
+                      image_height=image_height,
+                      supersampling=supersampling,
+                      beacon_color=beacon_color,
+                      background_color=background_color)
+
+        if supersampling < 1:
+            raise ValueError("Supersampling must be at least 1")
+
+        self.image_width = image_width
+        self.image_height = image_height
+        self.supersampling = supersampling
+        self.beacon_color = beacon_color
+        self.background_color = background_color
+
+        # Offsets of the samples inside a pixel, evenly spread
+        self._sample_offsets = (np.arange(supersampling) + 0.5) / supersampling
+
+    @staticmethod
+    def get_beacon_corners(beacon: Beacon) -> np.ndarray:
+        """
+        Calculate the corners of the beacon in world coordinates.
+
+        :param beacon: beacon with its dimensions and location in millimeters,
+        and its rotation in degrees.
+
+        :return: array with shape (4, 3), corners in counterclockwise order
+        seen from the side the beacon faces.
+        :rtype: np.ndarray
+        """
+
+        half_width = beacon.dimensions[0] / 2
+        half_height = beacon.dimensions[1] / 2
+        corners = np.array([
+            [-half_width, -half_height, 0],
+            [half_width, -half_height, 0],
+            [half_width, half_height, 0],
+            [-half_width, half_height, 0]])
+
+        rotation_matrix = CameraProjection.get_rotation_matrix(beacon.rotation)
+        return corners @ rotation_matrix.T + np.asarray(beacon.location, dtype=np.float64)
+
+    def get_beacon_polygon(self, camera: Camera, beacon: Beacon) -> np.ndarray:
+        """
+        Project the beacon onto the image, clipping the parts of it behind the
+        camera.
+
+        :param camera: camera the scene is rendered from.
+        :param beacon: beacon shown in the scene.
+
+        :return: array with shape (N, 2) with the vertices of the beacon in the
+        image, in pixels. Empty if the beacon is behind the camera.
+        :rtype: np.ndarray
+        """
+
+        projection = CameraProjection(camera, self.image_width, self.image_height)
+        corners = projection.to_camera(AnalyticRenderer.get_beacon_corners(beacon))
+
+        # Clip the polygon against the near plane (Sutherland-Hodgman)
+        clipped = []
+        for index in range(len(corners)):
+            current = corners[index]
+            following = corners[(index + 1) % len(corners)]
+            current_inside = current[2] <= -AnalyticRenderer.NEAR_CLIP
+            following_inside = following[2] <= -AnalyticRenderer.NEAR_CLIP
+            if current_inside:
+                clipped.append(current)
+            if current_inside != following_inside:
+                t = (-AnalyticRenderer.NEAR_CLIP - current[2]) / (following[2] - current[2])
+                clipped.append(current + t * (following - current))
+
+        if len(clipped) < 3:
+            return np.empty((0, 2))
+
+        return projection.project_camera_points(np.array(clipped))
+
+    def get_coverage(self, polygon: np.ndarray) -> np.ndarray:
+        """
+        Calculate how much of each pixel a convex polygon covers.
+
+        :param polygon: array with shape (N, 2) with the vertices of the
+        polygon in the image, in pixels.
+
+        :return: array with shape (height, width) with the fraction of each
+        pixel covered, from 0 to 1.
+        :rtype: np.ndarray
+        """
+
+        coverage = np.zeros((self.image_height, self.image_width), dtype=np.float32)
+        if len(polygon) < 3:
+            return coverage
+
+        # Only the pixels in the bounding box of the polygon can be covered
+        column_start = max(int(np.floor(polygon[:, 0].min())), 0)
+        column_stop = min(int(np.ceil(polygon[:, 0].max())), self.image_width)
+        row_start = max(int(np.floor(polygon[:, 1].min())), 0)
+        row_stop = min(int(np.ceil(polygon[:, 1].max())), self.image_height)
+        if column_start >= column_stop or row_start >= row_stop:
+            return coverage
+
+        # Make the edges go the same way, so a sample is inside the polygon if
+        # it is on the same side of all of them
+        area = np.sum(
+            polygon[:, 0] * np.roll(polygon[:, 1], -1) - np.roll(polygon[:, 0], -1) * polygon[:, 1])
+        if area < 0:
+            polygon = polygon[::-1]
+        edges_start = polygon
+        edges_vector = np.roll(polygon, -1, axis=0) - polygon
+
+        samples_x = (np.arange(column_start, column_stop)[:, np.newaxis] + self._sample_offsets).ravel()
+        samples_per_pixel = self.supersampling ** 2
+        for chunk_start in range(row_start, row_stop, AnalyticRenderer.ROWS_PER_CHUNK):
+            chunk_stop = min(chunk_start + AnalyticRenderer.ROWS_PER_CHUNK, row_stop)
+            samples_y = (np.arange(chunk_start, chunk_stop)[:, np.newaxis] + self._sample_offsets).ravel()
+
+            inside = np.ones((len(samples_y), len(samples_x)), dtype=bool)
+            for (start_x, start_y), (vector_x, vector_y) in zip(edges_start, edges_vector):
+                inside &= (vector_x * (samples_y[:, np.newaxis] - start_y) -
+                           vector_y * (samples_x[np.newaxis, :] - start_x)) >= 0
+
+            coverage[chunk_start:chunk_stop, column_start:column_stop] = inside.reshape(
+                chunk_stop - chunk_start, self.supersampling,
+                column_stop - column_start, self.supersampling).sum(axis=(1, 3)) / samples_per_pixel
+
+        return coverage
+
+    def render(self, camera: Camera, beacon: Beacon) -> np.ndarray:
+        """
+        Render the beacon as seen from the camera.
+
+        :param camera: camera the scene is rendered from, with its location in
+        millimeters and its rotation in degrees.
+        :param beacon: beacon shown in the scene.
+
+        :return: RGB pixels as unsigned bytes, with shape (height, width, 3),
+        top row first.
+        :rtype: np.ndarray
+        """
+
+        coverage = self.get_coverage(self.get_beacon_polygon(camera, beacon))[:, :, np.newaxis]
+
+        background_color = np.asarray(self.background_color, dtype=np.float32)
+        beacon_color = np.asarray(self.beacon_color, dtype=np.float32)
+        pixels = background_color + coverage * (beacon_color - background_color)
+
+        return np.round(pixels).astype(np.uint8)
+
+    @staticmethod
+    def compare(image: np.ndarray, reference: np.ndarray) -> dict:
+        """
+        Measure how much a render differs from a reference render of the same
+        step, for example, one made by Blender. Each image is thresholded
+        halfway between its darkest and brightest values to find the beacon,
+        so differences in color management don't hide geometric ones.
+
+        :param image: RGB pixels of the render, with shape (height, width, 3).
+        :param reference: RGB pixels of the reference render, with the same
+        shape.
+
+        :return: mean absolute difference of the gray levels, intersection
+        over union of the beacon in both images, their areas in pixels, and
+        the distance between their centroids in pixels (None if the beacon
+        isn't in both images).
+        :rtype: dict
+        """
+
+        if image.shape != reference.shape:
+            raise ValueError(f"Images have different sizes: {image.shape} and {reference.shape}")
+
+        gray = image.astype(np.float32).mean(axis=2)
+        reference_gray = reference.astype(np.float32).mean(axis=2)
+
+        def beacon_mask(pixels):
+            low, high = pixels.min(), pixels.max()
+            if high - low < 1:
+                return np.zeros(pixels.shape, dtype=bool)
+            return pixels > (low + high) / 2
+
+        def centroid(mask):
+            rows, columns = np.nonzero(mask)
+            return np.array([columns.mean() + 0.5, rows.mean() + 0.5]) if len(rows) > 0 else None
+
+        mask = beacon_mask(gray)
+        reference_mask = beacon_mask(reference_gray)
+        union = np.count_nonzero(mask | reference_mask)
+        intersection = np.count_nonzero(mask & reference_mask)
+
+        beacon_centroid = centroid(mask)
+        reference_centroid = centroid(reference_mask)
+        if beacon_centroid is not None and reference_centroid is not None:
+            centroid_distance = float(np.linalg.norm(beacon_centroid - reference_centroid))
+        else:
+            centroid_distance = None
+
+        return {
+            "mean_absolute_difference": float(np.abs(gray - reference_gray).mean()),
+            "intersection_over_union": intersection / union if union > 0 else 1.0,
+            "area": int(np.count_nonzero(mask)),
+            "reference_area": int(np.count_nonzero(reference_mask)),
+            "centroid_distance": centroid_distance
+        }
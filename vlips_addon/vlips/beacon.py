@@ -2,6 +2,7 @@ import logging
 import math
 from typing import Tuple
 
+from .call_trace import CallTrace
 from .constants import DECIMAL_PRECISION
 
 log = logging.getLogger(__name__)
@@ -30,11 +31,11 @@ class Beacon:
         """
 
         log.info("Create instance of Beacon class")
-        log.debug(f"Beacon.__init__("
-                  f"name={name}, "
-                  f"dimensions={dimensions}, "
-                  f"location={location}, "
-                  f"rotation={rotation})")
+        CallTrace.log(log, "Beacon.__init__",
+                      name=name,
+                      dimensions=dimensions,
+                      location=location,
+                      rotation=rotation)
 
         self.name = name
         self.dimensions = dimensions
@@ -0,0 +1,238 @@
+import logging
+import os
+import tempfile
+
+import numpy as np
+
+from .analytic_renderer import AnalyticRenderer
+from .beacon import Beacon
+from .call_trace import CallTrace
+from .camera import Camera
+from .camera_projection import CameraProjection
+from .constants import CAMERA_DEFAULT_ROTATION
+
+log = logging.getLogger(__name__)
+
+
+class BeaconLabels:
+    """
+    Ground truth of where the beacon shows up in every render of a camera
+    movement, calculated for all the steps at once with the camera model
+    Blender uses, instead of reading it back from the EXIF data of each render.
+
+    Labels are kept as columns, one array per label with a row per step:
+
+    - index: position of the step in the camera movement.
+    - filepath: path to the render of the step.
+    - corners: beacon corners in the image, in pixels, shape (N, 4, 2).
+    - bounding_box: minimum column, minimum row, maximum column, and maximum
+      row of the corners, in pixels, shape (N, 4).
+    - distance: distance between the camera and the center of the beacon, in
+      millimeters.
+    - in_front: whether the whole beacon is in front of the camera. Image
+      coordinates aren't meaningful otherwise.
+    - in_image: whether the whole beacon is inside the image.
+    - partially_in_image: whether any part of the beacon is inside the image.
+      A beacon partly behind the camera is assumed to be.
+    """
+
+    FILE_NAME = "labels.npz"
+
+    @staticmethod
+    def compute(
+            camera: Camera,
+            beacon: Beacon,
+            image_width: int,
+            image_height: int,
+            camera_locations: np.ndarray,
+            rotation_x_angles: np.ndarray,
+            rotation_z_angles: np.ndarray
+    ) -> dict:
+        """
+        Calculate the labels of many camera placements at once.
+
+        :param camera: camera whose intrinsics are used. Its location and
+        rotation are ignored.
+        :param beacon: beacon shown in the scene.
+        :param image_width: width of the renders, in pixels.
+        :param image_height: height of the renders, in pixels.
+        :param camera_locations: array with shape (N, 3) with the location of
+        the camera in each step, in millimeters.
+        :param rotation_x_angles: array with shape (N,) with the rotation
+        around camera's X axis in each step, in degrees.
+        :param rotation_z_angles: array with shape (N,) with the rotation
+        around camera's Z axis in each step, in degrees.
+
+        :return: labels as columns.
+        :rtype: dict
+        """
+
+        log.info("Compute beacon labels")
+        CallTrace.log(log, "BeaconLabels.compute",
+                      camera=camera,
+                      beacon=beacon,
+                      image_width=image_width,
+                      image_height=image_height,
+                      camera_locations=camera_locations)
+
+        camera_locations = np.asarray(camera_locations, dtype=np.float64).reshape(-1, 3)
+        rotations = np.column_stack((
+            CAMERA_DEFAULT_ROTATION[0] - np.asarray(rotation_x_angles, dtype=np.float64),
+            np.full(len(camera_locations), CAMERA_DEFAULT_ROTATION[1]),
+            CAMERA_DEFAULT_ROTATION[2] - np.asarray(rotation_z_angles, dtype=np.float64)))
+
+        corners, corners_in_front = CameraProjection.project_poses(
+            camera=camera,
+            image_width=image_width,
+            image_height=image_height,
+            locations=camera_locations,
+            rotations=rotations,
+            points=AnalyticRenderer.get_beacon_corners(beacon))
+
+        bounding_box = np.concatenate((corners.min(axis=1), corners.max(axis=1)), axis=1)
+        in_front = corners_in_front.all(axis=1)
+        in_image = in_front & \
+            (bounding_box[:, 0] >= 0) & (bounding_box[:, 1] >= 0) & \
+            (bounding_box[:, 2] <= image_width) & (bounding_box[:, 3] <= image_height)
+        partially_in_image = (in_front & BeaconLabels._overlaps_image(
+            corners, bounding_box, image_width, image_height)) | \
+            (corners_in_front.any(axis=1) & ~in_front)
+
+        return {
+            "corners": corners,
+            "bounding_box": bounding_box,
+            "distance": np.linalg.norm(np.asarray(beacon.location, dtype=np.float64) - camera_locations, axis=1),
+            "in_front": in_front,
+            "in_image": in_image,
+            "partially_in_image": partially_in_image
+        }
+
+    @staticmethod
+    def _overlaps_image(
+            corners: np.ndarray,
+            bounding_box: np.ndarray,
+            image_width: int,
+            image_height: int
+    ) -> np.ndarray:
+        """
+        Check whether the beacon overlaps the image, looking for an axis that
+        separates them: the image sides, or the beacon sides, since both are
+        convex.
+
+        :param corners: array with shape (N, 4, 2) with the beacon corners in
+        the image of each step, in order around the beacon.
+        :param bounding_box: array with shape (N, 4) with the bounding box of
+        the corners.
+        :param image_width: width of the renders, in pixels.
+        :param image_height: height of the renders, in pixels.
+
+        :return: array with shape (N,), True where the beacon overlaps the
+        image.
+        :rtype: np.ndarray
+        """
+
+        bounding_boxes_overlap = \
+            (bounding_box[:, 0] < image_width) & (bounding_box[:, 2] > 0) & \
+            (bounding_box[:, 1] < image_height) & (bounding_box[:, 3] > 0)
+
+        image_corners = np.array([[0, 0], [image_width, 0], [image_width, image_height], [0, image_height]])
+        next_corners = np.roll(corners, -1, axis=1)
+        edges = next_corners - corners
+
+        # The corners go clockwise or counterclockwise depending on the pose,
+        # so the inner side of the edges is given by the sign of the area
+        orientation = np.sign(np.sum(
+            corners[:, :, 0] * next_corners[:, :, 1] - next_corners[:, :, 0] * corners[:, :, 1], axis=1))
+
+        # Cross product of every edge with the vectors from its start to every
+        # image corner, with shape (N, 4 edges, 4 image corners)
+        offsets = image_corners[np.newaxis, np.newaxis, :, :] - corners[:, :, np.newaxis, :]
+        cross = edges[:, :, np.newaxis, 0] * offsets[:, :, :, 1] - edges[:, :, np.newaxis, 1] * offsets[:, :, :, 0]
+        separated = (cross * orientation[:, np.newaxis, np.newaxis] < 0).all(axis=2).any(axis=1)
+
+        return bounding_boxes_overlap & ~separated
+
+    @staticmethod
+    def from_manifest_steps(
+            steps: [dict],
+            camera: Camera,
+            beacon: Beacon,
+            image_width: int,
+            image_height: int
+    ) -> dict:
+        """
+        Calculate the labels of the steps of a camera movement.
+
+        :param steps: steps as stored in the camera movement manifest.
+        :param camera: camera whose intrinsics are used.
+        :param beacon: beacon shown in the scene.
+        :param image_width: width of the renders, in pixels.
+        :param image_height: height of the renders, in pixels.
+
+        :return: labels as columns, including the index and the file path of
+        each step.
+        :rtype: dict
+        """
+
+        labels = BeaconLabels.compute(
+            camera=camera,
+            beacon=beacon,
+            image_width=image_width,
+            image_height=image_height,
+            camera_locations=np.array([step["camera_location"] for step in steps], dtype=np.float64),
+            rotation_x_angles=np.array([step["rotation_x_angle"] for step in steps], dtype=np.float64),
+            rotation_z_angles=np.array([step["rotation_z_angle"] for step in steps], dtype=np.float64))
+
+        labels["index"] = np.array([step["index"] for step in steps], dtype=np.int64)
+        labels["filepath"] = np.array([step["filepath"] for step in steps], dtype=str)
+
+        return labels
+
+    @staticmethod
+    def select(labels: dict, rows) -> dict:
+        """
+        Keep only some of the steps.
+
+        :param labels: labels as columns.
+        :param rows: boolean mask or indices of the steps to keep.
+
+        :return: labels of the steps kept, as columns.
+        :rtype: dict
+        """
+
+        return {name: column[rows] for name, column in labels.items()}
+
+    @staticmethod
+    def save(filepath: str, labels: dict):
+        """
+        Save the labels as a NumPy archive, one array per column. The file is
+        written to a temporary file first, so it is never left half-written.
+
+        :param filepath: path to the file where the labels must be saved.
+        :param labels: labels as columns.
+        """
+
+        log.info("Save beacon labels")
+        CallTrace.log(log, "BeaconLabels.save",
+                      filepath=filepath)
+
+        directory = os.path.dirname(os.path.abspath(filepath))
+        os.makedirs(directory, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=".labels_", suffix=".npz")
+        with os.fdopen(file_descriptor, "wb") as file:
+            np.savez(file, **labels)
+        os.replace(temporary_path, filepath)
+
+    @staticmethod
+    def load(filepath: str) -> dict:
+        """
+        Load labels saved with `save`.
+
+        :param filepath: path to the file with the labels.
+
+        :return: labels as columns.
+        :rtype: dict
+        """
+
+        with np.load(filepath) as archive:
+            return {name: archive[name] for name in archive.files}
@@ -0,0 +1,185 @@
+import json
+import logging
+import time
+from collections.abc import Sized
+from enum import Enum
+
+log = logging.getLogger(__name__)
+
+
+class CallTrace:
+    """
+    Log the calls to the methods of the add-on and the library without paying
+    for it when nobody is listening. The message of a call is only formatted
+    when a handler is going to write it, so a disabled DEBUG level costs a
+    level check per call, instead of formatting every argument (Blender
+    contexts and property groups included).
+
+    Optionally, every Nth call to each method is also written as a JSON object
+    to the "vlips.trace" logger, so long sweeps can be traced without logging
+    every step.
+    """
+
+    LOGGER_NAME = "vlips.trace"
+    FILE_NAME = "call_trace.jsonl"
+
+    # Sized arguments longer than this are logged as their number of items
+    MAX_LOGGED_ITEMS = 8
+
+    sample_every = 0
+    trace_log = logging.getLogger(LOGGER_NAME)
+    _counts = {}
+    _handler = None
+
+    def __init__(self, name: str, arguments: dict):
+        """
+        Create an instance of the CallTrace class, describing a call to be
+        formatted when, and if, it is logged.
+
+        :param name: name of the method called, qualified with its class.
+        :param arguments: arguments of the call, by name.
+        """
+
+        self.name = name
+        self.arguments = arguments
+
+    def __str__(self):
+        """
+        Return the call as it is shown in logs, this is, its name and
+        arguments.
+        """
+
+        return (f"{self.name}("
+                f"{', '.join(f'{key}={CallTrace.format_value(value)}' for key, value in self.arguments.items())})")
+
+    @staticmethod
+    def log(logger: logging.Logger, name: str, /, **arguments):
+        """
+        Log a call to a method at DEBUG level, and trace it if it is sampled.
+        Nothing is formatted unless DEBUG is enabled for the logger.
+
+        :param logger: logger of the module the method belongs to.
+        :param name: name of the method called, qualified with its class.
+        :param arguments: arguments of the call, by name. The logger and name
+        are positional only, so methods can have arguments with these names.
+        """
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s", CallTrace(name, arguments))
+        if CallTrace.sample_every:
+            CallTrace.sample(name, arguments)
+
+    @staticmethod
+    def set_sample_every(sample_every: int):
+        """
+        Enable or disable the structured trace.
+
+        :param sample_every: trace one of every this many calls to each method,
+        or 0 to disable the trace.
+        """
+
+        log.info("Set sampling of the call trace")
+        log.debug("CallTrace.set_sample_every(sample_every=%s)", sample_every)
+
+        if sample_every < 0:
+            raise ValueError("sample_every must be 0 or greater")
+
+        CallTrace.sample_every = sample_every
+        CallTrace._counts = {}
+
+    @staticmethod
+    def start(filepath, sample_every: int):
+        """
+        Write one of every few calls to each method to a JSON lines file, until
+        the trace is stopped. The trace isn't shown with the rest of the log.
+
+        :param filepath: path of the file the trace is appended to.
+        :param sample_every: trace one of every this many calls to each method.
+        """
+
+        log.info("Start the call trace")
+        log.debug("CallTrace.start(filepath=%s, sample_every=%s)", filepath, sample_every)
+
+        CallTrace.stop()
+        CallTrace._handler = logging.FileHandler(filepath)
+        CallTrace._handler.setFormatter(logging.Formatter("%(message)s"))
+        CallTrace.trace_log.addHandler(CallTrace._handler)
+        CallTrace.trace_log.setLevel(logging.INFO)
+        CallTrace.trace_log.propagate = False
+        CallTrace.set_sample_every(sample_every)
+
+    @staticmethod
+    def stop():
+        """
+        Stop the trace started by start, closing its file.
+        """
+
+        log.info("Stop the call trace")
+        log.debug("CallTrace.stop()")
+
+        CallTrace.set_sample_every(0)
+        if CallTrace._handler is not None:
+            CallTrace.trace_log.removeHandler(CallTrace._handler)
+            CallTrace._handler.close()
+            CallTrace._handler = None
+            CallTrace.trace_log.propagate = True
+
+    @staticmethod
+    def sample(name: str, arguments: dict):
+        """
+        Count a call to a method, writing it to the trace if it is one of the
+        sampled ones.
+
+        :param name: name of the method called, qualified with its class.
+        :param arguments: arguments of the call, by name.
+        """
+
+        count = CallTrace._counts.get(name, 0)
+        CallTrace._counts[name] = count + 1
+        if count % CallTrace.sample_every != 0 or not CallTrace.trace_log.isEnabledFor(logging.INFO):
+            return
+
+        CallTrace.trace_log.info("%s", json.dumps({
+            "time": time.time(),
+            "call": name,
+            "count": count + 1,
+            "arguments": {key: CallTrace.get_traced_value(value) for key, value in arguments.items()}
+        }))
+
+    @staticmethod
+    def format_value(value) -> str:
+        """
+        Format an argument of a call as it is shown in logs. Long collections,
+        like the steps of a camera movement, are shown as their number of
+        items.
+
+        :param value: argument of a call.
+
+        :return: argument formatted.
+        :rtype: str
+        """
+
+        if isinstance(value, Sized) and not isinstance(value, (str, bytes)) \
+                and len(value) > CallTrace.MAX_LOGGED_ITEMS:
+            return f"{len(value)} items"
+        return str(value)
+
+    @staticmethod
+    def get_traced_value(value):
+        """
+        Convert an argument of a call into a value that can be written as JSON.
+
+        :param value: argument of a call.
+
+        :return: argument as a JSON value.
+        """
+
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        if isinstance(value, Enum):
+            return CallTrace.get_traced_value(value.value)
+        if isinstance(value, (tuple, list)) and len(value) <= CallTrace.MAX_LOGGED_ITEMS:
+            return [CallTrace.get_traced_value(item) for item in value]
+        if hasattr(value, "item") and getattr(value, "ndim", None) == 0:
+            return value.item()
+        return CallTrace.format_value(value)
@@ -5,6 +5,7 @@ from enum import Enum
 from fractions import Fraction
 from typing import Tuple
 
+from .call_trace import CallTrace
 from .constants import DECIMAL_PRECISION
 
 log = logging.getLogger(__name__)
@@ -89,21 +90,21 @@ class Camera:
         """
 
         log.info("Create instance of Camera class")
-        log.debug(f"Camera.__init__("
-                  f"name={name}, "
-                  f"facing={facing}, "
-                  f"resolution_width={resolution_width}, "
-                  f"resolution_height={resolution_height}, "
-                  f"focal_length={focal_length}, "
-                  f"pixel_size={pixel_size}, "
-                  f"make={make}, "
-                  f"model={model}, "
-                  f"software={software}, "
-                  f"location={location}, "
-                  f"rotation={rotation}, "
-                  f"grid_location={grid_location}, "
-                  f"rotation_x_angle={rotation_x_angle}, "
-                  f"rotation_z_angle={rotation_z_angle})")
+        CallTrace.log(log, "Camera.__init__",
+                      name=name,
+                      facing=facing,
+                      resolution_width=resolution_width,
+                      resolution_height=resolution_height,
+                      focal_length=focal_length,
+                      pixel_size=pixel_size,
+                      make=make,
+                      model=model,
+                      software=software,
+                      location=location,
+                      rotation=rotation,
+                      grid_location=grid_location,
+                      rotation_x_angle=rotation_x_angle,
+                      rotation_z_angle=rotation_z_angle)
 
         if not isinstance(facing, Camera.Facing):
             raise TypeError("facing must be an instance of Camera.facing enum")
@@ -0,0 +1,138 @@
+import logging
+
+import numpy as np
+
+from .call_trace import CallTrace
+
+log = logging.getLogger(__name__)
+
+
+class CameraFOV:
+    """
+    Area of the floor plane the camera sees at a given distance from the
+    beacon, and the grid of tiles the camera can be moved through while the
+    whole beacon stays inside the image.
+
+    The dimensions are calculated with basic trigonometry, as the triangles
+    formed by the sensor and the FOV are similar, so no Blender object is
+    needed to know them.
+    """
+
+    full_width = 0.0  # millimeters
+    full_height = 0.0  # millimeters
+    beacon_width = 0.0  # millimeters
+    beacon_height = 0.0  # millimeters
+    width_in_tiles_original = 0  # tiles
+    height_in_tiles_original = 0  # tiles
+    width_in_tiles = 0  # tiles
+    height_in_tiles = 0  # tiles
+    tile_side = 0  # millimeters
+
+    def __init__(
+            self,
+            sensor_width: float,
+            sensor_height: float,
+            focal_length: float,
+            beacon_distance: float,
+            beacon_dimensions: (float, float),
+            tile_side: float
+    ):
+        """
+        Create an instance of the CameraFOV class.
+
+        :param sensor_width: width of the sensor, as rendered, in millimeters.
+        :param sensor_height: height of the sensor, as rendered, in
+        millimeters.
+        :param focal_length: focal length of the lens/sensor couple, in
+        millimeters.
+        :param beacon_distance: distance between the beacon and the camera, in
+        millimeters.
+        :param beacon_dimensions: width and height of the beacon, in
+        millimeters.
+        :param tile_side: length of each tile in the scene, in millimeters.
+        """
+
+        log.info("Create instance of CameraFOV class")
+        CallTrace.log(log, "CameraFOV.__init__",
+                      sensor_width=sensor_width,
+                      sensor_height=sensor_height,
+                      focal_length=focal_length,
+                      beacon_distance=beacon_distance,
+                      beacon_dimensions=beacon_dimensions,
+                      tile_side=tile_side)
+
+        self.tile_side = tile_side
+
+        # Area covered by the lens at the distance of the beacon
+        self.full_width = sensor_width * beacon_distance / focal_length
+        self.full_height = sensor_height * beacon_distance / focal_length
+
+        # Subtract half a beacon around the perimeter of the FOV to count
+        # for the need of having to move the camera to the fringe of said
+        # FOV. Half in one side, half in the other, is a full beacon.
+        self.beacon_width = self.full_width - beacon_dimensions[0]
+        self.beacon_height = self.full_height - beacon_dimensions[1]
+
+        # Adjust the dimensions of the FOV so only full tiles can fit into it
+        self.width_in_tiles_original = self.beacon_width // tile_side
+        self.height_in_tiles_original = self.beacon_height // tile_side
+
+        # Make the number of tiles even, so the corners of four tiles always
+        # are in the coordinates' origin
+        self.width_in_tiles = self.width_in_tiles_original - self.width_in_tiles_original % 2
+        self.height_in_tiles = self.height_in_tiles_original - self.height_in_tiles_original % 2
+
+        # If any of the dimensions of the FOV in tiles is 0, set both to 0
+        if self.width_in_tiles <= 0 or self.height_in_tiles <= 0:
+            self.width_in_tiles = 0
+            self.height_in_tiles = 0
+
+    @property
+    def width(self) -> float:
+        """
+        Width of the FOV made of an even number of full tiles, in millimeters.
+        """
+
+        return self.width_in_tiles * self.tile_side
+
+    @property
+    def height(self) -> float:
+        """
+        Height of the FOV made of an even number of full tiles, in
+        millimeters.
+        """
+
+        return self.height_in_tiles * self.tile_side
+
+    def get_grid_x(self):
+        """
+        Get the X coordinates of the camera when it scans the FOV, left to
+        right.
+
+        :return: X coordinates, in millimeters.
+        :rtype: np.ndarray
+        """
+
+        return np.arange(-self.width / 2, self.width / 2 + self.tile_side, self.tile_side)
+
+    def get_grid_y(self):
+        """
+        Get the Y coordinates of the camera when it scans the FOV, top to
+        bottom.
+
+        :return: Y coordinates, in millimeters.
+        :rtype: np.ndarray
+        """
+
+        return np.arange(self.height / 2, -self.height / 2 - self.tile_side, -self.tile_side)
+
+    def __str__(self):
+        """
+        Return a string representation of the object. Useful to show the details
+        of the FOV in logs.
+        """
+
+        return (f"CameraFOV\n"
+                f"- Full: {self.full_width} x {self.full_height} mm\n"
+                f"- Beacon: {self.beacon_width} x {self.beacon_height} mm\n"
+                f"- Even Tiles: {self.width_in_tiles} x {self.height_in_tiles} tiles")
@@ -0,0 +1,299 @@
+import json
+import logging
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import piexif
+
+from .call_trace import CallTrace
+from .constants import DECIMAL_PRECISION
+from .exif_reader import ExifReader
+
+log = logging.getLogger(__name__)
+
+
+class CameraMovementManifest:
+    """
+    Keep track of the steps of a camera movement, so an interrupted render can
+    be resumed where it stopped.
+
+    The manifest lists every planned step and the path of its render. Each
+    completed render is appended to a completion log as soon as it is saved.
+    A step is considered rendered if its file exists and its EXIF data
+    describes the same camera placement as the step. Steps planned but left
+    out of the render on purpose are marked as culled.
+    """
+
+    MANIFEST_FILE_NAME = "manifest.json"
+    COMPLETED_FILE_NAME = "manifest_completed.jsonl"
+
+    output_path = ""
+    manifest_path = ""
+    completed_path = ""
+
+    def __init__(
+            self,
+            output_path: str,
+            completed_file_name: str = COMPLETED_FILE_NAME
+    ):
+        """
+        Create an instance of the CameraMovementManifest class for the renders
+        saved to the given folder.
+
+        :param output_path: folder where the renders are saved to.
+        :param completed_file_name: name of the file where completed renders
+        are logged. Processes rendering parts of the same camera movement at
+        the same time must use different files.
+        """
+
+        log.info("Create instance of CameraMovementManifest class")
+        CallTrace.log(log, "CameraMovementManifest.__init__",
+                      output_path=output_path,
+                      completed_file_name=completed_file_name)
+
+        self.output_path = output_path
+        self.manifest_path = os.path.join(output_path, CameraMovementManifest.MANIFEST_FILE_NAME)
+        self.completed_path = os.path.join(output_path, completed_file_name)
+
+    @staticmethod
+    def create_step(
+            index: int,
+            filepath: str,
+            camera_location: (float, float, float),
+            rotation_x_angle: float,
+            rotation_z_angle: float
+    ) -> dict:
+        """
+        Describe a step of the camera movement as stored in the manifest.
+
+        :param index: position of the step in the camera movement.
+        :param filepath: path to the file where the render is saved.
+        :param camera_location: camera's X, Y, and Z location in millimeters.
+        :param rotation_x_angle: rotation around camera's X axis, in degrees.
+        :param rotation_z_angle: rotation around camera's Z axis, in degrees.
+
+        :return: dictionary describing the step.
+        :rtype: dict
+        """
+
+        return {
+            "index": index,
+            "filepath": filepath,
+            "camera_location": [
+                round(camera_location[0]),
+                round(camera_location[1]),
+                round(camera_location[2])],
+            "rotation_x_angle": round(float(rotation_x_angle), DECIMAL_PRECISION),
+            "rotation_z_angle": round(float(rotation_z_angle), DECIMAL_PRECISION)
+        }
+
+    @staticmethod
+    def exclude_culled(steps: [dict]) -> [dict]:
+        """
+        Filter out the steps marked as culled, which must not be rendered.
+
+        :param steps: steps to check, as returned by `create_step`.
+
+        :return: steps that must be rendered, in the same order.
+        :rtype: [dict]
+        """
+
+        return [step for step in steps if not step.get("culled", False)]
+
+    def write(self, steps: Iterable[dict]):
+        """
+        Save the list of planned steps, replacing any previous manifest. Steps
+        are written as they are iterated, so they don't need to be kept in a
+        list. The file is written to a temporary file first, so a crash never
+        leaves a truncated manifest behind.
+
+        :param steps: every step of the camera movement, as returned by
+        `create_step`.
+        """
+
+        log.info("Write camera movement manifest")
+        CallTrace.log(log, "CameraMovementManifest.write",
+                      steps=steps)
+
+        Path(self.output_path).mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=self.output_path,
+            prefix=".manifest_",
+            suffix=".json")
+        with os.fdopen(file_descriptor, "w") as file:
+            file.write('{"steps": [')
+            for index, step in enumerate(steps):
+                if index > 0:
+                    file.write(", ")
+                json.dump(step, file)
+            file.write("]}")
+        os.replace(temporary_path, self.manifest_path)
+
+    def read(self) -> [dict]:
+        """
+        Load the list of planned steps.
+
+        :return: every step of the camera movement, or an empty list if there
+        is no manifest.
+        :rtype: [dict]
+        """
+
+        log.info("Read camera movement manifest")
+        log.debug("CameraMovementManifest.read()")
+
+        if not os.path.isfile(self.manifest_path):
+            return []
+
+        with open(self.manifest_path, "r") as file:
+            return json.load(file)["steps"]
+
+    def record_completion(self, step: dict):
+        """
+        Log that the render of a step has been saved. The line is flushed to
+        disk right away, so it survives a crash of the process.
+
+        :param step: step whose render has been saved, as returned by
+        `create_step`.
+        """
+
+        log.info("Record completed step")
+        CallTrace.log(log, "CameraMovementManifest.record_completion",
+                      step=step)
+
+        stat = os.stat(step["filepath"])
+        completion = dict(step, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        with open(self.completed_path, "a") as file:
+            file.write(f"{json.dumps(completion)}\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def read_completions(self) -> dict:
+        """
+        Load the completed steps logged by every process rendering to the
+        output folder.
+
+        :return: completions indexed by render path.
+        :rtype: dict
+        """
+
+        log.info("Read completed steps")
+        log.debug("CameraMovementManifest.read_completions()")
+
+        completions = {}
+        for completed_path in Path(self.output_path).glob("manifest_completed*.jsonl"):
+            with open(completed_path, "r") as file:
+                for line in file:
+                    # The last line may be incomplete if the process died
+                    # while writing it
+                    try:
+                        completion = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    completions[completion["filepath"]] = completion
+
+        return completions
+
+    def get_pending_steps(self, steps: [dict]) -> [dict]:
+        """
+        Filter out the steps already rendered, see `iter_pending_steps`.
+
+        :param steps: steps to check, as returned by `create_step`.
+
+        :return: steps that still have to be rendered, in the same order.
+        :rtype: [dict]
+        """
+
+        log.info("Get pending steps")
+        CallTrace.log(log, "CameraMovementManifest.get_pending_steps",
+                      steps=steps)
+
+        pending_steps = list(self.iter_pending_steps(steps))
+
+        log.debug("- %s steps already rendered", len(steps) - len(pending_steps))
+
+        return pending_steps
+
+    def iter_pending_steps(self, steps: Iterable[dict]) -> Iterator[dict]:
+        """
+        Filter out the steps already rendered, as they are iterated.
+
+        A step logged as completed whose file hasn't changed since is trusted
+        without opening it. Otherwise, if its file exists, the EXIF data is
+        read to check it was rendered with the same camera placement.
+        Completions are read when the first step is checked.
+
+        :param steps: steps to check, as returned by `create_step`.
+
+        :return: iterator over the steps that still have to be rendered, in
+        the same order.
+        :rtype: Iterator[dict]
+        """
+
+        completions = self.read_completions()
+
+        for step in steps:
+            filepath = step["filepath"]
+            if not os.path.isfile(filepath):
+                yield step
+                continue
+
+            completion = completions.get(filepath)
+            if completion is not None and CameraMovementManifest._is_same_step(step, completion):
+                stat = os.stat(filepath)
+                if completion["size"] == stat.st_size and completion["mtime_ns"] == stat.st_mtime_ns:
+                    continue
+
+            if not CameraMovementManifest.exif_matches(step):
+                yield step
+
+    @staticmethod
+    def exif_matches(step: dict) -> bool:
+        """
+        Check whether the render of a step was made with the camera placement
+        the step describes.
+
+        :param step: step to check, as returned by `create_step`.
+
+        :return: True if the EXIF data of the render matches the step, False
+        if it doesn't or it can't be read.
+        :rtype: bool
+        """
+
+        try:
+            user_comment = ExifReader(step["filepath"]).get_user_comment()
+            camera = user_comment["camera"]
+        except (OSError, ValueError, KeyError, struct.error, piexif.InvalidImageDataError):
+            return False
+
+        return CameraMovementManifest._is_same_step(step, camera)
+
+    @staticmethod
+    def _is_same_step(step: dict, other: dict) -> bool:
+        """
+        Compare the camera placement of a step with another step or with the
+        camera details stored as EXIF data.
+
+        :param step: step to compare, as returned by `create_step`.
+        :param other: dictionary with camera location and rotation angles.
+
+        :return: True if both describe the same camera placement.
+        :rtype: bool
+        """
+
+        # Blender stores locations and angles as single precision floats, so
+        # allow them to be off by the last rounded digit
+        location_tolerance = 1
+        angle_tolerance = 10 ** -(DECIMAL_PRECISION - 1)
+
+        try:
+            location = other["camera_location"] if "camera_location" in other else other["location"]
+            return all(
+                abs(expected - actual) <= location_tolerance
+                for expected, actual in zip(step["camera_location"], location)) and \
+                abs(step["rotation_x_angle"] - other["rotation_x_angle"]) <= angle_tolerance and \
+                abs(step["rotation_z_angle"] - other["rotation_z_angle"]) <= angle_tolerance
+        except (KeyError, TypeError):
+            return False
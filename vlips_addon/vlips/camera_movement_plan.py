@@ -0,0 +1,207 @@
+import logging
+from typing import Iterator
+
+import numpy as np
+
+from .call_trace import CallTrace
+from .camera_movement_manifest import CameraMovementManifest
+from .camera_movement_step_table import CameraMovementStepTable
+from .sweep import Sweep
+
+log = logging.getLogger(__name__)
+
+
+class CameraMovementPlan:
+    """
+    Steps of a camera movement in the order they are rendered: the table
+    with the value of every axis of its sweep, the rows of the table in
+    render order, which of them are culled, and how many expensive
+    transitions the order saves.
+
+    Steps are handed around as rows of the table. The manifest step of a row,
+    with the path of its render, is composed only when it is needed, so the
+    plan keeps no manifest steps, however long the camera movement is.
+    """
+
+    def __init__(
+            self,
+            sweep: Sweep,
+            step_table: CameraMovementStepTable,
+            get_manifest_step,
+            order: np.ndarray = None,
+            transitions: dict = None
+    ):
+        """
+        Create an instance of the CameraMovementPlan class.
+
+        :param sweep: sweep of the camera movement.
+        :param step_table: table with a row per step.
+        :param get_manifest_step: function returning the step of a row of the
+        table as stored in the manifest of the camera movement, see
+        `CameraMovementManifest.create_step`, given the table and the row.
+        Its index must be the row.
+        :param order: rows of the table, in the order they are rendered. All
+        of them, in the order of the table, if not provided.
+        :param transitions: transitions between steps before and after
+        ordering them, see `Sweep.compare_transitions`. None if they weren't
+        counted.
+        """
+
+        log.info("Create instance of CameraMovementPlan class")
+        CallTrace.log(log, "CameraMovementPlan.__init__",
+                      sweep=sweep,
+                      step_table=step_table,
+                      get_manifest_step=get_manifest_step,
+                      order=order,
+                      transitions=transitions)
+
+        self.sweep = sweep
+        self.step_table = step_table
+        self._get_manifest_step = get_manifest_step
+        self.order = np.arange(len(step_table)) if order is None else np.asarray(order, dtype=np.int64)
+        self.culled = np.zeros(len(step_table), dtype=bool)
+        self.transitions = {} if transitions is None else transitions
+
+    def __len__(self):
+        return len(self.order)
+
+    def get_step(self, row: int) -> dict:
+        """
+        Get the value of every axis of the sweep in a step.
+
+        :param row: row of the step in the table.
+
+        :return: value of every axis, by name.
+        :rtype: dict
+        """
+
+        return self.step_table.get_step(row)
+
+    def get_manifest_step(self, row: int) -> dict:
+        """
+        Compose the step of a row as stored in the manifest.
+
+        :param row: row of the step in the table.
+
+        :return: dictionary describing the step, marked as culled if it is.
+        :rtype: dict
+        """
+
+        manifest_step = self._get_manifest_step(self.step_table, int(row))
+        if self.culled[row]:
+            manifest_step["culled"] = True
+
+        return manifest_step
+
+    def iter_manifest_steps(self, rows: np.ndarray = None) -> Iterator[dict]:
+        """
+        Compose the manifest steps of some rows as they are iterated.
+
+        :param rows: rows of the steps. Every step of the plan, in render
+        order, if not provided.
+
+        :return: iterator over the manifest steps, in the order of the rows.
+        :rtype: Iterator[dict]
+        """
+
+        if rows is None:
+            rows = self.order
+
+        return (self.get_manifest_step(row) for row in rows)
+
+    def cull(self, visible: np.ndarray, tag: bool) -> int:
+        """
+        Leave out of the render the steps that aren't visible. File paths
+        don't change, so renders get the same names they would get without
+        culling.
+
+        :param visible: whether every step of the plan, in render order, must
+        be rendered.
+        :param tag: True to keep the steps left out in the plan, marked as
+        culled, False to remove them from it.
+
+        :return: number of steps left out.
+        :rtype: int
+        """
+
+        visible = np.asarray(visible, dtype=bool)
+        culled_steps = len(visible) - int(np.count_nonzero(visible))
+        if tag:
+            self.culled[self.order[~visible]] = True
+        else:
+            self.order = self.order[visible]
+
+        return culled_steps
+
+    def get_renderable_rows(self) -> np.ndarray:
+        """
+        Get the rows of the steps that must be rendered, this is, not culled.
+
+        :return: rows, in render order.
+        :rtype: np.ndarray
+        """
+
+        return self.order[~self.culled[self.order]]
+
+    def iter_pending_rows(self, manifest: CameraMovementManifest, rows: np.ndarray) -> Iterator[int]:
+        """
+        Filter out the rows whose render is already saved, as they are
+        iterated, see `CameraMovementManifest.iter_pending_steps`.
+
+        :param manifest: manifest the renders are recorded in.
+        :param rows: rows to check.
+
+        :return: iterator over the rows that still have to be rendered, in
+        the same order.
+        :rtype: Iterator[int]
+        """
+
+        return (
+            manifest_step["index"]
+            for manifest_step in manifest.iter_pending_steps(self.iter_manifest_steps(rows)))
+
+    def get_pending_rows(self, manifest: CameraMovementManifest, rows: np.ndarray) -> np.ndarray:
+        """
+        Filter out the rows whose render is already saved, see
+        `iter_pending_rows`.
+
+        :param manifest: manifest the renders are recorded in.
+        :param rows: rows to check.
+
+        :return: rows that still have to be rendered, in the same order.
+        :rtype: np.ndarray
+        """
+
+        return np.fromiter(self.iter_pending_rows(manifest, rows), dtype=np.int64)
+
+    def find_shared_file_path(self) -> str:
+        """
+        Look for a file the render of several steps would be saved to. Paths
+        are hashed as they are composed, and only the ones whose hash repeats
+        are compared, so they are never kept in a list.
+
+        :return: file path shared by several steps, or None if every step
+        has its own file.
+        :rtype: str
+        """
+
+        log.info("Find shared file path")
+        log.debug("CameraMovementPlan.find_shared_file_path()")
+
+        hashes = np.fromiter(
+            (hash(manifest_step["filepath"]) for manifest_step in self.iter_manifest_steps()),
+            dtype=np.int64,
+            count=len(self.order))
+        unique_hashes, hash_counts = np.unique(hashes, return_counts=True)
+        repeated_hashes = unique_hashes[hash_counts > 1]
+        if len(repeated_hashes) == 0:
+            return None
+
+        file_paths = set()
+        for row in self.order[np.isin(hashes, repeated_hashes)]:
+            file_path = self.get_manifest_step(row)["filepath"]
+            if file_path in file_paths:
+                return file_path
+            file_paths.add(file_path)
+
+        return None
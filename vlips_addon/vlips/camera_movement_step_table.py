@@ -0,0 +1,151 @@
+import logging
+from typing import Iterable
+
+import numpy as np
+
+from .call_trace import CallTrace
+
+log = logging.getLogger(__name__)
+
+
+class CameraMovementStepTable:
+    """
+    Steps of a camera movement kept as a structured array, a row per step,
+    instead of a dictionary per step. Looking a step up is a matter of
+    indexing the array, and the numbering of the file of every step is
+    calculated once, for all of them, when the table is created.
+
+    Columns are those of the plan given, usually one per axis of the sweep of
+    the camera movement (see `Sweep.get_dtype`), followed by:
+
+    - file_index: index of the render among the steps with the same values in
+      the group fields. It starts over every time any of them changes.
+    - file_index_digits: digits the file index is padded to, those of the
+      largest index among the steps with the same values in the group fields.
+
+    Steps of sampled camera movements rarely share values, so their files may
+    be numbered by their position in the camera movement instead, see
+    `group_fields`.
+    """
+
+    FILE_DTYPE = np.dtype([
+        ("file_index", np.int32),
+        ("file_index_digits", np.int8)
+    ])
+
+    # Rows are converted in chunks, so an iterator over millions of steps
+    # never becomes a list of millions of tuples
+    CHUNK_SIZE = 65536
+
+    steps = None
+    fields = ()
+
+    def __init__(self, steps: np.ndarray, group_fields: [str] = ()):
+        """
+        Create an instance of the CameraMovementStepTable class, numbering the
+        file of every step.
+
+        :param steps: structured array with a row per step.
+        :param group_fields: columns whose runs of equal values the file index
+        starts over with. If empty, the file index is the position of the
+        step in the camera movement, padded to the digits of the last one, so
+        no two steps share it.
+        """
+
+        log.info("Create instance of CameraMovementStepTable class")
+        CallTrace.log(log, "CameraMovementStepTable.__init__",
+                      steps=steps,
+                      group_fields=group_fields)
+
+        self.fields = steps.dtype.names
+        self.steps = np.zeros(len(steps), dtype=steps.dtype.descr + CameraMovementStepTable.FILE_DTYPE.descr)
+        for field in self.fields:
+            self.steps[field] = steps[field]
+
+        if len(self.steps) == 0:
+            return
+
+        if not group_fields:
+            self.steps["file_index"] = np.arange(len(self.steps))
+            self.steps["file_index_digits"] = len(str(len(self.steps) - 1))
+            return
+
+        groups = self.steps[list(group_fields)]
+
+        # A file index starts over at the first step of every run of steps
+        # with the same values
+        run_starts = np.ones(len(self.steps), dtype=bool)
+        run_starts[1:] = groups[1:] != groups[:-1]
+        run_start_indices = np.flatnonzero(run_starts)
+        run_lengths = np.diff(np.append(run_start_indices, len(self.steps)))
+        self.steps["file_index"] = np.arange(len(self.steps)) - np.repeat(run_start_indices, run_lengths)
+
+        # Padding comes from every step sharing the values, not only from the
+        # ones in the same run
+        _, group_indices, group_sizes = np.unique(groups, return_inverse=True, return_counts=True)
+        group_digits = np.array([len(str(group_size - 1)) for group_size in group_sizes], dtype=np.int8)
+        self.steps["file_index_digits"] = group_digits[group_indices.reshape(-1)]
+
+    @staticmethod
+    def from_rows(rows: Iterable[tuple], dtype: np.dtype, group_fields: [str] = ()):
+        """
+        Create a table from the steps of a camera movement, as they are
+        iterated.
+
+        :param rows: values of each step, in the order of the columns.
+        :param dtype: columns of the plan, like the ones of `Sweep.get_dtype`.
+        :param group_fields: columns whose runs of equal values the file index
+        starts over with, see `__init__`.
+
+        :return: table with a row per step.
+        :rtype: CameraMovementStepTable
+        """
+
+        log.info("Create camera movement step table from rows")
+        log.debug("CameraMovementStepTable.from_rows()")
+
+        chunks = []
+        chunk = []
+        for row in rows:
+            chunk.append(tuple(row))
+            if len(chunk) == CameraMovementStepTable.CHUNK_SIZE:
+                chunks.append(np.array(chunk, dtype=dtype))
+                chunk = []
+        chunks.append(np.array(chunk, dtype=dtype))
+
+        return CameraMovementStepTable(np.concatenate(chunks), group_fields=group_fields)
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __getitem__(self, index):
+        """
+        Get a step, or several, of the table.
+
+        :param index: position of the step in the camera movement, or anything
+        NumPy arrays can be indexed with.
+
+        :return: row of the step, or structured array with the rows.
+        """
+
+        return self.steps[index]
+
+    def get_step(self, index: int) -> dict:
+        """
+        Describe a step as a dictionary with the value of every column of the
+        plan, as the sweep of the camera movement does. Values with several
+        components, like locations, are tuples.
+
+        :param index: position of the step in the camera movement.
+
+        :return: value of every column of the plan.
+        :rtype: dict
+        """
+
+        row = self.steps[index]
+        step = {}
+        for field in self.fields:
+            value = row[field].tolist()
+            step[field] = tuple(value) if isinstance(value, list) else value
+
+        return step
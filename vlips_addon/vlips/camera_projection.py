@@ -0,0 +1,211 @@
+import logging
+
+import numpy as np
+
+from .camera import Camera
+
+log = logging.getLogger(__name__)
+
+
+class CameraProjection:
+    """
+    Pinhole model of the camera simulated in Blender, used to find where
+    points in the scene show up in its renders.
+
+    The camera looks along its local -Z axis, with +Y pointing up and +X to
+    the right of the image, and its rotation is applied as Blender's XYZ
+    Euler rotation. The sensor width is fit to the larger side of the image,
+    as Blender does with automatic sensor fit, and the principal point is the
+    center of the image. Pixel coordinates start at the top left corner of the
+    image, so the center of the first pixel is (0.5, 0.5).
+    """
+
+    camera = None
+    image_width = 0  # pixels
+    image_height = 0  # pixels
+    focal_length_pixels = 0.0  # pixels
+    location = None  # millimeters
+    rotation_matrix = None
+
+    def __init__(
+            self,
+            camera: Camera,
+            image_width: int,
+            image_height: int
+    ):
+        """
+        Create an instance of the CameraProjection class for a camera and the
+        size of the images it renders.
+
+        :param camera: camera whose renders are projected, with its location in
+        millimeters and its rotation in degrees.
+        :param image_width: width of the renders, in pixels. It is the camera's
+        resolution height if the camera is in portrait orientation.
+        :param image_height: height of the renders, in pixels.
+        """
+
+        self.camera = camera
+        self.image_width = image_width
+        self.image_height = image_height
+        self.focal_length_pixels = CameraProjection.get_focal_length_pixels(camera, image_width, image_height)
+        self.location = np.asarray(camera.location, dtype=np.float64)
+        self.rotation_matrix = CameraProjection.get_rotation_matrix(camera.rotation)
+
+    @staticmethod
+    def get_focal_length_pixels(
+            camera: Camera,
+            image_width: int,
+            image_height: int
+    ) -> float:
+        """
+        Calculate the focal length of the camera in pixels of its renders.
+
+        :param camera: camera whose renders are projected.
+        :param image_width: width of the renders, in pixels.
+        :param image_height: height of the renders, in pixels.
+
+        :return: focal length, in pixels.
+        :rtype: float
+        """
+
+        sensor_width = camera.resolution_width * camera.pixel_size
+        return camera.focal_length * max(image_width, image_height) / sensor_width
+
+    @staticmethod
+    def get_rotation_matrix(rotation: (float, float, float)) -> np.ndarray:
+        """
+        Calculate the matrix of a rotation given as Blender's XYZ Euler angles,
+        this is, rotating around X first, then Y, then Z.
+
+        :param rotation: rotation around the X, Y, and Z axes, in degrees.
+
+        :return: 3x3 matrix transforming camera coordinates into world
+        coordinates.
+        :rtype: np.ndarray
+        """
+
+        return CameraProjection.get_rotation_matrices(np.array([rotation], dtype=np.float64))[0]
+
+    @staticmethod
+    def get_rotation_matrices(rotations: np.ndarray) -> np.ndarray:
+        """
+        Calculate the matrices of several rotations at once, as
+        `get_rotation_matrix` does.
+
+        :param rotations: array with shape (N, 3) with the rotation around the
+        X, Y, and Z axes, in degrees.
+
+        :return: array with shape (N, 3, 3).
+        :rtype: np.ndarray
+        """
+
+        x, y, z = np.radians(np.asarray(rotations, dtype=np.float64)).T
+        zeros = np.zeros_like(x)
+        ones = np.ones_like(x)
+        rotation_x = np.stack([
+            np.stack([ones, zeros, zeros], axis=-1),
+            np.stack([zeros, np.cos(x), -np.sin(x)], axis=-1),
+            np.stack([zeros, np.sin(x), np.cos(x)], axis=-1)], axis=-2)
+        rotation_y = np.stack([
+            np.stack([np.cos(y), zeros, np.sin(y)], axis=-1),
+            np.stack([zeros, ones, zeros], axis=-1),
+            np.stack([-np.sin(y), zeros, np.cos(y)], axis=-1)], axis=-2)
+        rotation_z = np.stack([
+            np.stack([np.cos(z), -np.sin(z), zeros], axis=-1),
+            np.stack([np.sin(z), np.cos(z), zeros], axis=-1),
+            np.stack([zeros, zeros, ones], axis=-1)], axis=-2)
+
+        return rotation_z @ rotation_y @ rotation_x
+
+    @staticmethod
+    def project_poses(
+            camera: Camera,
+            image_width: int,
+            image_height: int,
+            locations: np.ndarray,
+            rotations: np.ndarray,
+            points: np.ndarray
+    ) -> (np.ndarray, np.ndarray):
+        """
+        Project the same points from many camera poses at once. Only the
+        intrinsics of the camera are used: its location and rotation are
+        replaced by each pose.
+
+        :param camera: camera whose renders are projected.
+        :param image_width: width of the renders, in pixels.
+        :param image_height: height of the renders, in pixels.
+        :param locations: array with shape (N, 3) with the location of the
+        camera in each pose, in millimeters.
+        :param rotations: array with shape (N, 3) with the rotation of the
+        camera in each pose, in degrees.
+        :param points: array with shape (M, 3) with the points to project, in
+        world coordinates, in millimeters.
+
+        :return: array with shape (N, M, 2) with the column and row of each
+        point in the image of each pose, in pixels, and array with shape
+        (N, M) telling whether each point is in front of the camera.
+        :rtype: (np.ndarray, np.ndarray)
+        """
+
+        focal_length_pixels = CameraProjection.get_focal_length_pixels(camera, image_width, image_height)
+        rotation_matrices = CameraProjection.get_rotation_matrices(rotations)
+
+        offsets = np.asarray(points, dtype=np.float64)[np.newaxis, :, :] - \
+            np.asarray(locations, dtype=np.float64)[:, np.newaxis, :]
+        camera_points = np.einsum("nmi,nij->nmj", offsets, rotation_matrices)
+
+        depth = -camera_points[:, :, 2]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            image_points = np.stack((
+                image_width / 2 + focal_length_pixels * camera_points[:, :, 0] / depth,
+                image_height / 2 - focal_length_pixels * camera_points[:, :, 1] / depth), axis=-1)
+
+        return image_points, depth > 0
+
+    def to_camera(self, points: np.ndarray) -> np.ndarray:
+        """
+        Transform points from world coordinates into camera coordinates.
+
+        :param points: array with shape (N, 3), in millimeters.
+
+        :return: array with shape (N, 3), in millimeters. Points in front of
+        the camera have a negative Z coordinate.
+        :rtype: np.ndarray
+        """
+
+        return (np.asarray(points, dtype=np.float64) - self.location) @ self.rotation_matrix
+
+    def project_camera_points(self, points: np.ndarray) -> np.ndarray:
+        """
+        Project points given in camera coordinates onto the image. Points
+        must be in front of the camera.
+
+        :param points: array with shape (N, 3), in millimeters.
+
+        :return: array with shape (N, 2) with the column and row of each
+        point in the image, in pixels.
+        :rtype: np.ndarray
+        """
+
+        depth = -points[:, 2]
+        return np.column_stack((
+            self.image_width / 2 + self.focal_length_pixels * points[:, 0] / depth,
+            self.image_height / 2 - self.focal_length_pixels * points[:, 1] / depth))
+
+    def project(self, points: np.ndarray) -> (np.ndarray, np.ndarray):
+        """
+        Project points given in world coordinates onto the image.
+
+        :param points: array with shape (N, 3), in millimeters.
+
+        :return: array with shape (N, 2) with the column and row of each
+        point in the image, in pixels, and array with shape (N,) telling
+        whether each point is in front of the camera. The image coordinates of
+        the points behind the camera are meaningless.
+        :rtype: (np.ndarray, np.ndarray)
+        """
+
+        camera_points = self.to_camera(points)
+        in_front = camera_points[:, 2] < 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.project_camera_points(camera_points), in_front
@@ -4,6 +4,12 @@ TILE_SIDE = 0.05  # meters
 FLOOR_SIDE_TILES = 32  # tiles
 LED_PANEL_WIDTH = 0.173  # meters
 
+# Camera
+
+# Rotation of the simulated camera when it faces the ceiling, before applying
+# its rotation X and Z angles. Must match the add-on's default camera rotation
+CAMERA_DEFAULT_ROTATION = (180.0, 0.0, 180.0)  # degrees
+
 # Smartphone
 
 
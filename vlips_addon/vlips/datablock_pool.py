@@ -0,0 +1,82 @@
+import logging
+
+from .call_trace import CallTrace
+
+log = logging.getLogger(__name__)
+
+
+class DatablockPool:
+    """
+    Blender datablocks (objects, meshes, materials...) created once and reused
+    by every later call that asks for them, so updating the scene on every step
+    of a camera movement doesn't leave thousands of orphan datablocks behind.
+
+    Datablocks removed from Blender since they were created are detected, as
+    accessing them raises ReferenceError, and created again.
+    """
+
+    def __init__(self):
+        """
+        Create an instance of the DatablockPool class, empty.
+        """
+
+        log.info("Create instance of DatablockPool class")
+        log.debug("DatablockPool.__init__()")
+
+        self._datablocks = {}
+
+    def get(self, kind: str, name: str, create):
+        """
+        Return the datablock of a kind with a name, creating it the first time
+        it is asked for.
+
+        :param kind: kind of datablock, like "mesh" or "material", so
+        datablocks of different kinds can share their name.
+        :param name: name of the datablock.
+        :param create: function without arguments that creates the datablock.
+
+        :return: datablock.
+        """
+
+        key = (kind, name)
+        datablock = self._datablocks.get(key)
+        if datablock is not None and DatablockPool.is_valid(datablock):
+            return datablock
+
+        CallTrace.log(log, "DatablockPool.get",
+                      kind=kind,
+                      name=name)
+
+        datablock = create()
+        self._datablocks[key] = datablock
+        return datablock
+
+    def clear(self):
+        """
+        Forget every datablock, as when the scene is emptied.
+        """
+
+        log.info("Clear datablock pool")
+        log.debug("DatablockPool.clear()")
+
+        self._datablocks.clear()
+
+    def __len__(self):
+        return len(self._datablocks)
+
+    @staticmethod
+    def is_valid(datablock) -> bool:
+        """
+        Tell whether a datablock still exists in Blender.
+
+        :param datablock: datablock.
+
+        :return: True if the datablock hasn't been removed.
+        :rtype: bool
+        """
+
+        try:
+            datablock.name
+        except ReferenceError:
+            return False
+        return True
@@ -4,6 +4,9 @@ import logging
 import piexif
 import piexif.helper
 
+from .call_trace import CallTrace
+from .region_of_interest import RegionOfInterest
+
 log = logging.getLogger(__name__)
 
 
@@ -18,10 +21,10 @@ class ExifReader:
         """
 
         log.info("Get a string representation of the camera")
-        log.debug(f"__init__("
-                  f"filepath={filepath})")
+        CallTrace.log(log, "__init__",
+                      filepath=filepath)
 
-        self.filepath = filepath
+        self.file_path = filepath
 
     def get_user_comment(self) -> dict:
         """
@@ -39,3 +42,21 @@ class ExifReader:
         user_comment_dictionary = json.loads(user_comment_string)
 
         return user_comment_dictionary
+
+    def get_crop(self) -> RegionOfInterest:
+        """
+        Load the region of the full render the image was cropped to.
+
+        :return: region the image was cropped to, or None if the image shows
+        the full render.
+        :rtype: RegionOfInterest
+        """
+
+        log.info("Get crop from EXIF data")
+        log.debug("get_crop()")
+
+        crop = self.get_user_comment().get("crop")
+        if crop is None:
+            return None
+
+        return RegionOfInterest.from_dict(crop)
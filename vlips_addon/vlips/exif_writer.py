@@ -1,11 +1,18 @@
+import io
 import json
 import logging
+import os
+import tempfile
 
+import numpy as np
 import piexif
 import piexif.helper
+from PIL import Image
 
 from .beacon import Beacon
+from .call_trace import CallTrace
 from .camera import Camera
+from .region_of_interest import RegionOfInterest
 from .scene import Scene
 
 log = logging.getLogger(__name__)
@@ -13,7 +20,8 @@ log = logging.getLogger(__name__)
 
 class ExifWriter:
     """
-    user_comment -> dictionary with miscellaneous information
+    user_comment -> dictionary with miscellaneous information. Images cropped
+    to a region of interest include the region, under the "crop" key.
     """
 
     @staticmethod
@@ -21,7 +29,8 @@ class ExifWriter:
             filepath: str,
             scene: Scene,
             beacon: Beacon,
-            camera: Camera):
+            camera: Camera,
+            crop: RegionOfInterest = None):
         """
         Save the data from the classes passed as parameters as EXIF data in the
         file which path has been indicated.
@@ -30,20 +39,113 @@ class ExifWriter:
         :param scene: instance of class Scene, with details about the scene.
         :param beacon: instance of class Beacon, with details about the beacon.
         :param camera: instance of class Camera, with details about the camera.
+        :param crop: region of the full render the image was cropped to.
+        Optional.
         """
 
         log.info(f"Save EXIF data to render file")
-        log.debug(f"ExifWriter.save_exif_data("
-                  f"filepath={filepath}, "
-                  f"scene={scene}, "
-                  f"beacon={beacon}, "
-                  f"camera={camera})")
+        CallTrace.log(log, "ExifWriter.save_exif_data",
+                      filepath=filepath,
+                      scene=scene,
+                      beacon=beacon,
+                      camera=camera,
+                      crop=crop)
+
+        exif_bytes = ExifWriter.get_exif_bytes(
+            scene=scene,
+            beacon=beacon,
+            camera=camera,
+            crop=crop)
+
+        piexif.insert(exif_bytes, filepath)
+
+    @staticmethod
+    def save_image(
+            filepath: str,
+            pixels: np.ndarray,
+            scene: Scene,
+            beacon: Beacon,
+            camera: Camera,
+            crop: RegionOfInterest = None,
+            quality: int = 100):
+        """
+        Encode an image held in memory as a JPEG file that already includes the
+        EXIF data, so the file is written only once. The file is written to a
+        temporary file first and then renamed, so a JPEG without EXIF data, or
+        a truncated one, never shows up with the final name. Missing folders
+        are created, as Blender does when it saves a render.
+
+        :param filepath: path to the file where the image must be saved.
+        :param pixels: RGB pixels of the image as an array of unsigned bytes,
+        with shape (height, width, 3), top row first.
+        :param scene: instance of class Scene, with details about the scene.
+        :param beacon: instance of class Beacon, with details about the beacon.
+        :param camera: instance of class Camera, with details about the camera.
+        :param crop: region of the full render the image was cropped to.
+        Optional.
+        :param quality: JPEG quality, from 0 to 100.
+        """
+
+        log.info(f"Save image with EXIF data")
+        CallTrace.log(log, "ExifWriter.save_image",
+                      filepath=filepath,
+                      pixels=pixels.shape,
+                      scene=scene,
+                      beacon=beacon,
+                      camera=camera,
+                      crop=crop,
+                      quality=quality)
+
+        exif_bytes = ExifWriter.get_exif_bytes(
+            scene=scene,
+            beacon=beacon,
+            camera=camera,
+            crop=crop)
+
+        buffer = io.BytesIO()
+        Image.fromarray(pixels, "RGB").save(buffer, "JPEG", quality=quality, exif=exif_bytes)
+
+        directory, file_name = os.path.split(os.path.abspath(filepath))
+        os.makedirs(directory, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=directory,
+            prefix=f".{file_name}.",
+            suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                file.write(buffer.getbuffer())
+            os.replace(temporary_path, filepath)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+    @staticmethod
+    def get_exif_bytes(
+            scene: Scene,
+            beacon: Beacon,
+            camera: Camera,
+            crop: RegionOfInterest = None) -> bytes:
+        """
+        Compose the EXIF data describing a render.
+
+        :param scene: instance of class Scene, with details about the scene.
+        :param beacon: instance of class Beacon, with details about the beacon.
+        :param camera: instance of class Camera, with details about the camera.
+        :param crop: region of the full render the image was cropped to.
+        Optional.
+
+        :return: EXIF data, ready to be inserted in a JPEG file.
+        :rtype: bytes
+        """
 
         user_comment = {
             "scene": scene.as_dict(),
             "beacon": beacon.as_dict(),
             "camera": camera.as_dict()
         }
+        if crop is not None:
+            user_comment["crop"] = crop.as_dict()
 
         exif_dictionary = {
             "0th": {
@@ -57,10 +159,9 @@ class ExifWriter:
             }
         }
 
-        exif_bytes = piexif.dump(exif_dictionary)
-        log.debug(f"exif_dictionary: {exif_dictionary}")
+        log.debug("exif_dictionary: %s", exif_dictionary)
 
-        piexif.insert(exif_bytes, filepath)
+        return piexif.dump(exif_dictionary)
 
     @staticmethod
     def replace_in_user_comment(
@@ -75,10 +176,10 @@ class ExifWriter:
         """
 
         log.info(f"Replace string in user comment")
-        log.debug(f"ExifWriter.replace_in_user_comment("
-                  f"filepath={file_path}, "
-                  f"scene={old_value}, "
-                  f"beacon={new_value})")
+        CallTrace.log(log, "ExifWriter.replace_in_user_comment",
+                      filepath=file_path,
+                      scene=old_value,
+                      beacon=new_value)
 
         exif_dictionary = piexif.load(file_path)
         user_comment_string: str = piexif.helper.UserComment.load(exif_dictionary["Exif"][piexif.ExifIFD.UserComment])
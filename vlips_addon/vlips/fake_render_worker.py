@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import os
+
+from PIL import Image
+
+from .call_trace import CallTrace
+from .camera_movement_manifest import CameraMovementManifest
+from .render_job_protocol import RenderJobProtocol
+
+log = logging.getLogger(__name__)
+
+
+class FakeRenderWorker:
+    """
+    Render worker speaking the same protocol as render_worker.py, without
+    Blender, to test and develop clients. Poses take a fixed time to "render",
+    and their renders are blank images, if saved at all.
+    """
+
+    DEFAULT_ROOM_HEIGHT = 2500  # millimeters
+
+    def __init__(
+            self,
+            render_time: float = 0.0,
+            fail_indices: [int] = (),
+            save_images: bool = False,
+            room_height: float = DEFAULT_ROOM_HEIGHT
+    ):
+        """
+        Create an instance of the FakeRenderWorker class, not listening yet.
+
+        :param render_time: time each pose takes to render, in seconds.
+        :param fail_indices: indices of the poses of every job that fail.
+        :param save_images: save a blank JPEG for every render.
+        :param room_height: height of the room, to get the Z location of the
+        camera.
+        """
+
+        log.info("Create instance of FakeRenderWorker class")
+        CallTrace.log(log, "FakeRenderWorker.__init__",
+                      render_time=render_time,
+                      fail_indices=fail_indices,
+                      save_images=save_images,
+                      room_height=room_height)
+
+        self.render_time = render_time
+        self.fail_indices = set(fail_indices)
+        self.save_images = save_images
+        self.room_height = room_height
+
+        # Jobs received, and the most that were waiting or rendering at once
+        self.jobs = []
+        self.max_pending_jobs = 0
+
+        self._pending_jobs = 0
+        self._server = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    @property
+    def address(self) -> (str, int):
+        """
+        Host and port the worker listens on.
+
+        :return: host and port.
+        :rtype: (str, int)
+        """
+
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self, host: str = RenderJobProtocol.DEFAULT_HOST, port: int = 0):
+        """
+        Start listening for connections.
+
+        :param host: address to listen on.
+        :param port: port to listen on, or 0 to pick a free one.
+        """
+
+        self._server = await asyncio.start_server(self._serve_connection, host, port)
+
+    async def close(self):
+        """
+        Stop listening for connections.
+        """
+
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Read the jobs sent over a connection, rendering them in order, as a
+        real worker does.
+        """
+
+        jobs = asyncio.Queue()
+        renderer = asyncio.create_task(self._render_jobs(jobs, writer))
+        try:
+            while line := await reader.readline():
+                try:
+                    message = RenderJobProtocol.decode(line)
+                    if message["type"] == RenderJobProtocol.MessageType.RENDER:
+                        RenderJobProtocol.validate_job(message)
+                except ValueError as error:
+                    await self._send(writer, type=RenderJobProtocol.MessageType.ERROR, error=str(error))
+                    continue
+
+                if message["type"] == RenderJobProtocol.MessageType.PING:
+                    await self._send(writer, type=RenderJobProtocol.MessageType.PONG)
+                elif message["type"] == RenderJobProtocol.MessageType.SHUTDOWN:
+                    self._server.close()
+                    break
+                elif message["type"] == RenderJobProtocol.MessageType.RENDER:
+                    self.jobs.append(message)
+                    self._pending_jobs += 1
+                    self.max_pending_jobs = max(self.max_pending_jobs, self._pending_jobs)
+                    jobs.put_nowait(message)
+        except ConnectionError:
+            pass
+        finally:
+            renderer.cancel()
+            writer.close()
+
+    async def _render_jobs(self, jobs: asyncio.Queue, writer: asyncio.StreamWriter):
+        """
+        Render the jobs of a connection, one after the other.
+        """
+
+        while True:
+            job = await jobs.get()
+            job_id = job["job_id"]
+            await self._send(writer, type=RenderJobProtocol.MessageType.START, job_id=job_id, total=len(job["poses"]))
+
+            rendered = 0
+            failed = 0
+            file_paths = RenderJobProtocol.get_file_paths(job)
+            for index, (pose, filepath) in enumerate(zip(job["poses"], file_paths)):
+                await asyncio.sleep(self.render_time)
+                step = CameraMovementManifest.create_step(
+                    index=index,
+                    filepath=filepath,
+                    camera_location=(pose["x"], pose["y"], self.room_height - pose["distance"]),
+                    rotation_x_angle=pose["rotation_x_angle"],
+                    rotation_z_angle=pose["rotation_z_angle"])
+                if index in self.fail_indices:
+                    failed += 1
+                    await self._send(writer, type=RenderJobProtocol.MessageType.FAILURE, job_id=job_id,
+                                     step=step, error="Fake render failure")
+                    continue
+
+                if self.save_images:
+                    os.makedirs(job["output_path"], exist_ok=True)
+                    Image.new("RGB", (8, 8)).save(filepath, "JPEG")
+                rendered += 1
+                await self._send(writer, type=RenderJobProtocol.MessageType.STEP, job_id=job_id, step=step)
+
+            self._pending_jobs -= 1
+            await self._send(writer, type=RenderJobProtocol.MessageType.FINISH, job_id=job_id,
+                             rendered=rendered, failed=failed, elapsed_time=self.render_time * len(job["poses"]))
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, **message):
+        writer.write(RenderJobProtocol.encode(message))
+        await writer.drain()
@@ -0,0 +1,227 @@
+import logging
+import queue
+import threading
+import time
+
+import numpy as np
+
+from .beacon import Beacon
+from .call_trace import CallTrace
+from .camera import Camera
+from .exif_writer import ExifWriter
+from .region_of_interest import RegionOfInterest
+from .scene import Scene
+from .stage_timer import StageTimer
+
+log = logging.getLogger(__name__)
+
+
+class ImageWriterPool:
+    """
+    Save renders and their EXIF data from background threads, so the process
+    rendering them doesn't wait for the disk.
+
+    Jobs wait in a bounded queue: handing one off blocks while the queue is
+    full, so renders never pile up in memory faster than they can be saved.
+    Saved and failed jobs are collected by the caller with `collect`, and
+    `flush` waits until every job handed off has been processed.
+    """
+
+    DEFAULT_WORKERS = 2
+    DEFAULT_QUEUE_SIZE = 8
+
+    def __init__(
+            self,
+            workers: int = DEFAULT_WORKERS,
+            queue_size: int = DEFAULT_QUEUE_SIZE,
+            stage_timer: StageTimer = None
+    ):
+        """
+        Create an instance of the ImageWriterPool class and start its threads.
+
+        :param workers: number of threads saving images.
+        :param queue_size: number of jobs that can wait to be processed before
+        handing off a new one blocks.
+        :param stage_timer: timer the jobs, and the waits for room in the
+        queue, are accounted to. Optional.
+        """
+
+        log.info("Create instance of ImageWriterPool class")
+        CallTrace.log(log, "ImageWriterPool.__init__",
+                      workers=workers,
+                      queue_size=queue_size,
+                      stage_timer=stage_timer)
+
+        if workers < 1:
+            raise ValueError("An image writer pool needs at least one worker")
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._saved = []
+        self._failures = []
+        self._closed = False
+        self._stage_timer = stage_timer
+        self._threads = [
+            threading.Thread(target=self._work, name=f"ImageWriterPool-{index}", daemon=True)
+            for index in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def save_image(
+            self,
+            filepath: str,
+            pixels: np.ndarray,
+            scene: Scene,
+            beacon: Beacon,
+            camera: Camera,
+            crop: RegionOfInterest = None,
+            tag=None
+    ):
+        """
+        Hand off an image to be encoded and saved with its EXIF data, as
+        `ExifWriter.save_image` does. Blocks while the queue is full.
+
+        :param filepath: path to the file where the image must be saved.
+        :param pixels: RGB pixels of the image as an array of unsigned bytes,
+        with shape (height, width, 3), top row first. It must not be modified
+        afterwards.
+        :param scene: instance of class Scene, with details about the scene.
+        :param beacon: instance of class Beacon, with details about the beacon.
+        :param camera: instance of class Camera, with details about the camera.
+        :param crop: region of the full render the image was cropped to.
+        Optional.
+        :param tag: value returned by `collect` once the job is processed.
+        The file path, if not provided.
+        """
+
+        self._put(
+            tag=filepath if tag is None else tag,
+            function=ExifWriter.save_image,
+            arguments={
+                "filepath": filepath, "pixels": pixels, "scene": scene, "beacon": beacon, "camera": camera,
+                "crop": crop})
+
+    def save_exif_data(
+            self,
+            filepath: str,
+            scene: Scene,
+            beacon: Beacon,
+            camera: Camera,
+            crop: RegionOfInterest = None,
+            tag=None
+    ):
+        """
+        Hand off an image already saved to get its EXIF data, as
+        `ExifWriter.save_exif_data` does. Blocks while the queue is full.
+
+        :param filepath: path to the file where the data must be stored.
+        :param scene: instance of class Scene, with details about the scene.
+        :param beacon: instance of class Beacon, with details about the beacon.
+        :param camera: instance of class Camera, with details about the camera.
+        :param crop: region of the full render the image was cropped to.
+        Optional.
+        :param tag: value returned by `collect` once the job is processed.
+        The file path, if not provided.
+        """
+
+        self._put(
+            tag=filepath if tag is None else tag,
+            function=ExifWriter.save_exif_data,
+            arguments={"filepath": filepath, "scene": scene, "beacon": beacon, "camera": camera, "crop": crop})
+
+    def collect(self) -> ([object], [(object, Exception)]):
+        """
+        Get the jobs processed since the last call.
+
+        :return: tags of the jobs saved, and tags of the jobs that failed
+        paired with the exception they raised.
+        :rtype: ([object], [(object, Exception)])
+        """
+
+        with self._lock:
+            saved, self._saved = self._saved, []
+            failures, self._failures = self._failures, []
+
+        return saved, failures
+
+    def flush(self):
+        """
+        Wait until every job handed off has been processed.
+        """
+
+        log.info("Flush image writer pool")
+        log.debug("ImageWriterPool.flush()")
+
+        self._queue.join()
+
+    def close(self):
+        """
+        Process every job handed off and stop the threads. Jobs can't be
+        handed off afterwards, but the last ones can still be collected.
+        """
+
+        log.info("Close image writer pool")
+        log.debug("ImageWriterPool.close()")
+
+        if self._closed:
+            return
+
+        self.flush()
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _put(self, tag, function, arguments: dict):
+        """
+        Queue a job, waiting for room if the queue is full.
+
+        :param tag: value returned by `collect` once the job is processed.
+        :param function: function saving the image.
+        :param arguments: keyword arguments of the function.
+        """
+
+        if self._closed:
+            raise RuntimeError("The image writer pool is closed")
+
+        if self._stage_timer is None:
+            self._queue.put((tag, function, arguments))
+            return
+
+        with self._stage_timer.stage("writer_queue_wait"):
+            self._queue.put((tag, function, arguments))
+
+    def _work(self):
+        """
+        Process jobs until a None job is found.
+        """
+
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+
+                tag, function, arguments = job
+                start_time = time.perf_counter()
+                try:
+                    function(**arguments)
+                except Exception as error:
+                    log.error(f"Saving {arguments['filepath']} failed: {error}")
+                    with self._lock:
+                        self._failures.append((tag, error))
+                else:
+                    with self._lock:
+                        self._saved.append(tag)
+                finally:
+                    if self._stage_timer is not None:
+                        self._stage_timer.record(function.__name__, time.perf_counter() - start_time)
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,137 @@
+import logging
+
+import numpy as np
+
+from .call_trace import CallTrace
+
+log = logging.getLogger(__name__)
+
+
+class MeshGeometry:
+    """
+    Vertices and faces of the meshes of the scene, as flat NumPy buffers ready
+    to be copied into a Blender mesh with foreach_set, instead of adding
+    primitives with Blender's operators.
+
+    Meshes have side 2 and are centered at the origin, like Blender's
+    primitives, so they are sized by the dimensions of their object.
+    """
+
+    def __init__(self, vertices: np.ndarray, faces: np.ndarray):
+        """
+        Create an instance of the MeshGeometry class.
+
+        :param vertices: X, Y, and Z coordinates of each vertex, one row per
+        vertex.
+        :param faces: indices of the vertices of each face, counterclockwise,
+        one row per face. Every face has the same number of vertices.
+        """
+
+        CallTrace.log(log, "MeshGeometry.__init__",
+                      vertices=vertices,
+                      faces=faces)
+
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float32)
+        self.faces = np.ascontiguousarray(faces, dtype=np.int32)
+
+    @property
+    def coordinates(self) -> np.ndarray:
+        """
+        Coordinates of the vertices, flattened, as foreach_set expects for the
+        "co" attribute of the vertices.
+
+        :return: coordinates of the vertices.
+        :rtype: np.ndarray
+        """
+
+        return self.vertices.ravel()
+
+    @property
+    def loop_vertex_indices(self) -> np.ndarray:
+        """
+        Index of the vertex of each loop, this is, each corner of each face.
+
+        :return: vertex indices of the loops.
+        :rtype: np.ndarray
+        """
+
+        return self.faces.ravel()
+
+    @property
+    def loop_starts(self) -> np.ndarray:
+        """
+        Index of the first loop of each face.
+
+        :return: loop starts of the faces.
+        :rtype: np.ndarray
+        """
+
+        return np.arange(0, self.faces.size, self.faces.shape[1], dtype=np.int32)
+
+    @property
+    def loop_totals(self) -> np.ndarray:
+        """
+        Number of loops of each face.
+
+        :return: loop totals of the faces.
+        :rtype: np.ndarray
+        """
+
+        return np.full(len(self.faces), self.faces.shape[1], dtype=np.int32)
+
+    @staticmethod
+    def get_grid(x_subdivisions: int = 1, y_subdivisions: int = 1) -> "MeshGeometry":
+        """
+        Return a flat grid on the XY plane, with a quad per tile. With a
+        single subdivision along each axis, it is a plane.
+
+        :param x_subdivisions: faces of the grid along its X axis.
+        :param y_subdivisions: faces of the grid along its Y axis.
+
+        :return: geometry of the grid.
+        :rtype: MeshGeometry
+        """
+
+        CallTrace.log(log, "MeshGeometry.get_grid",
+                      x_subdivisions=x_subdivisions,
+                      y_subdivisions=y_subdivisions)
+
+        if x_subdivisions < 1 or y_subdivisions < 1:
+            raise ValueError("Grids must have at least one subdivision along each axis")
+
+        x_vertices = x_subdivisions + 1
+        y_vertices = y_subdivisions + 1
+        x, y = np.meshgrid(np.linspace(-1, 1, x_vertices), np.linspace(-1, 1, y_vertices))
+        vertices = np.column_stack((x.ravel(), y.ravel(), np.zeros(x.size)))
+
+        # Faces start at the lower left corner of each tile
+        corners = (np.arange(y_subdivisions)[:, None] * x_vertices + np.arange(x_subdivisions)).ravel()
+        faces = np.column_stack((corners, corners + 1, corners + x_vertices + 1, corners + x_vertices))
+
+        return MeshGeometry(vertices, faces)
+
+    @staticmethod
+    def get_cube() -> "MeshGeometry":
+        """
+        Return a cube, with its faces pointing outwards.
+
+        :return: geometry of the cube.
+        :rtype: MeshGeometry
+        """
+
+        log.info("Get cube geometry")
+        log.debug("MeshGeometry.get_cube()")
+
+        # Vertex index bits are the X, Y, and Z signs
+        vertices = np.array([
+            ((index >> 2) & 1, (index >> 1) & 1, index & 1)
+            for index in range(8)], dtype=np.float32) * 2 - 1
+        faces = np.array([
+            (0, 1, 3, 2),  # -X
+            (4, 6, 7, 5),  # +X
+            (0, 4, 5, 1),  # -Y
+            (2, 3, 7, 6),  # +Y
+            (0, 2, 6, 4),  # -Z
+            (1, 5, 7, 3)])  # +Z
+
+        return MeshGeometry(vertices, faces)
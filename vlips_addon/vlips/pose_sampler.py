@@ -0,0 +1,222 @@
+import logging
+from enum import Enum
+
+import numpy as np
+
+from .call_trace import CallTrace
+
+log = logging.getLogger(__name__)
+
+
+class PoseSampler:
+    """
+    Draw points spread evenly over a box, so a few of them describe the whole
+    parameter space of a camera movement as well as a full grid would.
+
+    Points are drawn in the unit hypercube and then scaled to the bounds of
+    each dimension. With the same seed, the same points are drawn. Only NumPy
+    is used, since Blender's Python doesn't include SciPy.
+    """
+
+    class Method(str, Enum):
+        SOBOL = "sobol"
+        HALTON = "halton"
+        LATIN_HYPERCUBE = "latin_hypercube"
+
+    # Primitive polynomials (degree, coefficients) and initial direction
+    # numbers of the first Sobol dimensions, from Joe and Kuo. The first
+    # dimension has no polynomial: every direction number is 1, shifted to
+    # its bit, which gives the van der Corput sequence in base 2
+    SOBOL_PARAMETERS = [
+        (0, 0, []),
+        (1, 0, [1]),
+        (2, 1, [1, 3]),
+        (3, 1, [1, 3, 1]),
+        (3, 2, [1, 1, 1]),
+        (4, 1, [1, 1, 3, 3]),
+        (4, 4, [1, 3, 5, 13]),
+        (5, 2, [1, 1, 5, 5, 17])
+    ]
+    SOBOL_BITS = 32
+    HALTON_BASES = [2, 3, 5, 7, 11, 13, 17, 19]
+
+    method = Method.SOBOL
+    seed = 0
+
+    def __init__(
+            self,
+            method=method,
+            seed=seed
+    ):
+        """
+        Create an instance of the PoseSampler class.
+
+        :param method: sampling method.
+        :param seed: seed of the random scrambling of the points. The same
+        seed always gives the same points.
+        """
+
+        log.info("Create instance of PoseSampler class")
+        CallTrace.log(log, "PoseSampler.__init__",
+                      method=method,
+                      seed=seed)
+
+        self.method = PoseSampler.Method(method)
+        self.seed = seed
+
+    def sample(self, count: int, bounds: [(float, float)]) -> np.ndarray:
+        """
+        Draw points inside a box.
+
+        :param count: number of points.
+        :param bounds: lower and upper limit of each dimension.
+
+        :return: array with shape (count, dimensions).
+        :rtype: np.ndarray
+        """
+
+        log.info("Sample poses")
+        CallTrace.log(log, "PoseSampler.sample",
+                      count=count,
+                      bounds=bounds)
+
+        bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 2)
+        points = self.sample_unit(count, len(bounds))
+
+        return bounds[:, 0] + points * (bounds[:, 1] - bounds[:, 0])
+
+    def sample_unit(self, count: int, dimensions: int) -> np.ndarray:
+        """
+        Draw points inside the unit hypercube.
+
+        :param count: number of points.
+        :param dimensions: number of dimensions.
+
+        :return: array with shape (count, dimensions), with values in [0, 1).
+        :rtype: np.ndarray
+        """
+
+        random_generator = np.random.default_rng(self.seed)
+        if self.method == PoseSampler.Method.SOBOL:
+            return PoseSampler.get_sobol_points(count, dimensions, random_generator)
+        elif self.method == PoseSampler.Method.HALTON:
+            return PoseSampler.get_halton_points(count, dimensions, random_generator)
+        else:
+            return PoseSampler.get_latin_hypercube_points(count, dimensions, random_generator)
+
+    @staticmethod
+    def get_sobol_points(
+            count: int,
+            dimensions: int,
+            random_generator: np.random.Generator = None
+    ) -> np.ndarray:
+        """
+        Draw the first points of the Sobol sequence. Points are scrambled with
+        a random digital shift if a random generator is given, which keeps
+        their distribution.
+
+        :param count: number of points.
+        :param dimensions: number of dimensions.
+        :param random_generator: generator of the digital shift. Optional.
+
+        :return: array with shape (count, dimensions), with values in [0, 1).
+        :rtype: np.ndarray
+        """
+
+        if dimensions > len(PoseSampler.SOBOL_PARAMETERS):
+            raise ValueError(f"Sobol points have at most {len(PoseSampler.SOBOL_PARAMETERS)} dimensions")
+        if count > 2 ** PoseSampler.SOBOL_BITS:
+            raise ValueError(f"Sobol points are limited to 2^{PoseSampler.SOBOL_BITS}")
+
+        bits = PoseSampler.SOBOL_BITS
+        indices = np.arange(count, dtype=np.uint64)
+        gray_codes = indices ^ (indices >> np.uint64(1))
+
+        points = np.zeros((count, dimensions), dtype=np.uint64)
+        for dimension in range(dimensions):
+            degree, coefficients, initial_numbers = PoseSampler.SOBOL_PARAMETERS[dimension]
+            if degree == 0:
+                direction_numbers = [1 << (bits - k) for k in range(1, bits + 1)]
+            else:
+                direction_numbers = [number << (bits - k) for k, number in enumerate(initial_numbers, start=1)]
+                for k in range(degree, bits):
+                    number = direction_numbers[k - degree] ^ (direction_numbers[k - degree] >> degree)
+                    for i in range(1, degree):
+                        if (coefficients >> (degree - 1 - i)) & 1:
+                            number ^= direction_numbers[k - i]
+                    direction_numbers.append(number)
+
+            # Each point is the XOR of the direction numbers of the bits set
+            # in the Gray code of its index
+            for k, number in enumerate(direction_numbers):
+                has_bit = (gray_codes >> np.uint64(k)) & np.uint64(1) == np.uint64(1)
+                points[has_bit, dimension] ^= np.uint64(number)
+
+        if random_generator is not None:
+            points ^= random_generator.integers(0, 2 ** bits, size=dimensions, dtype=np.uint64)
+
+        return points.astype(np.float64) / 2 ** bits
+
+    @staticmethod
+    def get_halton_points(
+            count: int,
+            dimensions: int,
+            random_generator: np.random.Generator = None
+    ) -> np.ndarray:
+        """
+        Draw the first points of the Halton sequence, skipping the origin.
+        Points are shifted by a random offset, modulo 1, if a random generator
+        is given.
+
+        :param count: number of points.
+        :param dimensions: number of dimensions.
+        :param random_generator: generator of the random offset. Optional.
+
+        :return: array with shape (count, dimensions), with values in [0, 1).
+        :rtype: np.ndarray
+        """
+
+        if dimensions > len(PoseSampler.HALTON_BASES):
+            raise ValueError(f"Halton points have at most {len(PoseSampler.HALTON_BASES)} dimensions")
+
+        points = np.zeros((count, dimensions), dtype=np.float64)
+        for dimension, base in enumerate(PoseSampler.HALTON_BASES[:dimensions]):
+            # Radical inverse: the digits of the index mirrored around the
+            # decimal point
+            indices = np.arange(1, count + 1, dtype=np.int64)
+            scale = 1.0
+            while np.any(indices > 0):
+                scale /= base
+                points[:, dimension] += (indices % base) * scale
+                indices //= base
+
+        if random_generator is not None:
+            points = (points + random_generator.random(dimensions)) % 1.0
+
+        return points
+
+    @staticmethod
+    def get_latin_hypercube_points(
+            count: int,
+            dimensions: int,
+            random_generator: np.random.Generator = None
+    ) -> np.ndarray:
+        """
+        Draw points so each dimension, split into as many strata as points,
+        has exactly one point in each stratum.
+
+        :param count: number of points.
+        :param dimensions: number of dimensions.
+        :param random_generator: generator of the strata order and of the
+        location of each point inside its stratum. Optional.
+
+        :return: array with shape (count, dimensions), with values in [0, 1).
+        :rtype: np.ndarray
+        """
+
+        if random_generator is None:
+            random_generator = np.random.default_rng()
+
+        strata = np.column_stack([random_generator.permutation(count) for _ in range(dimensions)]) \
+            if dimensions > 0 else np.zeros((count, 0))
+        return (strata + random_generator.random((count, dimensions))) / count
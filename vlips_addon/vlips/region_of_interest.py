@@ -0,0 +1,242 @@
+import logging
+import math
+
+import numpy as np
+
+from .analytic_renderer import AnalyticRenderer
+from .beacon import Beacon
+from .call_trace import CallTrace
+from .camera import Camera
+from .camera_projection import CameraProjection
+
+log = logging.getLogger(__name__)
+
+
+class RegionOfInterest:
+    """
+    Rectangle of a render where the beacon shows up. Renders can be limited to
+    it, and saved cropped to it, so the pixels known to be empty are neither
+    rendered nor encoded.
+
+    Coordinates are in pixels of the full image, starting at its top left
+    corner, so points found in a cropped image are moved back to the full
+    image by adding the offset of the region.
+    """
+
+    DEFAULT_MARGIN = 16  # pixels
+
+    x = 0  # pixels
+    y = 0  # pixels
+    width = 0  # pixels
+    height = 0  # pixels
+    image_width = 0  # pixels
+    image_height = 0  # pixels
+
+    def __init__(
+            self,
+            x=x,
+            y=y,
+            width=width,
+            height=height,
+            image_width=image_width,
+            image_height=image_height
+    ):
+        """
+        Create an instance of the RegionOfInterest class.
+
+        :param x: column of the left side of the region, in pixels.
+        :param y: row of the top side of the region, in pixels.
+        :param width: width of the region, in pixels.
+        :param height: height of the region, in pixels.
+        :param image_width: width of the full image, in pixels.
+        :param image_height: height of the full image, in pixels.
+        """
+
+        log.info("Create instance of RegionOfInterest class")
+        CallTrace.log(log, "RegionOfInterest.__init__",
+                      x=x,
+                      y=y,
+                      width=width,
+                      height=height,
+                      image_width=image_width,
+                      image_height=image_height)
+
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.image_width = image_width
+        self.image_height = image_height
+
+    @staticmethod
+    def around_beacon(
+            camera: Camera,
+            beacon: Beacon,
+            image_width: int,
+            image_height: int,
+            margin: int = DEFAULT_MARGIN
+    ):
+        """
+        Find the region of the image where the beacon shows up, projecting it
+        with the camera model Blender uses.
+
+        :param camera: camera the scene is rendered from.
+        :param beacon: beacon shown in the scene.
+        :param image_width: width of the renders, in pixels.
+        :param image_height: height of the renders, in pixels.
+        :param margin: pixels added around the beacon, so its blurred edges
+        aren't cut.
+
+        :return: region around the beacon, clipped to the image, or None if the
+        beacon is partly behind the camera or outside the image, and the whole
+        image must be rendered.
+        :rtype: RegionOfInterest
+        """
+
+        log.info("Find region of interest around the beacon")
+        CallTrace.log(log, "RegionOfInterest.around_beacon",
+                      camera=camera,
+                      beacon=beacon,
+                      image_width=image_width,
+                      image_height=image_height,
+                      margin=margin)
+
+        corners, in_front = CameraProjection(camera, image_width, image_height).project(
+            AnalyticRenderer.get_beacon_corners(beacon))
+        if not in_front.all():
+            return None
+
+        # Rounding errors must not widen the region by a whole pixel
+        corners = np.round(corners, 6)
+        left = max(0, math.floor(corners[:, 0].min()) - margin)
+        top = max(0, math.floor(corners[:, 1].min()) - margin)
+        right = min(image_width, math.ceil(corners[:, 0].max()) + margin)
+        bottom = min(image_height, math.ceil(corners[:, 1].max()) + margin)
+        if right <= left or bottom <= top:
+            return None
+
+        return RegionOfInterest(
+            x=left,
+            y=top,
+            width=right - left,
+            height=bottom - top,
+            image_width=image_width,
+            image_height=image_height)
+
+    @staticmethod
+    def from_dict(dictionary: dict):
+        """
+        Create an instance from the dictionary returned by `as_dict`.
+
+        :param dictionary: properties of the region.
+
+        :return: region described by the dictionary.
+        :rtype: RegionOfInterest
+        """
+
+        return RegionOfInterest(
+            x=dictionary["x"],
+            y=dictionary["y"],
+            width=dictionary["width"],
+            height=dictionary["height"],
+            image_width=dictionary["image_width"],
+            image_height=dictionary["image_height"])
+
+    def get_border(self) -> (float, float, float, float):
+        """
+        Describe the region as Blender's render border: minimum and maximum X
+        and Y as a fraction of the image size, with Y starting at the bottom.
+        Blender converts the border back to whole pixels discarding the
+        fractional part, so a quarter of a pixel is added to every side to
+        land on the intended pixel despite rounding errors.
+
+        :return: minimum X, maximum X, minimum Y, and maximum Y.
+        :rtype: (float, float, float, float)
+        """
+
+        return (
+            min(1.0, (self.x + 0.25) / self.image_width),
+            min(1.0, (self.x + self.width + 0.25) / self.image_width),
+            min(1.0, (self.image_height - self.y - self.height + 0.25) / self.image_height),
+            min(1.0, (self.image_height - self.y + 0.25) / self.image_height))
+
+    def get_area_fraction(self) -> float:
+        """
+        Calculate the fraction of the image covered by the region.
+
+        :return: area of the region divided by the area of the image.
+        :rtype: float
+        """
+
+        return self.width * self.height / (self.image_width * self.image_height)
+
+    def to_full_frame(self, points: np.ndarray) -> np.ndarray:
+        """
+        Move points found in the cropped image to the full image.
+
+        :param points: array with shape (N, 2) with the column and row of each
+        point in the cropped image, in pixels.
+
+        :return: array with shape (N, 2) with the column and row of each point
+        in the full image, in pixels.
+        :rtype: np.ndarray
+        """
+
+        return np.asarray(points, dtype=np.float64) + (self.x, self.y)
+
+    def paste(
+            self,
+            pixels: np.ndarray,
+            background_color: (int, int, int) = AnalyticRenderer.DEFAULT_BACKGROUND_COLOR
+    ) -> np.ndarray:
+        """
+        Place the pixels of the cropped image in an image of the full size.
+
+        :param pixels: RGB pixels of the cropped image as an array of unsigned
+        bytes, with shape (height, width, 3), top row first.
+        :param background_color: RGB color of the pixels outside the region.
+
+        :return: RGB pixels of the full image as an array of unsigned bytes,
+        with shape (image height, image width, 3), top row first.
+        :rtype: np.ndarray
+        """
+
+        if pixels.shape[:2] != (self.height, self.width):
+            raise ValueError(
+                f"Pixels have shape {pixels.shape[:2]}, {(self.height, self.width)} expected for the region")
+
+        full_frame = np.empty((self.image_height, self.image_width, 3), dtype=np.uint8)
+        full_frame[:] = background_color
+        full_frame[self.y:self.y + self.height, self.x:self.x + self.width] = pixels
+
+        return full_frame
+
+    def as_dict(self) -> dict:
+        """
+        Return a copy of the instance's properties in a dictionary.
+
+        :return: a copy of the instance's properties in a dictionary.
+        """
+
+        log.info("Get region of interest properties as dictionary")
+        log.debug("as_dict()")
+
+        return {
+            "x": self.x,
+            "y": self.y,
+            "width": self.width,
+            "height": self.height,
+            "image_width": self.image_width,
+            "image_height": self.image_height
+        }
+
+    def __str__(self):
+        """
+        Return a string representation of the object. Useful to show the details
+        of the region in logs.
+        """
+
+        return (f"RegionOfInterest\n"
+                f"- Offset: ({self.x}, {self.y}) px\n"
+                f"- Size: {self.width}x{self.height} px\n"
+                f"- Image Size: {self.image_width}x{self.image_height} px")
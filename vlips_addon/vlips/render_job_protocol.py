@@ -0,0 +1,164 @@
+import json
+import logging
+import math
+import os
+from enum import Enum
+
+from .call_trace import CallTrace
+
+log = logging.getLogger(__name__)
+
+
+class RenderJobProtocol:
+    """
+    Messages exchanged with a render worker, this is, a Blender process that
+    keeps the scene built and renders jobs sent over a local socket. Each
+    message is a JSON object on its own line.
+
+    A job is a list of poses and the folder where their renders are saved to.
+    The worker answers a job with a "start" message, a "step" or a "failure"
+    message for every pose, as soon as its render is saved, and a "finish"
+    message. Jobs sent over the same connection are rendered in order.
+    """
+
+    DEFAULT_HOST = "127.0.0.1"
+    DEFAULT_PORT = 8765
+    ENCODING = "utf-8"
+
+    # Every pose has these values: camera's X and Y location in millimeters,
+    # distance to the beacon in millimeters, and rotation angles in degrees
+    POSE_KEYS = ("x", "y", "distance", "rotation_x_angle", "rotation_z_angle")
+
+    DEFAULT_FILE_PREFIX = "render"
+
+    class MessageType(str, Enum):
+        # Client to worker
+        RENDER = "render"
+        PING = "ping"
+        SHUTDOWN = "shutdown"
+
+        # Worker to client
+        PONG = "pong"
+        START = "start"
+        STEP = "step"
+        FAILURE = "failure"
+        FINISH = "finish"
+        ERROR = "error"
+
+    @staticmethod
+    def encode(message: dict) -> bytes:
+        """
+        Encode a message to be sent.
+
+        :param message: message.
+
+        :return: message as a line of JSON.
+        :rtype: bytes
+        """
+
+        return (json.dumps(message) + "\n").encode(RenderJobProtocol.ENCODING)
+
+    @staticmethod
+    def decode(line: bytes) -> dict:
+        """
+        Decode a message received.
+
+        :param line: message as a line of JSON.
+
+        :return: message.
+        :rtype: dict
+        """
+
+        try:
+            message = json.loads(line.decode(RenderJobProtocol.ENCODING))
+        except (UnicodeDecodeError, json.JSONDecodeError) as error:
+            raise ValueError(f"Message is not valid JSON: {error}") from error
+
+        if not isinstance(message, dict) or "type" not in message:
+            raise ValueError("Message must be an object with a type")
+        try:
+            message["type"] = RenderJobProtocol.MessageType(message["type"])
+        except ValueError:
+            raise ValueError(f"Unknown message type {message['type']}") from None
+
+        return message
+
+    @staticmethod
+    def create_job(job_id: str, poses: [dict], output_path: str, file_prefix: str = DEFAULT_FILE_PREFIX) -> dict:
+        """
+        Describe a job to be sent to a worker.
+
+        :param job_id: identifier of the job, sent back in every message about
+        it.
+        :param poses: poses to render, with the values in POSE_KEYS.
+        :param output_path: folder where the renders are saved to.
+        :param file_prefix: name of the renders, followed by the index of their
+        pose.
+
+        :return: job message.
+        :rtype: dict
+        """
+
+        CallTrace.log(log, "RenderJobProtocol.create_job",
+                      job_id=job_id,
+                      poses=poses,
+                      output_path=output_path,
+                      file_prefix=file_prefix)
+
+        job = {
+            "type": RenderJobProtocol.MessageType.RENDER.value,
+            "job_id": job_id,
+            "output_path": str(output_path),
+            "file_prefix": file_prefix,
+            "poses": list(poses)
+        }
+        RenderJobProtocol.validate_job(job)
+        job["poses"] = [{key: float(pose[key]) for key in RenderJobProtocol.POSE_KEYS} for pose in job["poses"]]
+        return job
+
+    @staticmethod
+    def validate_job(job: dict):
+        """
+        Check a job has everything a worker needs to render it, so a malformed
+        job is rejected before any of its poses is rendered. Pose values must
+        be finite numbers.
+
+        :param job: job message.
+        """
+
+        for key in ("job_id", "output_path", "poses"):
+            if key not in job:
+                raise ValueError(f"Job must have {key}")
+        if not isinstance(job["output_path"], str) or not job["output_path"]:
+            raise ValueError("Job output path must be a non-empty string")
+        if not isinstance(job["poses"], list):
+            raise ValueError("Job poses must be a list")
+        for index, pose in enumerate(job["poses"]):
+            if not isinstance(pose, dict):
+                raise ValueError(f"Pose {index} of job {job['job_id']} must be an object")
+            missing_keys = [key for key in RenderJobProtocol.POSE_KEYS if key not in pose]
+            if missing_keys:
+                raise ValueError(f"Pose {index} of job {job['job_id']} lacks {', '.join(missing_keys)}")
+            for key in RenderJobProtocol.POSE_KEYS:
+                value = pose[key]
+                if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                    raise ValueError(
+                        f"Pose {index} of job {job['job_id']} has {key} {value!r}, which must be a finite number")
+
+    @staticmethod
+    def get_file_paths(job: dict) -> [str]:
+        """
+        Compose the path of the render of every pose of a job: the file prefix
+        followed by the index of the pose, padded so files sort in order.
+
+        :param job: job message.
+
+        :return: file paths, one per pose, in the same order.
+        :rtype: [str]
+        """
+
+        file_prefix = job.get("file_prefix") or RenderJobProtocol.DEFAULT_FILE_PREFIX
+        digits = len(str(max(len(job["poses"]) - 1, 0)))
+        return [
+            os.path.join(job["output_path"], f"{file_prefix}_{index:0{digits}d}.jpg")
+            for index in range(len(job["poses"]))]
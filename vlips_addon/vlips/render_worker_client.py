@@ -0,0 +1,373 @@
+import asyncio
+import logging
+import uuid
+from typing import NamedTuple
+
+from .call_trace import CallTrace
+from .render_job_protocol import RenderJobProtocol
+
+log = logging.getLogger(__name__)
+
+
+class RenderResult(NamedTuple):
+    """
+    Render of a pose of a job: index of the pose, path of the render, and the
+    step sent by the worker, as stored in camera movement manifests. Failed
+    renders have an "error" in their metadata.
+    """
+
+    step: int
+    filepath: str
+    metadata: dict
+
+
+class RenderJob:
+    """
+    Job submitted to a render worker. Iterate over it asynchronously to get
+    the render of every pose as soon as it is saved, in the order the worker
+    saves them.
+    """
+
+    def __init__(self, job_id: str, total: int):
+        """
+        Create an instance of the RenderJob class.
+
+        :param job_id: identifier of the job.
+        :param total: number of poses of the job.
+        """
+
+        self.job_id = job_id
+        self.total = total
+        self.rendered = 0
+        self.failed = 0
+        self.finished = False
+        self._messages = asyncio.Queue()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> RenderResult:
+        while not self.finished:
+            message = await self._messages.get()
+            message_type = message["type"]
+            if message_type == RenderJobProtocol.MessageType.STEP:
+                self.rendered += 1
+                step = message["step"]
+                return RenderResult(step["index"], step["filepath"], step)
+            elif message_type == RenderJobProtocol.MessageType.FAILURE:
+                self.failed += 1
+                step = dict(message["step"], error=message["error"])
+                return RenderResult(step["index"], step["filepath"], step)
+            elif message_type == RenderJobProtocol.MessageType.FINISH:
+                self.finished = True
+            elif message_type == RenderJobProtocol.MessageType.ERROR:
+                self.finished = True
+                raise RuntimeError(f"Job {self.job_id} failed: {message['error']}")
+
+        raise StopAsyncIteration
+
+    def put(self, message: dict):
+        """
+        Hand a message about the job, read from its worker, to whoever is
+        iterating over it.
+
+        :param message: message read from the worker.
+        """
+
+        self._messages.put_nowait(message)
+
+
+class RenderWorkerConnection:
+    """
+    Connection with a render worker. At most a number of jobs are in flight
+    at once, this is, sent and not finished yet, so the worker isn't flooded
+    and jobs can go to other workers instead.
+    """
+
+    def __init__(self, host: str, port: int, max_in_flight: int):
+        """
+        Create an instance of the RenderWorkerConnection class, not connected
+        yet.
+
+        :param host: address of the worker.
+        :param port: port the worker listens on.
+        :param max_in_flight: maximum number of jobs in flight.
+        """
+
+        log.info("Create instance of RenderWorkerConnection class")
+        CallTrace.log(log, "RenderWorkerConnection.__init__",
+                      host=host,
+                      port=port,
+                      max_in_flight=max_in_flight)
+
+        if max_in_flight < 1:
+            raise ValueError("At least one job must be allowed in flight")
+
+        self.host = host
+        self.port = port
+        self.max_in_flight = max_in_flight
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._jobs = {}
+        self._reader = None
+        self._writer = None
+        self._reader_task = None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._jobs)
+
+    async def open(self):
+        """
+        Connect to the worker.
+        """
+
+        log.info(f"Connect to render worker {self.host}:{self.port}")
+
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._reader_task = asyncio.create_task(self._read())
+
+    async def close(self):
+        """
+        Disconnect from the worker. Jobs still in flight fail.
+        """
+
+        log.info(f"Disconnect from render worker {self.host}:{self.port}")
+
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+        if self._reader_task is not None:
+            await self._reader_task
+
+    async def send(self, message: dict):
+        """
+        Send a message to the worker.
+
+        :param message: message.
+        """
+
+        self._writer.write(RenderJobProtocol.encode(message))
+        await self._writer.drain()
+
+    async def submit(self, job_message: dict) -> RenderJob:
+        """
+        Send a job to the worker, waiting first until fewer jobs than the
+        maximum are in flight.
+
+        :param job_message: job, as created by RenderJobProtocol.create_job.
+
+        :return: job submitted.
+        :rtype: RenderJob
+        """
+
+        await self._slots.acquire()
+        job = RenderJob(job_message["job_id"], len(job_message["poses"]))
+        self._jobs[job.job_id] = job
+        try:
+            await self.send(job_message)
+        except (ConnectionError, RuntimeError):
+            self._finish(job.job_id)
+            raise
+        return job
+
+    def _finish(self, job_id: str):
+        """
+        Forget a job that won't get more messages, making room for another.
+
+        :param job_id: identifier of the job.
+        """
+
+        if self._jobs.pop(job_id, None) is not None:
+            self._slots.release()
+
+    async def _read(self):
+        """
+        Hand every message read from the worker to the job it is about, until
+        the connection is closed.
+        """
+
+        error = "Connection with the render worker closed"
+        try:
+            while line := await self._reader.readline():
+                try:
+                    message = RenderJobProtocol.decode(line)
+                except ValueError as decode_error:
+                    log.error(f"Invalid message from render worker {self.host}:{self.port}: {decode_error}")
+                    continue
+
+                job = self._jobs.get(message.get("job_id"))
+                if job is None:
+                    if message["type"] == RenderJobProtocol.MessageType.ERROR:
+                        log.error(f"Render worker {self.host}:{self.port} error: {message['error']}")
+
+                        # The worker couldn't tell which job the error is
+                        # about, as when it rejects a job, so any job in
+                        # flight may never finish
+                        if message.get("job_id") is None:
+                            self._fail_jobs(f"Render worker error: {message['error']}")
+                    continue
+
+                job.put(message)
+                if message["type"] in (RenderJobProtocol.MessageType.FINISH, RenderJobProtocol.MessageType.ERROR):
+                    self._finish(job.job_id)
+        except ConnectionError as connection_error:
+            error = f"Connection with the render worker lost: {connection_error}"
+
+        # Jobs in flight will never finish
+        self._fail_jobs(error)
+
+    def _fail_jobs(self, error: str):
+        """
+        Fail every job in flight, making room for others.
+
+        :param error: description of the failure.
+        """
+
+        for job_id, job in list(self._jobs.items()):
+            job.put({"type": RenderJobProtocol.MessageType.ERROR, "job_id": job_id, "error": error})
+            self._finish(job_id)
+
+
+class RenderWorkerClient:
+    """
+    Request renders from local render workers (see render_worker.py) without
+    blocking: jobs are submitted with asyncio and their renders are awaited
+    as they are saved, so the caller can keep computing meanwhile.
+
+    Jobs go to the worker with fewest jobs in flight. Each worker has at most
+    a number of jobs in flight at once; further submissions wait.
+    """
+
+    DEFAULT_MAX_IN_FLIGHT = 2
+    DEFAULT_BATCH_SIZE = 32
+
+    def __init__(
+            self,
+            workers: [(str, int)] = ((RenderJobProtocol.DEFAULT_HOST, RenderJobProtocol.DEFAULT_PORT),),
+            max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+    ):
+        """
+        Create an instance of the RenderWorkerClient class, not connected yet.
+
+        :param workers: host and port of every worker.
+        :param max_in_flight: maximum number of jobs in flight per worker.
+        """
+
+        log.info("Create instance of RenderWorkerClient class")
+        CallTrace.log(log, "RenderWorkerClient.__init__",
+                      workers=workers,
+                      max_in_flight=max_in_flight)
+
+        if not workers:
+            raise ValueError("At least one render worker is needed")
+
+        self.connections = [RenderWorkerConnection(host, port, max_in_flight) for host, port in workers]
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def connect(self):
+        """
+        Connect to every worker.
+        """
+
+        await asyncio.gather(*(connection.open() for connection in self.connections))
+
+    async def close(self):
+        """
+        Disconnect from every worker.
+        """
+
+        await asyncio.gather(*(connection.close() for connection in self.connections))
+
+    async def submit(
+            self,
+            poses: [dict],
+            output_path: str,
+            file_prefix: str = RenderJobProtocol.DEFAULT_FILE_PREFIX
+    ) -> RenderJob:
+        """
+        Submit a job to the worker with fewest jobs in flight.
+
+        :param poses: poses to render, with the values in
+        RenderJobProtocol.POSE_KEYS.
+        :param output_path: folder where the renders are saved to.
+        :param file_prefix: name of the renders, followed by the index of their
+        pose.
+
+        :return: job submitted, to be iterated over asynchronously.
+        :rtype: RenderJob
+        """
+
+        job_message = RenderJobProtocol.create_job(uuid.uuid4().hex, poses, output_path, file_prefix)
+        connection = min(self.connections, key=lambda worker_connection: worker_connection.in_flight)
+        return await connection.submit(job_message)
+
+    async def render(
+            self,
+            poses: [dict],
+            output_path: str,
+            file_prefix: str = RenderJobProtocol.DEFAULT_FILE_PREFIX,
+            batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        """
+        Render poses split into batches, one job each, spread over the workers.
+        Each batch is saved with its own file prefix, the given one followed by
+        the index of the batch.
+
+        :param poses: poses to render, with the values in
+        RenderJobProtocol.POSE_KEYS.
+        :param output_path: folder where the renders are saved to.
+        :param file_prefix: name of the renders.
+        :param batch_size: poses per job.
+
+        :return: asynchronous iterator of the render of every pose, as soon as
+        it is saved. Its step is the index of the pose in the poses given.
+        """
+
+        CallTrace.log(log, "RenderWorkerClient.render",
+                      poses=poses,
+                      output_path=output_path,
+                      file_prefix=file_prefix,
+                      batch_size=batch_size)
+
+        if batch_size < 1:
+            raise ValueError("Batches must have at least one pose")
+
+        poses = list(poses)
+        starts = range(0, len(poses), batch_size)
+        digits = len(str(max(len(starts) - 1, 0)))
+        results = asyncio.Queue()
+
+        async def render_batch(batch_index, start):
+            try:
+                job = await self.submit(
+                    poses[start:start + batch_size], output_path, f"{file_prefix}_{batch_index:0{digits}d}")
+                async for result in job:
+                    await results.put(result._replace(step=start + result.step))
+                await results.put(None)
+            except Exception as error:
+                await results.put(error)
+
+        tasks = [asyncio.create_task(render_batch(batch_index, start)) for batch_index, start in enumerate(starts)]
+        try:
+            pending_batches = len(tasks)
+            while pending_batches > 0:
+                result = await results.get()
+                if result is None:
+                    pending_batches -= 1
+                elif isinstance(result, Exception):
+                    raise result
+                else:
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
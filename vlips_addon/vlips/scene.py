@@ -1,5 +1,7 @@
 import logging
 
+from .call_trace import CallTrace
+
 log = logging.getLogger(__name__)
 
 
@@ -21,9 +23,9 @@ class Scene:
         """
 
         log.info("Create instance of Scene class")
-        log.debug(f"Scene.__init__("
-                  f"tile_side={tile_side}, "
-                  f"floor_sides_tiles={floor_sides_tiles})")
+        CallTrace.log(log, "Scene.__init__",
+                      tile_side=tile_side,
+                      floor_sides_tiles=floor_sides_tiles)
 
         self.tile_side = tile_side
         self.floor_sides_tiles = floor_sides_tiles
@@ -0,0 +1,174 @@
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from .call_trace import CallTrace
+
+log = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """
+    Measure how long each stage of a sweep takes, so a slow sweep can be
+    traced back to the stage that dominates it. Stages can be timed from
+    several threads at once, as the image writers do.
+
+    Only the duration of every run of a stage is kept, so the overhead is a
+    couple of clock reads and a list append per stage.
+    """
+
+    REPORT_FILE_NAME = "timing_report.json"
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self):
+        """
+        Create an instance of the StageTimer class, starting the clock of the
+        sweep.
+        """
+
+        log.info("Create instance of StageTimer class")
+        log.debug("StageTimer.__init__()")
+
+        self._lock = threading.Lock()
+        self._durations = {}
+        self._renders = 0
+        self._start_time = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Time the code run inside the context as a run of a stage.
+
+        :param name: name of the stage.
+        """
+
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start_time)
+
+    def record(self, name: str, duration: float):
+        """
+        Account for a run of a stage timed elsewhere.
+
+        :param name: name of the stage.
+        :param duration: duration of the run, in seconds.
+        """
+
+        with self._lock:
+            self._durations.setdefault(name, []).append(duration)
+
+    def count_renders(self, count: int = 1):
+        """
+        Account for renders finished, for the throughput of the sweep.
+
+        :param count: number of renders finished.
+        """
+
+        with self._lock:
+            self._renders += count
+
+    def get_report(self, **details) -> dict:
+        """
+        Summarize the durations of every stage: number of runs, total, mean,
+        percentiles, and maximum, in seconds, along with the throughput and the
+        peak memory of the process.
+
+        :param details: additional values to include in the report.
+
+        :return: report of the sweep.
+        :rtype: dict
+        """
+
+        log.info("Get timing report")
+        CallTrace.log(log, "StageTimer.get_report",
+                      details=details)
+
+        elapsed_time = time.perf_counter() - self._start_time
+        with self._lock:
+            durations = {name: np.array(values) for name, values in self._durations.items()}
+            renders = self._renders
+
+        stages = {}
+        for name, values in sorted(durations.items(), key=lambda item: -item[1].sum()):
+            stage = {
+                "count": len(values),
+                "total": float(values.sum()),
+                "mean": float(values.mean()),
+                "max": float(values.max())
+            }
+            for percentile, value in zip(StageTimer.PERCENTILES, np.percentile(values, StageTimer.PERCENTILES)):
+                stage[f"p{percentile}"] = float(value)
+            stages[name] = stage
+
+        report = dict(details)
+        report.update({
+            "elapsed_time": elapsed_time,
+            "renders": renders,
+            "renders_per_second": renders / elapsed_time if elapsed_time > 0 else 0.0,
+            "peak_memory": StageTimer.get_peak_memory(),
+            "stages": stages
+        })
+        return report
+
+    def save_report(self, filepath, **details) -> dict:
+        """
+        Save the report of the sweep as JSON. The file is written to a
+        temporary file first, so a crash never leaves a truncated report
+        behind.
+
+        :param filepath: path to the file where the report must be saved.
+        :param details: additional values to include in the report.
+
+        :return: report saved.
+        :rtype: dict
+        """
+
+        log.info("Save timing report")
+        CallTrace.log(log, "StageTimer.save_report",
+                      filepath=filepath,
+                      details=details)
+
+        report = self.get_report(**details)
+
+        directory = Path(filepath).parent
+        directory.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=directory,
+            prefix=".timing_report_",
+            suffix=".json")
+        with os.fdopen(file_descriptor, "w") as file:
+            json.dump(report, file, indent=2)
+        os.replace(temporary_path, filepath)
+
+        return report
+
+    @staticmethod
+    def get_peak_memory():
+        """
+        Get the peak resident memory of the process.
+
+        :return: peak memory, in bytes, or None if the platform doesn't tell.
+        :rtype: int
+        """
+
+        try:
+            import resource
+        except ImportError:
+            return None
+
+        peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        # Linux reports kilobytes, macOS bytes
+        if sys.platform != "darwin":
+            peak_memory *= 1024
+        return peak_memory
@@ -0,0 +1,463 @@
+import logging
+import os
+from typing import Iterator
+
+import numpy as np
+
+from .call_trace import CallTrace
+
+log = logging.getLogger(__name__)
+
+
+class SweepAxis:
+    """
+    Dimension of a sweep: the values it goes through, and how each of them is
+    applied to the scene, stored in the folders of the renders, shown in
+    their EXIF data, and weighed when ordering the steps.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            values,
+            apply=None,
+            folder=None,
+            exif_field: str = None,
+            cost: float = 0.0,
+            shape: tuple = ()
+    ):
+        """
+        Create an instance of the SweepAxis class.
+
+        :param name: name of the axis, unique in its sweep. Steps of the sweep
+        have a value for each name.
+        :param values: values of the axis, or a function returning them given
+        the values of the axes registered before this one, for axes that
+        depend on others.
+        :param apply: function setting a value of the axis in the scene, given
+        Blender's context and the value. Optional, for axes the scene doesn't
+        depend on.
+        :param folder: function returning the name of the folder of the renders
+        with a value of the axis. Optional, for axes that don't add folders.
+        :param exif_field: name of the field of the EXIF data of the renders
+        the value of the axis is stored in. Optional.
+        :param cost: estimated cost of changing the value of the axis between
+        consecutive steps, in any unit shared by the axes of the sweep, like
+        seconds. See `Sweep.order_by_cost`.
+        :param shape: shape of every value, empty for numbers, like (2,) for
+        points of a plane. Values are kept as floats in tables of steps.
+        """
+
+        self.name = name
+        self.values = values
+        self.apply = apply
+        self.folder = folder
+        self.exif_field = exif_field
+        self.cost = cost
+        self.shape = tuple(shape)
+
+    @staticmethod
+    def from_range(name: str, start: float, end: float, step: float, label: str = None, **kwargs):
+        """
+        Create an axis going from a value to another, both included, in steps
+        of the same size. Values are only generated, and the step checked,
+        when the sweep is iterated, so a camera movement whose values are
+        drawn instead, as when sampling, can still use the axis for the
+        folders and EXIF fields of its renders.
+
+        :param name: name of the axis.
+        :param start: first value.
+        :param end: last value.
+        :param step: difference between consecutive values.
+        :param label: name of the axis in error messages. Its name, if not
+        provided.
+        :param kwargs: any other argument of the axis.
+
+        :return: axis.
+        :rtype: SweepAxis
+        """
+
+        def values(outer_values):
+            if step == 0:
+                raise ValueError(f"{label or name} step cannot be zero")
+            return np.arange(start, end + step, step).tolist()
+
+        return SweepAxis(name, values, **kwargs)
+
+    def get_values(self, outer_values: dict) -> list:
+        """
+        Get the values of the axis.
+
+        :param outer_values: values of the axes registered before this one.
+
+        :return: values of the axis.
+        :rtype: list
+        """
+
+        if callable(self.values):
+            return list(self.values(outer_values))
+
+        return list(self.values)
+
+
+class Sweep:
+    """
+    Set of axes whose combinations of values are rendered, one step per
+    combination. Steps go through the values of the last axis registered
+    first, as nested loops with the first axis outermost would.
+
+    Every step is a dictionary with a value per axis name, and everything
+    depending on the axes, this is, the changes made to the scene before
+    rendering a step, the folder its render is saved to, the EXIF fields it
+    fills, the columns of the table steps are kept in, and the cost of moving
+    from one step to the next, comes from the registration of its axes.
+    Adding a dimension to a camera movement is a matter of registering
+    another axis.
+    """
+
+    def __init__(self, axes: [SweepAxis] = ()):
+        """
+        Create an instance of the Sweep class.
+
+        :param axes: axes of the sweep, from outermost to innermost.
+        """
+
+        log.info("Create instance of Sweep class")
+        CallTrace.log(log, "Sweep.__init__",
+                      axes=axes)
+
+        self.axes = []
+        for axis in axes:
+            self.register(axis)
+
+    def register(self, axis: SweepAxis) -> SweepAxis:
+        """
+        Add an axis to the sweep, inside the ones already registered.
+
+        :param axis: axis.
+
+        :return: axis registered.
+        :rtype: SweepAxis
+        """
+
+        if any(registered_axis.name == axis.name for registered_axis in self.axes):
+            raise ValueError(f"Axis {axis.name} is already registered")
+
+        self.axes.append(axis)
+        return axis
+
+    def get_axis(self, name: str) -> SweepAxis:
+        """
+        Get an axis by its name.
+
+        :param name: name of the axis.
+
+        :return: axis.
+        :rtype: SweepAxis
+        """
+
+        for axis in self.axes:
+            if axis.name == name:
+                return axis
+
+        raise KeyError(f"Axis {name} isn't registered")
+
+    def __iter__(self) -> Iterator[dict]:
+        """
+        Go through the steps of the sweep, composing them as they are
+        iterated.
+
+        :return: iterator over the value of every axis in each step.
+        :rtype: Iterator[dict]
+        """
+
+        def iterate_steps(axis_index, outer_values):
+            if axis_index == len(self.axes):
+                yield dict(outer_values)
+                return
+
+            axis = self.axes[axis_index]
+            for value in axis.get_values(outer_values):
+                outer_values[axis.name] = value
+                yield from iterate_steps(axis_index + 1, outer_values)
+            outer_values.pop(axis.name, None)
+
+        if not self.axes:
+            return iter(())
+
+        return iterate_steps(0, {})
+
+    def count(self) -> int:
+        """
+        Count the steps of the sweep, going through them, since the values of
+        some axes may depend on others.
+
+        :return: number of steps.
+        :rtype: int
+        """
+
+        return sum(1 for _ in self)
+
+    def get_directory(self, step: dict) -> str:
+        """
+        Compose the folder the render of a step is saved to, relative to the
+        output path, with the folder of every axis that has one, outermost
+        first.
+
+        :param step: value of every axis.
+
+        :return: relative path of the folder, empty if no axis adds one.
+        :rtype: str
+        """
+
+        folders = [axis.folder(step[axis.name]) for axis in self.axes if axis.folder is not None]
+        if not folders:
+            return ""
+
+        return os.path.join(*folders)
+
+    def get_exif_fields(self, step: dict) -> dict:
+        """
+        Get the EXIF fields filled by the axes in a step.
+
+        :param step: value of every axis.
+
+        :return: value of every EXIF field.
+        :rtype: dict
+        """
+
+        return {axis.exif_field: step[axis.name] for axis in self.axes if axis.exif_field is not None}
+
+    def get_dtype(self) -> np.dtype:
+        """
+        Describe the table steps of the sweep are kept in: a column per axis,
+        named after it, with the shape of its values.
+
+        :return: data type of the rows of the table.
+        :rtype: np.dtype
+        """
+
+        return np.dtype([(axis.name, np.float64, axis.shape) for axis in self.axes])
+
+    def get_row(self, step: dict) -> tuple:
+        """
+        Get the values of a step as a row of the table of `get_dtype`.
+
+        :param step: value of every axis.
+
+        :return: value of every axis, in the order they are registered in.
+        :rtype: tuple
+        """
+
+        return tuple(step[axis.name] for axis in self.axes)
+
+    def apply(self, context, step: dict, previous_step: dict = None) -> [str]:
+        """
+        Set the values of a step in the scene, only for the axes whose value
+        differs from the one in the previous step, if any. Axes the step has
+        no value for are left as they are.
+
+        :param context: Blender's current context, handed to every axis.
+        :param step: value of every axis.
+        :param previous_step: step applied before, if any.
+
+        :return: names of the axes applied.
+        :rtype: [str]
+        """
+
+        applied_axes = []
+        for axis in self.axes:
+            if axis.apply is None or axis.name not in step:
+                continue
+            if previous_step is not None and previous_step.get(axis.name) == step[axis.name]:
+                continue
+            axis.apply(context, step[axis.name])
+            applied_axes.append(axis.name)
+
+        return applied_axes
+
+    def count_transitions(self, steps, order: np.ndarray = None) -> dict:
+        """
+        Count how many times the value of each axis changes between
+        consecutive steps.
+
+        :param steps: steps as columns, like a table with the dtype of
+        `get_dtype`, or a dictionary of arrays, with a column per axis.
+        :param order: positions of the steps in the order they are rendered.
+        The order of the columns, if not provided.
+
+        :return: number of changes of each axis, by name.
+        :rtype: dict
+        """
+
+        return {
+            axis.name: int(np.count_nonzero(Sweep._get_changes(Sweep._get_column(steps, axis.name, order))))
+            for axis in self.axes}
+
+    def count_expensive_transitions(self, steps, min_cost: float, order: np.ndarray = None) -> int:
+        """
+        Count the consecutive steps between which the value of any axis at
+        least as expensive as the given cost changes.
+
+        :param steps: steps as columns, see `count_transitions`.
+        :param min_cost: cost from which changing an axis is expensive.
+        :param order: positions of the steps in the order they are rendered.
+        The order of the columns, if not provided.
+
+        :return: number of expensive transitions.
+        :rtype: int
+        """
+
+        changes = None
+        for axis in self.axes:
+            if axis.cost < min_cost:
+                continue
+            axis_changes = Sweep._get_changes(Sweep._get_column(steps, axis.name, order))
+            changes = axis_changes if changes is None else changes | axis_changes
+
+        return 0 if changes is None else int(np.count_nonzero(changes))
+
+    def get_transition_cost(self, steps, order: np.ndarray = None) -> float:
+        """
+        Estimate the cost of going through the steps in the given order, from
+        the number of changes of each axis and their cost.
+
+        :param steps: steps as columns, see `count_transitions`.
+        :param order: positions of the steps in the order they are rendered.
+        The order of the columns, if not provided.
+
+        :return: estimated cost.
+        :rtype: float
+        """
+
+        transitions = self.count_transitions(steps, order)
+
+        return sum(axis.cost * transitions[axis.name] for axis in self.axes)
+
+    def compare_transitions(self, steps, order: np.ndarray, min_cost: float) -> dict:
+        """
+        Compare the transitions between the steps in the order of the columns
+        and in the given one.
+
+        :param steps: steps as columns, see `count_transitions`.
+        :param order: positions of the steps in the new order, like the ones
+        of `order_by_cost`.
+        :param min_cost: cost from which changing an axis is expensive.
+
+        :return: number of expensive transitions, and estimated cost of all of
+        them, before and after ordering.
+        :rtype: dict
+        """
+
+        return {
+            "expensive_transitions_before": self.count_expensive_transitions(steps, min_cost),
+            "expensive_transitions_after": self.count_expensive_transitions(steps, min_cost, order),
+            "transition_cost_before": self.get_transition_cost(steps),
+            "transition_cost_after": self.get_transition_cost(steps, order)
+        }
+
+    def order_by_cost(self, steps) -> np.ndarray:
+        """
+        Order steps so the most expensive axes change as rarely as possible.
+        Steps are grouped by the value of the most expensive axis, then by the
+        value of the next one, and so on, and the values of every axis but the
+        most expensive one are gone through forth and back, alternately, as in
+        a reflected Gray code, so consecutive steps differ in the value of a
+        single axis, which moves to its next value, whenever the steps allow
+        it.
+
+        Values of an axis keep the order they first appear in, and axes with
+        the same cost keep the order they were registered in, so steps of a
+        sweep whose axes are already registered from most to least expensive
+        only change the direction they go through the cheapest axes in.
+
+        Steps are sorted as columns, an axis after the other, so no dictionary
+        is composed per step.
+
+        :param steps: steps as columns, see `count_transitions`.
+
+        :return: positions of the steps in the new order.
+        :rtype: np.ndarray
+        """
+
+        log.info("Order sweep steps by transition cost")
+        CallTrace.log(log, "Sweep.order_by_cost",
+                      steps=steps)
+
+        count = len(Sweep._get_column(steps, self.axes[0].name)) if self.axes else 0
+        if count == 0:
+            return np.arange(count)
+
+        # Every step keeps the position of its group among the groups of the
+        # axes sorted so far, in the order they are gone through
+        groups = np.zeros(count, dtype=np.int64)
+        for axis in sorted(self.axes, key=lambda sorted_axis: -sorted_axis.cost):
+            ranks = Sweep._get_ranks(Sweep._get_column(steps, axis.name))
+
+            # The direction changes every time the outer axes move on
+            ranks = np.where(groups % 2 == 1, -ranks, ranks)
+
+            positions = np.lexsort((ranks, groups))
+            sorted_groups = groups[positions]
+            sorted_ranks = ranks[positions]
+            group_starts = np.ones(count, dtype=bool)
+            group_starts[1:] = (sorted_groups[1:] != sorted_groups[:-1]) | (sorted_ranks[1:] != sorted_ranks[:-1])
+            groups[positions] = np.cumsum(group_starts) - 1
+
+        return np.argsort(groups, kind="stable")
+
+    @staticmethod
+    def _get_column(steps, name: str, order: np.ndarray = None) -> np.ndarray:
+        """
+        Get the values of an axis in every step.
+
+        :param steps: steps as columns, see `count_transitions`.
+        :param name: name of the axis.
+        :param order: positions of the steps in the order they are wanted in.
+        The order of the columns, if not provided.
+
+        :return: values of the axis, a row per step.
+        :rtype: np.ndarray
+        """
+
+        column = np.asarray(steps[name])
+
+        return column if order is None else column[order]
+
+    @staticmethod
+    def _get_changes(column: np.ndarray) -> np.ndarray:
+        """
+        Tell which consecutive steps have different values.
+
+        :param column: values of an axis, a row per step.
+
+        :return: whether the value changes from every step to the next one.
+        :rtype: np.ndarray
+        """
+
+        changes = column[1:] != column[:-1]
+
+        # Values with several components change if any of them does
+        return np.any(changes, axis=tuple(range(1, changes.ndim)))
+
+    @staticmethod
+    def _get_ranks(column: np.ndarray) -> np.ndarray:
+        """
+        Replace every value by its rank in the order values first appear in.
+
+        :param column: values of an axis, a row per step.
+
+        :return: rank of the value of every step.
+        :rtype: np.ndarray
+        """
+
+        if column.ndim > 1:
+            _, first_positions, inverse = np.unique(
+                column.reshape(len(column), -1), axis=0, return_index=True, return_inverse=True)
+        else:
+            _, first_positions, inverse = np.unique(column, return_index=True, return_inverse=True)
+
+        value_ranks = np.empty(len(first_positions), dtype=np.int64)
+        value_ranks[np.argsort(first_positions)] = np.arange(len(first_positions))
+
+        return value_ranks[inverse.reshape(-1)]
@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+
+from vlips import AnalyticRenderer, Beacon, Camera
+
+
+class TestAnalyticRenderer(unittest.TestCase):
+
+    def setUp(self):
+        self.renderer = AnalyticRenderer(image_width=400, image_height=300)
+        self.beacon = Beacon(dimensions=(100, 50, 0), location=(0, 0, 2000))
+
+    @staticmethod
+    def create_camera(location=(0, 0, 1000), rotation=(180, 0, 180)):
+        return Camera(
+            facing=Camera.Facing.FRONT,
+            resolution_width=400,
+            resolution_height=300,
+            focal_length=4.0,
+            pixel_size=0.01,
+            location=location,
+            rotation=rotation)
+
+    def test_beacon_area_matches_projection(self):
+        pixels = self.renderer.render(self.create_camera(), self.beacon)
+        # 100 x 50 mm at 1000 mm with a focal length of 400 px
+        self.assertEqual((300, 400, 3), pixels.shape, "Render should have the image size")
+        self.assertAlmostEqual(
+            40 * 20, pixels[:, :, 0].sum() / 255, delta=1,
+            msg="Beacon should cover its projected area")
+        self.assertEqual(255, pixels[150, 200, 0], "Beacon should be in the image center")
+
+    def test_partially_covered_pixels_are_blended(self):
+        camera = self.create_camera(location=(1, 0, 1000))
+        pixels = self.renderer.render(camera, self.beacon)
+        edge_values = set(pixels[150, :, 0]) - {0, 255}
+        self.assertTrue(edge_values, "Pixels in the edges of the beacon should be blended")
+
+    def test_beacon_behind_camera_is_not_rendered(self):
+        camera = self.create_camera(location=(0, 0, 2500))
+        pixels = self.renderer.render(camera, self.beacon)
+        self.assertEqual(0, pixels.max(), "Beacon behind the camera shouldn't be rendered")
+
+    def test_compare_identical_renders(self):
+        pixels = self.renderer.render(self.create_camera(rotation=(170, 0, 180)), self.beacon)
+        comparison = AnalyticRenderer.compare(pixels, pixels)
+        self.assertEqual(1.0, comparison["intersection_over_union"], "Beacons should overlap")
+        self.assertEqual(0.0, comparison["centroid_distance"], "Beacons should be in the same place")
+
+    def test_compare_shifted_renders(self):
+        pixels = self.renderer.render(self.create_camera(), self.beacon)
+        shifted = self.renderer.render(self.create_camera(location=(25, 0, 1000)), self.beacon)
+        comparison = AnalyticRenderer.compare(pixels, shifted)
+        self.assertAlmostEqual(10.0, comparison["centroid_distance"], delta=0.5,
+                               msg="Beacon should move 25 mm at 1000 mm with a focal length of 400 px")
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from vlips import AnalyticRenderer, Beacon, BeaconLabels, Camera, CameraMovementManifest, CameraProjection
+
+
+class TestBeaconLabels(unittest.TestCase):
+
+    def setUp(self):
+        self.camera = Camera(
+            facing=Camera.Facing.FRONT,
+            resolution_width=400,
+            resolution_height=300,
+            focal_length=4.0,
+            pixel_size=0.01)
+        self.beacon = Beacon(dimensions=(100, 50, 0), location=(0, 0, 2000))
+        self.steps = [
+            CameraMovementManifest.create_step(
+                index=index,
+                filepath=f"{index}.jpg",
+                camera_location=(index * 100, -index * 50, 1000),
+                rotation_x_angle=index * 5.0,
+                rotation_z_angle=-index * 10.0)
+            for index in range(5)]
+
+    def test_labels_match_projection_of_each_step(self):
+        labels = BeaconLabels.from_manifest_steps(self.steps, self.camera, self.beacon, 400, 300)
+        corners = AnalyticRenderer.get_beacon_corners(self.beacon)
+        for row, step in enumerate(self.steps):
+            camera = Camera(
+                facing=Camera.Facing.FRONT,
+                resolution_width=400,
+                resolution_height=300,
+                focal_length=4.0,
+                pixel_size=0.01,
+                location=step["camera_location"],
+                rotation=(180 - step["rotation_x_angle"], 0, 180 - step["rotation_z_angle"]))
+            expected, _ = CameraProjection(camera, 400, 300).project(corners)
+            np.testing.assert_allclose(
+                expected, labels["corners"][row],
+                err_msg=f"Corners of step {row} should match its own projection")
+
+    def test_labels_of_centered_beacon(self):
+        labels = BeaconLabels.from_manifest_steps(self.steps[:1], self.camera, self.beacon, 400, 300)
+        np.testing.assert_allclose(
+            [[180, 140, 220, 160]], labels["bounding_box"],
+            err_msg="Beacon above the camera should be centered")
+        np.testing.assert_allclose([1000], labels["distance"], err_msg="Distance should be the height difference")
+        self.assertTrue(labels["in_image"][0], "Centered beacon should be inside the image")
+
+    def test_save_and_load(self):
+        labels = BeaconLabels.from_manifest_steps(self.steps, self.camera, self.beacon, 400, 300)
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, BeaconLabels.FILE_NAME)
+            BeaconLabels.save(filepath, labels)
+            loaded = BeaconLabels.load(filepath)
+        self.assertEqual(sorted(labels), sorted(loaded), "Every column should be saved")
+        self.assertEqual(["0.jpg", "1.jpg", "2.jpg", "3.jpg", "4.jpg"], list(loaded["filepath"]),
+                         "File paths should be saved")
+
+    def test_visibility_of_beacon_partly_outside_image(self):
+        steps = [
+            CameraMovementManifest.create_step(
+                index=index,
+                filepath=f"{index}.jpg",
+                camera_location=(x, 0, 1000),
+                rotation_x_angle=0.0,
+                rotation_z_angle=rotation_z_angle)
+            for index, (x, rotation_z_angle) in enumerate([(0, 0.0), (500, 0.0), (520, 45.0), (5000, 0.0)])]
+        labels = BeaconLabels.from_manifest_steps(steps, self.camera, self.beacon, 400, 300)
+        self.assertEqual([True, False, False, False], list(labels["in_image"]), "Only the centered beacon is inside")
+        self.assertEqual(
+            [True, True, True, False], list(labels["partially_in_image"]),
+            "Beacons crossing the side of the image should be partially inside")
+
+    def test_beacon_behind_camera_is_not_visible(self):
+        steps = [CameraMovementManifest.create_step(
+            index=0,
+            filepath="0.jpg",
+            camera_location=(0, 0, 3000),
+            rotation_x_angle=0.0,
+            rotation_z_angle=0.0)]
+        labels = BeaconLabels.from_manifest_steps(steps, self.camera, self.beacon, 400, 300)
+        self.assertFalse(labels["partially_in_image"][0], "Beacon behind the camera should not be visible")
@@ -0,0 +1,68 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+from vlips import CallTrace, Camera
+
+
+class FormattedValue:
+    """
+    Argument counting how many times it is formatted.
+    """
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "value"
+
+
+class TestCallTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = logging.getLogger("vlips.tests.call_trace")
+        self.logger.setLevel(logging.INFO)
+
+    def tearDown(self):
+        CallTrace.stop()
+
+    def test_disabled_debug_does_not_format_arguments(self):
+        value = FormattedValue()
+        CallTrace.log(self.logger, "Test.method", value=value)
+        self.assertEqual(0, value.formatted, "Arguments shouldn't be formatted when DEBUG is disabled")
+
+    def test_enabled_debug_logs_call(self):
+        self.logger.setLevel(logging.DEBUG)
+        with self.assertLogs(self.logger, logging.DEBUG) as logs:
+            CallTrace.log(self.logger, "Test.method", name="beacon", location=(0, 0, 2000))
+        self.assertEqual(
+            ["Test.method(name=beacon, location=(0, 0, 2000))"], [record.getMessage() for record in logs.records],
+            "Call should be logged with its name and arguments")
+
+    def test_long_collections_are_logged_as_their_length(self):
+        self.assertEqual(
+            "(name=1000 items)", str(CallTrace("", {"name": list(range(1000))})),
+            "Long collections should be logged as their number of items")
+
+    def test_sampled_calls_are_traced(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, CallTrace.FILE_NAME)
+            CallTrace.start(filepath, sample_every=3)
+            for index in range(7):
+                CallTrace.log(self.logger, "Test.method", index=index, facing=Camera.Facing.FRONT)
+            CallTrace.stop()
+
+            with open(filepath, "r") as file:
+                records = [json.loads(line) for line in file]
+
+        self.assertEqual(
+            [0, 3, 6], [record["arguments"]["index"] for record in records],
+            "One of every 3 calls should be traced")
+        self.assertEqual("front", records[0]["arguments"]["facing"], "Enums should be traced as their value")
+
+    def test_negative_sampling_is_rejected(self):
+        with self.assertRaises(ValueError):
+            CallTrace.set_sample_every(-1)
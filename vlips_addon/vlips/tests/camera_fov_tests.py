@@ -0,0 +1,45 @@
+import unittest
+
+from vlips import CameraFOV
+
+
+class TestCameraFOV(unittest.TestCase):
+
+    @staticmethod
+    def create_camera_fov(beacon_distance=1000, tile_side=50):
+        # 4000 x 3000 pixels, 1 micron each, with a 4 mm lens
+        return CameraFOV(
+            sensor_width=4.0,
+            sensor_height=3.0,
+            focal_length=4.0,
+            beacon_distance=beacon_distance,
+            beacon_dimensions=(174, 174),
+            tile_side=tile_side)
+
+    def test_full_fov_grows_with_distance(self):
+        camera_fov = self.create_camera_fov()
+        self.assertEqual(1000, camera_fov.full_width, "Full FOV width should follow the similar triangles")
+        self.assertEqual(750, camera_fov.full_height, "Full FOV height should follow the similar triangles")
+
+    def test_fov_has_an_even_number_of_tiles(self):
+        camera_fov = self.create_camera_fov()
+        self.assertEqual(16, camera_fov.width_in_tiles_original, "826 mm should fit 16 full tiles")
+        self.assertEqual(11, camera_fov.height_in_tiles_original, "576 mm should fit 11 full tiles")
+        self.assertEqual(16, camera_fov.width_in_tiles, "An even number of tiles should be kept")
+        self.assertEqual(10, camera_fov.height_in_tiles, "An odd number of tiles should lose one")
+        self.assertEqual((800, 500), (camera_fov.width, camera_fov.height), "FOV should be made of full tiles")
+
+    def test_fov_smaller_than_a_tile_is_empty(self):
+        camera_fov = self.create_camera_fov(beacon_distance=200)
+        self.assertEqual((0, 0), (camera_fov.width_in_tiles, camera_fov.height_in_tiles), "FOV should be empty")
+        self.assertEqual([0.0], list(camera_fov.get_grid_x()), "Camera should only be placed in the middle")
+        self.assertEqual([0.0], list(camera_fov.get_grid_y()), "Camera should only be placed in the middle")
+
+    def test_grid_goes_left_to_right_and_top_to_bottom(self):
+        camera_fov = self.create_camera_fov()
+        grid_x = list(camera_fov.get_grid_x())
+        grid_y = list(camera_fov.get_grid_y())
+        self.assertEqual(17, len(grid_x), "There should be a column per tile corner")
+        self.assertEqual((-400, 400), (grid_x[0], grid_x[-1]), "Columns should go left to right")
+        self.assertEqual(11, len(grid_y), "There should be a row per tile corner")
+        self.assertEqual((250, -250), (grid_y[0], grid_y[-1]), "Rows should go top to bottom")
@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+
+from PIL import Image
+
+from vlips import Beacon, Camera, CameraMovementManifest, ExifWriter, Scene
+
+
+class TestCameraMovementManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_path = self.directory.name
+        self.manifest = CameraMovementManifest(self.output_path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def create_step(self, index, camera_location=(0, 50, 1000), rotation_x_angle=0.0, rotation_z_angle=10.0):
+        return CameraMovementManifest.create_step(
+            index=index,
+            filepath=os.path.join(self.output_path, f"{index}.jpg"),
+            camera_location=camera_location,
+            rotation_x_angle=rotation_x_angle,
+            rotation_z_angle=rotation_z_angle)
+
+    @staticmethod
+    def render(step, camera_location=None):
+        if camera_location is None:
+            camera_location = step["camera_location"]
+        Image.new("RGB", (8, 8)).save(step["filepath"], "JPEG")
+        ExifWriter.save_exif_data(
+            filepath=step["filepath"],
+            scene=Scene(tile_side=50, floor_sides_tiles=32),
+            beacon=Beacon(dimensions=(174, 174, 0), location=(0, 0, 2000)),
+            camera=Camera(
+                facing=Camera.Facing.FRONT,
+                focal_length=3.52,
+                location=tuple(camera_location),
+                rotation_x_angle=step["rotation_x_angle"],
+                rotation_z_angle=step["rotation_z_angle"]))
+
+    def test_write_and_read_steps(self):
+        steps = [self.create_step(0), self.create_step(1)]
+        self.manifest.write(steps)
+        self.assertEqual(steps, self.manifest.read(), "Manifest should return the steps written")
+
+    def test_steps_are_written_as_iterated(self):
+        steps = [self.create_step(index) for index in range(3)]
+        self.manifest.write(step for step in steps)
+        self.assertEqual(steps, self.manifest.read(), "Manifest should return the steps iterated")
+
+    def test_steps_without_render_are_pending(self):
+        steps = [self.create_step(0), self.create_step(1)]
+        self.assertEqual(steps, self.manifest.get_pending_steps(steps), "Every step should be pending")
+
+    def test_rendered_step_with_same_placement_is_skipped(self):
+        steps = [self.create_step(0), self.create_step(1)]
+        self.render(steps[0])
+        self.assertEqual(
+            [steps[1]], self.manifest.get_pending_steps(steps),
+            "Only the step without render should be pending")
+
+    def test_rendered_step_with_other_placement_is_pending(self):
+        steps = [self.create_step(0)]
+        self.render(steps[0], camera_location=(500, 50, 1000))
+        self.assertEqual(
+            steps, self.manifest.get_pending_steps(steps),
+            "Step rendered with another camera location should be pending")
+
+    def test_render_without_exif_is_pending(self):
+        steps = [self.create_step(0)]
+        Image.new("RGB", (8, 8)).save(steps[0]["filepath"], "JPEG")
+        self.assertEqual(
+            steps, self.manifest.get_pending_steps(steps),
+            "Step rendered without EXIF data should be pending")
+
+    def test_pending_steps_are_filtered_as_iterated(self):
+        steps = [self.create_step(0), self.create_step(1)]
+        self.render(steps[0])
+        pending_steps = self.manifest.iter_pending_steps(iter(steps))
+        self.assertEqual(steps[1], next(pending_steps), "Only the step without render should be pending")
+        self.assertIsNone(next(pending_steps, None), "No other step should be pending")
+
+    def test_completed_step_is_skipped_without_reading_exif(self):
+        steps = [self.create_step(0)]
+        Image.new("RGB", (8, 8)).save(steps[0]["filepath"], "JPEG")
+        self.manifest.record_completion(steps[0])
+        self.assertEqual(
+            [], self.manifest.get_pending_steps(steps),
+            "Step logged as completed and unchanged since should be skipped")
+
+    def test_completions_from_other_logs_are_read(self):
+        steps = [self.create_step(0)]
+        self.render(steps[0])
+        CameraMovementManifest(self.output_path, completed_file_name="manifest_completed_3.jsonl") \
+            .record_completion(steps[0])
+        self.assertIn(
+            steps[0]["filepath"], self.manifest.read_completions(),
+            "Completions logged by other shards should be read")
+
+    def test_culled_steps_are_excluded(self):
+        steps = [self.create_step(0), dict(self.create_step(1), culled=True), self.create_step(2)]
+        self.assertEqual(
+            [steps[0], steps[2]], CameraMovementManifest.exclude_culled(steps),
+            "Steps marked as culled should be excluded")
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from vlips import CameraMovementManifest, CameraMovementPlan, CameraMovementStepTable, Sweep, SweepAxis
+
+
+class TestCameraMovementPlan(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_path = self.directory.name
+        self.sweep = Sweep([
+            SweepAxis("distance", [1000, 2000], folder=lambda value: f"distance_{int(value):+}"),
+            SweepAxis("x", [0, 50, 100])])
+        self.composed_steps = 0
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def get_manifest_step(self, step_table, index):
+        self.composed_steps += 1
+        step = step_table[index]
+        return CameraMovementManifest.create_step(
+            index=index,
+            filepath=os.path.join(
+                self.output_path, self.sweep.get_directory(step), f"{int(step['file_index'])}.jpg"),
+            camera_location=(float(step["x"]), 0, 2000 - float(step["distance"])),
+            rotation_x_angle=0.0,
+            rotation_z_angle=0.0)
+
+    def create_plan(self, group_fields=("distance",), order=None):
+        step_table = CameraMovementStepTable.from_rows(
+            (self.sweep.get_row(step) for step in self.sweep), self.sweep.get_dtype(), group_fields)
+        return CameraMovementPlan(self.sweep, step_table, self.get_manifest_step, order=order)
+
+    def test_manifest_steps_are_composed_when_iterated(self):
+        plan = self.create_plan(order=[3, 4, 5, 0, 1, 2])
+        manifest_steps = plan.iter_manifest_steps()
+        self.assertEqual(0, self.composed_steps, "No manifest step should be composed before iterating")
+        self.assertEqual(
+            [3, 4, 5, 0, 1, 2], [manifest_step["index"] for manifest_step in manifest_steps],
+            "Manifest steps should follow the order of the plan")
+        self.assertEqual({"distance": 1000.0, "x": 50.0}, plan.get_step(1), "Step should have every axis")
+
+    def test_tagged_steps_stay_in_the_plan(self):
+        plan = self.create_plan(order=[5, 4, 3, 2, 1, 0])
+        culled_steps = plan.cull(np.array([True, False, True, True, False, True]), tag=True)
+        self.assertEqual(2, culled_steps)
+        self.assertEqual(6, len(plan), "Tagged steps should stay in the plan")
+        self.assertEqual([5, 3, 2, 0], plan.get_renderable_rows().tolist(), "Tagged steps shouldn't be rendered")
+        self.assertTrue(plan.get_manifest_step(4)["culled"], "Tagged steps should be marked as culled")
+
+    def test_removed_steps_leave_the_plan(self):
+        plan = self.create_plan(order=[5, 4, 3, 2, 1, 0])
+        plan.cull(np.array([True, False, True, True, False, True]), tag=False)
+        self.assertEqual([5, 3, 2, 0], plan.order.tolist(), "Culled steps should be removed")
+        self.assertEqual([5, 3, 2, 0], plan.get_renderable_rows().tolist())
+
+    def test_pending_rows_skip_saved_renders(self):
+        plan = self.create_plan()
+        manifest = CameraMovementManifest(self.output_path)
+        manifest_step = plan.get_manifest_step(1)
+        os.makedirs(os.path.dirname(manifest_step["filepath"]), exist_ok=True)
+        with open(manifest_step["filepath"], "wb"):
+            pass
+        manifest.record_completion(manifest_step)
+        self.assertEqual(
+            [0, 2, 4], plan.get_pending_rows(manifest, np.array([0, 1, 2, 4])).tolist(),
+            "Only rows without render should be pending")
+
+    def test_shared_file_path_is_found(self):
+        self.assertIsNone(self.create_plan().find_shared_file_path(), "Every step should have its own file")
+        shared_file_path = self.create_plan(group_fields=("x",)).find_shared_file_path()
+        self.assertEqual(
+            os.path.join(self.output_path, "distance_+1000", "0.jpg"), shared_file_path,
+            "Steps numbered by x share files in the same folder")
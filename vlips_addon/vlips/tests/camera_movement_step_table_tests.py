@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+
+from vlips import CameraMovementStepTable, PoseSampler
+
+
+class TestCameraMovementStepTable(unittest.TestCase):
+
+    DTYPE = np.dtype([
+        ("distance", np.float64),
+        ("rotation_x_angle", np.float64),
+        ("location", np.float64, (2,))
+    ])
+    GROUP_FIELDS = ["distance", "rotation_x_angle"]
+
+    @staticmethod
+    def get_rows(distances, angles, tiles):
+        for distance in distances:
+            for angle in angles:
+                for tile in range(tiles):
+                    yield distance, angle, (tile * 50.0, 0.0)
+
+    def test_rows_keep_their_values(self):
+        rows = list(self.get_rows([300, 400], [0, 10], 3))
+        table = CameraMovementStepTable.from_rows(iter(rows), self.DTYPE, self.GROUP_FIELDS)
+        self.assertEqual(len(rows), len(table), "There should be a row per step")
+        self.assertEqual(("distance", "rotation_x_angle", "location"), table.fields)
+        self.assertEqual(
+            {"distance": 300.0, "rotation_x_angle": 10.0, "location": (50.0, 0.0)}, table.get_step(4),
+            "Step should keep the values of its row")
+        self.assertEqual((len(rows), 2), table.steps["location"].shape, "Locations should have two columns")
+
+    def test_file_index_starts_over_with_every_group(self):
+        table = CameraMovementStepTable.from_rows(self.get_rows([300, 400], [0, 10], 3), self.DTYPE, self.GROUP_FIELDS)
+        self.assertEqual(
+            [0, 1, 2] * 4, table.steps["file_index"].tolist(),
+            "File index should start over when distance or angle changes")
+
+    def test_file_index_digits_follow_group_size(self):
+        rows = list(self.get_rows([300], [0], 11)) + list(self.get_rows([400], [0], 3))
+        table = CameraMovementStepTable.from_rows(rows, self.DTYPE, self.GROUP_FIELDS)
+        self.assertEqual(
+            [2] * 11 + [1] * 3, table.steps["file_index_digits"].tolist(),
+            "File index should be padded to the digits of the largest index in its group")
+
+    def test_file_index_is_position_without_group_fields(self):
+        rows = list(self.get_rows([300], [0, 10], 6))
+        table = CameraMovementStepTable.from_rows(rows, self.DTYPE)
+        self.assertEqual(list(range(12)), table.steps["file_index"].tolist(), "File index should be the position")
+        self.assertEqual([2] * 12, table.steps["file_index_digits"].tolist(), "Padding should follow the last index")
+
+    def test_sampled_files_are_unique(self):
+        # Poses drawn close to each other have the same truncated angle and
+        # grid coordinates
+        samples = PoseSampler(method=PoseSampler.Method.SOBOL).sample(count=100, bounds=[(-45, 45), (-500, 500)])
+        rows = [(1000.0, angle, (x, 0.0)) for angle, x in samples]
+        table = CameraMovementStepTable.from_rows(rows, self.DTYPE)
+        files = {
+            (int(step["rotation_x_angle"]), int(step["location"][0] / 50), int(step["file_index"]))
+            for step in table.steps}
+        self.assertEqual(len(rows), len(files), "Every sample should have its own file")
+
+    def test_rows_are_read_in_chunks(self):
+        chunk_size = CameraMovementStepTable.CHUNK_SIZE
+        CameraMovementStepTable.CHUNK_SIZE = 4
+        try:
+            table = CameraMovementStepTable.from_rows(
+                self.get_rows([300, 400, 500], [0], 3), self.DTYPE, self.GROUP_FIELDS)
+        finally:
+            CameraMovementStepTable.CHUNK_SIZE = chunk_size
+        self.assertEqual(9, len(table), "Every chunk should be kept")
+        self.assertEqual([0, 1, 2] * 3, table.steps["file_index"].tolist(), "Groups should span chunks")
+
+    def test_empty_table(self):
+        table = CameraMovementStepTable.from_rows([], self.DTYPE)
+        self.assertEqual(0, len(table), "Table should be empty")
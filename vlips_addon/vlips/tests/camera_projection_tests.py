@@ -0,0 +1,39 @@
+import unittest
+
+import numpy as np
+
+from vlips import Camera, CameraProjection
+
+
+class TestCameraProjection(unittest.TestCase):
+
+    def setUp(self):
+        self.camera = Camera(
+            facing=Camera.Facing.FRONT,
+            resolution_width=400,
+            resolution_height=300,
+            focal_length=4.0,
+            pixel_size=0.01,
+            location=(0, 0, 1000),
+            rotation=(180, 0, 180))
+        self.projection = CameraProjection(self.camera, 400, 300)
+
+    def test_point_above_camera_is_projected_to_image_center(self):
+        points, in_front = self.projection.project(np.array([[0, 0, 2000]]))
+        np.testing.assert_allclose([[200, 150]], points, err_msg="Point should be in the image center")
+        self.assertTrue(in_front[0], "Point above the camera should be in front of it")
+
+    def test_point_is_projected_with_focal_length_in_pixels(self):
+        points, _ = self.projection.project(np.array([[0, 100, 2000]]))
+        np.testing.assert_allclose(
+            [[200, 150 - 40]], points,
+            err_msg="Point should be focal length times distance ratio pixels above the center")
+
+    def test_point_below_camera_is_behind_it(self):
+        _, in_front = self.projection.project(np.array([[0, 0, 500]]))
+        self.assertFalse(in_front[0], "Point below the camera should be behind it")
+
+    def test_sensor_width_fits_larger_image_side(self):
+        self.assertAlmostEqual(
+            400.0, CameraProjection.get_focal_length_pixels(self.camera, 300, 400),
+            msg="Focal length in pixels shouldn't change in portrait orientation")
@@ -0,0 +1,58 @@
+import unittest
+
+from vlips import DatablockPool
+
+
+class Datablock:
+    """
+    Stand-in for a Blender datablock, which raises ReferenceError once it is
+    removed.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self.removed = False
+
+    @property
+    def name(self):
+        if self.removed:
+            raise ReferenceError("StructRNA has been removed")
+        return self._name
+
+
+class TestDatablockPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = DatablockPool()
+        self.created = []
+
+    def create(self, name):
+        def create():
+            datablock = Datablock(name)
+            self.created.append(datablock)
+            return datablock
+        return create
+
+    def test_datablock_is_created_once(self):
+        for _ in range(1000):
+            self.pool.get("material", "FOV", self.create("FOV"))
+        self.assertEqual(1, len(self.created), "Datablock should be created only the first time")
+
+    def test_kinds_are_pooled_apart(self):
+        mesh = self.pool.get("mesh", "FOV", self.create("FOV"))
+        material = self.pool.get("material", "FOV", self.create("FOV"))
+        self.assertIsNot(mesh, material, "Datablocks of different kinds should be pooled apart")
+        self.assertEqual(2, len(self.pool))
+
+    def test_removed_datablock_is_created_again(self):
+        material = self.pool.get("material", "FOV", self.create("FOV"))
+        material.removed = True
+        self.assertIsNot(
+            material, self.pool.get("material", "FOV", self.create("FOV")),
+            "Datablock removed from Blender should be created again")
+
+    def test_clear_forgets_datablocks(self):
+        self.pool.get("material", "FOV", self.create("FOV"))
+        self.pool.clear()
+        self.pool.get("material", "FOV", self.create("FOV"))
+        self.assertEqual(2, len(self.created), "Datablock should be created again after clearing the pool")
@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from vlips import Beacon, Camera, ExifReader, ExifWriter, RegionOfInterest, Scene
+
+
+class TestExifWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.directory.name, "render.jpg")
+        self.scene = Scene(tile_side=50, floor_sides_tiles=32)
+        self.beacon = Beacon(dimensions=(174, 174, 0), location=(0, 0, 2000))
+        self.camera = Camera(
+            facing=Camera.Facing.FRONT,
+            focal_length=3.52,
+            location=(100, -50, 1000),
+            rotation_x_angle=5.0,
+            rotation_z_angle=10.0)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def save_image(self, pixels):
+        ExifWriter.save_image(
+            filepath=self.filepath,
+            pixels=pixels,
+            scene=self.scene,
+            beacon=self.beacon,
+            camera=self.camera)
+
+    def test_save_image_includes_exif_data(self):
+        self.save_image(np.zeros((6, 8, 3), dtype=np.uint8))
+        camera = ExifReader(self.filepath).get_user_comment()["camera"]
+        self.assertEqual([100, -50, 1000], camera["location"], "Image should include the camera location")
+        self.assertEqual(10.0, camera["rotation_z_angle"], "Image should include the camera rotation")
+
+    def test_save_image_keeps_pixels(self):
+        pixels = np.zeros((6, 8, 3), dtype=np.uint8)
+        pixels[:3] = 255
+        self.save_image(pixels)
+        with Image.open(self.filepath) as image:
+            self.assertEqual((8, 6), image.size, "Image should keep its width and height")
+            self.assertGreater(image.getpixel((4, 0))[0], 250, "Top rows should be white")
+            self.assertLess(image.getpixel((4, 5))[0], 5, "Bottom rows should be black")
+
+    def test_save_image_replaces_file_without_leftovers(self):
+        self.save_image(np.zeros((6, 8, 3), dtype=np.uint8))
+        self.save_image(np.full((6, 8, 3), 255, dtype=np.uint8))
+        self.assertEqual(
+            ["render.jpg"], os.listdir(self.directory.name),
+            "Only the image should be left in the folder")
+
+    def test_save_image_creates_missing_folders(self):
+        self.filepath = os.path.join(self.directory.name, "distance_+300", "render.jpg")
+        self.save_image(np.zeros((6, 8, 3), dtype=np.uint8))
+        self.assertTrue(os.path.isfile(self.filepath), "Image should be saved in a new folder")
+
+    def test_save_image_includes_crop(self):
+        crop = RegionOfInterest(x=3, y=2, width=8, height=6, image_width=40, image_height=30)
+        ExifWriter.save_image(
+            filepath=self.filepath,
+            pixels=np.zeros((6, 8, 3), dtype=np.uint8),
+            scene=self.scene,
+            beacon=self.beacon,
+            camera=self.camera,
+            crop=crop)
+        self.assertEqual(crop.as_dict(), ExifReader(self.filepath).get_crop().as_dict(), "Image should include the crop")
+
+    def test_full_image_has_no_crop(self):
+        self.save_image(np.zeros((6, 8, 3), dtype=np.uint8))
+        self.assertIsNone(ExifReader(self.filepath).get_crop(), "Full image should have no crop")
@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from vlips import Beacon, Camera, ExifReader, ImageWriterPool, Scene, StageTimer
+
+
+class TestImageWriterPool(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.pool = ImageWriterPool(workers=2, queue_size=2)
+        self.scene = Scene(tile_side=50, floor_sides_tiles=32)
+        self.beacon = Beacon(dimensions=(174, 174, 0), location=(0, 0, 2000))
+
+    def tearDown(self):
+        self.pool.close()
+        self.directory.cleanup()
+
+    def save_image(self, file_name, x=0, tag=None):
+        self.pool.save_image(
+            filepath=os.path.join(self.directory.name, file_name),
+            pixels=np.zeros((4, 4, 3), dtype=np.uint8),
+            scene=self.scene,
+            beacon=self.beacon,
+            camera=Camera(facing=Camera.Facing.FRONT, focal_length=3.52, location=(x, 0, 1000)),
+            tag=tag)
+
+    def test_flush_waits_for_every_image(self):
+        for index in range(10):
+            self.save_image(f"{index}.jpg", x=index, tag=index)
+        self.pool.flush()
+        saved, failures = self.pool.collect()
+        self.assertEqual(list(range(10)), sorted(saved), "Every image should be saved")
+        self.assertEqual([], failures, "No image should fail")
+        self.assertEqual(
+            [9, 0, 1000],
+            ExifReader(os.path.join(self.directory.name, "9.jpg")).get_user_comment()["camera"]["location"],
+            "Images should include their own EXIF data")
+
+    def test_failures_are_collected(self):
+        os.mkdir(os.path.join(self.directory.name, "0.jpg"))
+        self.save_image("0.jpg")
+        self.pool.flush()
+        saved, failures = self.pool.collect()
+        self.assertEqual([], saved, "Image with the path of a folder shouldn't be saved")
+        self.assertEqual(1, len(failures), "Failure should be collected")
+        self.assertIsInstance(failures[0][1], OSError, "Failure should include its exception")
+
+    def test_save_exif_data_to_existing_image(self):
+        filepath = os.path.join(self.directory.name, "render.jpg")
+        Image.new("RGB", (4, 4)).save(filepath, "JPEG")
+        self.pool.save_exif_data(
+            filepath=filepath,
+            scene=self.scene,
+            beacon=self.beacon,
+            camera=Camera(facing=Camera.Facing.FRONT, focal_length=3.52, location=(5, 0, 1000)))
+        self.pool.close()
+        self.assertEqual([filepath], self.pool.collect()[0], "Tag should default to the file path")
+        self.assertEqual(
+            [5, 0, 1000], ExifReader(filepath).get_user_comment()["camera"]["location"],
+            "Image should include the EXIF data")
+
+    def test_closed_pool_refuses_images(self):
+        self.pool.close()
+        with self.assertRaises(RuntimeError):
+            self.save_image("0.jpg")
+
+    def test_jobs_are_timed(self):
+        self.pool.close()
+        stage_timer = StageTimer()
+        self.pool = ImageWriterPool(workers=2, queue_size=2, stage_timer=stage_timer)
+        for index in range(3):
+            self.save_image(f"{index}.jpg", x=index)
+        self.pool.flush()
+        stages = stage_timer.get_report()["stages"]
+        self.assertEqual(3, stages["save_image"]["count"], "Every job should be timed")
+        self.assertEqual(3, stages["writer_queue_wait"]["count"], "Every hand-off should be timed")
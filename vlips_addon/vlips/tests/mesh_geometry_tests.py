@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+
+from vlips import MeshGeometry
+
+
+class TestMeshGeometry(unittest.TestCase):
+
+    @staticmethod
+    def get_normals(geometry):
+        corners = geometry.vertices[geometry.faces]
+        return np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 1])
+
+    def test_plane_is_a_single_quad(self):
+        geometry = MeshGeometry.get_grid()
+        self.assertEqual((4, 3), geometry.vertices.shape)
+        self.assertEqual((1, 4), geometry.faces.shape)
+        np.testing.assert_array_equal(
+            [-1, 1], [geometry.vertices[:, 0].min(), geometry.vertices[:, 0].max()],
+            "Plane should have side 2")
+
+    def test_grid_has_a_face_per_tile(self):
+        geometry = MeshGeometry.get_grid(x_subdivisions=5, y_subdivisions=3)
+        self.assertEqual(6 * 4, len(geometry.vertices))
+        self.assertEqual(5 * 3, len(geometry.faces))
+        self.assertTrue(np.all(self.get_normals(geometry)[:, 2] > 0), "Grid faces should point up")
+
+    def test_grid_needs_subdivisions(self):
+        with self.assertRaises(ValueError):
+            MeshGeometry.get_grid(x_subdivisions=0)
+
+    def test_cube_faces_point_outwards(self):
+        geometry = MeshGeometry.get_cube()
+        centers = geometry.vertices[geometry.faces].mean(axis=1)
+        self.assertTrue(
+            np.all(np.sum(self.get_normals(geometry) * centers, axis=1) > 0),
+            "Cube faces should point outwards")
+
+    def test_loops_describe_the_faces(self):
+        geometry = MeshGeometry.get_grid(x_subdivisions=2, y_subdivisions=2)
+        np.testing.assert_array_equal([0, 4, 8, 12], geometry.loop_starts)
+        np.testing.assert_array_equal([4, 4, 4, 4], geometry.loop_totals)
+        np.testing.assert_array_equal(geometry.faces.ravel(), geometry.loop_vertex_indices)
+        self.assertEqual(9 * 3, geometry.coordinates.size)
@@ -0,0 +1,60 @@
+import unittest
+
+import numpy as np
+
+from vlips import PoseSampler
+
+
+class TestPoseSampler(unittest.TestCase):
+
+    def test_sobol_points_without_scrambling(self):
+        points = PoseSampler.get_sobol_points(4, 2)
+        np.testing.assert_array_equal(
+            [[0.0, 0.0], [0.5, 0.5], [0.75, 0.25], [0.25, 0.75]], points,
+            "First Sobol points should match the sequence")
+
+    def test_first_sobol_dimension_is_van_der_corput(self):
+        points = PoseSampler.get_sobol_points(8, 1)
+        np.testing.assert_array_equal(
+            [0, 4, 6, 2, 3, 7, 5, 1], (points[:, 0] * 8).astype(int),
+            "First dimension should be the van der Corput sequence in Gray code order")
+
+    def test_halton_points_without_scrambling(self):
+        points = PoseSampler.get_halton_points(3, 2)
+        np.testing.assert_allclose(
+            [[1 / 2, 1 / 3], [1 / 4, 2 / 3], [3 / 4, 1 / 9]], points,
+            err_msg="First Halton points should be the radical inverses of 1, 2, and 3")
+
+    def test_sobol_points_are_stratified(self):
+        points = PoseSampler(method=PoseSampler.Method.SOBOL, seed=7).sample_unit(256, 5)
+        for dimension in range(5):
+            self.assertEqual(
+                256, len(np.unique(np.floor(points[:, dimension] * 256))),
+                f"Each interval of dimension {dimension} should have one point")
+
+    def test_latin_hypercube_points_are_stratified(self):
+        points = PoseSampler(method=PoseSampler.Method.LATIN_HYPERCUBE, seed=7).sample_unit(50, 3)
+        for dimension in range(3):
+            self.assertEqual(
+                list(range(50)), sorted(np.floor(points[:, dimension] * 50).astype(int)),
+                f"Each stratum of dimension {dimension} should have one point")
+
+    def test_same_seed_draws_same_points(self):
+        for method in PoseSampler.Method:
+            first = PoseSampler(method=method, seed=3).sample(20, [(0, 10), (-5, 5)])
+            second = PoseSampler(method=method, seed=3).sample(20, [(0, 10), (-5, 5)])
+            np.testing.assert_array_equal(first, second, f"{method} should draw the same points with the same seed")
+
+    def test_points_are_inside_bounds(self):
+        bounds = [(300, 1500), (-30, 30), (0, 360)]
+        for method in PoseSampler.Method:
+            points = PoseSampler(method=method, seed=11).sample(100, bounds)
+            self.assertEqual((100, 3), points.shape, "There should be one row per point")
+            for dimension, (lower, upper) in enumerate(bounds):
+                self.assertTrue(
+                    np.all((points[:, dimension] >= lower) & (points[:, dimension] < upper)),
+                    f"{method} points should be inside the bounds of dimension {dimension}")
+
+    def test_too_many_dimensions(self):
+        with self.assertRaises(ValueError):
+            PoseSampler.get_sobol_points(4, len(PoseSampler.SOBOL_PARAMETERS) + 1)
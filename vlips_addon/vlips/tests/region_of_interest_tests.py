@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+
+from vlips import Beacon, Camera, RegionOfInterest
+
+
+class TestRegionOfInterest(unittest.TestCase):
+
+    def setUp(self):
+        self.beacon = Beacon(dimensions=(100, 50, 0), location=(0, 0, 2000))
+
+    def create_camera(self, location=(0, 0, 1000), rotation=(180.0, 0.0, 180.0)):
+        return Camera(
+            facing=Camera.Facing.FRONT,
+            resolution_width=400,
+            resolution_height=300,
+            focal_length=4.0,
+            pixel_size=0.01,
+            location=location,
+            rotation=rotation)
+
+    def test_region_around_centered_beacon(self):
+        region = RegionOfInterest.around_beacon(self.create_camera(), self.beacon, 400, 300, margin=10)
+        self.assertEqual(
+            (170, 130, 60, 40), (region.x, region.y, region.width, region.height),
+            "Region should be the beacon plus the margin")
+
+    def test_region_is_clipped_to_image(self):
+        region = RegionOfInterest.around_beacon(
+            self.create_camera(location=(450, 0, 1000)), self.beacon, 400, 300, margin=10)
+        self.assertEqual(400, region.x + region.width, "Region should end at the right side of the image")
+        self.assertLess(region.width, 60, "Region should only keep the part of the beacon inside the image")
+
+    def test_no_region_for_beacon_outside_image(self):
+        self.assertIsNone(
+            RegionOfInterest.around_beacon(self.create_camera(location=(5000, 0, 1000)), self.beacon, 400, 300),
+            "Beacon outside the image should need the whole image")
+        self.assertIsNone(
+            RegionOfInterest.around_beacon(
+                self.create_camera(rotation=(0.0, 0.0, 180.0)), self.beacon, 400, 300),
+            "Beacon behind the camera should need the whole image")
+
+    def test_border_matches_pixels(self):
+        region = RegionOfInterest(x=170, y=130, width=60, height=40, image_width=400, image_height=300)
+        min_x, max_x, min_y, max_y = region.get_border()
+        self.assertEqual(
+            (170, 230, 130, 170), (int(min_x * 400), int(max_x * 400), int(min_y * 300), int(max_y * 300)),
+            "Border should become the pixels of the region, counting rows from the bottom")
+
+    def test_paste_and_full_frame_coordinates(self):
+        region = RegionOfInterest(x=3, y=2, width=4, height=2, image_width=10, image_height=8)
+        full_frame = region.paste(np.full((2, 4, 3), 255, dtype=np.uint8))
+        self.assertEqual((8, 10, 3), full_frame.shape, "Full frame should have the size of the image")
+        self.assertEqual(8 * 3 * 255, int(full_frame.sum()), "Only the region should be filled")
+        self.assertEqual(255, full_frame[2, 3, 0], "Region should start at its offset")
+        np.testing.assert_allclose(
+            [[4.5, 3.5]], region.to_full_frame([[1.5, 1.5]]),
+            err_msg="Points should be moved by the offset of the region")
+
+    def test_dictionary_roundtrip(self):
+        region = RegionOfInterest(x=3, y=2, width=4, height=2, image_width=10, image_height=8)
+        self.assertEqual(
+            region.as_dict(), RegionOfInterest.from_dict(region.as_dict()).as_dict(),
+            "Region should be recreated from its dictionary")
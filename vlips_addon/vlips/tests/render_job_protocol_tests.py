@@ -0,0 +1,45 @@
+import os
+import unittest
+
+from vlips import RenderJobProtocol
+
+
+class TestRenderJobProtocol(unittest.TestCase):
+
+    @staticmethod
+    def create_pose(x=0, y=0):
+        return {"x": x, "y": y, "distance": 1000, "rotation_x_angle": 0, "rotation_z_angle": 10}
+
+    def test_messages_survive_encoding(self):
+        job = RenderJobProtocol.create_job("job", [self.create_pose()], "/tmp/renders")
+        line = RenderJobProtocol.encode(job)
+        self.assertTrue(line.endswith(b"\n"), "Messages should be lines")
+        self.assertEqual(job, RenderJobProtocol.decode(line), "Decoded message should be the one encoded")
+
+    def test_invalid_messages_are_rejected(self):
+        for line in (b"not json\n", b"[]\n", b'{"job_id": "job"}\n', b'{"type": "dance"}\n'):
+            with self.assertRaises(ValueError, msg=line):
+                RenderJobProtocol.decode(line)
+
+    def test_poses_must_be_complete(self):
+        with self.assertRaises(ValueError):
+            RenderJobProtocol.create_job("job", [{"x": 0, "y": 0}], "/tmp/renders")
+
+    def test_pose_values_must_be_finite_numbers(self):
+        for value in ("1000", None, True, float("nan"), float("inf")):
+            pose = dict(self.create_pose(), distance=value)
+            with self.assertRaises(ValueError, msg=repr(value)):
+                RenderJobProtocol.create_job("job", [pose], "/tmp/renders")
+
+    def test_decoded_pose_values_are_checked(self):
+        line = b'{"type": "render", "job_id": "job", "output_path": "/tmp/renders", "poses": ' \
+               b'[{"x": 0, "y": 0, "distance": NaN, "rotation_x_angle": 0, "rotation_z_angle": 0}]}\n'
+        with self.assertRaisesRegex(ValueError, "distance nan, which must be a finite number"):
+            RenderJobProtocol.validate_job(RenderJobProtocol.decode(line))
+
+    def test_file_paths_are_padded(self):
+        job = RenderJobProtocol.create_job(
+            "job", [self.create_pose(x=index) for index in range(12)], "/tmp/renders", file_prefix="fov")
+        file_paths = RenderJobProtocol.get_file_paths(job)
+        self.assertEqual(os.path.join("/tmp/renders", "fov_00.jpg"), file_paths[0])
+        self.assertEqual(os.path.join("/tmp/renders", "fov_11.jpg"), file_paths[-1])
@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+from vlips import FakeRenderWorker, RenderWorkerClient
+
+
+class TestRenderWorkerClient(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_path = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    @staticmethod
+    def create_poses(count):
+        return [
+            {"x": index * 50, "y": 0, "distance": 1000, "rotation_x_angle": 0, "rotation_z_angle": 0}
+            for index in range(count)]
+
+    async def test_job_results_arrive_as_saved(self):
+        async with FakeRenderWorker(save_images=True) as worker:
+            async with RenderWorkerClient(workers=[worker.address]) as client:
+                job = await client.submit(self.create_poses(3), self.output_path)
+                results = [result async for result in job]
+
+        self.assertEqual([0, 1, 2], [result.step for result in results])
+        self.assertTrue(all(os.path.isfile(result.filepath) for result in results), "Renders should be saved")
+        self.assertEqual([100, 0, 1500], results[2].metadata["camera_location"])
+        self.assertEqual(3, job.rendered)
+
+    async def test_failures_are_results_with_error(self):
+        async with FakeRenderWorker(fail_indices=[1]) as worker:
+            async with RenderWorkerClient(workers=[worker.address]) as client:
+                job = await client.submit(self.create_poses(3), self.output_path)
+                results = [result async for result in job]
+
+        self.assertEqual(["error" in result.metadata for result in results], [False, True, False])
+        self.assertEqual(1, job.failed)
+
+    async def test_render_spreads_batches_over_workers(self):
+        async with FakeRenderWorker(render_time=0.001) as first_worker, \
+                FakeRenderWorker(render_time=0.001) as second_worker:
+            async with RenderWorkerClient(workers=[first_worker.address, second_worker.address]) as client:
+                results = [
+                    result async for result in client.render(self.create_poses(20), self.output_path, batch_size=4)]
+
+        self.assertEqual(list(range(20)), sorted(result.step for result in results), "Every pose should render once")
+        self.assertEqual(20, len({result.filepath for result in results}), "Batches shouldn't share file names")
+        self.assertTrue(first_worker.jobs and second_worker.jobs, "Both workers should get jobs")
+
+    async def test_jobs_in_flight_are_capped(self):
+        async with FakeRenderWorker(render_time=0.001) as worker:
+            async with RenderWorkerClient(workers=[worker.address], max_in_flight=2) as client:
+                results = [
+                    result async for result in client.render(self.create_poses(12), self.output_path, batch_size=2)]
+
+        self.assertEqual(12, len(results))
+        self.assertEqual(6, len(worker.jobs))
+        self.assertLessEqual(worker.max_pending_jobs, 2, "No more than 2 jobs should be in flight")
+
+    async def test_invalid_job_fails(self):
+        async with FakeRenderWorker() as worker:
+            async with RenderWorkerClient(workers=[worker.address]) as client:
+                with self.assertRaises(ValueError):
+                    await client.submit([{"x": 0}], self.output_path)
+
+    async def test_error_without_job_fails_jobs_in_flight(self):
+        async with FakeRenderWorker() as worker:
+            async with RenderWorkerClient(workers=[worker.address]) as client:
+                # The worker rejects the job without knowing its identifier
+                job = await client.connections[0].submit({"type": "render", "job_id": "rejected", "poses": []})
+                with self.assertRaisesRegex(RuntimeError, "Job must have output_path"):
+                    [result async for result in job]
+                self.assertEqual(0, client.connections[0].in_flight, "Failed job should make room for others")
+
+    async def test_lost_worker_fails_jobs_in_flight(self):
+        worker = FakeRenderWorker(render_time=10)
+        await worker.start()
+        async with RenderWorkerClient(workers=[worker.address]) as client:
+            job = await client.submit(self.create_poses(1), self.output_path)
+            await client.connections[0].close()
+            with self.assertRaises(RuntimeError):
+                [result async for result in job]
+        await worker.close()
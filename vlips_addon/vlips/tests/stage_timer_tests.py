@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from vlips import StageTimer
+
+
+class TestStageTimer(unittest.TestCase):
+
+    def test_stages_are_summarized(self):
+        stage_timer = StageTimer()
+        for duration in [0.1, 0.2, 0.3, 0.4]:
+            stage_timer.record("render", duration)
+        stage_timer.record("save_image", 0.05)
+
+        report = stage_timer.get_report()
+        render = report["stages"]["render"]
+        self.assertEqual(4, render["count"], "Every run should be counted")
+        self.assertAlmostEqual(1.0, render["total"], msg="Runs should add up")
+        self.assertAlmostEqual(0.25, render["mean"], msg="Mean should be the average run")
+        self.assertAlmostEqual(0.25, render["p50"], msg="Median should be between the middle runs")
+        self.assertAlmostEqual(0.4, render["max"], msg="Maximum should be the longest run")
+        self.assertEqual(["render", "save_image"], list(report["stages"]), "Longest stages should come first")
+
+    def test_stage_context_times_its_code(self):
+        stage_timer = StageTimer()
+        with self.assertRaises(ValueError):
+            with stage_timer.stage("failing"):
+                raise ValueError()
+        self.assertEqual(1, stage_timer.get_report()["stages"]["failing"]["count"], "Failed runs should be timed")
+
+    def test_renders_from_several_threads(self):
+        stage_timer = StageTimer()
+        threads = [
+            threading.Thread(target=lambda: [stage_timer.count_renders() for _ in range(100)])
+            for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        report = stage_timer.get_report()
+        self.assertEqual(400, report["renders"], "Renders from every thread should be counted")
+        self.assertGreater(report["renders_per_second"], 0, "Throughput should be positive")
+
+    def test_report_is_saved_with_details(self):
+        stage_timer = StageTimer()
+        stage_timer.record("render", 0.1)
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, StageTimer.REPORT_FILE_NAME)
+            stage_timer.save_report(filepath, cancelled=True)
+            with open(filepath, "r") as file:
+                report = json.load(file)
+            self.assertEqual([StageTimer.REPORT_FILE_NAME], os.listdir(directory), "No temporary file should be left")
+        self.assertTrue(report["cancelled"], "Details should be included")
+        self.assertIn("render", report["stages"], "Stages should be included")
@@ -0,0 +1,154 @@
+import os
+import unittest
+
+import numpy as np
+
+from vlips import Sweep, SweepAxis
+
+
+class TestSweep(unittest.TestCase):
+
+    def test_steps_go_through_inner_axes_first(self):
+        sweep = Sweep([SweepAxis("distance", [1000, 2000]), SweepAxis("angle", [0, 45])])
+        self.assertEqual(
+            [
+                {"distance": 1000, "angle": 0},
+                {"distance": 1000, "angle": 45},
+                {"distance": 2000, "angle": 0},
+                {"distance": 2000, "angle": 45}
+            ],
+            list(sweep))
+
+    def test_values_can_depend_on_outer_axes(self):
+        sweep = Sweep([
+            SweepAxis("distance", [1, 2]),
+            SweepAxis("x", lambda outer_values: range(outer_values["distance"]))])
+        self.assertEqual([(1, 0), (2, 0), (2, 1)], [(step["distance"], step["x"]) for step in sweep])
+        self.assertEqual(3, sweep.count())
+
+    def test_range_includes_end(self):
+        self.assertEqual([-10.0, 0.0, 10.0], SweepAxis.from_range("angle", -10, 10, 10).get_values({}))
+
+    def test_range_step_cannot_be_zero(self):
+        sweep = Sweep([SweepAxis.from_range("distance", 1000, 2000, 0, label="Distance")])
+        with self.assertRaisesRegex(ValueError, "Distance step cannot be zero"):
+            list(sweep)
+
+    def test_axis_names_are_unique(self):
+        sweep = Sweep([SweepAxis("distance", [1000])])
+        with self.assertRaises(ValueError):
+            sweep.register(SweepAxis("distance", [2000]))
+
+    def test_directory_has_a_folder_per_axis_with_one(self):
+        sweep = Sweep([
+            SweepAxis("distance", [1000], folder=lambda value: f"distance_{value:+}"),
+            SweepAxis("x", [0]),
+            SweepAxis("angle", [-5], folder=lambda value: f"angle_{value:+}")])
+        step = next(iter(sweep))
+        self.assertEqual(os.path.join("distance_+1000", "angle_-5"), sweep.get_directory(step))
+        self.assertEqual("", Sweep([SweepAxis("x", [0])]).get_directory({"x": 0}))
+
+    def test_exif_fields_of_axes(self):
+        sweep = Sweep([SweepAxis("angle", [30], exif_field="rotation_x_angle"), SweepAxis("x", [0])])
+        self.assertEqual({"rotation_x_angle": 30}, sweep.get_exif_fields({"angle": 30, "x": 0}))
+
+    def test_apply_skips_unchanged_values(self):
+        applied = []
+        sweep = Sweep([
+            SweepAxis("height", [2500, 3000], apply=lambda context, value: applied.append((context, "height", value))),
+            SweepAxis("x", [0, 1], apply=lambda context, value: applied.append((context, "x", value))),
+            SweepAxis("label", ["a"])])
+        previous_step = None
+        for step in sweep:
+            sweep.apply("context", step, previous_step)
+            previous_step = step
+        self.assertEqual(
+            [("height", 2500), ("x", 0), ("x", 1), ("height", 3000), ("x", 0), ("x", 1)],
+            [(name, value) for _, name, value in applied])
+        self.assertEqual({"context"}, {context for context, _, _ in applied}, "Axes should get the context")
+        self.assertEqual(["x"], sweep.apply("context", {"x": 2}), "Axes without values should be left as they are")
+
+    def test_table_has_a_column_per_axis(self):
+        sweep = Sweep([SweepAxis("distance", [1000, 2000]), SweepAxis("location", [(0, 50)], shape=(2,))])
+        table = np.array([sweep.get_row(step) for step in sweep], dtype=sweep.get_dtype())
+        self.assertEqual(("distance", "location"), table.dtype.names)
+        self.assertEqual([1000.0, 2000.0], table["distance"].tolist())
+        self.assertEqual([[0.0, 50.0], [0.0, 50.0]], table["location"].tolist())
+
+    @staticmethod
+    def get_table(sweep: Sweep) -> np.ndarray:
+        return np.array([sweep.get_row(step) for step in sweep], dtype=sweep.get_dtype())
+
+    def test_order_by_cost_changes_expensive_axes_least(self):
+        sweep = Sweep([
+            SweepAxis("x", [0, 1, 2], cost=1),
+            SweepAxis("height", [2500, 3000], cost=100)])
+        table = self.get_table(sweep)
+        order = sweep.order_by_cost(table)
+
+        self.assertEqual(sorted(order), list(range(len(table))), "Every step should be kept once")
+        self.assertEqual(5, sweep.count_expensive_transitions(table, min_cost=100))
+        self.assertEqual(1, sweep.count_expensive_transitions(table, min_cost=100, order=order))
+        self.assertEqual([0, 1, 2, 2, 1, 0], table["x"][order].tolist())
+        self.assertLess(sweep.get_transition_cost(table, order), sweep.get_transition_cost(table))
+
+    def test_order_by_cost_moves_one_axis_at_a_time(self):
+        sweep = Sweep([
+            SweepAxis("distance", [1000, 2000, 3000], cost=10),
+            SweepAxis("angle", [-10, 0, 10], cost=1),
+            SweepAxis("x", [0, 1, 2, 3], cost=1)])
+        table = self.get_table(sweep)
+        order = sweep.order_by_cost(table)
+
+        self.assertEqual(0, order[0])
+        transitions = sweep.count_transitions(table, order)
+        self.assertEqual({"distance": 2, "angle": 6, "x": 27}, transitions)
+        self.assertEqual(len(table) - 1, sum(transitions.values()), "A single axis should change per step")
+
+    def test_order_by_cost_groups_locations(self):
+        sweep = Sweep([
+            SweepAxis("location", [(0, 0), (50, 0), (0, 50)], shape=(2,), cost=1),
+            SweepAxis("distance", [1000, 2000], cost=100)])
+        table = self.get_table(sweep)
+        order = sweep.order_by_cost(table)
+
+        self.assertEqual({"location": 2, "distance": 5}, sweep.count_transitions(table))
+        self.assertEqual({"location": 4, "distance": 1}, sweep.count_transitions(table, order))
+        self.assertEqual(
+            [[0, 0], [50, 0], [0, 50], [0, 50], [50, 0], [0, 0]], table["location"][order].tolist(),
+            "Locations should be gone through forth and back, in the order they first appear in")
+
+    def test_compare_transitions_when_expensive_axis_is_inner(self):
+        sweep = Sweep([
+            SweepAxis("x", [0, 1, 2, 3], cost=1),
+            SweepAxis("distance", [1000, 2000], cost=100)])
+        columns = {name: self.get_table(sweep)[name] for name in ("x", "distance")}
+        order = sweep.order_by_cost(columns)
+
+        self.assertEqual(
+            {
+                "expensive_transitions_before": 7,
+                "expensive_transitions_after": 1,
+                "transition_cost_before": 703,
+                "transition_cost_after": 106
+            },
+            sweep.compare_transitions(columns, order, min_cost=100))
+
+    def test_compare_transitions_when_expensive_axis_is_outer(self):
+        sweep = Sweep([
+            SweepAxis("distance", [1000, 2000], cost=100),
+            SweepAxis("x", [0, 1, 2, 3], cost=1)])
+        table = self.get_table(sweep)
+        transitions = sweep.compare_transitions(table, sweep.order_by_cost(table), min_cost=100)
+
+        self.assertEqual(1, transitions["expensive_transitions_before"])
+        self.assertEqual(1, transitions["expensive_transitions_after"])
+        self.assertEqual(
+            transitions["transition_cost_before"] - 1, transitions["transition_cost_after"],
+            "Only the jump of the cheap axis back to its first value should be saved")
+
+    def test_order_by_cost_without_steps(self):
+        sweep = Sweep([SweepAxis("distance", [], cost=100), SweepAxis("x", [0], cost=1)])
+        table = self.get_table(sweep)
+        self.assertEqual([], sweep.order_by_cost(table).tolist())
+        self.assertEqual(0, sweep.count_expensive_transitions(table, min_cost=100))
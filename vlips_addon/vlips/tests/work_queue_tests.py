@@ -0,0 +1,115 @@
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from vlips import WorkQueue
+
+
+def run_worker(path, worker_id, lease_duration, render_time=0.0, crash_step=None):
+    """
+    Work on a queue as a render node would, writing a file per step rendered,
+    and dying without warning when rendering the given step.
+    """
+
+    def render_steps(steps):
+        for step in steps:
+            if step == crash_step:
+                os._exit(1)
+            time.sleep(render_time)
+            with open(os.path.join(path, "renders", f"{step}.json"), "w") as file:
+                json.dump({"worker_id": worker_id}, file)
+
+    queue = WorkQueue(path, worker_id=worker_id, lease_duration=lease_duration)
+    queue.work(render_steps, poll_interval=0.05)
+
+
+class TestWorkQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+        os.makedirs(os.path.join(self.path, "renders"))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def get_rendered_steps(self):
+        return sorted(int(file_path.stem) for file_path in Path(self.path, "renders").glob("*.json"))
+
+    def test_create_splits_steps_into_batches(self):
+        queue = WorkQueue(self.path)
+        self.assertEqual(3, queue.create(range(10), batch_size=4))
+        self.assertEqual({"total": 3, "done": 0, "given_up": 0, "leased": 0, "pending": 3}, queue.get_status())
+
+    def test_leased_batches_are_not_claimed_twice(self):
+        queue = WorkQueue(self.path, worker_id="first")
+        queue.create(range(4), batch_size=2)
+        first_lease = queue.claim()
+        second_lease = WorkQueue(self.path, worker_id="second").claim()
+        self.assertEqual([0, 1], first_lease.steps)
+        self.assertEqual([2, 3], second_lease.steps)
+        self.assertIsNone(queue.claim(), "Every batch should be leased")
+
+    def test_expired_lease_is_reclaimed(self):
+        queue = WorkQueue(self.path, worker_id="dead", lease_duration=0.05)
+        queue.create(range(2), batch_size=2)
+        dead_lease = queue.claim()
+        time.sleep(0.1)
+
+        lease = WorkQueue(self.path, worker_id="alive").claim()
+        self.assertEqual(0, lease.batch_index)
+        self.assertFalse(queue.heartbeat(dead_lease), "Expired lease should be lost")
+
+    def test_heartbeat_keeps_lease(self):
+        queue = WorkQueue(self.path, lease_duration=0.2)
+        queue.create(range(2), batch_size=2)
+        lease = queue.claim()
+        with queue.keep_alive(lease):
+            time.sleep(0.5)
+            self.assertIsNone(WorkQueue(self.path).claim(), "Lease renewed should not expire")
+
+    def test_released_batch_is_given_up_after_max_attempts(self):
+        queue = WorkQueue(self.path, max_attempts=2)
+        queue.create(range(2), batch_size=2)
+        queue.release(queue.claim(), "Render failed")
+        queue.release(queue.claim(), "Render failed")
+        self.assertIsNone(queue.claim(), "Batch should be given up")
+        self.assertEqual(1, queue.get_status()["given_up"])
+
+    def test_work_completes_batches(self):
+        queue = WorkQueue(self.path)
+        queue.create(range(5), batch_size=2)
+        rendered = []
+        result = queue.work(rendered.extend)
+        self.assertEqual(list(range(5)), rendered)
+        self.assertEqual({"completed": 3, "failed": 0}, result)
+        self.assertEqual(3, queue.get_status()["done"])
+
+    def test_workers_finish_work_of_dead_worker(self):
+        lease_duration = 0.5
+        queue = WorkQueue(self.path, lease_duration=lease_duration)
+        queue.create(range(40), batch_size=4)
+
+        # Dies after its first batch, holding the lease of the second one
+        dead_worker = multiprocessing.Process(target=run_worker, args=(self.path, "dead", lease_duration, 0.01, 5))
+        dead_worker.start()
+        dead_worker.join()
+        self.assertEqual(1, dead_worker.exitcode, "Worker should die while rendering")
+
+        workers = [
+            multiprocessing.Process(target=run_worker, args=(self.path, f"node{index}", lease_duration, 0.01))
+            for index in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=30)
+
+        self.assertEqual([0] * len(workers), [worker.exitcode for worker in workers])
+        self.assertEqual(list(range(40)), self.get_rendered_steps(), "Every step should be rendered")
+        self.assertEqual({"total": 10, "done": 10, "given_up": 0, "leased": 0, "pending": 0}, queue.get_status())
+        failures = [json.loads(file_path.read_text()) for file_path in Path(self.path, "failures").glob("1_*.json")]
+        self.assertEqual([("dead", "Lease expired")], [(failure["worker_id"], failure["error"]) for failure in failures])
@@ -1,6 +1,8 @@
 import datetime
 import logging
 
+from .call_trace import CallTrace
+
 log = logging.getLogger(__name__)
 
 
@@ -16,8 +18,8 @@ class Timestamp:
         """
 
         log.info("Get timestamp with format")
-        log.debug(f"Timestamp.get("
-                  f"format_string={format_string}")
+        CallTrace.log(log, "Timestamp.get",
+                      format_string=format_string)
 
         timestamp = datetime.datetime.now().strftime(format_string)
 
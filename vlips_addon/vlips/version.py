@@ -1,6 +1,8 @@
 import logging
 from typing import Tuple
 
+from .call_trace import CallTrace
+
 log = logging.getLogger(__name__)
 
 
@@ -31,11 +33,11 @@ class Version:
         """
 
         log.info("Create new instance of class Version")
-        log.debug(f"Version.init("
-                      f"major={major}"
-                      f"minor={minor}"
-                      f"minor={patch}"
-                      f"components={components})")
+        CallTrace.log(log, "Version.init",
+                      major=major,
+                      minor=minor,
+                      patch=patch,
+                      components=components)
 
         if components is None:
             self.major = major
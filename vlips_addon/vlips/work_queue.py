@@ -0,0 +1,395 @@
+import json
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from .call_trace import CallTrace
+
+log = logging.getLogger(__name__)
+
+
+class WorkQueueLease:
+    """
+    Claim of a worker on a batch of steps, valid until it expires unless the
+    worker renews it with heartbeats.
+    """
+
+    def __init__(self, batch_index: int, steps: [int], token: str, expires_at: float):
+        """
+        Create an instance of the WorkQueueLease class.
+
+        :param batch_index: index of the batch claimed.
+        :param steps: indices of the steps of the batch.
+        :param token: identifier of this claim, so a lease taken over by
+        another worker isn't renewed or released by mistake.
+        :param expires_at: time the lease expires at, in seconds since the
+        epoch.
+        """
+
+        self.batch_index = batch_index
+        self.steps = steps
+        self.token = token
+        self.expires_at = expires_at
+
+
+class WorkQueue:
+    """
+    Steps of a camera movement shared by several render nodes through a
+    folder every node can reach, like a shared volume. Steps are grouped in
+    batches, and workers on any node claim one batch at a time under a
+    time-limited lease, renewed with heartbeats while they render it. Batches
+    whose lease expires, because their worker died, are claimed again by
+    other workers, and batches whose worker failed are released right away,
+    up to a number of attempts.
+
+    Only files are used, no database: leases are created atomically with
+    exclusive creation, and expired leases are taken over by renaming them,
+    which only one worker can do. Clocks of the nodes must be synchronized,
+    as with NTP, since leases expire at absolute times.
+    """
+
+    QUEUE_FOLDER_NAME = "work_queue"
+    DEFAULT_BATCH_SIZE = 16
+    DEFAULT_LEASE_DURATION = 300.0  # seconds
+    DEFAULT_MAX_ATTEMPTS = 3
+
+    def __init__(
+            self,
+            path: str,
+            worker_id: str = None,
+            lease_duration: float = DEFAULT_LEASE_DURATION,
+            max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    ):
+        """
+        Create an instance of the WorkQueue class for the queue in the given
+        folder.
+
+        :param path: folder of the queue, usually inside the output folder of
+        the camera movement.
+        :param worker_id: name of the worker in leases and logs. Host name and
+        process id, if not provided.
+        :param lease_duration: time a lease lasts without heartbeats, in
+        seconds.
+        :param max_attempts: number of times a batch can fail before it is
+        given up.
+        """
+
+        log.info("Create instance of WorkQueue class")
+        CallTrace.log(log, "WorkQueue.__init__",
+                      path=path,
+                      worker_id=worker_id,
+                      lease_duration=lease_duration,
+                      max_attempts=max_attempts)
+
+        if lease_duration <= 0:
+            raise ValueError("Leases must last some time")
+        if max_attempts < 1:
+            raise ValueError("Batches must be attempted at least once")
+
+        self.path = Path(path)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_duration = lease_duration
+        self.max_attempts = max_attempts
+
+        self._batches_path = self.path / "batches"
+        self._leases_path = self.path / "leases"
+        self._done_path = self.path / "done"
+        self._failures_path = self.path / "failures"
+
+    def create(self, steps: [int], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Fill the queue with the steps to render, replacing whatever it had.
+        Only the scheduler calls it, before starting the workers.
+
+        :param steps: indices of the steps to render.
+        :param batch_size: steps per batch.
+
+        :return: number of batches.
+        :rtype: int
+        """
+
+        log.info("Create work queue")
+        CallTrace.log(log, "WorkQueue.create",
+                      steps=steps,
+                      batch_size=batch_size)
+
+        if batch_size < 1:
+            raise ValueError("Batches must have at least one step")
+
+        for folder in (self._batches_path, self._leases_path, self._done_path, self._failures_path):
+            folder.mkdir(parents=True, exist_ok=True)
+            for file_path in folder.iterdir():
+                file_path.unlink()
+
+        steps = [int(step) for step in steps]
+        batches = [steps[start:start + batch_size] for start in range(0, len(steps), batch_size)]
+        for batch_index, batch in enumerate(batches):
+            self._write_json(self._batches_path / f"{batch_index}.json", {"steps": batch})
+
+        return len(batches)
+
+    def claim(self) -> WorkQueueLease:
+        """
+        Claim the first batch that isn't done, given up, or leased by a worker
+        still alive.
+
+        :return: lease on the batch, or None if there is nothing to claim now.
+        :rtype: WorkQueueLease
+        """
+
+        for batch_index in self._get_batch_indices():
+            if self._is_done(batch_index) or self._count_failures(batch_index) >= self.max_attempts:
+                continue
+
+            lease_path = self._get_lease_path(batch_index)
+            lease = self._read_json(lease_path)
+            if lease is not None:
+                if lease["expires_at"] > time.time():
+                    continue
+
+                # Only one worker can rename the expired lease out of the way.
+                # If another worker reclaimed it in the meantime, the lease
+                # renamed is its new one, so it is put back
+                expired_path = lease_path.with_name(f"{batch_index}.expired-{uuid.uuid4().hex}")
+                try:
+                    os.rename(lease_path, expired_path)
+                except FileNotFoundError:
+                    continue
+                renamed_lease = self._read_json(expired_path)
+                if renamed_lease is None or renamed_lease["token"] != lease["token"]:
+                    try:
+                        os.link(expired_path, lease_path)
+                    except FileExistsError:
+                        pass
+                    expired_path.unlink()
+                    continue
+                expired_path.unlink()
+
+                log.warning(f"Lease of batch {batch_index} held by {lease['worker_id']} expired, reclaimed")
+                self._record_failure(batch_index, lease["worker_id"], "Lease expired")
+                if self._count_failures(batch_index) >= self.max_attempts:
+                    continue
+
+            token = uuid.uuid4().hex
+            expires_at = time.time() + self.lease_duration
+            try:
+                file_descriptor = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                continue
+            with os.fdopen(file_descriptor, "w") as file:
+                json.dump({"worker_id": self.worker_id, "token": token, "expires_at": expires_at}, file)
+
+            # The batch may have been completed, and its lease removed, since
+            # it was checked
+            if self._is_done(batch_index):
+                lease_path.unlink()
+                continue
+
+            log.info(f"Batch {batch_index} claimed by {self.worker_id}")
+            return WorkQueueLease(
+                batch_index=batch_index,
+                steps=self._read_json(self._batches_path / f"{batch_index}.json")["steps"],
+                token=token,
+                expires_at=expires_at)
+
+        return None
+
+    def heartbeat(self, lease: WorkQueueLease) -> bool:
+        """
+        Renew a lease, so it doesn't expire while its batch is being rendered.
+
+        :param lease: lease to renew.
+
+        :return: False if the lease was lost, as when it expired and another
+        worker claimed the batch.
+        :rtype: bool
+        """
+
+        if not self._owns(lease):
+            log.warning(f"Lease of batch {lease.batch_index} lost by {self.worker_id}")
+            return False
+
+        lease.expires_at = time.time() + self.lease_duration
+        self._write_json(
+            self._get_lease_path(lease.batch_index),
+            {"worker_id": self.worker_id, "token": lease.token, "expires_at": lease.expires_at})
+        return True
+
+    def complete(self, lease: WorkQueueLease):
+        """
+        Mark the batch of a lease as done, and release the lease.
+
+        :param lease: lease on the batch rendered.
+        """
+
+        log.info(f"Batch {lease.batch_index} completed by {self.worker_id}")
+
+        self._write_json(self._done_path / f"{lease.batch_index}.json", {"worker_id": self.worker_id})
+        self._remove_lease(lease)
+
+    def release(self, lease: WorkQueueLease, error: str):
+        """
+        Give a batch back after failing to render it, so another worker can
+        try again right away.
+
+        :param lease: lease on the batch that failed.
+        :param error: description of the failure.
+        """
+
+        log.warning(f"Batch {lease.batch_index} released by {self.worker_id}: {error}")
+
+        self._record_failure(lease.batch_index, self.worker_id, error)
+        self._remove_lease(lease)
+
+    @contextmanager
+    def keep_alive(self, lease: WorkQueueLease):
+        """
+        Renew a lease from a background thread while the code inside the
+        context runs, three times per lease duration.
+
+        :param lease: lease to renew.
+        """
+
+        stopped = threading.Event()
+
+        def beat():
+            while not stopped.wait(self.lease_duration / 3):
+                if not self.heartbeat(lease):
+                    return
+
+        thread = threading.Thread(target=beat, name=f"WorkQueue-heartbeat-{lease.batch_index}", daemon=True)
+        thread.start()
+        try:
+            yield lease
+        finally:
+            stopped.set()
+            thread.join()
+
+    def work(self, render_steps, poll_interval: float = 1.0) -> dict:
+        """
+        Claim and render batches until none is left, waiting for batches
+        leased by other workers in case their lease expires.
+
+        :param render_steps: function rendering a list of step indices. A
+        batch fails if it raises an exception.
+        :param poll_interval: time to wait before trying to claim again when
+        every pending batch is leased, in seconds.
+
+        :return: number of batches completed and failed by this worker.
+        :rtype: dict
+        """
+
+        CallTrace.log(log, "WorkQueue.work",
+                      render_steps=render_steps,
+                      poll_interval=poll_interval)
+
+        completed = 0
+        failed = 0
+        while True:
+            lease = self.claim()
+            if lease is None:
+                status = self.get_status()
+                if status["pending"] + status["leased"] == 0:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            try:
+                with self.keep_alive(lease):
+                    render_steps(lease.steps)
+            except Exception as error:
+                failed += 1
+                self.release(lease, str(error))
+            else:
+                completed += 1
+                self.complete(lease)
+
+        return {"completed": completed, "failed": failed}
+
+    def get_status(self) -> dict:
+        """
+        Count the batches of the queue by state.
+
+        :return: number of batches in total, done, given up after failing
+        too many times, leased, and pending.
+        :rtype: dict
+        """
+
+        status = {"total": 0, "done": 0, "given_up": 0, "leased": 0, "pending": 0}
+        now = time.time()
+        for batch_index in self._get_batch_indices():
+            status["total"] += 1
+            if self._is_done(batch_index):
+                status["done"] += 1
+            elif self._count_failures(batch_index) >= self.max_attempts:
+                status["given_up"] += 1
+            else:
+                lease = self._read_json(self._get_lease_path(batch_index))
+                if lease is not None and lease["expires_at"] > now:
+                    status["leased"] += 1
+                else:
+                    status["pending"] += 1
+
+        return status
+
+    def _get_batch_indices(self) -> [int]:
+        if not self._batches_path.is_dir():
+            return []
+        return sorted(int(file_path.stem) for file_path in self._batches_path.glob("*.json"))
+
+    def _get_lease_path(self, batch_index: int) -> Path:
+        return self._leases_path / f"{batch_index}.json"
+
+    def _is_done(self, batch_index: int) -> bool:
+        return (self._done_path / f"{batch_index}.json").is_file()
+
+    def _count_failures(self, batch_index: int) -> int:
+        return len(list(self._failures_path.glob(f"{batch_index}_*.json")))
+
+    def _record_failure(self, batch_index: int, worker_id: str, error: str):
+        self._write_json(
+            self._failures_path / f"{batch_index}_{uuid.uuid4().hex}.json",
+            {"worker_id": worker_id, "error": error, "time": time.time()})
+
+    def _owns(self, lease: WorkQueueLease) -> bool:
+        current_lease = self._read_json(self._get_lease_path(lease.batch_index))
+        return current_lease is not None and current_lease["token"] == lease.token
+
+    def _remove_lease(self, lease: WorkQueueLease):
+        if self._owns(lease):
+            try:
+                self._get_lease_path(lease.batch_index).unlink()
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _read_json(file_path: Path):
+        """
+        Load a JSON file, or None if it doesn't exist or is being written.
+        """
+
+        try:
+            with open(file_path, "r") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def _write_json(file_path: Path, content):
+        """
+        Save a JSON file atomically, so other nodes never read it half written.
+        """
+
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=file_path.parent,
+            prefix=".",
+            suffix=".tmp")
+        with os.fdopen(file_descriptor, "w") as file:
+            json.dump(content, file)
+        os.replace(temporary_path, file_path)